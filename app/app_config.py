@@ -468,17 +468,66 @@ UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 TEMP_DIR = STORAGE_DIR / "temp"
 TEMP_DIR.mkdir(parents=True, exist_ok=True)
 
+# Ingest-time normalization of uploaded photos (requires Pillow)
+PHOTO_NORMALIZE_ON_UPLOAD = os.getenv("PHOTO_NORMALIZE_ON_UPLOAD", "true").lower() == "true"
+PHOTO_MAX_DIMENSION = int(os.getenv("PHOTO_MAX_DIMENSION", "1600"))
+PHOTO_QUALITY = int(os.getenv("PHOTO_QUALITY", "82"))
+PHOTO_OUTPUT_FORMAT = os.getenv("PHOTO_OUTPUT_FORMAT", "webp").lower()  # "webp" or "jpeg"
 
-def get_upload_path(filename: str) -> Path:
-    """Get absolute path for an uploaded file.
-    
-    Args:
-        filename: The filename (not full path)
-        
-    Returns:
-        Absolute Path to the file in uploads directory
-    """
-    return UPLOADS_DIR / filename
+# Photo columns hold FileStore filenames; longer values are legacy inline base64
+MAX_PHOTO_REFERENCE_LENGTH = 255
+
+# In-memory cache of base64-encoded photos (PhotoService)
+PHOTO_CACHE_MAX_MB = int(os.getenv("PHOTO_CACHE_MAX_MB", "64"))
+PHOTO_CACHE_MAX_ENTRIES = int(os.getenv("PHOTO_CACHE_MAX_ENTRIES", "512"))
+
+# Longest side in pixels of the tiny inline preview shown while a photo loads
+PHOTO_PLACEHOLDER_SIZE = int(os.getenv("PHOTO_PLACEHOLDER_SIZE", "16"))
+
+# Threads shared by all sessions for loading photos concurrently (list/grid views)
+PHOTO_PREFETCH_WORKERS = int(os.getenv("PHOTO_PREFETCH_WORKERS", "8"))
+
+# Store uploads by SHA-256 with reference counting so identical files are kept once
+CONTENT_ADDRESSED_UPLOADS = os.getenv("CONTENT_ADDRESSED_UPLOADS", "true").lower() == "true"
+
+# Orphaned uploads are quarantined, then purged after this many hours; files
+# younger than this are never collected (their row may not be saved yet)
+UPLOAD_GC_GRACE_HOURS = float(os.getenv("UPLOAD_GC_GRACE_HOURS", "24"))
+
+# Upload storage backend: "filesystem" (files under storage/uploads) or
+# "sqlite" (images as BLOBs in BLOB_STORE_PATH, one file to back up and replicate)
+FILE_STORE_BACKEND = os.getenv("FILE_STORE_BACKEND", "filesystem").lower()
+BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", str(STORAGE_DIR / "data/photos.db"))
+
+# Spread uploads over two levels of hashed subdirectories (uploads/ab/cd/<file>)
+SHARDED_UPLOADS = os.getenv("SHARDED_UPLOADS", "true").lower() == "true"
+
+# Analytics aggregation engine: "python" (row-by-row), "numpy" (columnar arrays)
+# or "auto" (numpy when installed)
+ANALYTICS_ENGINE = os.getenv("ANALYTICS_ENGINE", "auto").lower()
+
+# Background analytics warmer: recompute dashboard/chart aggregates after writes
+# settle for DEBOUNCE seconds (at most MAX_DELAY after the first write of a burst).
+# Its snapshot is served to pages for at most MAX_STALE seconds after it was built.
+ANALYTICS_WARMER = os.getenv("ANALYTICS_WARMER", "true").lower() == "true"
+ANALYTICS_WARMER_DEBOUNCE_SECONDS = float(os.getenv("ANALYTICS_WARMER_DEBOUNCE_SECONDS", "2"))
+ANALYTICS_WARMER_MAX_DELAY_SECONDS = float(os.getenv("ANALYTICS_WARMER_MAX_DELAY_SECONDS", "15"))
+ANALYTICS_WARMER_MAX_STALE_SECONDS = float(os.getenv("ANALYTICS_WARMER_MAX_STALE_SECONDS", "300"))
+
+# Capacity forecast: animals the shelter can house, weeks projected on the
+# charts page, and the half-life (days) of the exponentially weighted rates
+SHELTER_CAPACITY = int(os.getenv("SHELTER_CAPACITY", "100"))
+FORECAST_WEEKS = int(os.getenv("FORECAST_WEEKS", "12"))
+FORECAST_HALFLIFE_DAYS = float(os.getenv("FORECAST_HALFLIFE_DAYS", "28"))
+
+# Built user dashboard/analytics insight bundles kept in memory (one per user
+# and data version; see user_data_versions)
+USER_INSIGHT_CACHE_MAX_ENTRIES = int(os.getenv("USER_INSIGHT_CACHE_MAX_ENTRIES", "1000"))
+
+# Public media (uploads published under content-hashed names inside assets/)
+MEDIA_DIR = ASSETS_DIR / "media"
+MEDIA_URL_PREFIX = "/media/"
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", str(365 * 24 * 60 * 60)))
 
 
 def is_valid_status(status: str, status_type: str = "animal") -> bool:
@@ -513,6 +562,42 @@ def is_adoptable_status(status: str) -> bool:
     return status.lower() in ADOPTABLE_STATUSES
 
 
+def normalize_breed(breed: Optional[str]) -> str:
+    """Normalize a breed into the key analytics group by.
+    
+    Stored as `breed_key` on animals and rescue missions when they are written.
+    
+    Args:
+        breed: Raw breed value
+        
+    Returns:
+        "Not Specified" for empty/unknown values, "Mixed Breed", or the
+        capitalized breed
+    """
+    if not breed or breed.strip() == "":
+        return "Not Specified"
+    
+    breed_clean = breed.strip()
+    
+    # Normalize "Unknown" variants to "Not Specified"
+    if breed_clean.lower() in ("unknown", "n/a", "not specified"):
+        return "Not Specified"
+    
+    # Keep "Mixed Breed" as-is (capitalized)
+    if breed_clean.lower() == "mixed breed":
+        return "Mixed Breed"
+    
+    return breed_clean.capitalize()
+
+
+def normalize_species(species: Optional[str]) -> str:
+    """Normalize a species into the key analytics group by ("Dog", "Unknown").
+    
+    Stored as `species_key` on animals when they are written.
+    """
+    return (species or "Unknown").strip().capitalize()
+
+
 __all__ = [
     "get_env",
     "APP_ROOT",
@@ -556,7 +641,34 @@ __all__ = [
     "ALLOWED_MIME_TYPES",
     "UPLOADS_DIR",
     "TEMP_DIR",
-    "get_upload_path",
+    "PHOTO_NORMALIZE_ON_UPLOAD",
+    "PHOTO_MAX_DIMENSION",
+    "PHOTO_QUALITY",
+    "PHOTO_OUTPUT_FORMAT",
+    "MAX_PHOTO_REFERENCE_LENGTH",
+    "PHOTO_CACHE_MAX_MB",
+    "PHOTO_CACHE_MAX_ENTRIES",
+    "PHOTO_PREFETCH_WORKERS",
+    "PHOTO_PLACEHOLDER_SIZE",
+    "CONTENT_ADDRESSED_UPLOADS",
+    "SHARDED_UPLOADS",
+    "FILE_STORE_BACKEND",
+    "BLOB_STORE_PATH",
+    "UPLOAD_GC_GRACE_HOURS",
+    "MEDIA_DIR",
+    "MEDIA_URL_PREFIX",
+    "MEDIA_CACHE_MAX_AGE",
+    "ANALYTICS_ENGINE",
+    "ANALYTICS_WARMER",
+    "ANALYTICS_WARMER_DEBOUNCE_SECONDS",
+    "ANALYTICS_WARMER_MAX_DELAY_SECONDS",
+    "ANALYTICS_WARMER_MAX_STALE_SECONDS",
+    "SHELTER_CAPACITY",
+    "FORECAST_WEEKS",
+    "FORECAST_HALFLIFE_DAYS",
+    "USER_INSIGHT_CACHE_MAX_ENTRIES",
     "is_valid_status",
     "is_adoptable_status",
+    "normalize_breed",
+    "normalize_species",
 ]
@@ -0,0 +1,29 @@
+"""ASGI entrypoint for production web deployments.
+
+Serves the same Flet app as ``main.py`` but wrapped in
+``MediaCacheMiddleware`` so content-hashed photo URLs under ``/media/`` are
+sent with long-lived cache headers. Run with::
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+"""
+from __future__ import annotations
+
+# main sets the FLET_SECRET_KEY default, so it is imported before Flet
+from main import main
+
+import flet as ft
+
+import app_config
+from storage.media import MediaCacheMiddleware
+
+
+app_config.MEDIA_DIR.mkdir(parents=True, exist_ok=True)
+
+app = MediaCacheMiddleware(
+    ft.app(
+        target=main,
+        export_asgi_app=True,
+        assets_dir=str(app_config.ASSETS_DIR),
+        upload_dir="uploads",
+    )
+)
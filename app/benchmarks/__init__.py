@@ -0,0 +1,6 @@
+"""Benchmark and report scripts.
+
+Each module is runnable from the ``app`` directory, e.g.::
+
+    python -m benchmarks.image_normalization --json
+"""
@@ -0,0 +1,286 @@
+"""Time every public AnalyticsService method at several data sizes.
+
+For each scale a temporary database is seeded with that many rescue
+missions (plus half as many adoption requests, a twentieth as many animals
+and a hundredth as many users), then every public analytics method, the
+snapshot both admin pages are built from and the per-user bundle of the
+user pages are timed cold (empty caches) and warm, and their peak
+traced memory is recorded. Usage::
+
+    python -m benchmarks.analytics_suite [--scales 1000,100000,1000000]
+        [--engine auto|python|numpy] [--output results.json]
+        [--baseline previous.json [--tolerance 1.5]] [--json]
+
+With ``--baseline`` the run exits with status 1 when any cold timing is more
+than ``--tolerance`` times slower than the same entry of an earlier report.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import inspect
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from storage.database import Database
+from services.analytics_service import AnalyticsService
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+DEFAULT_SCALES = (1_000, 100_000, 1_000_000)
+
+BREEDS = ["Beagle", "beagle", "Pug", "Aspin", "Puspin", "Persian", "Shih Tzu", "unknown", "Mixed Breed", None]
+SPECIES = ["dog", "cat", "Dog", "rabbit"]
+MISSION_STATUSES = ["pending", "on-going", "rescued", "rescued|archived", "failed", "cancelled", "removed"]
+REQUEST_STATUSES = ["pending", "approved", "approved|archived", "denied", "cancelled"]
+
+# Page-level data assembly; the views themselves need a Flet page
+PAGE_LOADS = {
+    "AdminDashboard/ChartsPage": "get_snapshot",
+    "UserDashboard/UserAnalyticsPage": "get_user_insight_bundle",
+}
+
+
+def _populate(db: Database, missions: int, seed: int = 1) -> Dict[str, int]:
+    """Seed three years of random history sized by the number of missions."""
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=3 * 365)
+    counts = {
+        "missions": missions,
+        "requests": max(1, missions // 2),
+        "animals": max(1, missions // 20),
+        "users": max(1, missions // 100),
+    }
+
+    def moment() -> datetime:
+        return start + timedelta(seconds=rng.randrange(3 * 365 * 86400))
+
+    def later(dt: datetime) -> Optional[str]:
+        # Roughly a third of rows have a follow-up timestamp within two weeks
+        if rng.random() > 0.35:
+            return None
+        return (dt + timedelta(seconds=rng.randrange(14 * 86400))).isoformat(sep=" ", timespec="seconds")
+
+    def mission() -> Tuple[Any, ...]:
+        reported = moment()
+        return (
+            rng.randint(1, counts["users"]), rng.choice(MISSION_STATUSES), rng.choice(BREEDS),
+            rng.choice(["low", "medium", "high"]), reported.isoformat(sep=" ", timespec="seconds"), later(reported),
+        )
+
+    def request() -> Tuple[Any, ...]:
+        requested = moment()
+        decided = later(requested)
+        return (
+            rng.randint(1, counts["users"]), rng.randint(1, counts["animals"]), rng.choice(REQUEST_STATUSES),
+            requested.isoformat(sep=" ", timespec="seconds"), decided, decided,
+        )
+
+    conn = db._get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO users (name, email, role) VALUES (?, ?, 'user')",
+            ((f"User {i}", f"user{i}@example.com") for i in range(counts["users"]))
+        )
+        conn.executemany(
+            "INSERT INTO animals (name, species, breed, status, intake_date) VALUES ('A', ?, ?, ?, ?)",
+            ((rng.choice(SPECIES), rng.choice(BREEDS),
+              rng.choice(["healthy", "recovering", "injured", "adopted", "processing"]),
+              moment().isoformat(sep=" ", timespec="seconds"))
+             for _ in range(counts["animals"]))
+        )
+        conn.executemany(
+            "INSERT INTO rescue_missions (user_id, location, status, breed, urgency, mission_date, rescued_at) "
+            "VALUES (?, 'X', ?, ?, ?, ?, ?)",
+            (mission() for _ in range(missions))
+        )
+        conn.executemany(
+            "INSERT INTO adoption_requests (user_id, animal_id, status, request_date, approved_at, decided_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (request() for _ in range(counts["requests"]))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return counts
+
+
+def _calls(service: AnalyticsService, user_id: int) -> Dict[str, Callable[[], Any]]:
+    """One representative call of every public method that reads data."""
+    today = date.today()
+    calls: Dict[str, Callable[[], Any]] = {
+        "get_trend": lambda: service.get_trend("rescues", today - timedelta(days=364), today, "week"),
+        "get_trends": lambda: service.get_trends(["rescues", "adoptions"], today - timedelta(days=364), today, "month"),
+        "get_breed_trends": lambda: service.get_breed_trends("rescue"),
+    }
+    skip = {"invalidate_cache", "refresh_snapshot", "unpublish_snapshot"}
+    for name, method in inspect.getmembers(service, inspect.ismethod):
+        if name.startswith("_") or name in skip or name in calls:
+            continue
+        params = inspect.signature(method).parameters
+        if "user_id" in params:
+            calls[name] = lambda method=method: method(user_id)
+        elif all(p.default is not inspect.Parameter.empty for p in params.values()):
+            calls[name] = method
+        else:
+            raise ValueError(f"No benchmark call defined for AnalyticsService.{name}")
+    for page, name in PAGE_LOADS.items():
+        calls[page] = calls[name]
+    return dict(sorted(calls.items()))
+
+
+def _measure(service: AnalyticsService, fn: Callable[[], Any]) -> Dict[str, Any]:
+    """Cold and warm time plus peak traced memory of one call."""
+    service.invalidate_cache()
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fn()
+    warm_s = time.perf_counter() - start
+
+    # Separate pass: tracing slows allocation-heavy code down
+    service.invalidate_cache()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "cold_s": round(cold_s, 5),
+        "warm_s": round(warm_s, 5),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+
+def _max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scale(missions: int, engine: str = "auto") -> Dict[str, Any]:
+    """Seed one temporary database and measure every call on it.
+
+    Args:
+        missions: Number of rescue missions (other tables scale with it)
+        engine: Analytics engine passed to AnalyticsService
+
+    Returns:
+        Dict with row counts, seeding time and per-call results
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "bench.db"))
+        service = AnalyticsService(db, engine=engine)
+        start = time.perf_counter()
+        rows = _populate(db, missions)
+        populate_s = time.perf_counter() - start
+
+        # The user with the most activity is the worst case for user pages
+        user = db.fetch_one(
+            "SELECT user_id, COUNT(*) AS n FROM rescue_missions GROUP BY user_id ORDER BY n DESC LIMIT 1"
+        )
+        results = {name: _measure(service, fn) for name, fn in _calls(service, user["user_id"]).items()}
+        service.invalidate_cache()
+
+    return {
+        "engine": "numpy" if service._use_columnar else "python",
+        "rows": rows,
+        "populate_s": round(populate_s, 2),
+        "results": results,
+        "max_rss_mb": _max_rss_mb(),
+    }
+
+
+def run(scales: Tuple[int, ...] = DEFAULT_SCALES, engine: str = "auto") -> Dict[str, Any]:
+    """Run the suite at every scale.
+
+    Args:
+        scales: Rescue mission counts to seed
+        engine: Analytics engine passed to AnalyticsService
+
+    Returns:
+        Report dict keyed by scale, with the run environment
+    """
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "engine": engine,
+        "scales": {str(missions): run_scale(missions, engine) for missions in scales},
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Cold timings more than `tolerance` times slower than in `baseline`.
+
+    Calls under a millisecond in the baseline are skipped; they are noise.
+    """
+    regressions = []
+    for scale, current in report["scales"].items():
+        previous = baseline.get("scales", {}).get(scale, {}).get("results", {})
+        for name, result in current["results"].items():
+            before = previous.get(name, {}).get("cold_s")
+            if before and before >= 0.001 and result["cold_s"] > before * tolerance:
+                regressions.append(f"{scale} {name}: {before:.4f} s -> {result['cold_s']:.4f} s")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES),
+                        help="Comma-separated rescue mission counts")
+    parser.add_argument("--engine", default="auto", choices=["auto", "python", "numpy"],
+                        help="Analytics engine")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare cold timings against")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed slowdown factor against the baseline")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    scales = tuple(max(1, int(s)) for s in args.scales.split(",") if s.strip())
+    report = run(scales, args.engine)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for scale, result in report["scales"].items():
+            rows = result["rows"]
+            print(f"\n[{result['engine']}] {rows['missions']} missions, {rows['requests']} requests, {rows['animals']} animals, "
+                  f"{rows['users']} users (seeded in {result['populate_s']:.1f} s, max RSS {result['max_rss_mb']} MB)")
+            print(f"  {'call':<40} {'cold s':>10} {'warm s':>10} {'peak MB':>9}")
+            for name, timing in result["results"].items():
+                print(f"  {name:<40} {timing['cold_s']:>10.4f} {timing['warm_s']:>10.4f} {timing['peak_mb']:>9.2f}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"[WARN] Slower than baseline: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
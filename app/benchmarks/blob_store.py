@@ -0,0 +1,104 @@
+"""Compare the filesystem and SQLite BLOB backends of FileStore.
+
+Writes, reads and deletes the same synthetic payloads through both
+backends in a temporary directory and prints throughput for each step.
+Usage::
+
+    python -m benchmarks.blob_store [--count N] [--size-kb KB] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from storage.blob_store import BlobFileStore
+from storage.file_store import FileStore
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _measure(store: FileStore, payloads: List[bytes]) -> Dict[str, Any]:
+    """Time write, read and delete of every payload through one store."""
+    names: List[str] = []
+    total_mb = sum(len(p) for p in payloads) / (1024 * 1024)
+
+    write_s = _timed(lambda: names.extend(
+        store.save_bytes(p, "photo.jpg", validate=False) for p in payloads
+    ))
+    read_s = _timed(lambda: [store.read_file_as_bytes(n) for n in names])
+    delete_s = _timed(lambda: [store.delete_file(n) for n in names])
+
+    return {
+        "write_s": round(write_s, 4),
+        "read_s": round(read_s, 4),
+        "delete_s": round(delete_s, 4),
+        "write_mb_s": round(total_mb / write_s, 1) if write_s else None,
+        "read_mb_s": round(total_mb / read_s, 1) if read_s else None,
+    }
+
+
+def run(count: int = 200, size_kb: int = 256) -> Dict[str, Any]:
+    """Benchmark both backends on identical random payloads.
+
+    Args:
+        count: Number of files
+        size_kb: Size of each file in KB
+
+    Returns:
+        Report dict with settings and per-backend timings
+    """
+    payloads = [os.urandom(size_kb * 1024) for _ in range(count)]
+    options = {"content_addressed": False, "normalize_images": False}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        stores = {
+            "filesystem": FileStore(uploads_dir=tmp_dir / "uploads", media_dir=tmp_dir / "media", **options),
+            "sqlite": BlobFileStore(db_path=str(tmp_dir / "photos.db"), media_dir=tmp_dir / "media", **options),
+        }
+        results = {name: _measure(store, payloads) for name, store in stores.items()}
+
+    return {
+        "settings": {"count": count, "size_kb": size_kb},
+        "backends": results,
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    settings = report["settings"]
+    print(f"{settings['count']} files x {settings['size_kb']} KB")
+    print(f"{'backend':12} {'write s':>9} {'read s':>9} {'delete s':>9} {'write MB/s':>11} {'read MB/s':>10}")
+    for name, row in report["backends"].items():
+        print(
+            f"{name:12} {row['write_s']:9.3f} {row['read_s']:9.3f} {row['delete_s']:9.3f} "
+            f"{row['write_mb_s']:11} {row['read_mb_s']:10}"
+        )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200, help="Number of files")
+    parser.add_argument("--size-kb", type=int, default=256, help="Size of each file in KB")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(max(1, args.count), max(1, args.size_kb))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Compare the Python and NumPy analytics engines on a large synthetic history.
+
+Fills a temporary database with random missions, adoption requests and
+animals, then times the whole-history distributions and rankings through
+AnalyticsService with each engine. Usage::
+
+    python -m benchmarks.columnar_analytics [--missions N] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from storage.database import Database
+from services.analytics_service import AnalyticsService
+from services.columnar_analytics import ColumnarAnalytics, NUMPY_AVAILABLE
+
+BREEDS = ["Beagle", "beagle", "Pug", "Aspin", "Puspin", "Persian", "Shih Tzu", "unknown", "Mixed Breed", None]
+SPECIES = ["dog", "cat", "Dog", "rabbit"]
+MISSION_STATUSES = ["pending", "on-going", "rescued", "rescued|archived", "failed", "cancelled", "removed"]
+REQUEST_STATUSES = ["pending", "approved", "approved|archived", "denied", "cancelled"]
+
+
+def _populate(db: Database, missions: int, seed: int = 1) -> None:
+    """Insert `missions` missions, half as many requests and a twentieth as many animals."""
+    rng = random.Random(seed)
+    start = datetime.utcnow() - timedelta(days=3 * 365)
+
+    def timestamp() -> str:
+        return (start + timedelta(seconds=rng.randrange(3 * 365 * 86400))).isoformat(sep=" ", timespec="seconds")
+
+    animals = max(1, missions // 20)
+    conn = db._get_connection()
+    try:
+        user_id = conn.execute(
+            "INSERT INTO users (name, email) VALUES ('Benchmark', 'benchmark@example.com')"
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO animals (name, species, breed, status, intake_date) VALUES ('A', ?, ?, ?, ?)",
+            ((rng.choice(SPECIES), rng.choice(BREEDS),
+              rng.choice(["healthy", "recovering", "injured", "adopted", "processing"]), timestamp())
+             for _ in range(animals))
+        )
+        conn.executemany(
+            "INSERT INTO rescue_missions (location, status, breed, urgency, mission_date) VALUES ('X', ?, ?, ?, ?)",
+            ((rng.choice(MISSION_STATUSES), rng.choice(BREEDS), rng.choice(["low", "medium", "high"]), timestamp())
+             for _ in range(missions))
+        )
+        conn.executemany(
+            "INSERT INTO adoption_requests (user_id, animal_id, status, request_date) VALUES (?, ?, ?, ?)",
+            ((user_id, rng.randint(1, animals), rng.choice(REQUEST_STATUSES), timestamp())
+             for _ in range(missions // 2))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _aggregates(service: AnalyticsService) -> List[Callable[[], Any]]:
+    return [
+        service.get_animal_statistics,
+        service.get_urgency_distribution,
+        service.get_species_adoption_ranking,
+        service.get_breed_distribution,
+        service.get_top_breeds_for_adoption,
+        service.get_top_breeds_for_rescue,
+        service.get_adoptable_breed_distribution,
+    ]
+
+
+def _timed(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(missions: int = 1_000_000) -> Dict[str, Any]:
+    """Benchmark both engines on the same synthetic database.
+
+    Args:
+        missions: Number of rescue missions
+
+    Returns:
+        Report dict with settings and timings in seconds
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / "bench.db"))
+        db.create_tables()
+        populate_s = _timed(lambda: _populate(db, missions))
+
+        python = AnalyticsService(db, engine="python")
+        report: Dict[str, Any] = {
+            "settings": {"missions": missions, "requests": missions // 2, "animals": max(1, missions // 20)},
+            "populate_s": round(populate_s, 2),
+            "python_s": round(sum(_timed(fn) for fn in _aggregates(python)), 3),
+        }
+
+        if NUMPY_AVAILABLE:
+            columnar = AnalyticsService(db, engine="numpy")
+            columnar._cache.clear()
+            report["numpy_load_s"] = round(_timed(lambda: ColumnarAnalytics.load(db)), 3)
+            columnar._columnar()  # warm the cached arrays
+            report["numpy_s"] = round(sum(_timed(fn) for fn in _aggregates(columnar)), 3)
+            report["speedup"] = round(report["python_s"] / max(report["numpy_s"], 1e-9), 1)
+        else:
+            report["numpy_s"] = None
+
+    return report
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--missions", type=int, default=1_000_000, help="Number of rescue missions")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(max(1, args.missions))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    settings = report["settings"]
+    print(f"{settings['missions']} missions, {settings['requests']} requests, {settings['animals']} animals")
+    print(f"python engine:  {report['python_s']:.3f} s")
+    if report["numpy_s"] is None:
+        print("numpy engine:   not installed")
+    else:
+        print(f"numpy engine:   {report['numpy_s']:.3f} s (+{report['numpy_load_s']:.3f} s one-off load)")
+        print(f"speedup:        {report['speedup']}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Report the effect of ingest-time image normalization on a photo corpus.
+
+For every image under a directory (the uploads folder by default, searched
+recursively since stored files sit in ``ab/cd/`` shards) this measures the
+stored size and Pillow decode time before and after ``normalize_image`` and
+prints the totals. Usage::
+
+    python -m benchmarks.image_normalization [DIRECTORY] [--repeat N] [--json]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import app_config
+from storage.image_normalizer import PIL_AVAILABLE, normalize_image
+
+if PIL_AVAILABLE:
+    from PIL import Image
+
+
+def _decode_seconds(data: bytes, repeat: int) -> float:
+    """Mean time to fully decode an image, in seconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+    return (time.perf_counter() - start) / repeat
+
+
+def _iter_images(directory: Path) -> Iterator[Path]:
+    """Image files anywhere under a directory, including the uploads shards (``ab/cd/``)."""
+    for path in sorted(directory.rglob("*")):
+        relative = path.relative_to(directory)
+        # Skips store bookkeeping such as the file index
+        if any(part.startswith(".") for part in relative.parts):
+            continue
+        if path.is_file() and path.suffix.lower() in app_config.ALLOWED_PHOTO_EXTENSIONS:
+            yield path
+
+
+def run(directory: Path, repeat: int = 3) -> Dict[str, Any]:
+    """Normalize every image in a directory in memory and collect measurements.
+
+    Args:
+        directory: Folder containing the sample corpus
+        repeat: Decode repetitions per image for timing
+
+    Returns:
+        Report dict with per-file rows and corpus totals
+    """
+    rows: List[Dict[str, Any]] = []
+    for path in _iter_images(directory):
+        original = path.read_bytes()
+        result = normalize_image(original)
+        rows.append({
+            "file": str(path.relative_to(directory)),
+            "bytes_before": len(original),
+            "bytes_after": len(result.data),
+            "decode_ms_before": _decode_seconds(original, repeat) * 1000,
+            "decode_ms_after": _decode_seconds(result.data, repeat) * 1000,
+            "changed": result.changed,
+        })
+
+    bytes_before = sum(r["bytes_before"] for r in rows)
+    bytes_after = sum(r["bytes_after"] for r in rows)
+    decode_before = sum(r["decode_ms_before"] for r in rows)
+    decode_after = sum(r["decode_ms_after"] for r in rows)
+
+    return {
+        "directory": str(directory),
+        "settings": {
+            "max_dimension": app_config.PHOTO_MAX_DIMENSION,
+            "quality": app_config.PHOTO_QUALITY,
+            "format": app_config.PHOTO_OUTPUT_FORMAT,
+        },
+        "files": rows,
+        "totals": {
+            "images": len(rows),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved_percent": round(100 * (1 - bytes_after / bytes_before), 1) if bytes_before else 0.0,
+            "decode_ms_before": round(decode_before, 2),
+            "decode_ms_after": round(decode_after, 2),
+            "decode_speedup": round(decode_before / decode_after, 2) if decode_after else None,
+        },
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    totals = report["totals"]
+    print(f"Corpus: {report['directory']} ({totals['images']} images)")
+    print(f"Settings: {report['settings']}")
+    print(f"{'file':40} {'KB before':>10} {'KB after':>10} {'ms before':>10} {'ms after':>10}")
+    for row in report["files"]:
+        print(
+            f"{row['file'][:40]:40} {row['bytes_before'] / 1024:10.1f} {row['bytes_after'] / 1024:10.1f} "
+            f"{row['decode_ms_before']:10.2f} {row['decode_ms_after']:10.2f}"
+        )
+    print(
+        f"Total: {totals['bytes_before'] / (1024 * 1024):.2f} MB -> {totals['bytes_after'] / (1024 * 1024):.2f} MB "
+        f"({totals['bytes_saved_percent']}% smaller), decode {totals['decode_ms_before']} ms -> "
+        f"{totals['decode_ms_after']} ms (x{totals['decode_speedup']})"
+    )
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", nargs="?", default=str(app_config.UPLOADS_DIR), help="Sample corpus directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Decode repetitions per image")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not PIL_AVAILABLE:
+        print("Pillow is required for this report. Install with: python -m pip install pillow")
+        return 1
+
+    report = run(Path(args.directory), max(1, args.repeat))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
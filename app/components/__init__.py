@@ -60,6 +60,8 @@ from .containers import (
     create_stat_card,
     create_map_container,
     create_animal_card,
+    set_animal_card_photo,
+    load_card_photos,
     show_page_loading,
     finish_page_loading,
     create_page_control_bar,
@@ -96,6 +98,7 @@ from .utils import (
     is_coordinate_string,
     parse_coordinates_from_string,
     format_coordinates_display,
+    format_duration,
     format_location_for_display,
 )
 
@@ -187,6 +190,8 @@ __all__ = [
     "create_stat_card",
     "create_map_container",
     "create_animal_card",
+    "set_animal_card_photo",
+    "load_card_photos",
     "create_page_control_bar",
     # Dialogs
     "show_snackbar",
@@ -215,6 +220,7 @@ __all__ = [
     "is_coordinate_string",
     "parse_coordinates_from_string",
     "format_coordinates_display",
+    "format_duration",
     "format_location_for_display",
     # Animal form
     "AnimalFormWidget",
@@ -12,6 +12,8 @@ except ImportError:
 from components.form_fields import create_form_text_field, create_form_dropdown
 from components.photo_upload import create_photo_upload_widget
 from services.photo_service import load_photo
+from storage.file_store import get_file_store, FileStoreError
+from storage.image_normalizer import preview_base64
 
 
 class AnimalFormWidget:
@@ -78,7 +80,7 @@ class AnimalFormWidget:
         self._existing_photo_base64 = None
         self._file_picker = None
         self._photo_display = None
-        self._pending_image_bytes = None
+        self._pending_image_path = None
         self._pending_original_name = None
         self._current_photo_base64 = None
         self._ai_button = None
@@ -203,19 +205,19 @@ class AnimalFormWidget:
                         return
                     
                     try:
-                        import base64
                         import os
                         
                         if not os.path.exists(file_path):
                             return
                         
-                        with open(file_path, "rb") as image_file:
-                            image_bytes = image_file.read()
+                        # Reject oversized or non-image files before reading them
+                        get_file_store().validate_upload(file_path, original_name)
                         
-                        self._pending_image_bytes = image_bytes
+                        self._pending_image_path = file_path
                         self._pending_original_name = original_name
                         
-                        photo_b64 = base64.b64encode(image_bytes).decode()
+                        # Downsized from the file as it will be stored, not read whole
+                        photo_b64 = preview_base64(file_path)
                         self._current_photo_base64 = photo_b64
                         self._photo_display.content = ft.Image(
                             src_base64=photo_b64,
@@ -234,6 +236,9 @@ class AnimalFormWidget:
                             self._ai_button.bgcolor = ft.Colors.TEAL_600
                             self._ai_button.color = ft.Colors.WHITE
                         
+                        self.page.update()
+                    except FileStoreError as ex:
+                        self.page.open(ft.SnackBar(ft.Text(f"Upload error: {str(ex)}")))
                         self.page.update()
                     except Exception:
                         pass
@@ -666,7 +671,7 @@ class AnimalFormWidget:
         if self.mode == "add" and self._photo_widget:
             form_data["photo_widget"] = self._photo_widget
         elif self.mode == "edit":
-            form_data["pending_image_bytes"] = self._pending_image_bytes
+            form_data["pending_image_path"] = self._pending_image_path
             form_data["pending_original_name"] = self._pending_original_name
         
         if self.on_submit_callback:
@@ -736,6 +736,9 @@ def create_animal_card(
     is_rescued: bool = False,
     rescue_info: Optional[Dict[str, Any]] = None,
     breed: Optional[str] = None,
+    photo_url: Optional[str] = None,
+    photo_ref: Optional[object] = None,
+    photo_placeholder: Optional[str] = None,
 ) -> object:
     """Create an animal display card with enhanced visual design.
     
@@ -755,6 +758,10 @@ def create_animal_card(
         is_rescued: Whether this animal came from a rescue mission
         rescue_info: Dict with rescue mission details (location, date, reporter, urgency)
         breed: Animal breed (optional)
+        photo_url: Cacheable media URL for the photo; preferred over photo_base64
+        photo_ref: Optional ft.Ref bound to the photo container, so the photo
+            can be filled in later with set_animal_card_photo
+        photo_placeholder: Tiny base64 preview shown (scaled up) until the photo arrives
     """
     if ft is None:
         raise RuntimeError("Flet must be installed to create containers")
@@ -801,150 +808,13 @@ def create_animal_card(
     is_adoptable = status_lower in ("healthy", "available", "adoptable", "ready")
     
     # Animal image - fixed 3:4 aspect ratio with COVER fit for uniform grid
-    if photo_base64:
-        animal_image = ft.Container(
-            content=ft.Image(
-                src_base64=photo_base64,
-                fit=ft.ImageFit.COVER,
-                border_radius=ft.border_radius.only(top_left=14, top_right=14),
-            ),
-            aspect_ratio=3/4,
-            border_radius=ft.border_radius.only(top_left=14, top_right=14),
-            clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
-        )
-    else:
-        animal_image = ft.Container(
-            ft.Icon(ft.Icons.PETS, size=70, color=ft.Colors.GREY_400),
-            aspect_ratio=3/4,
-            bgcolor=ft.Colors.GREY_200,
-            border_radius=ft.border_radius.only(top_left=14, top_right=14),
-            alignment=ft.alignment.center,
-        )
+    animal_image = _animal_photo_container(photo_url, photo_base64, photo_placeholder, photo_ref)
     
     # Action buttons with enhanced styling
-    if is_admin and on_edit:
-        # For adopted animals, just show Edit (no edit for adopted animals)
-        if status_lower == "adopted":
-            if on_archive or on_remove:
-                buttons = ft.Row([
-                    ft.IconButton(
-                        icon=ft.Icons.ARCHIVE_OUTLINED,
-                        icon_color=ft.Colors.AMBER_700,
-                        icon_size=15,
-                        tooltip="Archive",
-                        on_click=lambda e: on_archive(animal_id) if on_archive else None,
-                        style=ft.ButtonStyle(
-                            bgcolor={ft.ControlState.HOVERED: ft.Colors.AMBER_50},
-                            shape=ft.CircleBorder(),
-                        ),
-                    ) if on_archive else ft.Container(),
-                    ft.IconButton(
-                        icon=ft.Icons.DELETE_OUTLINE,
-                        icon_color=ft.Colors.RED_600,
-                        icon_size=15,
-                        tooltip="Remove",
-                        on_click=lambda e: on_remove(animal_id) if on_remove else None,
-                        style=ft.ButtonStyle(
-                            bgcolor={ft.ControlState.HOVERED: ft.Colors.RED_50},
-                            shape=ft.CircleBorder(),
-                        ),
-                    ) if on_remove else ft.Container(),
-                ], spacing=4, alignment=ft.MainAxisAlignment.CENTER)
-            else:
-                buttons = ft.Container()  # No actions for adopted animals
-        else:
-            action_buttons = []
-            
-            # Edit icon button
-            action_buttons.append(
-                ft.IconButton(
-                    icon=ft.Icons.EDIT,
-                    icon_color=ft.Colors.TEAL_600,
-                    icon_size=15,
-                    tooltip="Edit",
-                    on_click=lambda e: on_edit(animal_id) if on_edit else None,
-                    style=ft.ButtonStyle(
-                        bgcolor={ft.ControlState.HOVERED: ft.Colors.TEAL_50},
-                        shape=ft.CircleBorder(),
-                    ),
-                )
-            )
-            
-            # Archive/Remove icons with enhanced styling
-            if on_archive:
-                action_buttons.append(
-                    ft.IconButton(
-                        icon=ft.Icons.ARCHIVE_OUTLINED,
-                        icon_color=ft.Colors.AMBER_700,
-                        icon_size=15,
-                        tooltip="Archive",
-                        on_click=lambda e: on_archive(animal_id) if on_archive else None,
-                        style=ft.ButtonStyle(
-                            bgcolor={ft.ControlState.HOVERED: ft.Colors.AMBER_50},
-                            shape=ft.CircleBorder(),
-                        ),
-                    )
-                )
-            
-            if on_remove:
-                action_buttons.append(
-                    ft.IconButton(
-                        icon=ft.Icons.DELETE_OUTLINE,
-                        icon_color=ft.Colors.RED_600,
-                        icon_size=15,
-                        tooltip="Remove",
-                        on_click=lambda e: on_remove(animal_id) if on_remove else None,
-                        style=ft.ButtonStyle(
-                            bgcolor={ft.ControlState.HOVERED: ft.Colors.RED_50},
-                            shape=ft.CircleBorder(),
-                        ),
-                    )
-                )
-            
-            buttons = ft.Row(action_buttons, spacing=4, alignment=ft.MainAxisAlignment.CENTER)
-    elif show_adopt_button and on_adopt:
-        if is_adoptable:
-            buttons = ft.ElevatedButton(
-                content=ft.Row([
-                    ft.Icon(ft.Icons.PETS, size=12, color=ft.Colors.WHITE),
-                    ft.Text("Adopt Me", size=10, color=ft.Colors.WHITE, weight=ft.FontWeight.W_600),
-                ], spacing=6, alignment=ft.MainAxisAlignment.CENTER, tight=True),
-                expand=True,
-                height=32,
-                on_click=lambda e: on_adopt(animal_id),
-                style=ft.ButtonStyle(
-                    bgcolor={
-                        ft.ControlState.DEFAULT: ft.Colors.TEAL_500,
-                        ft.ControlState.HOVERED: ft.Colors.TEAL_600,
-                    },
-                    color=ft.Colors.WHITE,
-                    shape=ft.RoundedRectangleBorder(radius=20),
-                    elevation={"default": 2, "hovered": 4},
-                    animation_duration=200,
-                    padding=ft.padding.symmetric(vertical=2),
-                )
-            )
-        else:
-            if status_lower == "adopted":
-                buttons = ft.Container(
-                    content=ft.Row([
-                        ft.Icon(ft.Icons.FAVORITE, size=12, color=ft.Colors.PURPLE_600),
-                        ft.Text("Already Adopted", size=10, color=ft.Colors.PURPLE_600, weight=ft.FontWeight.W_500),
-                    ], spacing=6, alignment=ft.MainAxisAlignment.CENTER),
-                    padding=ft.padding.symmetric(vertical=2),
-                    height=32,
-                )
-            else:
-                buttons = ft.Container(
-                    content=ft.Row([
-                        ft.Icon(ft.Icons.BLOCK, size=12, color=ft.Colors.GREY_500),
-                        ft.Text("Not Available", size=10, color=ft.Colors.GREY_500, weight=ft.FontWeight.W_500),
-                    ], spacing=6, alignment=ft.MainAxisAlignment.CENTER),
-                    padding=ft.padding.symmetric(vertical=2),
-                    height=32,
-                )
-    else:
-        buttons = ft.Container()
+    buttons = _animal_card_buttons(
+        animal_id, status_lower, is_adoptable, is_admin, show_adopt_button,
+        on_adopt, on_edit, on_archive, on_remove,
+    )
     
     # Wrap image with enhanced "Rescued" badge overlay if animal came from rescue mission
     if is_rescued:
@@ -1084,29 +954,7 @@ def create_animal_card(
     else:
         image_with_badge = animal_image
     
-    if age is None:
-        age_display = ""
-    elif age == 0:
-        age_display = "Under 1 yr"
-    elif age > 20:
-        age_display = "20+ yrs"
-    elif age == 1:
-        age_display = "1 yr old"
-    else:
-        age_display = f"{age} yrs old"
-    
-    species_text = species.capitalize()
-    if breed and breed.lower() not in ("not specified", "unknown", "not applicable", "n/a", ""):
-        species_breed_text = f"{species_text} ({breed})"
-    else:
-        species_breed_text = species_text
-    
-    # Combine age and species into one subtitle line to save vertical space
-    subtitle_parts = []
-    if age_display:
-        subtitle_parts.append(age_display)
-    subtitle_parts.append(species_breed_text)
-    subtitle_text = " · ".join(subtitle_parts)
+    subtitle_text = _animal_subtitle(age, species, breed)
     
     # Compact info section - name + subtitle + status badge
     info_section = ft.Container(
@@ -1180,6 +1028,271 @@ def create_animal_card(
     return card
 
 
+def _animal_photo_container(
+    photo_url: Optional[str],
+    photo_base64: Optional[str],
+    photo_placeholder: Optional[str],
+    photo_ref: Optional[object],
+) -> object:
+    """Build the fixed 3:4 photo area of an animal card, greyed out until a photo or preview is known."""
+    has_photo = bool(photo_url or photo_base64 or photo_placeholder)
+    return ft.Container(
+        content=_animal_photo_content(photo_url, photo_base64, photo_placeholder),
+        aspect_ratio=3/4,
+        bgcolor=None if has_photo else ft.Colors.GREY_200,
+        border_radius=ft.border_radius.only(top_left=14, top_right=14),
+        clip_behavior=ft.ClipBehavior.ANTI_ALIAS,
+        alignment=None if has_photo else ft.alignment.center,
+        ref=photo_ref,
+    )
+
+
+def _animal_card_buttons(
+    animal_id: int,
+    status_lower: str,
+    is_adoptable: bool,
+    is_admin: bool,
+    show_adopt_button: bool,
+    on_adopt: Optional[Callable],
+    on_edit: Optional[Callable],
+    on_archive: Optional[Callable],
+    on_remove: Optional[Callable],
+) -> object:
+    """Build the admin actions or the adopt button shown under an animal card."""
+    if is_admin and on_edit:
+        # For adopted animals, just show Edit (no edit for adopted animals)
+        if status_lower == "adopted":
+            if on_archive or on_remove:
+                buttons = ft.Row([
+                    ft.IconButton(
+                        icon=ft.Icons.ARCHIVE_OUTLINED,
+                        icon_color=ft.Colors.AMBER_700,
+                        icon_size=15,
+                        tooltip="Archive",
+                        on_click=lambda e: on_archive(animal_id) if on_archive else None,
+                        style=ft.ButtonStyle(
+                            bgcolor={ft.ControlState.HOVERED: ft.Colors.AMBER_50},
+                            shape=ft.CircleBorder(),
+                        ),
+                    ) if on_archive else ft.Container(),
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE_OUTLINE,
+                        icon_color=ft.Colors.RED_600,
+                        icon_size=15,
+                        tooltip="Remove",
+                        on_click=lambda e: on_remove(animal_id) if on_remove else None,
+                        style=ft.ButtonStyle(
+                            bgcolor={ft.ControlState.HOVERED: ft.Colors.RED_50},
+                            shape=ft.CircleBorder(),
+                        ),
+                    ) if on_remove else ft.Container(),
+                ], spacing=4, alignment=ft.MainAxisAlignment.CENTER)
+            else:
+                buttons = ft.Container()  # No actions for adopted animals
+        else:
+            action_buttons = []
+            
+            # Edit icon button
+            action_buttons.append(
+                ft.IconButton(
+                    icon=ft.Icons.EDIT,
+                    icon_color=ft.Colors.TEAL_600,
+                    icon_size=15,
+                    tooltip="Edit",
+                    on_click=lambda e: on_edit(animal_id) if on_edit else None,
+                    style=ft.ButtonStyle(
+                        bgcolor={ft.ControlState.HOVERED: ft.Colors.TEAL_50},
+                        shape=ft.CircleBorder(),
+                    ),
+                )
+            )
+            
+            # Archive/Remove icons with enhanced styling
+            if on_archive:
+                action_buttons.append(
+                    ft.IconButton(
+                        icon=ft.Icons.ARCHIVE_OUTLINED,
+                        icon_color=ft.Colors.AMBER_700,
+                        icon_size=15,
+                        tooltip="Archive",
+                        on_click=lambda e: on_archive(animal_id) if on_archive else None,
+                        style=ft.ButtonStyle(
+                            bgcolor={ft.ControlState.HOVERED: ft.Colors.AMBER_50},
+                            shape=ft.CircleBorder(),
+                        ),
+                    )
+                )
+            
+            if on_remove:
+                action_buttons.append(
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE_OUTLINE,
+                        icon_color=ft.Colors.RED_600,
+                        icon_size=15,
+                        tooltip="Remove",
+                        on_click=lambda e: on_remove(animal_id) if on_remove else None,
+                        style=ft.ButtonStyle(
+                            bgcolor={ft.ControlState.HOVERED: ft.Colors.RED_50},
+                            shape=ft.CircleBorder(),
+                        ),
+                    )
+                )
+            
+            buttons = ft.Row(action_buttons, spacing=4, alignment=ft.MainAxisAlignment.CENTER)
+    elif show_adopt_button and on_adopt:
+        if is_adoptable:
+            buttons = ft.ElevatedButton(
+                content=ft.Row([
+                    ft.Icon(ft.Icons.PETS, size=12, color=ft.Colors.WHITE),
+                    ft.Text("Adopt Me", size=10, color=ft.Colors.WHITE, weight=ft.FontWeight.W_600),
+                ], spacing=6, alignment=ft.MainAxisAlignment.CENTER, tight=True),
+                expand=True,
+                height=32,
+                on_click=lambda e: on_adopt(animal_id),
+                style=ft.ButtonStyle(
+                    bgcolor={
+                        ft.ControlState.DEFAULT: ft.Colors.TEAL_500,
+                        ft.ControlState.HOVERED: ft.Colors.TEAL_600,
+                    },
+                    color=ft.Colors.WHITE,
+                    shape=ft.RoundedRectangleBorder(radius=20),
+                    elevation={"default": 2, "hovered": 4},
+                    animation_duration=200,
+                    padding=ft.padding.symmetric(vertical=2),
+                )
+            )
+        else:
+            if status_lower == "adopted":
+                buttons = ft.Container(
+                    content=ft.Row([
+                        ft.Icon(ft.Icons.FAVORITE, size=12, color=ft.Colors.PURPLE_600),
+                        ft.Text("Already Adopted", size=10, color=ft.Colors.PURPLE_600, weight=ft.FontWeight.W_500),
+                    ], spacing=6, alignment=ft.MainAxisAlignment.CENTER),
+                    padding=ft.padding.symmetric(vertical=2),
+                    height=32,
+                )
+            else:
+                buttons = ft.Container(
+                    content=ft.Row([
+                        ft.Icon(ft.Icons.BLOCK, size=12, color=ft.Colors.GREY_500),
+                        ft.Text("Not Available", size=10, color=ft.Colors.GREY_500, weight=ft.FontWeight.W_500),
+                    ], spacing=6, alignment=ft.MainAxisAlignment.CENTER),
+                    padding=ft.padding.symmetric(vertical=2),
+                    height=32,
+                )
+    else:
+        buttons = ft.Container()
+    return buttons
+
+
+def _animal_subtitle(age: Optional[int], species: str, breed: Optional[str]) -> str:
+    """Combine age and species/breed into one subtitle line to save vertical space."""
+    if age is None:
+        age_display = ""
+    elif age == 0:
+        age_display = "Under 1 yr"
+    elif age > 20:
+        age_display = "20+ yrs"
+    elif age == 1:
+        age_display = "1 yr old"
+    else:
+        age_display = f"{age} yrs old"
+    
+    species_text = species.capitalize()
+    if breed and breed.lower() not in ("not specified", "unknown", "not applicable", "n/a", ""):
+        species_breed_text = f"{species_text} ({breed})"
+    else:
+        species_breed_text = species_text
+    
+    subtitle_parts = []
+    if age_display:
+        subtitle_parts.append(age_display)
+    subtitle_parts.append(species_breed_text)
+    return " · ".join(subtitle_parts)
+
+
+def _animal_photo_content(
+    photo_url: Optional[str],
+    photo_base64: Optional[str],
+    photo_placeholder: Optional[str] = None,
+) -> object:
+    """Build the photo, its preview, or the placeholder icon shown at the top of an animal card."""
+    if photo_url or photo_base64 or photo_placeholder:
+        return ft.Image(
+            src=photo_url,
+            src_base64=None if photo_url else (photo_base64 or photo_placeholder),
+            fit=ft.ImageFit.COVER,
+            border_radius=ft.border_radius.only(top_left=14, top_right=14),
+            # The preview is a few pixels wide; smooth scaling makes it a soft blur
+            filter_quality=ft.FilterQuality.MEDIUM if not (photo_url or photo_base64) else None,
+            gapless_playback=True,
+        )
+    return ft.Icon(ft.Icons.PETS, size=70, color=ft.Colors.GREY_400)
+
+
+def set_animal_card_photo(
+    photo_container: object,
+    photo_url: Optional[str] = None,
+    photo_base64: Optional[str] = None,
+) -> None:
+    """Swap an animal card's placeholder for its photo.
+    
+    Args:
+        photo_container: The container bound to create_animal_card's photo_ref
+        photo_url: Cacheable media URL for the photo
+        photo_base64: Base64 encoded photo (legacy)
+    """
+    if photo_container is None or not (photo_url or photo_base64):
+        return
+    current = photo_container.content
+    if isinstance(current, ft.Image):
+        # Swap the source in place; gapless playback keeps the preview up until the photo decodes
+        current.src = photo_url
+        current.src_base64 = None if photo_url else photo_base64
+        current.filter_quality = None
+    else:
+        photo_container.content = _animal_photo_content(photo_url, photo_base64)
+    photo_container.bgcolor = None
+    photo_container.alignment = None
+    try:
+        photo_container.update()
+    except Exception:
+        pass  # Card no longer on the page (navigated away)
+
+
+def load_card_photos(page, photo_slots: List[tuple]) -> None:
+    """Fill animal card photos in the background as they resolve.
+    
+    Cards are built with placeholders first; photos are then resolved
+    concurrently and each card is updated as soon as its photo is ready.
+    
+    Args:
+        page: Flet page
+        photo_slots: List of (photo value from database, ft.Ref passed as photo_ref)
+    """
+    import threading
+    from services.photo_service import get_photo_service
+    
+    refs_by_photo: Dict[str, List[object]] = {}
+    for photo, ref in photo_slots:
+        if photo:
+            refs_by_photo.setdefault(photo, []).append(ref)
+    if not refs_by_photo:
+        return
+    
+    def fill(photo, source):
+        for ref in refs_by_photo.get(photo, []):
+            set_animal_card_photo(ref.current, *source)
+    
+    def resolve():
+        get_photo_service().resolve_many(
+            refs_by_photo.keys(),
+            on_resolved=lambda photo, source: page.run_thread(fill, photo, source),
+        )
+    
+    threading.Thread(target=resolve, daemon=True).start()
+
+
 def _handle_card_hover(e, card):
     """Handle card hover animation - only scale to avoid blinking."""
     if ft is None:
@@ -1385,5 +1498,7 @@ __all__ = [
     "create_stat_card",
     "create_map_container",
     "create_animal_card",
+    "set_animal_card_photo",
+    "load_card_photos",
     "create_page_control_bar",
 ]
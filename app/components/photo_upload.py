@@ -2,7 +2,6 @@
 from __future__ import annotations
 from typing import Optional, TYPE_CHECKING, Callable
 import asyncio
-import base64
 import os
 import time
 from pathlib import Path
@@ -17,6 +16,7 @@ except ImportError:
     ft = None
 
 from storage.file_store import get_file_store, FileStoreError
+from storage.image_normalizer import preview_base64
 from services.photo_service import get_photo_service
 
 
@@ -58,7 +58,7 @@ class PhotoUploadWidget:
         self._current_web_source_id: Optional[int] = None
         self._current_web_upload_progress_seen: bool = False
         self._current_web_upload_notified: bool = False
-        self._pending_image_bytes: Optional[bytes] = None
+        self._pending_image_path: Optional[str] = None
         
         self.photo_display = self._create_photo_display(initial_photo)
         self._upload_progress = ft.ProgressBar(width=self.width, visible=False, value=0, color=ft.Colors.BLUE)
@@ -139,10 +139,11 @@ class PhotoUploadWidget:
                 if not os.path.exists(file_path):
                     raise FileNotFoundError(f"File not found: {file_path}")
                 
-                with open(file_path, "rb") as image_file:
-                    self._pending_image_bytes = image_file.read()
+                # Size and type are checked from stat + header before anything is read
+                self.file_store.validate_upload(file_path, self._original_filename)
+                self._pending_image_path = file_path
 
-                self._photo_base64 = base64.b64encode(self._pending_image_bytes).decode()
+                self._photo_base64 = preview_base64(file_path)
                 self._photo_filename = None
 
                 self.photo_display.content = ft.Image(
@@ -243,8 +244,6 @@ class PhotoUploadWidget:
         return str(latest)
 
     def _finalize_uploaded_file(self, file_path: str, event_file_name: str) -> bool:
-        import base64
-
         target_name = self._upload_targets.get(event_file_name, event_file_name)
         if target_name in self._upload_completed_targets:
             return True
@@ -252,10 +251,19 @@ class PhotoUploadWidget:
         if not self._is_uploaded_file_ready(file_path):
             return False
 
-        with open(file_path, "rb") as image_file:
-            self._pending_image_bytes = image_file.read()
+        try:
+            self.file_store.validate_upload(file_path, self._original_filename)
+        except FileStoreError as ex:
+            self._upload_progress.visible = False
+            self._upload_progress.update()
+            self._upload_completed_targets.add(target_name)
+            self._upload_targets.pop(event_file_name, None)
+            self.page.open(ft.SnackBar(ft.Text(f"Upload error: {str(ex)}")))
+            self.page.update()
+            return True
 
-        self._photo_base64 = base64.b64encode(self._pending_image_bytes).decode()
+        self._pending_image_path = file_path
+        self._photo_base64 = preview_base64(file_path)
         self._photo_filename = None
 
         self.photo_display.content = ft.Image(
@@ -372,22 +380,23 @@ class PhotoUploadWidget:
             
 
     def save_with_name(self, animal_name: str) -> Optional[str]:
-        if not hasattr(self, '_pending_image_bytes') or not self._pending_image_bytes:
+        if not self._pending_image_path:
             return self._photo_filename
         
         try:
-            filename = self.file_store.save_bytes(
-                self._pending_image_bytes,
-                original_name=self._original_filename or "photo.jpg",
-                validate=True,
-                custom_name=animal_name
-            )
+            with open(self._pending_image_path, "rb") as image_file:
+                filename = self.file_store.save_stream(
+                    image_file,
+                    original_name=self._original_filename or "photo.jpg",
+                    validate=True,
+                    custom_name=animal_name
+                )
             
             self._photo_filename = filename
-            self._pending_image_bytes = None
+            self._pending_image_path = None
             return filename
             
-        except FileStoreError as ex:
+        except (FileStoreError, OSError) as ex:
             print(f"[ERROR] Failed to save photo: {ex}")
             return None
     
@@ -12,7 +12,8 @@ def create_profile_section(
     user_name: str, 
     is_admin: bool = False,
     profile_photo: Optional[str] = None,
-    on_click: Optional[Callable] = None
+    on_click: Optional[Callable] = None,
+    profile_photo_url: Optional[str] = None,
 ) -> object:
     """Create a profile section showing user info and online status.
     
@@ -21,6 +22,7 @@ def create_profile_section(
         is_admin: Whether the user is an admin
         profile_photo: Base64 encoded photo or None for default icon
         on_click: Optional callback when profile is clicked
+        profile_photo_url: Cacheable media URL for the photo; preferred over profile_photo
     """
     if ft is None:
         raise RuntimeError("Flet must be installed to create profile sections")
@@ -28,9 +30,10 @@ def create_profile_section(
     # Truncate long names with ellipsis for display
     display_name = user_name if len(user_name) <= 18 else user_name[:16] + "..."
     
-    if profile_photo:
+    if profile_photo_url or profile_photo:
         avatar_content = ft.Image(
-            src_base64=profile_photo,
+            src=profile_photo_url,
+            src_base64=None if profile_photo_url else profile_photo,
             width=38,
             height=38,
             fit=ft.ImageFit.COVER,
@@ -1,6 +1,6 @@
 """Sidebar components for the application."""
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, Tuple
 
 try:
     import flet as ft
@@ -13,22 +13,22 @@ from .profile import create_profile_section
 from .responsive_layout import is_mobile
 
 
-def _get_user_profile_photo(user_id: Optional[int]) -> Optional[str]:
+def _get_user_profile_photo(user_id: Optional[int]) -> Tuple[Optional[str], Optional[str]]:
     """Fetch user's profile photo from database.
     
     Args:
         user_id: The user's ID
         
     Returns:
-        Base64 encoded photo string or None
+        Tuple of (media URL, legacy base64 data); at most one is set
     """
     if not user_id:
-        return None
+        return None, None
     
     try:
         import app_config
         from storage.database import Database
-        from services.photo_service import load_photo
+        from services.photo_service import load_photo_source
         
         db = Database(app_config.DB_PATH)
         user = db.fetch_one(
@@ -37,11 +37,11 @@ def _get_user_profile_photo(user_id: Optional[int]) -> Optional[str]:
         )
         
         if user and user.get("profile_picture"):
-            return load_photo(user["profile_picture"])
+            return load_photo_source(user["profile_picture"])
     except Exception as e:
         print(f"[WARN] Could not load profile photo: {e}")
     
-    return None
+    return None, None
 
 
 def _handle_logout(page: object) -> None:
@@ -85,7 +85,7 @@ def create_admin_sidebar(page: object, current_route: str = "") -> object:
         user_id = None
     
     # Fetch profile photo
-    profile_photo = _get_user_profile_photo(user_id)
+    profile_photo_url, profile_photo = _get_user_profile_photo(user_id)
     
     nav_items = [
         ("Admin Dashboard", "/admin", ["/admin"]),
@@ -109,7 +109,8 @@ def create_admin_sidebar(page: object, current_route: str = "") -> object:
         user_name, 
         is_admin=True,
         profile_photo=profile_photo,
-        on_click=lambda e: page.go("/profile")
+        on_click=lambda e: page.go("/profile"),
+        profile_photo_url=profile_photo_url,
     )
     
     return ft.Container(
@@ -167,7 +168,7 @@ def create_user_sidebar(page: object, user_name: str = "User", current_route: st
         user_id = None
     
     # Fetch profile photo
-    profile_photo = _get_user_profile_photo(user_id)
+    profile_photo_url, profile_photo = _get_user_profile_photo(user_id)
     
     nav_items = [
         ("User Dashboard", "/user", ["/user"]),
@@ -191,7 +192,8 @@ def create_user_sidebar(page: object, user_name: str = "User", current_route: st
         user_name, 
         is_admin=False,
         profile_photo=profile_photo,
-        on_click=lambda e: page.go("/profile")
+        on_click=lambda e: page.go("/profile"),
+        profile_photo_url=profile_photo_url,
     )
     
     return ft.Container(
@@ -263,7 +265,7 @@ def _build_drawer(page, current_route: str, is_admin: bool) -> object:
         user_name = "Admin" if is_admin else "User"
         user_id = None
 
-    profile_photo = _get_user_profile_photo(user_id)
+    profile_photo_url, profile_photo = _get_user_profile_photo(user_id)
 
     destinations = []
     selected_idx = 0
@@ -288,9 +290,10 @@ def _build_drawer(page, current_route: str, is_admin: bool) -> object:
             page.go(route_list[idx])
 
     # Header inside drawer
-    if profile_photo:
+    if profile_photo_url or profile_photo:
         drawer_avatar = ft.Image(
-            src_base64=profile_photo,
+            src=profile_photo_url,
+            src_base64=None if profile_photo_url else profile_photo,
             width=36,
             height=36,
             fit=ft.ImageFit.COVER,
@@ -377,6 +377,32 @@ def format_coordinates_display(lat: float, lng: float, short: bool = False) -> s
         return f"{abs(lat):.2f}°{lat_dir}, {abs(lng):.2f}°{lng_dir}"
 
 
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a duration compactly for stat tables.
+    
+    Args:
+        seconds: Duration in seconds, or None when unknown
+        
+    Returns:
+        "—" for None, otherwise minutes, hours or days
+        
+    Examples:
+        >>> format_duration(600)
+        '10m'
+        >>> format_duration(5400)
+        '1.5h'
+        >>> format_duration(3 * 86400)
+        '3.0d'
+    """
+    if seconds is None:
+        return "—"
+    if seconds < 3600:
+        return f"{round(seconds / 60)}m"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
 def format_location_for_display(
     location: Optional[str], 
     latitude: Optional[float] = None, 
@@ -462,5 +488,6 @@ __all__ = [
     "is_coordinate_string",
     "parse_coordinates_from_string",
     "format_coordinates_display",
+    "format_duration",
     "format_location_for_display",
 ]
@@ -14,6 +14,9 @@ except Exception:  # pragma: no cover - flet not installed in test env
 	ft = None  # type: ignore
 
 from services.auth_service import AuthService
+from services.photo_migration_service import start_background_migration
+from services.upload_gc_service import start_background_gc
+from services.analytics_warmer import start_analytics_warmer
 from state import get_app_state
 from routes import get_route_handler, _extract_query_params, clear_page, check_route_access
 import app_config
@@ -26,6 +29,16 @@ def main(page) -> None:
 	# Initialize auth service and ensure admin user exists
 	auth = AuthService(app_config.DB_PATH)
 
+	# Move any legacy inline base64 photos into FileStore (once per process)
+	start_background_migration(app_config.DB_PATH)
+
+	# Quarantine and purge uploads no row references any more (once per process)
+	start_background_gc(app_config.DB_PATH)
+
+	# Recompute dashboard/chart aggregates in the background after writes (once per process)
+	if app_config.ANALYTICS_WARMER:
+		start_analytics_warmer(app_config.DB_PATH)
+
 	# Initialize per-session state (one AppState per connected client)
 	app_state = get_app_state(page, app_config.DB_PATH)
 	app_state.initialize(page)
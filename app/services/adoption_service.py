@@ -121,8 +121,17 @@ class AdoptionService:
         new_status_lower = status.lower()
         animal_id = existing.get("animal_id")
         
-        # If approving, also set was_approved flag and approved_at for historical tracking
         now = datetime.now()
+        
+        # Approvals and denials record when the decision was made (local time,
+        # like updated_at; its decided_ts shadow is UTC)
+        if new_status_lower in ("approved", "denied") and old_status != new_status_lower:
+            self.db.execute(
+                "UPDATE adoption_requests SET decided_at = ? WHERE id = ?",
+                (now, request_id)
+            )
+        
+        # If approving, also set was_approved flag and approved_at for historical tracking
         if new_status_lower == "approved" and old_status != "approved":
             self.db.execute(
                 "UPDATE adoption_requests SET status = ?, updated_at = ?, was_approved = 1, approved_at = ? WHERE id = ?",
@@ -151,11 +160,12 @@ class AdoptionService:
                     f"""UPDATE adoption_requests 
                         SET status = '{AdoptionStatus.DENIED}', 
                             notes = 'Animal was adopted by another applicant',
-                            updated_at = ?
+                            updated_at = ?,
+                            decided_at = ?
                         WHERE animal_id = ? 
                         AND id != ? 
                         AND LOWER(status) = '{AdoptionStatus.PENDING}'""",
-                    (datetime.now(), animal_id, request_id)
+                    (now, now, animal_id, request_id)
                 )
         
         elif new_status_lower == "denied" and old_status == "approved":
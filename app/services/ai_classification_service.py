@@ -538,9 +538,10 @@ class AIClassificationService:
                 if os.path.exists(image_source):
                     image = Image.open(image_source)
                 else:
-                    upload_path = app_config.UPLOADS_DIR / image_source
-                    if upload_path.exists():
-                        image = Image.open(upload_path)
+                    from storage.file_store import get_file_store
+                    store = get_file_store()
+                    if store.file_exists(image_source):
+                        image = Image.open(io.BytesIO(store.read_file_as_bytes(image_source)))
                     else:
                         return None
             
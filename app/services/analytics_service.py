@@ -1,19 +1,120 @@
 """Analytics service for data aggregation and reporting."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+import calendar
+import sqlite3
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
 
 from storage.database import Database
-from storage.cache import get_query_cache, QueryCache
+from storage.cache import get_query_cache, LRUCache, QueryCache
 from .animal_service import AnimalService
 from .rescue_service import RescueService
 from .adoption_service import AdoptionService
-from components.utils import parse_datetime
+from .status_counter_service import StatusCounterService
+from .daily_stats_service import (
+    DailyStatsService, GRANULARITIES, bucket_starts, _sql_base_status
+)
+from .columnar_analytics import ColumnarAnalytics, NUMPY_AVAILABLE
 import app_config
 from app_config import RescueStatus, AdoptionStatus, AnimalStatus
 
 
+# Percentiles reported by the latency metrics: (name, percent)
+_PERCENTILES = (("p50", 50), ("p90", 90), ("p99", 99))
+
+# Tables whose versions key the cached aggregates (see Database.create_tables)
+_ANALYTICS_TABLES = ("animals", "rescue_missions", "adoption_requests")
+
+
+def _epoch(value: date | datetime) -> int:
+    """Epoch seconds of a naive UTC date/datetime, comparable with the *_ts columns."""
+    return calendar.timegm(value.timetuple())
+
+
+@dataclass
+class AnalyticsSnapshot:
+    """Every admin dashboard and chart aggregate, derived from one read of each table.
+    
+    Built by ``AnalyticsService.get_snapshot`` and cached as a unit. Treat
+    the contents as read-only; they are shared by every caller until the
+    cache entry expires or is invalidated.
+    """
+    created_at: datetime
+    trend_30_days: Tuple[List[str], List[int], List[int]]
+    trend_14_days: Tuple[List[str], List[int], List[int]]
+    type_distribution: Dict[str, int]
+    health_status_counts: Dict[str, int]
+    dashboard_stats: Dict[str, Any]
+    monthly_changes: Dict[str, str]
+    rescue_status_distribution: Dict[str, int]
+    adoption_status_distribution: Dict[str, int]
+    urgency_distribution: Dict[str, int]
+    pending_rescue_missions: int
+    species_adoption_ranking: List[Tuple[str, int]]
+    breed_distribution: List[Tuple[str, int]]
+    breed_trends: Dict[str, Tuple[List[str], List[Tuple[str, List[int]]]]]
+    chart_insights: Dict[str, Any]
+    # Raw adoption request status (lowercased) -> count, over every request
+    request_status_counts: Dict[str, int] = field(default_factory=dict)
+    # Rescue missions with coordinates, newest first (for the rescue map)
+    missions: List[Dict[str, Any]] = field(default_factory=list)
+    # Length of stay, rescue response and adoption decision percentiles
+    latency_metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class UserInsightBundle:
+    """Every per-user aggregate shown on the user dashboard and analytics page.
+    
+    Built by ``AnalyticsService.get_user_insight_bundle`` from queries scoped
+    to one user's missions and requests, each run once per bundle.
+    """
+    user_id: int
+    activity_stats: Dict[str, Any]
+    rescue_status_distribution: Dict[str, int]
+    adoption_status_distribution: Dict[str, int]
+    insights: Dict[str, Any]
+    impact_insights: List[Dict[str, Any]]
+    chart_data: Tuple[List[str], List[int], List[int]]
+    breed_preferences: List[Tuple[str, int]]
+    # Missions / requests the user filed and has not cancelled (any other status)
+    rescue_reports: int = 0
+    adoption_requests: int = 0
+
+
+class _SignatureReader:
+    """One thread's read connection for ``AnalyticsService._data_signature``.
+    
+    The connection is closed by ``close()`` or, at the latest, when the
+    holder is dropped: when its thread ends or its service is collected.
+    """
+    
+    def __init__(self, db: Database) -> None:
+        self.conn = db._get_connection()
+        self.data_version: Optional[int] = None
+        self.value: Optional[Tuple[Any, ...]] = None
+        self._finalizer = weakref.finalize(self, _SignatureReader._close_connection, self.conn)
+    
+    @staticmethod
+    def _close_connection(conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.ProgrammingError:
+            # Collected on another thread: dropping the last reference closes it
+            pass
+    
+    def close(self) -> None:
+        self._finalizer()
+
+
+# (db path, user id, data version, day) -> UserInsightBundle, shared by all instances
+_user_bundles: LRUCache[UserInsightBundle] = LRUCache(max_size=app_config.USER_INSIGHT_CACHE_MAX_ENTRIES)
+
+
 class AnalyticsService:
     """Service for generating analytics and aggregated statistics.
     
@@ -25,13 +126,16 @@ class AnalyticsService:
     - Monthly comparison changes
     
     Uses QueryCache for performance optimization on expensive queries.
+    With NumPy installed, whole-history distributions and rankings are
+    computed by the columnar engine (see ANALYTICS_ENGINE).
     """
 
-    def __init__(self, db: Optional[Database | str] = None) -> None:
+    def __init__(self, db: Optional[Database | str] = None, engine: Optional[str] = None) -> None:
         """Initialize with database connection.
         
         Args:
             db: Database instance or path to sqlite file.
+            engine: "python", "numpy" or "auto" (defaults to app_config.ANALYTICS_ENGINE)
         """
         if isinstance(db, Database):
             self.db = db
@@ -41,9 +145,215 @@ class AnalyticsService:
         self.animal_service = AnimalService(self.db)
         self.rescue_service = RescueService(self.db)
         self.adoption_service = AdoptionService(self.db)
+        self.daily_stats = DailyStatsService(self.db)
+        self.status_counters = StatusCounterService(self.db)
         
         self._cache: QueryCache = get_query_cache()
         self._cache_ttl = 120
+        
+        # Rows pre-loaded while a snapshot is being built, and the
+        # connection the data signature is read on (per thread)
+        self._scan = threading.local()
+        
+        engine = (engine or app_config.ANALYTICS_ENGINE).lower()
+        if engine == "numpy" and not NUMPY_AVAILABLE:
+            print("[WARN] ANALYTICS_ENGINE=numpy but NumPy is not installed; using the Python engine")
+        self._use_columnar = engine in ("numpy", "auto") and NUMPY_AVAILABLE
+
+    def _scanned(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Rows of the snapshot being built on this thread, if any."""
+        rows = getattr(self._scan, "rows", None)
+        return rows[key] if rows is not None else None
+
+    def _all_animals(self) -> List[Dict[str, Any]]:
+        rows = self._scanned("animals")
+        return rows if rows is not None else (self.animal_service.get_all_animals() or [])
+
+    def _analytics_animals(self) -> List[Dict[str, Any]]:
+        rows = self._scanned("analytics_animals")
+        return rows if rows is not None else (self.animal_service.get_all_animals_for_analytics() or [])
+
+    def _adoptable_animals(self) -> List[Dict[str, Any]]:
+        rows = self._scanned("adoptable_animals")
+        return rows if rows is not None else (self.animal_service.get_adoptable_animals() or [])
+
+    def _analytics_missions(self) -> List[Dict[str, Any]]:
+        rows = self._scanned("analytics_missions")
+        return rows if rows is not None else (self.rescue_service.get_all_missions_for_analytics() or [])
+
+    def _analytics_requests(self) -> List[Dict[str, Any]]:
+        rows = self._scanned("analytics_requests")
+        return rows if rows is not None else (self.adoption_service.get_all_requests_for_analytics() or [])
+
+    def _columnar(self) -> Optional[ColumnarAnalytics]:
+        """Columnar arrays of the current data, or None when the Python engine is used.
+        
+        Loaded once per data signature and shared through the query cache.
+        """
+        if not self._use_columnar:
+            return None
+        engine = getattr(self._scan, "columnar", None)
+        if engine is not None:
+            return engine
+        return self._cache.get_or_fetch(
+            "analytics_columnar",
+            self._data_signature(),
+            lambda: ColumnarAnalytics.load(self.db),
+            ttl_seconds=self._cache_ttl
+        )
+
+    def get_snapshot(self) -> AnalyticsSnapshot:
+        """Get every dashboard and chart aggregate in one cached object.
+        
+        Each table is read once and all distributions, trends and insights
+        are derived from those rows, instead of every method re-reading the
+        tables. The snapshot is cached for the analytics TTL and keyed by the
+        tables' change versions, so any insert, delete or update is picked up
+        on the next call while a repeat read costs one version lookup.
+        
+        While an AnalyticsWarmer runs for this database, a miss is served from
+        the warmer's latest snapshot (see `AnalyticsWarmer.status` for how
+        stale it is) instead of aggregating on the caller's thread, as long
+        as it is younger than ANALYTICS_WARMER_MAX_STALE_SECONDS.
+        
+        Returns:
+            AnalyticsSnapshot
+        """
+        signature = self._data_signature()
+        snapshot = self._cache.get("analytics_snapshot", signature)
+        if snapshot is None:
+            snapshot = self._cache.get("analytics_snapshot_latest", (self.db.db_path,))
+        if snapshot is None:
+            snapshot = self.refresh_snapshot(signature)
+        return snapshot
+
+    def refresh_snapshot(self, signature: Optional[Tuple[Any, ...]] = None, publish: bool = False) -> AnalyticsSnapshot:
+        """Rebuild the snapshot and store it in the cache.
+        
+        Args:
+            signature: Data signature read before the rebuild (read now if None)
+            publish: Also keep it as this database's latest snapshot, served
+                on signature misses until the next publish or for at most
+                ANALYTICS_WARMER_MAX_STALE_SECONDS (used by AnalyticsWarmer)
+            
+        Returns:
+            The new AnalyticsSnapshot
+        """
+        if signature is None:
+            signature = self._data_signature()
+        snapshot = self._build_snapshot()
+        self._cache.set("analytics_snapshot", signature, snapshot, ttl_seconds=self._cache_ttl)
+        if publish:
+            self._cache.set(
+                "analytics_snapshot_latest", (self.db.db_path,), snapshot,
+                ttl_seconds=app_config.ANALYTICS_WARMER_MAX_STALE_SECONDS
+            )
+        return snapshot
+
+    def unpublish_snapshot(self) -> None:
+        """Stop serving the latest published snapshot of this database."""
+        self._cache.invalidate("analytics_snapshot_latest", (self.db.db_path,))
+
+    def _data_signature(self) -> Tuple[Any, ...]:
+        """Database path plus the trigger-bumped version of each analytics table.
+        
+        Every insert, update and delete bumps its table's version in the same
+        transaction. The versions are only re-read when ``PRAGMA data_version``
+        of this thread's read connection shows that another connection has
+        committed since, so a repeat call without writes reads no table.
+        """
+        reader = getattr(self._scan, "signature", None)
+        if reader is None:
+            reader = self._scan.signature = _SignatureReader(self.db)
+        try:
+            data_version = reader.conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != reader.data_version:
+                versions = dict(reader.conn.execute(
+                    f"SELECT table_name, version FROM table_versions "
+                    f"WHERE table_name IN ({', '.join('?' for _ in _ANALYTICS_TABLES)})",
+                    _ANALYTICS_TABLES
+                ).fetchall())
+                reader.value = (self.db.db_path, *(versions.get(table, 0) for table in _ANALYTICS_TABLES))
+                reader.data_version = data_version
+        except sqlite3.Error:
+            # Reconnect on the next call
+            self.close()
+            raise
+        return reader.value
+
+    def close(self) -> None:
+        """Close the calling thread's signature connection (reopened on demand).
+        
+        Long-lived threads that are done with the service call this; other
+        threads' connections close when the thread ends or the service is
+        garbage collected.
+        """
+        reader = getattr(self._scan, "signature", None)
+        self._scan.signature = None
+        if reader is not None:
+            reader.close()
+
+    def _build_snapshot(self) -> AnalyticsSnapshot:
+        """Read each table once and derive every aggregate from those rows.
+        
+        With the NumPy engine the aggregates come from the columnar arrays,
+        so only the missions shown on the rescue map are loaded as rows.
+        """
+        engine = self._columnar()
+        if engine is None:
+            animals = self.animal_service.get_all_animals() or []
+            missions = self.rescue_service.get_all_missions() or []
+            requests = self.adoption_service.get_all_requests() or []
+
+            # Same filters as the *_for_analytics / adoptable queries (NULL status never matches)
+            adoptable = set(app_config.ADOPTABLE_STATUSES)
+            self._scan.rows = {
+                "animals": animals,
+                "analytics_animals": [a for a in animals if a.get("status") is not None and a["status"] != "removed"],
+                "adoptable_animals": [a for a in animals if a.get("status") is not None and a["status"].lower() in adoptable],
+                "analytics_missions": [m for m in missions if m.get("status") not in (None, "removed", "cancelled")],
+                "analytics_requests": [r for r in requests if r.get("status") not in (None, "removed", "cancelled")],
+            }
+            map_missions = [m for m in missions if m.get("latitude") is not None and m.get("longitude") is not None]
+            request_status_counts: Dict[str, int] = {}
+            for r in requests:
+                status = (r.get("status") or "").lower()
+                request_status_counts[status] = request_status_counts.get(status, 0) + 1
+        else:
+            map_missions = self.rescue_service.get_map_missions() or []
+            request_status_counts = {
+                row["status"]: row["count"]
+                for row in self.db.fetch_all(
+                    "SELECT LOWER(COALESCE(status, '')) AS status, COUNT(*) AS count FROM adoption_requests GROUP BY 1"
+                )
+            }
+        self._scan.columnar = engine
+        try:
+            type_dist, status_counts = self.get_animal_statistics()
+
+            return AnalyticsSnapshot(
+                created_at=datetime.utcnow(),
+                trend_30_days=self._get_daily_trend(30),
+                trend_14_days=self._get_daily_trend(14),
+                type_distribution=type_dist,
+                health_status_counts=status_counts,
+                dashboard_stats=self._compute_dashboard_stats(),
+                monthly_changes=self.get_monthly_changes(),
+                rescue_status_distribution=self.get_rescue_status_distribution(),
+                adoption_status_distribution=self.get_adoption_status_distribution(),
+                urgency_distribution=self.get_urgency_distribution(),
+                pending_rescue_missions=self.get_pending_rescue_missions(),
+                species_adoption_ranking=self.get_species_adoption_ranking(limit=5),
+                breed_distribution=self.get_breed_distribution(),
+                breed_trends={mode: self.get_breed_trends(mode=mode) for mode in ("adoption", "rescue")},
+                chart_insights=self.get_chart_insights(),
+                request_status_counts=request_status_counts,
+                missions=map_missions,
+                latency_metrics=self.get_latency_metrics(),
+            )
+        finally:
+            self._scan.rows = None
+            self._scan.columnar = None
 
     def get_chart_data(self) -> Tuple[Tuple[List[str], List[int], List[int]], Dict[str, int], Dict[str, int]]:
         """Return aggregated data for charts.
@@ -54,57 +364,10 @@ class AnalyticsService:
             - type_dist: Dictionary of animal type distribution (empty dict if no data)
             - status_counts: Dictionary of health status counts (always includes healthy, recovering, injured)
         """
-        now = datetime.utcnow()
-        days: List[datetime] = []
-        for i in range(29, -1, -1):
-            d = now - timedelta(days=i)
-            days.append(d)
-        day_labels = [d.strftime("%m-%d") for d in days]
-        day_dates = [d.strftime("%Y-%m-%d") for d in days]
-
-        rescued_counts = [0 for _ in day_labels]
-        adopted_counts = [0 for _ in day_labels]
-
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        for ms in missions:
-            status = (ms.get("status") or "").lower()
-            base_status = RescueStatus.get_base_status(status)
-            is_rescued = base_status == RescueStatus.RESCUED
-            if not is_rescued:
-                continue
-            dt = ms.get("rescued_at") or ms.get("mission_date")
-            if not dt:
-                continue
-            # Parse date using shared helper
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                rescued_counts[idx] += 1
-
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        for req in requests:
-            # Only count requests with approved status (current or archived)
-            status_lower = (req.get("status") or "").lower()
-            base_status = AdoptionStatus.get_base_status(status_lower)
-            if base_status not in app_config.APPROVED_ADOPTION_STATUSES:
-                continue
-            dt = req.get("approved_at") or req.get("request_date")
-            if not dt:
-                continue
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                adopted_counts[idx] += 1
-
+        trend = self._get_daily_trend(30)
         type_dist, status_counts = self.get_animal_statistics()
 
-        return (day_labels, rescued_counts, adopted_counts), type_dist, status_counts
+        return trend, type_dist, status_counts
 
     def get_chart_data_14_days(self) -> Tuple[List[str], List[int], List[int]]:
         """Return 14-day trend data for rescued vs adopted chart (admin dashboard).
@@ -112,54 +375,96 @@ class AnalyticsService:
         Returns:
             Tuple containing (day_labels, rescued_counts, adopted_counts)
         """
-        now = datetime.utcnow()
-        days: List[datetime] = []
-        for i in range(13, -1, -1):
-            d = now - timedelta(days=i)
-            days.append(d)
-        day_labels = [d.strftime("%m-%d") for d in days]
-        day_dates = [d.strftime("%Y-%m-%d") for d in days]
+        return self._get_daily_trend(14)
 
-        rescued_counts = [0 for _ in day_labels]
-        adopted_counts = [0 for _ in day_labels]
+    def _get_daily_trend(self, days: int) -> Tuple[List[str], List[int], List[int]]:
+        """Count rescues and approved adoptions per day for the last `days` days (UTC).
+        
+        Rescues are dated by rescued_at (falling back to mission_date) and
+        adoptions by request_date; both come from the daily_stats rollup.
+        
+        Args:
+            days: Number of days, ending today
+            
+        Returns:
+            Tuple containing (day_labels, rescued_counts, adopted_counts)
+        """
+        end = datetime.utcnow().date()
+        labels, series = self.get_trends(["rescues", "adoptions"], end - timedelta(days=days - 1), end)
+        return (labels, series["rescues"], series["adoptions"])
 
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        for ms in missions:
-            status = (ms.get("status") or "").lower()
-            base_status = RescueStatus.get_base_status(status)
-            is_rescued = base_status == RescueStatus.RESCUED
-            if not is_rescued:
-                continue
-            dt = ms.get("rescued_at") or ms.get("mission_date")
-            if not dt:
-                continue
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                rescued_counts[idx] += 1
+    def get_trend(
+        self,
+        metric: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = "day"
+    ) -> Tuple[List[str], List[int]]:
+        """Get one daily_stats metric per day, week, month or year.
+        
+        Reads only the rollup rows inside the range, so a year of weekly data
+        costs at most 366 small rows whatever the size of the history.
+        
+        Args:
+            metric: One of DAILY_METRICS (e.g. "rescues", "adoptions", "intakes")
+            start: First day (defaults to 29 days before `end`); widened to
+                the start of its week/month/year so every bucket is complete
+            end: Last day (defaults to today, UTC)
+            granularity: "day", "week", "month" or "year"
+            
+        Returns:
+            Tuple of (bucket_labels, counts)
+        """
+        labels, series = self.get_trends([metric], start, end, granularity)
+        return labels, series[metric]
 
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        for req in requests:
-            # Only count requests with approved status (current or archived)
-            status_lower = (req.get("status") or "").lower()
-            base_status = AdoptionStatus.get_base_status(status_lower)
-            if base_status not in app_config.APPROVED_ADOPTION_STATUSES:
-                continue
-            dt = req.get("approved_at") or req.get("request_date")
-            if not dt:
-                continue
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                adopted_counts[idx] += 1
+    def get_trends(
+        self,
+        metrics: List[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = "day"
+    ) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Get several daily_stats metrics over the same buckets in one query.
+        
+        Args:
+            metrics: Metrics from DAILY_METRICS
+            start: First day (see get_trend)
+            end: Last day (see get_trend)
+            granularity: "day", "week", "month" or "year"
+            
+        Returns:
+            Tuple of (bucket_labels, metric -> counts)
+            
+        Raises:
+            ValueError: For an unknown metric or granularity
+        """
+        buckets = self._trend_buckets(start, end, granularity)
+        rows = self.daily_stats.get_series(
+            metrics, buckets[0].isoformat(), (end or datetime.utcnow().date()).isoformat(), granularity
+        )
+        keys = [b.isoformat() for b in buckets]
+        series = {m: [rows.get(k, {}).get(m) or 0 for k in keys] for m in metrics}
+        return [self._bucket_label(b, granularity) for b in buckets], series
+
+    def _trend_buckets(self, start: Optional[date], end: Optional[date], granularity: str) -> List[date]:
+        """Bucket start days covering [start, end] with the default 30-day window."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        end = end or datetime.utcnow().date()
+        start = start or end - timedelta(days=29)
+        if start > end:
+            raise ValueError("start must not be after end")
+        return bucket_starts(start, end, granularity)
 
-        return (day_labels, rescued_counts, adopted_counts)
+    @staticmethod
+    def _bucket_label(bucket: date, granularity: str) -> str:
+        """Chart label of a bucket: MM-DD for days and weeks, 'Jan 2025' for months, '2025' for years."""
+        if granularity == "month":
+            return bucket.strftime("%b %Y")
+        if granularity == "year":
+            return bucket.strftime("%Y")
+        return bucket.strftime("%m-%d")
 
     def get_animal_statistics(self) -> Tuple[Dict[str, int], Dict[str, int]]:
         """Calculate animal type distribution and health status counts.
@@ -171,7 +476,11 @@ class AnalyticsService:
             - type_distribution: Empty dict if no animals, otherwise counts by species
             - status_counts: Always contains 'healthy', 'recovering', 'injured' keys (with 0 if none)
         """
-        animals = self.animal_service.get_all_animals_for_analytics() or []
+        engine = self._columnar()
+        if engine is not None:
+            return engine.animal_statistics()
+        
+        animals = self._analytics_animals()
         type_dist: Dict[str, int] = {}
         status_counts: Dict[str, int] = {
             "healthy": 0,
@@ -196,34 +505,25 @@ class AnalyticsService:
     def get_dashboard_stats(self) -> Dict[str, Any]:
         """Get summary statistics for dashboard display.
         
-        Excludes "removed" and "cancelled" items from all counts.
-        Returns cached results for performance.
+        Excludes "removed" and "cancelled" items from all counts. Read
+        straight from the trigger-maintained status counters (a few primary-key
+        lookups), so it is never cached and always reflects the latest write.
         
         Returns:
             Dictionary with total animals, adoptions, and pending requests
         """
-        def _fetch_stats():
-            animals = self.animal_service.get_all_animals_for_analytics() or []
-            all_requests = self.adoption_service.get_all_requests_for_analytics() or []
-            
-            total_animals = len(animals)
-            total_adoptions = len([r for r in all_requests 
-                if AdoptionStatus.get_base_status((r.get("status") or "").lower()) in app_config.APPROVED_ADOPTION_STATUSES])
-            pending_applications = len([r for r in all_requests 
-                if AdoptionStatus.get_base_status((r.get("status") or "").lower()) == "pending"])
-            
-            return {
-                "total_animals": total_animals,
-                "total_adoptions": total_adoptions,
-                "pending_applications": pending_applications,
-            }
+        return self._compute_dashboard_stats()
+
+    def _compute_dashboard_stats(self) -> Dict[str, Any]:
+        """Count animals, approved adoptions and pending requests (uncached)."""
+        counts = self.status_counters.get_counts("animals", "adoption_requests")
+        requests = counts["adoption_requests"]
         
-        return self._cache.get_or_fetch(
-            "dashboard_stats",
-            None,
-            _fetch_stats,
-            ttl_seconds=self._cache_ttl
-        )
+        return {
+            "total_animals": sum(counts["animals"].values()),
+            "total_adoptions": sum(requests.get(s, 0) for s in app_config.APPROVED_ADOPTION_STATUSES),
+            "pending_applications": requests.get("pending", 0),
+        }
 
     def get_monthly_changes(self) -> Dict[str, str]:
         """Calculate percentage changes comparing this month vs last month.
@@ -235,46 +535,13 @@ class AnalyticsService:
             - adoptions_change: Change in adoptions
             - pending_change: Change in pending applications
         """
-        now = datetime.utcnow()
-        
-        this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        today = datetime.utcnow().date()
+        this_month_start = today.replace(day=1)
         last_month_end = this_month_start - timedelta(days=1)
         last_month_start = last_month_end.replace(day=1)
         
-        def is_in_range(dt, start: datetime, end: datetime) -> bool:
-            """Check if datetime is within range."""
-            parsed = parse_datetime(dt)
-            if parsed is None:
-                return False
-            return start <= parsed <= end
-        
-        animals = self.animal_service.get_all_animals_for_analytics() or []
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        
-        animals_this_month = len([a for a in animals if is_in_range(a.get("intake_date"), this_month_start, now)])
-        animals_last_month = len([a for a in animals if is_in_range(a.get("intake_date"), last_month_start, last_month_end)])
-        
-        rescues_this_month = len([m for m in missions 
-            if is_in_range(m.get("mission_date"), this_month_start, now)
-            and RescueStatus.get_base_status((m.get("status") or "").lower()) == RescueStatus.RESCUED])
-        rescues_last_month = len([m for m in missions 
-            if is_in_range(m.get("mission_date"), last_month_start, last_month_end)
-            and RescueStatus.get_base_status((m.get("status") or "").lower()) == RescueStatus.RESCUED])
-        
-        adoptions_this_month = len([r for r in requests 
-            if is_in_range(r.get("request_date"), this_month_start, now) 
-            and AdoptionStatus.get_base_status((r.get("status") or "").lower()) in app_config.APPROVED_ADOPTION_STATUSES])
-        adoptions_last_month = len([r for r in requests 
-            if is_in_range(r.get("request_date"), last_month_start, last_month_end)
-            and AdoptionStatus.get_base_status((r.get("status") or "").lower()) in app_config.APPROVED_ADOPTION_STATUSES])
-        
-        pending_this_month = len([r for r in requests 
-            if is_in_range(r.get("request_date"), this_month_start, now)
-            and AdoptionStatus.get_base_status((r.get("status") or "").lower()) == "pending"])
-        pending_last_month = len([r for r in requests 
-            if is_in_range(r.get("request_date"), last_month_start, last_month_end)
-            and AdoptionStatus.get_base_status((r.get("status") or "").lower()) == "pending"])
+        this_month = self.daily_stats.get_totals(this_month_start.isoformat(), today.isoformat())
+        last_month = self.daily_stats.get_totals(last_month_start.isoformat(), last_month_end.isoformat())
         
         def calc_change(current: int, previous: int) -> str:
             """Calculate percentage change and format as string."""
@@ -293,10 +560,10 @@ class AnalyticsService:
                 return "No change"
         
         return {
-            "animals_change": calc_change(animals_this_month, animals_last_month),
-            "rescues_change": calc_change(rescues_this_month, rescues_last_month),
-            "adoptions_change": calc_change(adoptions_this_month, adoptions_last_month),
-            "pending_change": calc_change(pending_this_month, pending_last_month),
+            "animals_change": calc_change(this_month["intakes"], last_month["intakes"]),
+            "rescues_change": calc_change(this_month["rescues_reported"], last_month["rescues_reported"]),
+            "adoptions_change": calc_change(this_month["adoptions"], last_month["adoptions"]),
+            "pending_change": calc_change(this_month["pending_requests"], last_month["pending_requests"]),
         }
 
     def get_user_activity_stats(self, user_id: int) -> Dict[str, Any]:
@@ -310,48 +577,65 @@ class AnalyticsService:
         Returns:
             Dictionary with user's adoption and rescue statistics
         """
-        all_adoptions = self.adoption_service.get_all_requests_for_analytics() or []
-        all_rescues = self.rescue_service.get_all_missions_for_analytics() or []
-        
-        user_adoptions = [a for a in all_adoptions if a.get("user_id") == user_id]
-        user_rescues = [r for r in all_rescues if r.get("user_id") == user_id]
-        
-        total_adoptions = len([a for a in user_adoptions 
-                              if AdoptionStatus.get_base_status((a.get("status") or "").lower()) == "approved"])
-        rescue_reports_filed = len(user_rescues)
-        pending_adoption_requests = len([a for a in user_adoptions 
-                                        if AdoptionStatus.get_base_status((a.get("status") or "").lower()) == "pending"])
-        ongoing_rescue_missions = len([r for r in user_rescues 
-                                       if RescueStatus.get_base_status((r.get("status") or "").lower()) == "on-going"])
+        adoptions = self._user_base_status_counts("adoption_requests", user_id, AdoptionStatus)
+        rescues = self._user_base_status_counts("rescue_missions", user_id, RescueStatus)
         
         return {
-            "total_adoptions": total_adoptions,
-            "rescue_reports_filed": rescue_reports_filed,
-            "pending_adoption_requests": pending_adoption_requests,
-            "ongoing_rescue_missions": ongoing_rescue_missions,
+            "total_adoptions": adoptions.get("approved", 0),
+            "rescue_reports_filed": sum(rescues.values()),
+            "pending_adoption_requests": adoptions.get("pending", 0),
+            "ongoing_rescue_missions": rescues.get("on-going", 0),
         }
 
+    def _user_status_counts(self, table: str, user_id: int) -> Dict[Optional[str], int]:
+        """Count one user's missions or requests per raw status.
+        
+        Uses the user_id index, so the cost follows the user's own row count.
+        While a user bundle is being built the result is reused.
+        
+        Args:
+            table: "rescue_missions" or "adoption_requests"
+            user_id: The user's ID
+            
+        Returns:
+            Dictionary of stored status -> count
+        """
+        memo = getattr(self._scan, "user", None)
+        key = ("status", table, user_id)
+        if memo is not None and key in memo:
+            return memo[key]
+        
+        rows = self.db.fetch_all(
+            f"SELECT status, COUNT(*) AS count FROM {table} WHERE user_id = ? GROUP BY status",
+            (user_id,)
+        )
+        counts = {row["status"]: row["count"] for row in rows}
+        if memo is not None:
+            memo[key] = counts
+        return counts
+
+    def _user_base_status_counts(self, table: str, user_id: int, status_type) -> Dict[str, int]:
+        """Count one user's rows that count in analytics, per base status.
+        
+        Mirrors get_all_missions_for_analytics/get_all_requests_for_analytics:
+        "removed", "cancelled" and missing statuses are left out.
+        """
+        counts: Dict[str, int] = {}
+        for status, count in self._user_status_counts(table, user_id).items():
+            if status is None or status in ("removed", "cancelled"):
+                continue
+            base = status_type.get_base_status(status.lower())
+            counts[base] = counts.get(base, 0) + count
+        return counts
+
     def get_rescue_status_distribution(self) -> Dict[str, int]:
         """Get rescue mission status distribution.
         
         Returns:
             Dictionary with counts for each status: pending, on-going, rescued, failed
         """
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        
-        status_counts = {
-            "pending": 0,
-            "on-going": 0,
-            "rescued": 0,
-            "failed": 0,
-        }
-        
-        for mission in missions:
-            status = RescueStatus.get_base_status((mission.get("status") or "").lower())
-            if status in status_counts:
-                status_counts[status] += 1
-        
-        return status_counts
+        counts = self.status_counters.get_counts("rescue_missions")["rescue_missions"]
+        return {status: counts.get(status, 0) for status in ("pending", "on-going", "rescued", "failed")}
 
     def get_adoption_status_distribution(self) -> Dict[str, int]:
         """Get adoption request status distribution.
@@ -359,24 +643,8 @@ class AnalyticsService:
         Returns:
             Dictionary with counts for each status: pending, approved, denied
         """
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        
-        status_counts = {
-            "pending": 0,
-            "approved": 0,
-            "denied": 0,
-        }
-        
-        for req in requests:
-            status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-            if status == "approved":
-                status_counts["approved"] += 1
-            elif status == "denied":
-                status_counts["denied"] += 1
-            elif status == "pending":
-                status_counts["pending"] += 1
-        
-        return status_counts
+        counts = self.status_counters.get_counts("adoption_requests")["adoption_requests"]
+        return {status: counts.get(status, 0) for status in ("pending", "approved", "denied")}
 
     def get_urgency_distribution(self) -> Dict[str, int]:
         """Get rescue mission urgency level distribution.
@@ -384,7 +652,11 @@ class AnalyticsService:
         Returns:
             Dictionary with counts for each urgency: low, medium, high
         """
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
+        engine = self._columnar()
+        if engine is not None:
+            return engine.urgency_distribution()
+        
+        missions = self._analytics_missions()
         
         urgency_counts = {
             "low": 0,
@@ -407,10 +679,7 @@ class AnalyticsService:
         Returns:
             Number of pending rescue missions
         """
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        pending = [m for m in missions 
-                   if RescueStatus.get_base_status((m.get("status") or "").lower()) == "pending"]
-        return len(pending)
+        return self.status_counters.get_counts("rescue_missions")["rescue_missions"].get("pending", 0)
 
     def get_species_adoption_ranking(self, limit: int = 5) -> List[Tuple[str, int]]:
         """Get top adopted species ranking.
@@ -421,7 +690,11 @@ class AnalyticsService:
         Returns:
             List of (species, count) tuples sorted by count descending
         """
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
+        engine = self._columnar()
+        if engine is not None:
+            return engine.species_adoption_ranking(limit)
+        
+        requests = self._analytics_requests()
         
         species_counts: Dict[str, int] = {}
         
@@ -443,9 +716,6 @@ class AnalyticsService:
         Returns:
             Dictionary with counts for each status
         """
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        user_missions = [m for m in missions if m.get("user_id") == user_id]
-        
         status_counts = {
             "pending": 0,
             "on-going": 0,
@@ -453,10 +723,9 @@ class AnalyticsService:
             "failed": 0,
         }
         
-        for mission in user_missions:
-            status = RescueStatus.get_base_status((mission.get("status") or "").lower())
+        for status, count in self._user_base_status_counts("rescue_missions", user_id, RescueStatus).items():
             if status in status_counts:
-                status_counts[status] += 1
+                status_counts[status] += count
         
         return status_counts
 
@@ -469,23 +738,15 @@ class AnalyticsService:
         Returns:
             Dictionary with counts for each status
         """
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        user_requests = [r for r in requests if r.get("user_id") == user_id]
-        
         status_counts = {
             "pending": 0,
             "approved": 0,
             "denied": 0,
         }
         
-        for req in user_requests:
-            status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-            if status == "approved":
-                status_counts["approved"] += 1
-            elif status == "denied":
-                status_counts["denied"] += 1
-            elif status == "pending":
-                status_counts["pending"] += 1
+        for status, count in self._user_base_status_counts("adoption_requests", user_id, AdoptionStatus).items():
+            if status in status_counts:
+                status_counts[status] += count
         
         return status_counts
 
@@ -505,46 +766,96 @@ class AnalyticsService:
             days.append(d)
         day_labels = [d.strftime("%m-%d") for d in days]
         day_dates = [d.strftime("%Y-%m-%d") for d in days]
+        start_ts = _epoch(days[0].date())
+        end_ts = _epoch(days[-1].date() + timedelta(days=1))
+
+        rescue_rows = self.db.fetch_all(
+            """
+            SELECT date(mission_ts, 'unixepoch') AS day, COUNT(*) AS count
+            FROM rescue_missions
+            WHERE user_id = ? AND status NOT IN ('removed', 'cancelled')
+              AND mission_ts >= ? AND mission_ts < ?
+            GROUP BY day
+            """,
+            (user_id, start_ts, end_ts)
+        )
+        placeholders = ", ".join("?" for _ in app_config.APPROVED_ADOPTION_STATUSES)
+        adoption_rows = self.db.fetch_all(
+            f"""
+            SELECT date(request_ts, 'unixepoch') AS day, COUNT(*) AS count
+            FROM adoption_requests
+            WHERE user_id = ? AND status NOT IN ('removed', 'cancelled')
+              AND {_sql_base_status("status")} IN ({placeholders})
+              AND request_ts >= ? AND request_ts < ?
+            GROUP BY day
+            """,
+            (user_id, *app_config.APPROVED_ADOPTION_STATUSES, start_ts, end_ts)
+        )
+        rescued_by_day = {row["day"]: row["count"] for row in rescue_rows}
+        adopted_by_day = {row["day"]: row["count"] for row in adoption_rows}
 
-        rescues_reported = [0 for _ in day_labels]
-        adoptions_approved = [0 for _ in day_labels]
+        rescues_reported = [rescued_by_day.get(d, 0) for d in day_dates]
+        adoptions_approved = [adopted_by_day.get(d, 0) for d in day_dates]
 
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        user_missions = [m for m in missions if m.get("user_id") == user_id]
+        return (day_labels, rescues_reported, adoptions_approved)
+
+    def get_user_data_version(self, user_id: int) -> int:
+        """Get the version of a user's missions and requests.
         
-        for ms in missions:
-            if ms.get("user_id") != user_id:
-                continue
-            dt = ms.get("mission_date")
-            if not dt:
-                continue
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                rescues_reported[idx] += 1
+        Triggers bump it in the same transaction as any change to them (or to
+        the breed/species of an animal they requested).
+        
+        Args:
+            user_id: The user's ID
+            
+        Returns:
+            Version number (0 if the user never had any)
+        """
+        row = self.db.fetch_one("SELECT version FROM user_data_versions WHERE user_id = ?", (user_id,))
+        return row["version"] if row else 0
 
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        user_requests = [r for r in requests if r.get("user_id") == user_id]
+    def get_user_insight_bundle(self, user_id: int) -> UserInsightBundle:
+        """Get every per-user aggregate for the user dashboard and analytics page.
         
-        for req in user_requests:
-            dt = req.get("request_date")
-            if not dt:
-                continue
-            d = parse_datetime(dt)
-            if d is None:
-                continue
-            date_str = d.strftime("%Y-%m-%d")
-            if date_str in day_dates:
-                idx = day_dates.index(date_str)
-                status_lower = (req.get("status") or "").lower()
-                base_status = AdoptionStatus.get_base_status(status_lower)
-                if base_status in app_config.APPROVED_ADOPTION_STATUSES:
-                    adoptions_approved[idx] += 1
+        Built bundles are kept per (user, data version, day), so repeat visits
+        cost one version lookup until the user's data changes; the day is part
+        of the key because the activity chart covers the last 30 days. While a
+        bundle is built the status counts and breed preferences are queried
+        once and shared by the stats, distributions and insight builders.
+        
+        Args:
+            user_id: The user's ID
+            
+        Returns:
+            UserInsightBundle
+        """
+        key = (self.db.db_path, user_id, self.get_user_data_version(user_id), datetime.utcnow().date())
+        bundle = _user_bundles.get(key)
+        if bundle is None:
+            bundle = self._build_user_insight_bundle(user_id)
+            _user_bundles.set(key, bundle)
+        return bundle
 
-        return (day_labels, rescues_reported, adoptions_approved)
+    def _build_user_insight_bundle(self, user_id: int) -> UserInsightBundle:
+        """Query and build one user's bundle (uncached)."""
+        self._scan.user = {}
+        try:
+            raw_rescues = self._user_status_counts("rescue_missions", user_id)
+            raw_requests = self._user_status_counts("adoption_requests", user_id)
+            return UserInsightBundle(
+                user_id=user_id,
+                activity_stats=self.get_user_activity_stats(user_id),
+                rescue_status_distribution=self.get_user_rescue_status_distribution(user_id),
+                adoption_status_distribution=self.get_user_adoption_status_distribution(user_id),
+                insights=self.get_user_insights(user_id),
+                impact_insights=self.get_user_impact_insights(user_id),
+                chart_data=self.get_user_chart_data(user_id),
+                breed_preferences=self.get_user_breed_preferences(user_id, limit=5),
+                rescue_reports=sum(c for s, c in raw_rescues.items() if (s or "").lower() != "cancelled"),
+                adoption_requests=sum(c for s, c in raw_requests.items() if (s or "").lower() != "cancelled"),
+            )
+        finally:
+            self._scan.user = None
 
     def get_user_insights(self, user_id: int) -> Dict[str, Any]:
         """Generate personalized insights for a specific user.
@@ -914,28 +1225,11 @@ class AnalyticsService:
         """
         insight = {}
         
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        
-        breed_species_counts: Dict[str, Tuple[str, int]] = {}  # breed -> (species, count)
-        
-        for req in requests:
-            status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-            if status != "cancelled":
-                breed = self._normalize_breed(req.get("animal_breed"))
-                species = (req.get("animal_species") or "Unknown").strip().capitalize()
-                
-                if breed in breed_species_counts:
-                    # Increment count (keep first species seen for this breed)
-                    existing_species, count = breed_species_counts[breed]
-                    breed_species_counts[breed] = (existing_species, count + 1)
-                else:
-                    breed_species_counts[breed] = (species, 1)
-        
-        sorted_breeds = sorted(breed_species_counts.items(), key=lambda x: x[1][1], reverse=True)
+        top_breeds = self.get_top_breeds_for_adoption(limit=1)
         
-        if sorted_breeds:
-            top_breed, (top_species, top_count) = sorted_breeds[0]
-            total_breeds = len(sorted_breeds)
+        if top_breeds:
+            top_breed = top_breeds[0][0]
+            top_species = self._breed_species("adoption", top_breed) or "Unknown"
             
             # HEADLINE: Most popular breed with species
             breed_headline = {
@@ -952,18 +1246,21 @@ class AnalyticsService:
             breed_detail = {"parts": detail_parts}
             
             # ACTION: Most adopted breed or 30-day trend
-            now = datetime.utcnow()
-            thirty_days_ago = now - timedelta(days=30)
+            thirty_days_ago = datetime.utcnow() - timedelta(days=30)
             
-            recent_count = 0
-            for req in requests:
-                status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-                if status != "cancelled":
-                    breed = self._normalize_breed(req.get("animal_breed"))
-                    if breed == top_breed:
-                        dt = parse_datetime(req.get("request_date"))
-                        if dt and dt >= thirty_days_ago:
-                            recent_count += 1
+            row = self.db.fetch_one(
+                f"""
+                SELECT COUNT(*) AS count
+                FROM adoption_requests ar
+                LEFT JOIN animals a ON ar.animal_id = a.id
+                WHERE ar.request_ts >= ?
+                  AND ar.status NOT IN ('removed', 'cancelled')
+                  AND {_sql_base_status("ar.status")} != 'cancelled'
+                  AND COALESCE(a.breed_key, 'Not Specified') = ?
+                """,
+                (_epoch(thirty_days_ago), top_breed)
+            )
+            recent_count = row["count"] if row else 0
             
             if recent_count > 0:
                 breed_action = {
@@ -1011,6 +1308,42 @@ class AnalyticsService:
         
         return insight
 
+    def _high_urgency_by_status(self) -> Dict[str, int]:
+        """Count high-urgency analytics missions per base status."""
+        engine = self._columnar()
+        if engine is not None:
+            return engine.high_urgency_by_status()
+        
+        counts: Dict[str, int] = {}
+        for m in self._analytics_missions():
+            if (m.get("urgency") or "").lower() == "high":
+                status = RescueStatus.get_base_status((m.get("status") or "").lower())
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def _breed_species(self, kind: str, breed: str) -> Optional[str]:
+        """Species of the newest adoption request or rescue mission of a breed.
+        
+        Args:
+            kind: "adoption" or "rescue"
+            breed: Normalized breed name
+            
+        Returns:
+            Capitalized species ("Unknown" when not recorded), or None if no row has the breed
+        """
+        engine = self._columnar()
+        if engine is not None:
+            return engine.breed_species(kind, breed)
+        
+        if kind == "adoption":
+            rows, breed_key, species_key = self._analytics_requests(), "animal_breed", "animal_species"
+        else:
+            rows, breed_key, species_key = self._analytics_missions(), "breed", "animal_type"
+        for row in rows:
+            if self._normalize_breed(row.get(breed_key)) == breed:
+                return (row.get(species_key) or "Unknown").strip().capitalize()
+        return None
+
     def get_chart_insights(self) -> Dict[str, Any]:
         """Generate insights from chart data.
         
@@ -1089,17 +1422,9 @@ class AnalyticsService:
         high_urgency = urgency_dist.get("high", 0)
         insights["high_urgency_count"] = high_urgency
         
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        pending_high_urgency = len([
-            m for m in missions
-            if RescueStatus.get_base_status((m.get("status") or "").lower()) == "pending"
-            and (m.get("urgency") or "").lower() == "high"
-        ])
-        ongoing_high_urgency = len([
-            m for m in missions
-            if RescueStatus.get_base_status((m.get("status") or "").lower()) == "on-going"
-            and (m.get("urgency") or "").lower() == "high"
-        ])
+        high_urgency_by_status = self._high_urgency_by_status()
+        pending_high_urgency = high_urgency_by_status.get("pending", 0)
+        ongoing_high_urgency = high_urgency_by_status.get("on-going", 0)
         insights["pending_high_urgency"] = pending_high_urgency
         insights["ongoing_high_urgency"] = ongoing_high_urgency
         insights["active_high_urgency"] = pending_high_urgency + ongoing_high_urgency
@@ -1110,133 +1435,36 @@ class AnalyticsService:
         insights["rescued_30d"] = total_rescued_30d
         insights["adopted_30d"] = total_adopted_30d
         
-        # Generate intelligent, contextual insight messages
-        # Return structured data for rich Flet rendering
+        # Structured headline/detail/action data for rich Flet rendering
+        insights["rescue_insight"] = self._rescue_insight(rescue_status, high_urgency_by_status)
+        insights["adoption_insight"] = self._adoption_insight(adoption_status)
+        insights["health_insight"] = self._health_insight(status_counts, type_dist)
         
-        # RESCUE INSIGHT - Contextual analysis
-        if total_missions > 0:
-            success_rate = insights.get("rescue_success_rate", 0)
-            
-            top_rescued_breeds = self.get_top_breeds_for_rescue(limit=1)
-            top_rescued_breed_info = None
-            if top_rescued_breeds:
-                top_breed = top_rescued_breeds[0][0]
-                missions = self.rescue_service.get_all_missions_for_analytics() or []
-                for m in missions:
-                    if self._normalize_breed(m.get("breed")) == top_breed:
-                        species = (m.get("animal_type") or "Unknown").strip().capitalize()
-                        top_rescued_breed_info = (top_breed, species)
-                        break
-            
-            if success_rate >= 80:
-                rescue_headline = {
-                    "text": f"Excellent performance! {success_rate:.0f}% rescue success rate.",
-                    "icon": "EMOJI_EVENTS",  # Trophy icon
-                    "color": "GREEN_700",
-                }
-                detail_parts = [
-                    {"text": "Your team has successfully rescued ", "weight": "normal"},
-                    {"text": str(rescued_count), "weight": "bold", "color": "GREEN_600"},
-                    {"text": " animals", "weight": "normal"},
-                ]
-                if top_rescued_breed_info:
-                    breed, species = top_rescued_breed_info
-                    detail_parts.extend([
-                        {"text": ". Most rescued: ", "weight": "normal"},
-                        {"text": f"{breed} ({species})", "weight": "bold", "color": "BLUE_600"},
-                    ])
-                else:
-                    detail_parts.append({"text": ".", "weight": "normal"})
-                rescue_detail = {"parts": detail_parts}
-            elif success_rate >= 50:
-                rescue_headline = {
-                    "text": f"Good progress with {success_rate:.0f}% success rate.",
-                    "icon": "TRENDING_UP",
-                    "color": "BLUE_700",
-                }
-                rescue_detail = {
-                    "parts": [
-                        {"text": str(rescued_count), "weight": "bold", "color": "GREEN_600"},
-                        {"text": " rescued, ", "weight": "normal"},
-                        {"text": str(active_count), "weight": "bold", "color": "ORANGE_600"},
-                        {"text": " missions still active.", "weight": "normal"},
-                    ]
-                }
-            else:
-                rescue_headline = {
-                    "text": f"Needs attention: {success_rate:.0f}% success rate.",
-                    "icon": "WARNING_AMBER",
-                    "color": "ORANGE_700",
-                }
-                rescue_detail = {
+        # BREED INSIGHT - Add breed-specific analysis
+        insights["breed_insight"] = self.get_breed_insights()
+        
+        return insights
+
+    def _rescue_insight(
+        self, rescue_status: Dict[str, int], high_urgency_by_status: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Build the rescue operations insight (headline, detail and action).
+        
+        Args:
+            rescue_status: Mission counts by status
+            high_urgency_by_status: High-urgency mission counts by status
+        """
+        total_missions = sum(rescue_status.values())
+        if total_missions == 0:
+            return {
+                "headline": {
+                    "text": "No rescue missions yet",
+                    "icon": "INFO",
+                    "color": "GREY_700",
+                },
+                "detail": {
                     "parts": [
-                        {"text": "Consider reviewing protocols. ", "weight": "normal"},
-                        {"text": str(failed_count), "weight": "bold", "color": "RED_600"},
-                        {"text": " missions unsuccessful.", "weight": "normal"},
-                    ]
-                }
-            
-            active_high_urgency = insights.get("active_high_urgency", 0)
-            pending_high_urgency = insights.get("pending_high_urgency", 0)
-            ongoing_high_urgency = insights.get("ongoing_high_urgency", 0)
-            
-            if active_count > 0:
-                rescue_action = {
-                    "icon": "ASSIGNMENT",
-                    "text": f"{active_count} active mission{'s' if active_count > 1 else ''} require attention.",
-                    "color": "BLUE_600",
-                    "bg_color": "BLUE_50",
-                    "severity": "info",
-                }
-            elif active_high_urgency > 0:
-                if pending_high_urgency > 0 and ongoing_high_urgency > 0:
-                    rescue_action = {
-                        "icon": "WARNING_AMBER",
-                        "text": f"{pending_high_urgency} pending, {ongoing_high_urgency} on-going high-urgency case{'s' if active_high_urgency > 1 else ''}.",
-                        "color": "AMBER_700",
-                        "bg_color": "AMBER_50",
-                        "severity": "warning",
-                    }
-                elif pending_high_urgency > 0:
-                    rescue_action = {
-                        "icon": "SCHEDULE",
-                        "text": f"{pending_high_urgency} high-urgency case{'s' if pending_high_urgency > 1 else ''} pending.",
-                        "color": "AMBER_700",
-                        "bg_color": "AMBER_50",
-                        "severity": "warning",
-                    }
-                else:
-                    rescue_action = {
-                        "icon": "LOCAL_FIRE_DEPARTMENT",
-                        "text": f"{ongoing_high_urgency} high-urgency case{'s' if ongoing_high_urgency > 1 else ''} on-going.",
-                        "color": "ORANGE_700",
-                        "bg_color": "ORANGE_50",
-                        "severity": "warning",
-                    }
-            else:
-                rescue_action = {
-                    "icon": "CHECK_CIRCLE",
-                    "text": "All missions up to date.",
-                    "color": "GREEN_600",
-                    "bg_color": "GREEN_50",
-                    "severity": "success",
-                }
-            
-            insights["rescue_insight"] = {
-                "headline": rescue_headline,
-                "detail": rescue_detail,
-                "action": rescue_action,
-            }
-        else:
-            insights["rescue_insight"] = {
-                "headline": {
-                    "text": "No rescue missions yet",
-                    "icon": "INFO",
-                    "color": "GREY_700",
-                },
-                "detail": {
-                    "parts": [
-                        {"text": "Start by adding rescue reports from the community.", "weight": "normal"},
+                        {"text": "Start by adding rescue reports from the community.", "weight": "normal"},
                     ]
                 },
                 "action": {
@@ -1248,82 +1476,128 @@ class AnalyticsService:
                 },
             }
         
-        # ADOPTION INSIGHT - Contextual analysis
-        if total_requests > 0:
-            approval_rate = insights.get("adoption_approval_rate", 0)
-            
-            if approval_rate >= 70:
-                adoption_headline = {
-                    "text": f"Strong adoption rate: {approval_rate:.0f}% approved!",
-                    "icon": "THUMB_UP",
-                    "color": "GREEN_700",
-                }
-            elif approval_rate >= 40:
-                adoption_headline = {
-                    "text": f"Moderate adoption: {approval_rate:.0f}% approval rate.",
-                    "icon": "TRENDING_FLAT",
-                    "color": "ORANGE_700",
-                }
-            else:
-                adoption_headline = {
-                    "text": f"Low approval rate: {approval_rate:.0f}%. Review criteria?",
-                    "icon": "HELP_OUTLINE",
-                    "color": "RED_700",
-                }
-            
-            top_adopted_breeds = self.get_top_breeds_for_adoption(limit=1)
-            top_adopted_breed_info = None
-            if top_adopted_breeds:
-                top_breed = top_adopted_breeds[0][0]
-                requests = self.adoption_service.get_all_requests_for_analytics() or []
-                for req in requests:
-                    if self._normalize_breed(req.get("animal_breed")) == top_breed:
-                        species = (req.get("animal_species") or "Unknown").strip().capitalize()
-                        top_adopted_breed_info = (top_breed, species)
-                        break
-            
-            if approved_count > 0 and top_adopted_breed_info:
-                breed, species = top_adopted_breed_info
-                adoption_detail = {
-                    "parts": [
-                        {"text": str(approved_count), "weight": "bold", "color": "TEAL_600"},
-                        {"text": " animals found homes. ", "weight": "normal"},
-                        {"text": f"{breed} ({species})", "weight": "bold", "color": "ORANGE_600"},
-                        {"text": " is most popular!", "weight": "normal"},
-                    ]
-                }
+        rescued_count = rescue_status.get("rescued", 0)
+        failed_count = rescue_status.get("failed", 0)
+        active_count = rescue_status.get("pending", 0) + rescue_status.get("on-going", 0)
+        success_rate = (rescued_count / total_missions) * 100
+        
+        top_rescued_breeds = self.get_top_breeds_for_rescue(limit=1)
+        top_rescued_breed_info = None
+        if top_rescued_breeds:
+            top_breed = top_rescued_breeds[0][0]
+            species = self._breed_species("rescue", top_breed)
+            if species is not None:
+                top_rescued_breed_info = (top_breed, species)
+
+        if success_rate >= 80:
+            rescue_headline = {
+                "text": f"Excellent performance! {success_rate:.0f}% rescue success rate.",
+                "icon": "EMOJI_EVENTS",  # Trophy icon
+                "color": "GREEN_700",
+            }
+            detail_parts = [
+                {"text": "Your team has successfully rescued ", "weight": "normal"},
+                {"text": str(rescued_count), "weight": "bold", "color": "GREEN_600"},
+                {"text": " animals", "weight": "normal"},
+            ]
+            if top_rescued_breed_info:
+                breed, species = top_rescued_breed_info
+                detail_parts.extend([
+                    {"text": ". Most rescued: ", "weight": "normal"},
+                    {"text": f"{breed} ({species})", "weight": "bold", "color": "BLUE_600"},
+                ])
             else:
-                adoption_detail = {
-                    "parts": [
-                        {"text": str(approved_count), "weight": "bold", "color": "TEAL_600"},
-                        {"text": f" adoption{'s' if approved_count != 1 else ''} completed so far.", "weight": "normal"},
-                    ]
+                detail_parts.append({"text": ".", "weight": "normal"})
+            rescue_detail = {"parts": detail_parts}
+        elif success_rate >= 50:
+            rescue_headline = {
+                "text": f"Good progress with {success_rate:.0f}% success rate.",
+                "icon": "TRENDING_UP",
+                "color": "BLUE_700",
+            }
+            rescue_detail = {
+                "parts": [
+                    {"text": str(rescued_count), "weight": "bold", "color": "GREEN_600"},
+                    {"text": " rescued, ", "weight": "normal"},
+                    {"text": str(active_count), "weight": "bold", "color": "ORANGE_600"},
+                    {"text": " missions still active.", "weight": "normal"},
+                ]
+            }
+        else:
+            rescue_headline = {
+                "text": f"Needs attention: {success_rate:.0f}% success rate.",
+                "icon": "WARNING_AMBER",
+                "color": "ORANGE_700",
+            }
+            rescue_detail = {
+                "parts": [
+                    {"text": "Consider reviewing protocols. ", "weight": "normal"},
+                    {"text": str(failed_count), "weight": "bold", "color": "RED_600"},
+                    {"text": " missions unsuccessful.", "weight": "normal"},
+                ]
+            }
+
+        pending_high_urgency = high_urgency_by_status.get("pending", 0)
+        ongoing_high_urgency = high_urgency_by_status.get("on-going", 0)
+        active_high_urgency = pending_high_urgency + ongoing_high_urgency
+
+        if active_count > 0:
+            rescue_action = {
+                "icon": "ASSIGNMENT",
+                "text": f"{active_count} active mission{'s' if active_count > 1 else ''} require attention.",
+                "color": "BLUE_600",
+                "bg_color": "BLUE_50",
+                "severity": "info",
+            }
+        elif active_high_urgency > 0:
+            if pending_high_urgency > 0 and ongoing_high_urgency > 0:
+                rescue_action = {
+                    "icon": "WARNING_AMBER",
+                    "text": f"{pending_high_urgency} pending, {ongoing_high_urgency} on-going high-urgency case{'s' if active_high_urgency > 1 else ''}.",
+                    "color": "AMBER_700",
+                    "bg_color": "AMBER_50",
+                    "severity": "warning",
                 }
-            
-            if pending_count > 0:
-                adoption_action = {
-                    "icon": "MARK_EMAIL_UNREAD",
-                    "text": f"{pending_count} application{'s' if pending_count > 1 else ''} awaiting review.",
-                    "color": "BLUE_600",
-                    "bg_color": "BLUE_50",
-                    "severity": "info",
+            elif pending_high_urgency > 0:
+                rescue_action = {
+                    "icon": "SCHEDULE",
+                    "text": f"{pending_high_urgency} high-urgency case{'s' if pending_high_urgency > 1 else ''} pending.",
+                    "color": "AMBER_700",
+                    "bg_color": "AMBER_50",
+                    "severity": "warning",
                 }
             else:
-                adoption_action = {
-                    "icon": "CHECK_CIRCLE",
-                    "text": "No pending applications.",
-                    "color": "GREEN_600",
-                    "bg_color": "GREEN_50",
-                    "severity": "success",
+                rescue_action = {
+                    "icon": "LOCAL_FIRE_DEPARTMENT",
+                    "text": f"{ongoing_high_urgency} high-urgency case{'s' if ongoing_high_urgency > 1 else ''} on-going.",
+                    "color": "ORANGE_700",
+                    "bg_color": "ORANGE_50",
+                    "severity": "warning",
                 }
-            
-            insights["adoption_insight"] = {
-                "headline": adoption_headline,
-                "detail": adoption_detail,
-                "action": adoption_action,
-            }
         else:
-            insights["adoption_insight"] = {
+            rescue_action = {
+                "icon": "CHECK_CIRCLE",
+                "text": "All missions up to date.",
+                "color": "GREEN_600",
+                "bg_color": "GREEN_50",
+                "severity": "success",
+            }
+
+        return {
+            "headline": rescue_headline,
+            "detail": rescue_detail,
+            "action": rescue_action,
+        }
+
+    def _adoption_insight(self, adoption_status: Dict[str, int]) -> Dict[str, Any]:
+        """Build the adoption progress insight (headline, detail and action).
+        
+        Args:
+            adoption_status: Adoption request counts by status
+        """
+        total_requests = sum(adoption_status.values())
+        if total_requests == 0:
+            return {
                 "headline": {
                     "text": "No adoption requests yet",
                     "icon": "INFO",
@@ -1343,88 +1617,88 @@ class AnalyticsService:
                 },
             }
         
-        # HEALTH INSIGHT - Contextual analysis
-        if total_animals > 0:
-            healthy_pct = insights.get("healthy_percentage", 0)
-            
-            if healthy_pct >= 80:
-                health_headline = {
-                    "text": f"Great health status: {healthy_pct:.0f}% are healthy!",
-                    "icon": "VERIFIED",
-                    "color": "GREEN_700",
-                }
-            elif healthy_pct >= 50:
-                health_headline = {
-                    "text": f"Moderate health: {healthy_pct:.0f}% healthy, {recovering_count} recovering.",
-                    "icon": "HEALING",
-                    "color": "ORANGE_700",
-                }
-            else:
-                health_headline = {
-                    "text": f"Health concern: Only {healthy_pct:.0f}% are fully healthy.",
-                    "icon": "WARNING",
-                    "color": "RED_700",
-                }
-            
-            if type_dist:
-                species_parts = []
-                sorted_species = sorted(type_dist.items(), key=lambda x: -x[1])[:3]
-                for i, (species, count) in enumerate(sorted_species):
-                    if i > 0:
-                        species_parts.append({"text": ", ", "weight": "normal"})
-                    species_parts.append({"text": str(count), "weight": "bold", "color": "TEAL_600"})
-                    species_parts.append({"text": f" {species}{'s' if count > 1 else ''}", "weight": "normal"})
-                
-                breed_dist = self.get_breed_distribution()
-                breed_count = len(breed_dist)
-                if breed_count > 0:
-                    species_parts.append({"text": f". {breed_count} unique breed", "weight": "normal"})
-                    species_parts.append({"text": "s" if breed_count > 1 else "", "weight": "normal"})
-                
-                health_detail = {
-                    "parts": [
-                        {"text": "Population: ", "weight": "normal", "icon": "PETS"},
-                    ] + species_parts
-                }
-            else:
-                health_detail = {
-                    "parts": [
-                        {"text": f"All {healthy_count} animals in your care are healthy!", "weight": "normal"},
-                    ]
-                }
-            
-            if injured_count > 0:
-                health_action = {
-                    "icon": "LOCAL_HOSPITAL",
-                    "text": f"Prioritize care for {injured_count} injured animal{'s' if injured_count > 1 else ''}.",
-                    "color": "RED_600",
-                    "bg_color": "RED_50",
-                    "severity": "urgent",
-                }
-            elif recovering_count > 0:
-                health_action = {
-                    "icon": "HEALING",
-                    "text": f"Monitor {recovering_count} recovering animal{'s' if recovering_count > 1 else ''}.",
-                    "color": "ORANGE_600",
-                    "bg_color": "ORANGE_50",
-                    "severity": "warning",
-                }
-            else:
-                health_action = {
-                    "icon": "CHECK_CIRCLE",
-                    "text": "No immediate health concerns.",
-                    "color": "GREEN_600",
-                    "bg_color": "GREEN_50",
-                    "severity": "success",
-                }
-            
-            insights["health_insight"] = {
-                "headline": health_headline,
-                "detail": health_detail,
-                "action": health_action,
+        approved_count = adoption_status.get("approved", 0)
+        pending_count = adoption_status.get("pending", 0)
+        approval_rate = (approved_count / total_requests) * 100
+        
+        if approval_rate >= 70:
+            adoption_headline = {
+                "text": f"Strong adoption rate: {approval_rate:.0f}% approved!",
+                "icon": "THUMB_UP",
+                "color": "GREEN_700",
+            }
+        elif approval_rate >= 40:
+            adoption_headline = {
+                "text": f"Moderate adoption: {approval_rate:.0f}% approval rate.",
+                "icon": "TRENDING_FLAT",
+                "color": "ORANGE_700",
+            }
+        else:
+            adoption_headline = {
+                "text": f"Low approval rate: {approval_rate:.0f}%. Review criteria?",
+                "icon": "HELP_OUTLINE",
+                "color": "RED_700",
+            }
+
+        top_adopted_breeds = self.get_top_breeds_for_adoption(limit=1)
+        top_adopted_breed_info = None
+        if top_adopted_breeds:
+            top_breed = top_adopted_breeds[0][0]
+            species = self._breed_species("adoption", top_breed)
+            if species is not None:
+                top_adopted_breed_info = (top_breed, species)
+
+        if approved_count > 0 and top_adopted_breed_info:
+            breed, species = top_adopted_breed_info
+            adoption_detail = {
+                "parts": [
+                    {"text": str(approved_count), "weight": "bold", "color": "TEAL_600"},
+                    {"text": " animals found homes. ", "weight": "normal"},
+                    {"text": f"{breed} ({species})", "weight": "bold", "color": "ORANGE_600"},
+                    {"text": " is most popular!", "weight": "normal"},
+                ]
+            }
+        else:
+            adoption_detail = {
+                "parts": [
+                    {"text": str(approved_count), "weight": "bold", "color": "TEAL_600"},
+                    {"text": f" adoption{'s' if approved_count != 1 else ''} completed so far.", "weight": "normal"},
+                ]
+            }
+
+        if pending_count > 0:
+            adoption_action = {
+                "icon": "MARK_EMAIL_UNREAD",
+                "text": f"{pending_count} application{'s' if pending_count > 1 else ''} awaiting review.",
+                "color": "BLUE_600",
+                "bg_color": "BLUE_50",
+                "severity": "info",
             }
         else:
-            insights["health_insight"] = {
+            adoption_action = {
+                "icon": "CHECK_CIRCLE",
+                "text": "No pending applications.",
+                "color": "GREEN_600",
+                "bg_color": "GREEN_50",
+                "severity": "success",
+            }
+
+        return {
+            "headline": adoption_headline,
+            "detail": adoption_detail,
+            "action": adoption_action,
+        }
+
+    def _health_insight(self, status_counts: Dict[str, int], type_dist: Dict[str, int]) -> Dict[str, Any]:
+        """Build the animal health insight (headline, detail and action).
+        
+        Args:
+            status_counts: Animal counts by health status
+            type_dist: Animal counts by species
+        """
+        total_animals = sum(status_counts.values())
+        if total_animals == 0:
+            return {
                 "headline": {
                     "text": "No animals registered",
                     "icon": "INFO",
@@ -1444,10 +1718,87 @@ class AnalyticsService:
                 },
             }
         
-        # BREED INSIGHT - Add breed-specific analysis
-        insights["breed_insight"] = self.get_breed_insights()
+        healthy_count = status_counts.get("healthy", 0)
+        recovering_count = status_counts.get("recovering", 0)
+        injured_count = status_counts.get("injured", 0)
+        healthy_pct = (healthy_count / total_animals) * 100
         
-        return insights
+        if healthy_pct >= 80:
+            health_headline = {
+                "text": f"Great health status: {healthy_pct:.0f}% are healthy!",
+                "icon": "VERIFIED",
+                "color": "GREEN_700",
+            }
+        elif healthy_pct >= 50:
+            health_headline = {
+                "text": f"Moderate health: {healthy_pct:.0f}% healthy, {recovering_count} recovering.",
+                "icon": "HEALING",
+                "color": "ORANGE_700",
+            }
+        else:
+            health_headline = {
+                "text": f"Health concern: Only {healthy_pct:.0f}% are fully healthy.",
+                "icon": "WARNING",
+                "color": "RED_700",
+            }
+
+        if type_dist:
+            species_parts = []
+            sorted_species = sorted(type_dist.items(), key=lambda x: -x[1])[:3]
+            for i, (species, count) in enumerate(sorted_species):
+                if i > 0:
+                    species_parts.append({"text": ", ", "weight": "normal"})
+                species_parts.append({"text": str(count), "weight": "bold", "color": "TEAL_600"})
+                species_parts.append({"text": f" {species}{'s' if count > 1 else ''}", "weight": "normal"})
+
+            breed_dist = self.get_breed_distribution()
+            breed_count = len(breed_dist)
+            if breed_count > 0:
+                species_parts.append({"text": f". {breed_count} unique breed", "weight": "normal"})
+                species_parts.append({"text": "s" if breed_count > 1 else "", "weight": "normal"})
+
+            health_detail = {
+                "parts": [
+                    {"text": "Population: ", "weight": "normal", "icon": "PETS"},
+                ] + species_parts
+            }
+        else:
+            health_detail = {
+                "parts": [
+                    {"text": f"All {healthy_count} animals in your care are healthy!", "weight": "normal"},
+                ]
+            }
+
+        if injured_count > 0:
+            health_action = {
+                "icon": "LOCAL_HOSPITAL",
+                "text": f"Prioritize care for {injured_count} injured animal{'s' if injured_count > 1 else ''}.",
+                "color": "RED_600",
+                "bg_color": "RED_50",
+                "severity": "urgent",
+            }
+        elif recovering_count > 0:
+            health_action = {
+                "icon": "HEALING",
+                "text": f"Monitor {recovering_count} recovering animal{'s' if recovering_count > 1 else ''}.",
+                "color": "ORANGE_600",
+                "bg_color": "ORANGE_50",
+                "severity": "warning",
+            }
+        else:
+            health_action = {
+                "icon": "CHECK_CIRCLE",
+                "text": "No immediate health concerns.",
+                "color": "GREEN_600",
+                "bg_color": "GREEN_50",
+                "severity": "success",
+            }
+
+        return {
+            "headline": health_headline,
+            "detail": health_detail,
+            "action": health_action,
+        }
 
     def get_user_impact_insights(self, user_id: int) -> List[Dict[str, Any]]:
         """Generate personalized impact insights for the user dashboard.
@@ -1591,7 +1942,7 @@ class AnalyticsService:
         return insights[:2]  # Show max 2 insights
 
     def _normalize_breed(self, breed: Optional[str]) -> str:
-        """Normalize breed value for analytics.
+        """Normalize breed value for analytics (see app_config.normalize_breed).
         
         Args:
             breed: Raw breed value from database
@@ -1599,20 +1950,7 @@ class AnalyticsService:
         Returns:
             Normalized breed string
         """
-        if not breed or breed.strip() == "":
-            return "Not Specified"
-        
-        breed_clean = breed.strip()
-        
-        # Normalize "Unknown" variants to "Not Specified"
-        if breed_clean.lower() in ("unknown", "n/a", "not specified"):
-            return "Not Specified"
-        
-        # Keep "Mixed Breed" as-is (capitalized)
-        if breed_clean.lower() == "mixed breed":
-            return "Mixed Breed"
-        
-        return breed_clean.capitalize()
+        return app_config.normalize_breed(breed)
 
     def get_breed_distribution(self) -> List[Tuple[str, int]]:
         """Get breed distribution for all animals regardless of status.
@@ -1621,16 +1959,18 @@ class AnalyticsService:
             List of (breed, count) tuples sorted by count descending.
             No limit - returns all breeds.
         """
-        animals = self.animal_service.get_all_animals() or []
-        
-        breed_counts: Dict[str, int] = {}
-        
-        for animal in animals:
-            breed = self._normalize_breed(animal.get("breed"))
-            breed_counts[breed] = breed_counts.get(breed, 0) + 1
-        
-        sorted_breeds = sorted(breed_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_breeds
+        engine = self._columnar()
+        if engine is not None:
+            return engine.breed_distribution()
+        
+        return self._breed_ranking(
+            """
+            SELECT breed_key AS breed, COUNT(*) AS count
+            FROM animals
+            GROUP BY breed_key
+            ORDER BY count DESC, MIN(id)
+            """
+        )
 
     def get_top_breeds_for_adoption(self, limit: int = 3) -> List[Tuple[str, int]]:
         """Get top breeds from ALL adoption requests (excluding cancelled).
@@ -1641,18 +1981,24 @@ class AnalyticsService:
         Returns:
             List of (breed, count) tuples sorted by count descending
         """
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        
-        breed_counts: Dict[str, int] = {}
-        
-        for req in requests:
-            status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-            if status != "cancelled":
-                breed = self._normalize_breed(req.get("animal_breed"))
-                breed_counts[breed] = breed_counts.get(breed, 0) + 1
-        
-        sorted_breeds = sorted(breed_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_breeds[:limit]
+        engine = self._columnar()
+        if engine is not None:
+            return engine.top_breeds("adoption", limit)
+        
+        # Requests without a linked animal count as "Not Specified"
+        return self._breed_ranking(
+            f"""
+            SELECT COALESCE(a.breed_key, 'Not Specified') AS breed, COUNT(*) AS count
+            FROM adoption_requests ar
+            LEFT JOIN animals a ON ar.animal_id = a.id
+            WHERE ar.status NOT IN ('removed', 'cancelled')
+              AND {_sql_base_status("ar.status")} != 'cancelled'
+            GROUP BY 1
+            ORDER BY count DESC, MAX(ar.request_date) DESC
+            LIMIT ?
+            """,
+            (limit,)
+        )
 
     def get_top_breeds_for_rescue(self, limit: int = 3) -> List[Tuple[str, int]]:
         """Get top breeds from ALL rescue missions (excluding cancelled).
@@ -1663,18 +2009,22 @@ class AnalyticsService:
         Returns:
             List of (breed, count) tuples sorted by count descending
         """
-        missions = self.rescue_service.get_all_missions_for_analytics() or []
-        
-        breed_counts: Dict[str, int] = {}
-        
-        for mission in missions:
-            status = RescueStatus.get_base_status((mission.get("status") or "").lower())
-            if status != RescueStatus.CANCELLED:
-                breed = self._normalize_breed(mission.get("breed"))
-                breed_counts[breed] = breed_counts.get(breed, 0) + 1
-        
-        sorted_breeds = sorted(breed_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_breeds[:limit]
+        engine = self._columnar()
+        if engine is not None:
+            return engine.top_breeds("rescue", limit)
+        
+        return self._breed_ranking(
+            f"""
+            SELECT breed_key AS breed, COUNT(*) AS count
+            FROM rescue_missions
+            WHERE status NOT IN ('removed', 'cancelled')
+              AND {_sql_base_status("status")} != '{RescueStatus.CANCELLED}'
+            GROUP BY breed_key
+            ORDER BY count DESC, MAX(mission_date) DESC
+            LIMIT ?
+            """,
+            (limit,)
+        )
 
     def get_adoptable_breed_distribution(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get breed distribution for adoptable animals only (status='processing').
@@ -1686,18 +2036,26 @@ class AnalyticsService:
             List of (breed_with_species, count) tuples sorted by count descending.
             Format: "Breed (Species)" e.g., "Golden Retriever (Dog)"
         """
-        animals = self.animal_service.get_adoptable_animals() or []
-        
-        breed_counts: Dict[str, int] = {}
-        
-        for animal in animals:
-            breed = self._normalize_breed(animal.get("breed"))
-            species = (animal.get("species") or "Unknown").strip().capitalize()
-            breed_with_species = f"{breed} ({species})"
-            breed_counts[breed_with_species] = breed_counts.get(breed_with_species, 0) + 1
-        
-        sorted_breeds = sorted(breed_counts.items(), key=lambda x: x[1], reverse=True)
-        return sorted_breeds[:limit]
+        engine = self._columnar()
+        if engine is not None:
+            return engine.adoptable_breed_distribution(limit)
+        
+        adoptable = ", ".join("?" for _ in app_config.ADOPTABLE_STATUSES)
+        return self._breed_ranking(
+            f"""
+            SELECT breed_key || ' (' || species_key || ')' AS breed, COUNT(*) AS count
+            FROM animals
+            WHERE LOWER(status) IN ({adoptable})
+            GROUP BY breed_key, species_key
+            ORDER BY count DESC, MIN(id)
+            LIMIT ?
+            """,
+            (*app_config.ADOPTABLE_STATUSES, limit)
+        )
+
+    def _breed_ranking(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[str, int]]:
+        """Run a ranking query selecting `breed` and `count` into (breed, count) tuples."""
+        return [(row["breed"], row["count"]) for row in self.db.fetch_all(sql, params)]
 
     def get_user_breed_preferences(self, user_id: int, limit: int = 5) -> List[Tuple[str, int]]:
         """Get breed preferences from user's adoption requests (all statuses except cancelled).
@@ -1710,89 +2068,234 @@ class AnalyticsService:
             List of (breed_with_species, count) tuples sorted by count descending.
             Format: "Breed (Species)" e.g., "Golden Retriever (Dog)"
         """
-        requests = self.adoption_service.get_all_requests_for_analytics() or []
-        user_requests = [r for r in requests if r.get("user_id") == user_id]
+        memo = getattr(self._scan, "user", None)
+        key = ("breeds", user_id)
+        if memo is not None and key in memo:
+            return memo[key][:limit]
+        
+        # Grouped per stored breed key and raw species; most recently requested groups
+        # first, so ties keep the order of the user's latest request like the row-by-row count
+        rows = self.db.fetch_all(
+            f"""
+            SELECT COALESCE(a.breed_key, 'Not Specified') AS breed,
+                   COALESCE(a.species, ar.animal_species) AS species,
+                   COUNT(*) AS count
+            FROM adoption_requests ar
+            LEFT JOIN animals a ON ar.animal_id = a.id
+            WHERE ar.user_id = ? AND ar.status NOT IN ('removed', 'cancelled')
+              AND {_sql_base_status("ar.status")} != 'cancelled'
+            GROUP BY 1, 2
+            ORDER BY MAX(ar.request_date) DESC
+            """,
+            (user_id,)
+        )
         
         breed_counts: Dict[str, int] = {}
         
-        for req in user_requests:
-            status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-            if status != "cancelled":
-                breed = self._normalize_breed(req.get("animal_breed"))
-                species = (req.get("animal_species") or "Unknown").strip().capitalize()
-                breed_with_species = f"{breed} ({species})"
-                breed_counts[breed_with_species] = breed_counts.get(breed_with_species, 0) + 1
+        for row in rows:
+            breed_with_species = f"{row['breed']} ({app_config.normalize_species(row['species'])})"
+            breed_counts[breed_with_species] = breed_counts.get(breed_with_species, 0) + row["count"]
         
         sorted_breeds = sorted(breed_counts.items(), key=lambda x: x[1], reverse=True)
+        if memo is not None:
+            memo[key] = sorted_breeds
         return sorted_breeds[:limit]
 
-    def get_breed_trends(self, mode: str = "adoption") -> Tuple[List[str], List[Tuple[str, List[int]]]]:
-        """Get 30-day trend data for top 3 breeds.
+    def get_breed_trends(
+        self,
+        mode: str = "adoption",
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        granularity: str = "day"
+    ) -> Tuple[List[str], List[Tuple[str, List[int]]]]:
+        """Get trend data for the top 3 breeds (last 30 days per day by default).
         
         Args:
             mode: "adoption" for adoption trends, "rescue" for rescue trends
+            start: First day (see get_trend)
+            end: Last day (see get_trend)
+            granularity: "day", "week", "month" or "year"
             
         Returns:
             Tuple containing:
-            - day_labels: List of date labels (MM-DD format)
+            - day_labels: List of bucket labels (MM-DD format for days)
             - breed_series: List of (breed_name, counts) tuples for top 3 breeds
         """
-        now = datetime.utcnow()
-        days: List[datetime] = []
-        for i in range(29, -1, -1):
-            d = now - timedelta(days=i)
-            days.append(d)
-        day_labels = [d.strftime("%m-%d") for d in days]
-        day_dates = [d.strftime("%Y-%m-%d") for d in days]
+        buckets = self._trend_buckets(start, end, granularity)
+        keys = [b.isoformat() for b in buckets]
+
+        kind = "adoption" if mode == "adoption" else "rescue"
+        top_breeds = [breed for breed, _ in self.daily_stats.get_top_breeds(kind, limit=3)]
+        counts = self.daily_stats.get_breed_series(
+            kind, top_breeds, keys[0], (end or datetime.utcnow().date()).isoformat(), granularity
+        )
+        
+        breed_series = [(breed, [counts.get((breed, k), 0) for k in keys]) for breed in top_breeds]
+        
+        return [self._bucket_label(b, granularity) for b in buckets], breed_series
+
+    def get_latency_metrics(self) -> Dict[str, Any]:
+        """Get every operational latency metric, cached per data signature.
+        
+        Returns:
+            Dict with "length_of_stay", "rescue_response" and "adoption_decision"
+            (see the individual methods)
+        """
+        return self._cache.get_or_fetch(
+            "analytics_latency",
+            self._data_signature(),
+            lambda: {
+                "length_of_stay": self.get_length_of_stay(),
+                "rescue_response": self.get_rescue_response_times(),
+                "adoption_decision": self.get_adoption_decision_times(),
+            },
+            ttl_seconds=self._cache_ttl
+        )
 
-        if mode == "adoption":
-            top_breeds_data = self.get_top_breeds_for_adoption(limit=3)
-        else:  # rescue
-            top_breeds_data = self.get_top_breeds_for_rescue(limit=3)
-        
-        top_breeds = [breed for breed, _ in top_breeds_data]
-        
-        breed_counts: Dict[str, List[int]] = {breed: [0] * 30 for breed in top_breeds}
-        
-        if mode == "adoption":
-            requests = self.adoption_service.get_all_requests_for_analytics() or []
-            for req in requests:
-                status = AdoptionStatus.get_base_status((req.get("status") or "").lower())
-                if status != "cancelled":
-                    dt = req.get("request_date")
-                    if not dt:
-                        continue
-                    d = parse_datetime(dt)
-                    if d is None:
-                        continue
-                    date_str = d.strftime("%Y-%m-%d")
-                    if date_str in day_dates:
-                        breed = self._normalize_breed(req.get("animal_breed"))
-                        if breed in breed_counts:
-                            idx = day_dates.index(date_str)
-                            breed_counts[breed][idx] += 1
-        else:  # rescue
-            missions = self.rescue_service.get_all_missions_for_analytics() or []
-            for mission in missions:
-                status = RescueStatus.get_base_status((mission.get("status") or "").lower())
-                if status != RescueStatus.CANCELLED:
-                    dt = mission.get("mission_date")
-                    if not dt:
-                        continue
-                    d = parse_datetime(dt)
-                    if d is None:
-                        continue
-                    date_str = d.strftime("%Y-%m-%d")
-                    if date_str in day_dates:
-                        breed = self._normalize_breed(mission.get("breed"))
-                        if breed in breed_counts:
-                            idx = day_dates.index(date_str)
-                            breed_counts[breed][idx] += 1
-        
-        # Convert to list of tuples
-        breed_series = [(breed, counts) for breed, counts in breed_counts.items()]
-        
-        return day_labels, breed_series
+    def get_length_of_stay(self, since: Optional[date] = None) -> Dict[str, Any]:
+        """Get intake to adoption time of adopted animals.
+        
+        Each animal counts once, from its intake to its earliest approved request.
+        
+        Args:
+            since: Only animals adopted on or after this day (default: all time)
+            
+        Returns:
+            Dict with "count", "errors" (negative durations left out) and
+            "p50"/"p90"/"p99" in seconds (None when empty)
+        """
+        placeholders = ", ".join("?" for _ in app_config.APPROVED_ADOPTION_STATUSES)
+        params: List[Any] = list(app_config.APPROVED_ADOPTION_STATUSES)
+        having = ""
+        if since is not None:
+            having = "HAVING MIN(ar.approved_ts) >= ?"
+            params.append(_epoch(since))
+        return self._latency_percentiles(
+            f"""
+            SELECT 'all' AS grp, MIN(ar.approved_ts) - a.intake_ts AS seconds
+            FROM adoption_requests ar
+            JOIN animals a ON ar.animal_id = a.id
+            WHERE ar.approved_ts IS NOT NULL AND a.intake_ts IS NOT NULL
+              AND a.status != 'removed'
+              AND {_sql_base_status("ar.status")} IN ({placeholders})
+            GROUP BY a.id
+            {having}
+            """,
+            params,
+            ["all"]
+        )["all"]
+
+    def get_rescue_response_times(self, since: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Get report to rescue time of rescued missions, by urgency.
+        
+        Args:
+            since: Only missions rescued on or after this day (default: all time)
+            
+        Returns:
+            Dict of "low", "medium", "high" and "all" -> {"count", "errors", "p50", "p90", "p99"}
+            with percentiles in seconds (None when empty)
+        """
+        params: List[Any] = []
+        since_sql = ""
+        if since is not None:
+            since_sql = "AND rescued_ts >= ?"
+            params.append(_epoch(since))
+        return self._latency_percentiles(
+            f"""
+            SELECT CASE LOWER(urgency) WHEN 'low' THEN 'low' WHEN 'high' THEN 'high' ELSE 'medium' END AS grp,
+                   rescued_ts - mission_ts AS seconds
+            FROM rescue_missions
+            WHERE rescued_ts IS NOT NULL AND mission_ts IS NOT NULL {since_sql}
+              AND status NOT IN ('removed', 'cancelled')
+              AND {_sql_base_status("status")} = '{RescueStatus.RESCUED}'
+            """,
+            params,
+            ["low", "medium", "high", "all"]
+        )
+
+    def get_adoption_decision_times(self, since: Optional[date] = None) -> Dict[str, Dict[str, Any]]:
+        """Get request to decision time of approved and denied adoption requests.
+        
+        Args:
+            since: Only requests decided on or after this day (default: all time)
+            
+        Returns:
+            Dict of "approved", "denied" and "all" -> {"count", "errors", "p50", "p90", "p99"}
+            with percentiles in seconds (None when empty)
+        """
+        placeholders = ", ".join("?" for _ in app_config.APPROVED_ADOPTION_STATUSES)
+        params: List[Any] = list(app_config.APPROVED_ADOPTION_STATUSES)
+        since_sql = ""
+        if since is not None:
+            since_sql = "AND decided_ts >= ?"
+            params.append(_epoch(since))
+        return self._latency_percentiles(
+            f"""
+            SELECT grp, seconds FROM (
+                SELECT CASE WHEN {_sql_base_status("status")} IN ({placeholders}) THEN 'approved'
+                            WHEN {_sql_base_status("status")} = 'denied' THEN 'denied' END AS grp,
+                       decided_ts - request_ts AS seconds
+                FROM adoption_requests
+                WHERE decided_ts IS NOT NULL AND request_ts IS NOT NULL {since_sql}
+                  AND status != 'removed'
+            )
+            WHERE grp IS NOT NULL
+            """,
+            params,
+            ["approved", "denied", "all"]
+        )
+
+    def _latency_percentiles(
+        self,
+        durations_sql: str,
+        params: Sequence[Any],
+        groups: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Nearest-rank p50/p90/p99 of `durations_sql` rows per group.
+        
+        `durations_sql` selects (grp, seconds). Ranks come from ROW_NUMBER()
+        over each group ordered by duration, so only the chosen rows leave
+        SQLite. Negative durations are data errors (an end before its start):
+        they are left out of the percentiles, counted under "errors" and
+        logged. When "all" is in `groups`, every row is also counted under it.
+        """
+        overall = ""
+        if "all" in groups:
+            overall = "UNION ALL SELECT 'all', seconds FROM durations WHERE grp != 'all'"
+        picks = ", ".join(
+            f"MIN(CASE WHEN seconds >= 0 AND rn * 100 >= {percent} * n THEN seconds END) AS {name}"
+            for name, percent in _PERCENTILES
+        )
+        rows = self.db.fetch_all(
+            f"""
+            WITH durations AS ({durations_sql}),
+            grouped AS (
+                SELECT grp, seconds FROM durations {overall}
+            ),
+            ranked AS (
+                SELECT grp, seconds,
+                       ROW_NUMBER() OVER (PARTITION BY grp, seconds < 0 ORDER BY seconds) AS rn,
+                       COUNT(*) OVER (PARTITION BY grp, seconds < 0) AS n
+                FROM grouped
+            )
+            SELECT grp, SUM(seconds >= 0) AS count, SUM(seconds < 0) AS errors, {picks}
+            FROM ranked
+            GROUP BY grp
+            """,
+            params
+        )
+        found = {row["grp"]: row for row in rows}
+        errors = found["all"]["errors"] if "all" in found else sum(row["errors"] for row in found.values())
+        if errors:
+            print(f"[WARN] Analytics: {errors} negative duration(s) left out of latency percentiles")
+        return {
+            group: {
+                "count": found[group]["count"] if group in found else 0,
+                "errors": found[group]["errors"] if group in found else 0,
+                **{name: found[group][name] if group in found else None for name, _ in _PERCENTILES},
+            }
+            for group in groups
+        }
 
     def invalidate_cache(self) -> None:
         """Invalidate all cached analytics data.
@@ -1801,6 +2304,7 @@ class AnalyticsService:
         (e.g., new animal, new adoption request, etc.)
         """
         self._cache.clear()
+        _user_bundles.clear()
 
 
-__all__ = ["AnalyticsService"]
+__all__ = ["AnalyticsService", "AnalyticsSnapshot", "UserInsightBundle"]
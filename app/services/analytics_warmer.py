@@ -0,0 +1,227 @@
+"""Background warmer that recomputes analytics aggregates after data changes.
+
+Without it the first admin to open the dashboard or charts page after a write
+pays the whole aggregation inside ``build``. The warmer polls SQLite's
+``PRAGMA data_version`` (which changes whenever another connection commits),
+confirms the analytics tables actually changed with the same signature the
+snapshot cache is keyed by, waits for bursts of writes to settle and then
+rebuilds the snapshot on its own thread. The result is published to the query
+cache, so ``AnalyticsService.get_snapshot`` becomes a cache read. A failed
+check is retried; when the thread ends the snapshot is unpublished, and a
+published snapshot is never served once it is older than
+``ANALYTICS_WARMER_MAX_STALE_SECONDS``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from storage.database import Database
+from .analytics_service import AnalyticsService
+import app_config
+
+
+class AnalyticsWarmer:
+    """Keep the dashboard/chart aggregates of one database warm in the background."""
+
+    def __init__(
+        self,
+        db: Optional[Database | str] = None,
+        *,
+        debounce_seconds: Optional[float] = None,
+        max_delay_seconds: Optional[float] = None,
+        poll_interval: float = 0.25,
+        retry_seconds: float = 5.0,
+    ) -> None:
+        """Create a warmer (call `start()` to run it).
+
+        Args:
+            db: Database instance or path. Defaults to app_config.DB_PATH
+            debounce_seconds: Quiet period after the last write before recomputing
+            max_delay_seconds: Longest a burst of writes can postpone a recompute
+            poll_interval: Seconds between change checks
+            retry_seconds: Wait after a failed check before trying again
+        """
+        self.service = AnalyticsService(db)
+        self.debounce_seconds = (
+            app_config.ANALYTICS_WARMER_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        )
+        self.max_delay_seconds = (
+            app_config.ANALYTICS_WARMER_MAX_DELAY_SECONDS if max_delay_seconds is None else max_delay_seconds
+        )
+        self.poll_interval = poll_interval
+        self.retry_seconds = retry_seconds
+        # Results are also refreshed when the cache TTL would have expired, for
+        # aggregates that depend on the current time (trends, "last 30 days")
+        self.max_age_seconds = float(self.service._cache_ttl)
+
+        self._aggregates: Dict[str, Callable[[], Any]] = {
+            "snapshot": lambda: self.service.refresh_snapshot(publish=True),
+        }
+        self._state: Dict[str, Dict[str, Any]] = {
+            name: {"computed_at": None, "attempted_at": None, "duration": None, "error": None} for name in self._aggregates
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature: Any = None
+        # Nothing has been computed yet: the first warm-up is due immediately
+        self._first_change: Optional[float] = time.time()
+        self._last_change = 0.0
+
+    def start(self) -> None:
+        """Start the background thread (no-op if it is already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the thread and stop serving its published snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.service.unpublish_snapshot()
+
+    def notify(self) -> None:
+        """Record a write now; the aggregates are recomputed once writes settle."""
+        now = time.time()
+        with self._lock:
+            if self._first_change is None:
+                self._first_change = now
+            self._last_change = now
+
+    def warm_now(self) -> None:
+        """Recompute every aggregate on the calling thread."""
+        with self._lock:
+            self._first_change = None
+        for name, refresh in self._aggregates.items():
+            started = time.perf_counter()
+            try:
+                refresh()
+                error = None
+            except Exception as e:
+                error = str(e)
+                print(f"[WARN] Analytics warmer: {name} failed: {e}")
+            with self._lock:
+                state = self._state[name]
+                state["attempted_at"] = time.time()
+                state["duration"] = time.perf_counter() - started
+                state["error"] = error
+                if error is None:
+                    state["computed_at"] = time.time()
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """How stale each aggregate is.
+
+        Returns:
+            Dict of aggregate name -> {
+                "computed_at": UTC datetime of the last successful recompute (or None),
+                "age_seconds": seconds since then (or None),
+                "pending": True if writes happened that it does not reflect yet,
+                "stale_seconds": seconds since the first such write (0.0 when fresh),
+                "last_duration_seconds": how long the last recompute took,
+                "last_error": message of the last failure, or None,
+            }
+        """
+        now = time.time()
+        with self._lock:
+            first_change = self._first_change
+            report = {}
+            for name, state in self._state.items():
+                computed_at = state["computed_at"]
+                report[name] = {
+                    "computed_at": datetime.utcfromtimestamp(computed_at) if computed_at else None,
+                    "age_seconds": now - computed_at if computed_at else None,
+                    "pending": first_change is not None,
+                    "stale_seconds": now - first_change if first_change is not None else 0.0,
+                    "last_duration_seconds": state["duration"],
+                    "last_error": state["error"],
+                }
+        return report
+
+    def _due(self) -> bool:
+        """True when pending writes have settled (or waited too long) or the results are too old."""
+        now = time.time()
+        with self._lock:
+            if self._first_change is not None:
+                return (now - self._last_change >= self.debounce_seconds
+                        or now - self._first_change >= self.max_delay_seconds)
+            # Failed attempts also wait max_age before retrying
+            attempted = [s["attempted_at"] for s in self._state.values()]
+            return any(a is None or now - a >= self.max_age_seconds for a in attempted)
+
+    def _check_for_changes(self, conn: Any, version: Optional[int]) -> int:
+        """Notify when the analytics tables changed since the last check; returns the new data_version."""
+        current = conn.execute("PRAGMA data_version").fetchone()[0]
+        if current != version:
+            signature = self.service._data_signature()
+            if self._signature is not None and signature != self._signature:
+                self.notify()
+            self._signature = signature
+        return current
+
+    def _run(self) -> None:
+        conn = None
+        version = None
+        try:
+            while not self._stop.is_set():
+                wait = self.poll_interval
+                try:
+                    if conn is None:
+                        conn = self.service.db._get_connection()
+                    version = self._check_for_changes(conn, version)
+                    if self._due():
+                        self.warm_now()
+                except Exception as e:
+                    print(f"[WARN] Analytics warmer: check failed, retrying in {self.retry_seconds:g} s: {e}")
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    # Writes missed meanwhile are found by the signature after reconnecting
+                    version = None
+                    wait = self.retry_seconds
+                self._stop.wait(wait)
+        finally:
+            if conn is not None:
+                conn.close()
+            self.service.close()
+            # Never leave a snapshot published that nothing keeps up to date
+            self.service.unpublish_snapshot()
+
+
+_warmer: Optional[AnalyticsWarmer] = None
+_warmer_lock = threading.Lock()
+
+
+def start_analytics_warmer(db_path: Optional[str] = None) -> Optional[AnalyticsWarmer]:
+    """Start the analytics warmer in a daemon thread, once per process.
+
+    Later calls are no-ops, so this is safe to call from every session start.
+
+    Args:
+        db_path: Path to database file. Defaults to app_config.DB_PATH
+
+    Returns:
+        The started warmer, or None if it was already started
+    """
+    global _warmer
+
+    with _warmer_lock:
+        if _warmer is not None:
+            return None
+        _warmer = AnalyticsWarmer(db_path)
+        _warmer.start()
+        return _warmer
+
+
+def get_analytics_warmer() -> Optional[AnalyticsWarmer]:
+    """The warmer started by `start_analytics_warmer`, if any."""
+    return _warmer
+
+
+__all__ = ["AnalyticsWarmer", "start_analytics_warmer", "get_analytics_warmer"]
@@ -44,13 +44,19 @@ class AnimalService:
         """Insert a new animal and return its id.
 
         Note: `type` maps to the `species` column in the DB; `health_status`
-        maps to `status`. `photo` should be a filename from FileStore.
+        maps to `status`. `photo` should be a filename from FileStore; inline
+        base64 data is extracted into FileStore before the insert.
         """
+        photo = self.photo_service.ensure_file_reference(photo, name or "animal")
+        placeholder = self.photo_service.create_placeholder(photo)
         sql = (
-            "INSERT INTO animals (name, species, breed, age, status, photo) "
-            "VALUES (?, ?, ?, ?, ?, ?)"
+            "INSERT INTO animals (name, species, breed, age, status, photo, photo_placeholder, breed_key, species_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
         )
-        last_id = self.db.execute(sql, (name, type, breed, age, health_status, photo))
+        last_id = self.db.execute(sql, (
+            name, type, breed, age, health_status, photo, placeholder,
+            app_config.normalize_breed(breed), app_config.normalize_species(type),
+        ))
         return last_id
 
     def get_all_animals(self) -> List[Dict[str, Any]]:
@@ -112,6 +118,19 @@ class AnimalService:
         if not set_clauses:
             return False
 
+        # Keep the analytics grouping keys in step with the raw values
+        if "breed" in fields:
+            set_clauses.append("breed_key = ?")
+            params.append(app_config.normalize_breed(fields["breed"]))
+        if "type" in fields:
+            set_clauses.append("species_key = ?")
+            params.append(app_config.normalize_species(fields["type"]))
+
+        if "photo" in fields:
+            # Keep the inline preview in step with the photo it was made from
+            set_clauses.append("photo_placeholder = ?")
+            params.append(self.photo_service.create_placeholder(fields["photo"]))
+
         params.append(animal_id)
         sql = f"UPDATE animals SET {', '.join(set_clauses)} WHERE id = ?"
         self.db.execute(sql, params)
@@ -142,21 +161,25 @@ class AnimalService:
         if not new_photo:
             return False
         
-        existing = self.db.fetch_one("SELECT id, photo FROM animals WHERE id = ?", (animal_id,))
+        existing = self.db.fetch_one("SELECT id, name, photo FROM animals WHERE id = ?", (animal_id,))
         if not existing:
             return False
         
+        new_photo = self.photo_service.ensure_file_reference(new_photo, existing.get("name") or "animal")
+        
         # Delete old photo file if it exists and is a filename (not base64)
         old_photo = existing.get('photo')
         if old_photo and not self.photo_service.is_base64(old_photo):
+            self.photo_service.invalidate(old_photo)
             try:
                 self.file_store.delete_file(old_photo)
                 print(f"[INFO] Deleted old photo file: {old_photo}")
             except FileStoreError as e:
                 print(f"[WARN] Could not delete old photo file: {e}")
         
-        sql = "UPDATE animals SET photo = ? WHERE id = ?"
-        self.db.execute(sql, (new_photo, animal_id))
+        placeholder = self.photo_service.create_placeholder(new_photo)
+        sql = "UPDATE animals SET photo = ?, photo_placeholder = ? WHERE id = ?"
+        self.db.execute(sql, (new_photo, placeholder, animal_id))
         return True
 
     def get_adoption_request_count(self, animal_id: int) -> int:
@@ -360,6 +383,7 @@ class AnimalService:
         photo_deleted = False
         photo = existing.get('photo')
         if photo and not self.photo_service.is_base64(photo):
+            self.photo_service.invalidate(photo)
             try:
                 self.file_store.delete_file(photo)
                 photo_deleted = True
@@ -51,7 +51,7 @@ def _download_and_save_profile_picture(picture_url: str, user_email: str) -> Opt
     
     try:
         import urllib.request
-        from storage.file_store import FileStore
+        from storage.file_store import get_file_store
         
         # Download the image
         req = urllib.request.Request(
@@ -73,7 +73,7 @@ def _download_and_save_profile_picture(picture_url: str, user_email: str) -> Opt
             else:
                 ext = "jpg"
         
-        file_store = FileStore()
+        file_store = get_file_store()
         username = user_email.split("@")[0] if user_email else "user"
         filename = file_store.save_bytes(
             data=image_data,
@@ -573,8 +573,8 @@ class AuthService:
             if existing:
                 existing_picture = existing.get("profile_picture")
                 if existing_picture:
-                    from storage.file_store import FileStore
-                    file_store = FileStore()
+                    from storage.file_store import get_file_store
+                    file_store = get_file_store()
                     if not file_store.file_exists(existing_picture):
                         # File was deleted, need to re-download
                         should_download = True
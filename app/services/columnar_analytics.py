@@ -0,0 +1,308 @@
+"""Columnar (NumPy) analytics engine for large histories.
+
+``ColumnarAnalytics.load`` reads the columns the dashboards need from each
+table once, dictionary-encodes the text columns (status, species, breed,
+urgency) into integer codes and turns dates into ``datetime64[D]`` arrays.
+Breeds and species are read from their stored normalized keys; status
+normalization then runs once per distinct value instead of once per row,
+and every count is a vectorized ``bincount`` over the codes.
+
+Results match the row-by-row methods of AnalyticsService, including the
+order of ties (first occurrence in the same row order). NumPy is optional;
+check ``NUMPY_AVAILABLE`` before loading.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from storage.database import Database
+import app_config
+from app_config import RescueStatus, AdoptionStatus, AnimalStatus, normalize_species
+
+
+class _Column:
+    """A dictionary-encoded text column: integer codes plus their distinct values."""
+
+    __slots__ = ("codes", "labels")
+
+    def __init__(self, values: Sequence[Any]) -> None:
+        lookup: Dict[Any, int] = {}
+        self.codes = np.fromiter(
+            (lookup.setdefault(v, len(lookup)) for v in values), dtype=np.int32, count=len(values)
+        )
+        self.labels: List[Any] = list(lookup)
+
+    def pair(self) -> Tuple[Any, List[Any]]:
+        """(row codes, labels) of values that are already normalized."""
+        return self.codes, self.labels
+
+    def map(self, fn: Callable[[Any], Any]) -> Tuple[Any, List[Any]]:
+        """Apply `fn` to each distinct value and return (row codes, new labels).
+
+        Values that map to the same result share a code.
+        """
+        lookup: Dict[Any, int] = {}
+        remap = np.array([lookup.setdefault(fn(v), len(lookup)) for v in self.labels], dtype=np.int32)
+        codes = remap[self.codes] if len(self.labels) else self.codes
+        return codes, list(lookup)
+
+
+def _dates(values: Sequence[Optional[int]]) -> Any:
+    """Epoch seconds (or None) as datetime64[D] days, None becoming NaT."""
+    seconds = np.array(values, dtype=np.float64)  # None -> NaN
+    days = np.full(len(seconds), np.datetime64("NaT"), dtype="datetime64[D]")
+    known = ~np.isnan(seconds)
+    days[known] = (seconds[known] // 86400).astype(np.int64).astype("datetime64[D]")
+    return days
+
+
+def _counts(codes: Any, labels: List[Any], mask: Any = None) -> Dict[Any, int]:
+    """Rows per label, in order of first occurrence (like a dict filled row by row)."""
+    if mask is not None:
+        codes = codes[mask]
+    if not len(codes):
+        return {}
+    counts = np.bincount(codes, minlength=len(labels))
+    present, first = np.unique(codes, return_index=True)
+    order = present[np.argsort(first, kind="stable")]
+    return {labels[c]: int(counts[c]) for c in order}
+
+
+def _ranking(codes: Any, labels: List[Any], mask: Any = None, limit: Optional[int] = None) -> List[Tuple[Any, int]]:
+    """(label, count) sorted by count descending; ties keep first-occurrence order."""
+    ranked = sorted(_counts(codes, labels, mask).items(), key=lambda x: x[1], reverse=True)
+    return ranked[:limit] if limit is not None else ranked
+
+
+class ColumnarAnalytics:
+    """Column arrays of the analytics tables and vectorized aggregates over them."""
+
+    def __init__(self, columns: Dict[str, Dict[str, Any]]) -> None:
+        self.animals = columns["animals"]
+        self.missions = columns["missions"]
+        self.requests = columns["requests"]
+
+        # Base statuses, computed once per distinct raw value
+        self._mission_base, self._mission_base_labels = self.missions["status"].map(
+            lambda s: RescueStatus.get_base_status((s or "").lower())
+        )
+        self._request_base, self._request_base_labels = self.requests["status"].map(
+            lambda s: AdoptionStatus.get_base_status((s or "").lower())
+        )
+
+    @classmethod
+    def load(cls, db: Database) -> "ColumnarAnalytics":
+        """Read the analytics columns of every table once.
+
+        Rows come in the same order as the AnimalService/RescueService/
+        AdoptionService queries so first-occurrence ties match.
+
+        Raises:
+            RuntimeError: If NumPy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for the columnar analytics engine")
+
+        adoptable = ", ".join(f"'{s}'" for s in app_config.ADOPTABLE_STATUSES)
+        animals = cls._fetch_columns(db, f"""
+            SELECT species_key, status, breed_key,
+                   status IS NOT NULL AND status != 'removed' AS counted,
+                   COALESCE(LOWER(status) IN ({adoptable}), 0) AS adoptable,
+                   intake_ts
+            FROM animals ORDER BY id
+        """, 6)
+        missions = cls._fetch_columns(db, """
+            SELECT status, breed_key, urgency,
+                   mission_ts, COALESCE(rescued_ts, mission_ts), animal_type
+            FROM rescue_missions
+            WHERE status NOT IN ('removed', 'cancelled')
+            ORDER BY mission_date DESC
+        """, 6)
+        requests = cls._fetch_columns(db, """
+            SELECT ar.status, COALESCE(a.breed_key, 'Not Specified'), COALESCE(a.species, ar.animal_species),
+                   ar.request_ts
+            FROM adoption_requests ar
+            LEFT JOIN animals a ON ar.animal_id = a.id
+            WHERE ar.status NOT IN ('removed', 'cancelled')
+            ORDER BY ar.request_date DESC
+        """, 4)
+
+        return cls({
+            "animals": {
+                "species": _Column(animals[0]),
+                "status": _Column(animals[1]),
+                "breed": _Column(animals[2]),
+                "counted": np.array(animals[3], dtype=bool),
+                "adoptable": np.array(animals[4], dtype=bool),
+                "intake_day": _dates(animals[5]),
+            },
+            "missions": {
+                "status": _Column(missions[0]),
+                "breed": _Column(missions[1]),
+                "urgency": _Column(missions[2]),
+                "reported_day": _dates(missions[3]),
+                "rescued_day": _dates(missions[4]),
+                "species": _Column(missions[5]),
+            },
+            "requests": {
+                "status": _Column(requests[0]),
+                "breed": _Column(requests[1]),
+                "species": _Column(requests[2]),
+                "day": _dates(requests[3]),
+            },
+        })
+
+    @staticmethod
+    def _fetch_columns(db: Database, sql: str, width: int) -> List[Tuple[Any, ...]]:
+        """Run `sql` and return its result transposed into `width` column tuples."""
+        conn = db._get_connection()
+        try:
+            rows = conn.execute(sql).fetchall()
+        finally:
+            conn.close()
+        if not rows:
+            return [()] * width
+        return list(zip(*rows))
+
+    # ------------------------------------------------------------------
+    # Status masks
+    # ------------------------------------------------------------------
+
+    def _mission_status_is(self, *statuses: str) -> Any:
+        hits = np.array([label in statuses for label in self._mission_base_labels], dtype=bool)
+        return hits[self._mission_base] if len(hits) else np.zeros(0, dtype=bool)
+
+    def _request_status_is(self, *statuses: str) -> Any:
+        hits = np.array([label in statuses for label in self._request_base_labels], dtype=bool)
+        return hits[self._request_base] if len(hits) else np.zeros(0, dtype=bool)
+
+    # ------------------------------------------------------------------
+    # Distributions and rankings
+    # ------------------------------------------------------------------
+
+    def animal_statistics(self) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """Species distribution and health status counts of non-removed animals."""
+        counted = self.animals["counted"]
+        species, species_labels = self.animals["species"].pair()
+        type_dist = _counts(species, species_labels, counted)
+
+        def bucket(status: Optional[str]) -> str:
+            base = AnimalStatus.get_base_status((status or "unknown").lower())
+            if base in ("healthy", "recovering", "injured"):
+                return base
+            if base in ("adopted", "processing", "unknown", ""):
+                return ""
+            return "injured"
+
+        buckets, bucket_labels = self.animals["status"].map(bucket)
+        found = _counts(buckets, bucket_labels, counted)
+        status_counts = {key: found.get(key, 0) for key in ("healthy", "recovering", "injured")}
+        return type_dist, status_counts
+
+    def urgency_distribution(self) -> Dict[str, int]:
+        def bucket(urgency: Optional[str]) -> str:
+            urgency = (urgency or "medium").lower()
+            return urgency if urgency in ("low", "medium", "high") else "medium"
+
+        codes, labels = self.missions["urgency"].map(bucket)
+        found = _counts(codes, labels)
+        return {key: found.get(key, 0) for key in ("low", "medium", "high")}
+
+    def high_urgency_by_status(self) -> Dict[str, int]:
+        """High-urgency missions per base status."""
+        codes, labels = self.missions["urgency"].map(lambda u: (u or "").lower() == "high")
+        high = np.array(labels, dtype=bool)[codes] if len(labels) else np.zeros(0, dtype=bool)
+        return _counts(self._mission_base, self._mission_base_labels, high)
+
+    def species_adoption_ranking(self, limit: int = 5) -> List[Tuple[str, int]]:
+        codes, labels = self.requests["species"].map(normalize_species)
+        return _ranking(codes, labels, self._request_status_is("approved"), limit)
+
+    def breed_distribution(self) -> List[Tuple[str, int]]:
+        """Breeds of every animal regardless of status."""
+        codes, labels = self.animals["breed"].pair()
+        return _ranking(codes, labels)
+
+    def top_breeds(self, kind: str, limit: int = 3) -> List[Tuple[str, int]]:
+        """Most frequent breeds of non-cancelled adoption requests or rescue missions."""
+        if kind == "adoption":
+            codes, labels = self.requests["breed"].pair()
+            mask = ~self._request_status_is("cancelled")
+        else:
+            codes, labels = self.missions["breed"].pair()
+            mask = ~self._mission_status_is(RescueStatus.CANCELLED)
+        return _ranking(codes, labels, mask, limit)
+
+    def breed_species(self, kind: str, breed: str) -> Optional[str]:
+        """Species of the newest adoption request or rescue mission of `breed`, if any."""
+        rows = self.requests if kind == "adoption" else self.missions
+        codes, labels = rows["breed"].pair()
+        if breed not in labels:
+            return None
+        first = int(np.argmax(codes == labels.index(breed)))
+        species = rows["species"]
+        return (species.labels[species.codes[first]] or "Unknown").strip().capitalize()
+
+    def adoptable_breed_distribution(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """"Breed (Species)" counts of adoptable animals."""
+        mask = self.animals["adoptable"]
+        breeds, breed_labels = self.animals["breed"].pair()
+        species, species_labels = self.animals["species"].pair()
+        width = max(len(species_labels), 1)
+        pairs = breeds[mask].astype(np.int64) * width + species[mask]
+        present = np.unique(pairs)
+        labels = [f"{breed_labels[p // width]} ({species_labels[p % width]})" for p in present.tolist()]
+        return _ranking(np.searchsorted(present, pairs), labels, limit=limit)
+
+    # ------------------------------------------------------------------
+    # Trends and period comparisons
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _per_day(days: Any, mask: Any, start: date, end: date) -> List[int]:
+        """Rows per day in the inclusive range [start, end]."""
+        first = np.datetime64(start, "D")
+        span = (np.datetime64(end, "D") - first).astype(int) + 1
+        offsets = (days[mask] - first).astype(np.int64)
+        valid = ~np.isnat(days[mask])
+        offsets = offsets[valid & (offsets >= 0) & (offsets < span)]
+        return np.bincount(offsets, minlength=span).tolist()
+
+    def daily_trend(self, start: date, end: date) -> Tuple[List[int], List[int]]:
+        """Rescues (by rescue date) and approved adoptions (by request date) per day."""
+        rescued = self._per_day(
+            self.missions["rescued_day"], self._mission_status_is(RescueStatus.RESCUED), start, end
+        )
+        adopted = self._per_day(
+            self.requests["day"], self._request_status_is(*app_config.APPROVED_ADOPTION_STATUSES), start, end
+        )
+        return rescued, adopted
+
+    def period_totals(self, start: date, end: date) -> Dict[str, int]:
+        """Counts over an inclusive date range, keyed like DailyStatsService.get_totals."""
+        first, last = np.datetime64(start, "D"), np.datetime64(end, "D")
+
+        def within(days: Any, mask: Any) -> int:
+            days = days[mask]
+            return int(((days >= first) & (days <= last)).sum())
+
+        return {
+            "intakes": within(self.animals["intake_day"], self.animals["counted"]),
+            "rescues": within(self.missions["rescued_day"], self._mission_status_is(RescueStatus.RESCUED)),
+            "rescues_reported": within(self.missions["reported_day"], self._mission_status_is(RescueStatus.RESCUED)),
+            "failed_rescues": within(self.missions["reported_day"], self._mission_status_is(RescueStatus.FAILED)),
+            "adoptions": within(self.requests["day"], self._request_status_is(*app_config.APPROVED_ADOPTION_STATUSES)),
+            "denials": within(self.requests["day"], self._request_status_is("denied")),
+            "pending_requests": within(self.requests["day"], self._request_status_is("pending")),
+        }
+
+
+__all__ = ["ColumnarAnalytics", "NUMPY_AVAILABLE"]
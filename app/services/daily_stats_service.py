@@ -0,0 +1,493 @@
+"""Daily rollup of intake, rescue and adoption counts.
+
+``daily_stats`` holds one row per calendar day with the number of animal
+intakes, rescues, failed rescues, adoption approvals, denials and pending
+requests dated to that day. ``daily_breed_stats`` holds the same for
+breeds (per day, plus an all-time bucket under day ``''``). Dashboards
+read a handful of these rows instead of recomputing history from every
+mission and request.
+
+The rollups are kept current by SQLite triggers generated from the metric
+definitions below, so every status transition updates them inside the
+transaction that changes the row, whichever service (or import) made the
+change. ``rebuild`` recomputes everything from the raw tables, e.g. after
+restoring a backup:
+
+    python -m services.daily_stats_service [--db PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from storage.database import Database
+import app_config
+
+
+def _sql_day(column: str) -> str:
+    """SQL expression for the calendar day ('YYYY-MM-DD') of a stored timestamp.
+
+    Timestamps are stored as 'YYYY-MM-DD HH:MM:SS[.ffffff]' or ISO text with a
+    'T'; any UTC offset is ignored, like parse_datetime. Unparseable values
+    give NULL.
+    """
+    return f"date(substr({column}, 1, 19))"
+
+
+def _sql_base_status(column: str) -> str:
+    """SQL expression matching RescueStatus/AdoptionStatus.get_base_status."""
+    return f"REPLACE(LOWER(TRIM({column})), '|archived', '')"
+
+
+def _sql_breed(column: str) -> str:
+    """SQL expression matching app_config.normalize_breed."""
+    return (
+        f"CASE WHEN {column} IS NULL OR TRIM({column}) = '' "
+        f"OR LOWER(TRIM({column})) IN ('unknown', 'n/a', 'not specified') THEN 'Not Specified' "
+        f"WHEN LOWER(TRIM({column})) = 'mixed breed' THEN 'Mixed Breed' "
+        f"ELSE UPPER(SUBSTR(TRIM({column}), 1, 1)) || LOWER(SUBSTR(TRIM({column}), 2)) END"
+    )
+
+
+GRANULARITIES = ("day", "week", "month", "year")
+
+
+def _sql_bucket(column: str, granularity: str) -> str:
+    """SQL expression for the first day of the bucket holding a 'YYYY-MM-DD' column.
+
+    Weeks start on Monday.
+    """
+    if granularity == "day":
+        return column
+    if granularity == "week":
+        return f"date({column}, '-' || ((CAST(strftime('%w', {column}) AS INTEGER) + 6) % 7) || ' days')"
+    if granularity == "month":
+        return f"substr({column}, 1, 7) || '-01'"
+    if granularity == "year":
+        return f"substr({column}, 1, 4) || '-01-01'"
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """First day of the bucket holding `day` (Python twin of _sql_bucket)."""
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "year":
+        return day.replace(month=1, day=1)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+def bucket_starts(start: date, end: date, granularity: str) -> List[date]:
+    """Start days of every bucket overlapping the inclusive range [start, end]."""
+    starts = []
+    current = bucket_start(start, granularity)
+    while current <= end:
+        starts.append(current)
+        if granularity == "day":
+            current += timedelta(days=1)
+        elif granularity == "week":
+            current += timedelta(days=7)
+        elif granularity == "month":
+            current = (current + timedelta(days=32)).replace(day=1)
+        else:
+            current = current.replace(year=current.year + 1)
+    return starts
+
+
+_COUNTED_MISSION = "{r}.status NOT IN ('removed', 'cancelled')"
+_COUNTED_REQUEST = "{r}.status NOT IN ('removed', 'cancelled')"
+_APPROVED = ", ".join(f"'{s}'" for s in app_config.APPROVED_ADOPTION_STATUSES)
+
+# Metric column -> (table, date expression, condition). "{r}" is the row alias.
+DAILY_METRICS: Dict[str, Tuple[str, str, str]] = {
+    "intakes": ("animals", "{r}.intake_date", "{r}.status != 'removed'"),
+    # Rescued missions, dated by rescue time (falling back to the report date)
+    "rescues": (
+        "rescue_missions",
+        "COALESCE(NULLIF({r}.rescued_at, ''), {r}.mission_date)",
+        f"{_COUNTED_MISSION} AND {_sql_base_status('{r}.status')} = 'rescued'",
+    ),
+    # Rescued missions, dated by report time (month-over-month comparisons)
+    "rescues_reported": (
+        "rescue_missions",
+        "{r}.mission_date",
+        f"{_COUNTED_MISSION} AND {_sql_base_status('{r}.status')} = 'rescued'",
+    ),
+    "failed_rescues": (
+        "rescue_missions",
+        "{r}.mission_date",
+        f"{_COUNTED_MISSION} AND {_sql_base_status('{r}.status')} = 'failed'",
+    ),
+    "adoptions": (
+        "adoption_requests",
+        "{r}.request_date",
+        f"{_COUNTED_REQUEST} AND {_sql_base_status('{r}.status')} IN ({_APPROVED})",
+    ),
+    "denials": (
+        "adoption_requests",
+        "{r}.request_date",
+        f"{_COUNTED_REQUEST} AND {_sql_base_status('{r}.status')} = 'denied'",
+    ),
+    "pending_requests": (
+        "adoption_requests",
+        "{r}.request_date",
+        f"{_COUNTED_REQUEST} AND {_sql_base_status('{r}.status')} = 'pending'",
+    ),
+}
+
+# Breed trend kind -> (table, date expression, condition, breed expression)
+BREED_METRICS: Dict[str, Tuple[str, str, str, str]] = {
+    "adoption": (
+        "adoption_requests",
+        "{r}.request_date",
+        f"{_COUNTED_REQUEST} AND {_sql_base_status('{r}.status')} != 'cancelled'",
+        "(SELECT breed FROM animals WHERE id = {r}.animal_id)",
+    ),
+    "rescue": (
+        "rescue_missions",
+        "{r}.mission_date",
+        f"{_COUNTED_MISSION} AND {_sql_base_status('{r}.status')} != 'cancelled'",
+        "{r}.breed",
+    ),
+}
+
+# Columns whose updates can move a row between buckets
+_WATCHED_COLUMNS = {
+    "animals": "status, intake_date",
+    "rescue_missions": "status, mission_date, rescued_at, breed",
+    "adoption_requests": "status, request_date, animal_id",
+}
+
+# Bump when the trigger bodies change; stale triggers are replaced by a rebuild
+_TRIGGER_VERSION = 2
+_TRIGGER_PREFIX = "daily_stats_"
+
+
+class DailyStatsService:
+    """Reads and rebuilds the daily rollup tables."""
+
+    def __init__(self, db: Optional[Database | str] = None, *, ensure_tables: bool = True) -> None:
+        """Initialize the service.
+
+        Args:
+            db: Database instance or path to sqlite file
+            ensure_tables: Whether to create the rollup tables and triggers
+                (backfilling them the first time)
+        """
+        if isinstance(db, Database):
+            self.db = db
+        else:
+            self.db = Database(db if isinstance(db, str) else app_config.DB_PATH)
+
+        if ensure_tables:
+            self._ensure_tables()
+
+    def _ensure_tables(self) -> None:
+        """Create the rollup tables, and rebuild them if the triggers are missing or stale."""
+        columns = ",\n".join(f"                {m} INTEGER NOT NULL DEFAULT 0" for m in DAILY_METRICS)
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                day TEXT PRIMARY KEY,
+{columns}
+            )
+        """)
+        self.db.ensure_columns_exist(
+            "daily_stats", {m: "INTEGER NOT NULL DEFAULT 0" for m in DAILY_METRICS}
+        )
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS daily_breed_stats (
+                kind TEXT NOT NULL,
+                day TEXT NOT NULL,
+                breed TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, day, breed)
+            )
+        """)
+
+        if not self.db.fetch_one(
+            "SELECT 1 AS found FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+            (f"{_TRIGGER_PREFIX}animals_insert_v{_TRIGGER_VERSION}",)
+        ):
+            self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Trigger generation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _contribution_sql(table: str, row: str, sign: int) -> List[str]:
+        """Statements adding (sign=1) or removing (sign=-1) one row's contributions."""
+        statements = []
+        for metric, (metric_table, date_expr, condition) in DAILY_METRICS.items():
+            if metric_table != table:
+                continue
+            day = _sql_day(date_expr.format(r=row))
+            statements.append(
+                f"INSERT INTO daily_stats (day, {metric}) SELECT {day}, {sign} "
+                f"WHERE {day} IS NOT NULL AND ({condition.format(r=row)}) "
+                f"ON CONFLICT(day) DO UPDATE SET {metric} = {metric} + excluded.{metric};"
+            )
+
+        for kind, (metric_table, date_expr, condition, breed_expr) in BREED_METRICS.items():
+            if metric_table != table:
+                continue
+            day = _sql_day(date_expr.format(r=row))
+            breed = _sql_breed(breed_expr.format(r=row))
+            # Every row counts toward the all-time bucket (''), dated rows toward their day too
+            statements.append(
+                f"INSERT INTO daily_breed_stats (kind, day, breed, count) "
+                f"SELECT '{kind}', d.day, {breed}, {sign} FROM (SELECT '' AS day UNION ALL SELECT {day}) d "
+                f"WHERE d.day IS NOT NULL AND ({condition.format(r=row)}) "
+                f"ON CONFLICT(kind, day, breed) DO UPDATE SET count = count + excluded.count;"
+            )
+        return statements
+
+    @staticmethod
+    def _adoption_breed_moves(animal_id: str, old_breed: str, new_breed: str) -> List[str]:
+        """Statements moving the adoption breed counts of one animal's requests to another breed."""
+        table, date_expr, condition, _ = BREED_METRICS["adoption"]
+        day = _sql_day(date_expr.format(r="r"))
+        moves = []
+        for column, sign in ((old_breed, "-"), (new_breed, "")):
+            for day_key in ("''", day):
+                moves.append(
+                    f"INSERT INTO daily_breed_stats (kind, day, breed, count) "
+                    f"SELECT 'adoption', {day_key}, {_sql_breed(column)}, {sign}COUNT(*) FROM {table} r "
+                    f"WHERE r.animal_id = {animal_id} AND {day_key} IS NOT NULL AND ({condition.format(r='r')}) "
+                    f"GROUP BY 2 "
+                    f"ON CONFLICT(kind, day, breed) DO UPDATE SET count = count + excluded.count;"
+                )
+        return moves
+
+    @classmethod
+    def _trigger_sql(cls) -> List[str]:
+        """CREATE TRIGGER statements for every watched table."""
+        version = f"_v{_TRIGGER_VERSION}"
+        triggers = []
+        for table, columns in _WATCHED_COLUMNS.items():
+            name = f"{_TRIGGER_PREFIX}{table}"
+            triggers.append(
+                f"CREATE TRIGGER {name}_insert{version} AFTER INSERT ON {table} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "NEW", 1)) + "\nEND"
+            )
+            triggers.append(
+                f"CREATE TRIGGER {name}_delete{version} AFTER DELETE ON {table} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "OLD", -1)) + "\nEND"
+            )
+            triggers.append(
+                f"CREATE TRIGGER {name}_update{version} AFTER UPDATE OF {columns} ON {table} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "OLD", -1) + cls._contribution_sql(table, "NEW", 1))
+                + "\nEND"
+            )
+
+        # Adoption breed comes from the animal, so re-bucket its requests when the breed changes
+        triggers.append(
+            f"CREATE TRIGGER {_TRIGGER_PREFIX}animals_breed{version} AFTER UPDATE OF breed ON animals "
+            f"WHEN ({_sql_breed('OLD.breed')}) IS NOT ({_sql_breed('NEW.breed')}) BEGIN\n"
+            + "\n".join(cls._adoption_breed_moves("NEW.id", "OLD.breed", "NEW.breed")) + "\nEND"
+        )
+        # ... and when the animal is deleted. Its requests lose the link (ON DELETE SET NULL)
+        # only after the row is gone, when their old breed can no longer be looked up.
+        triggers.append(
+            f"CREATE TRIGGER {_TRIGGER_PREFIX}animals_remove{version} BEFORE DELETE ON animals "
+            f"WHEN ({_sql_breed('OLD.breed')}) IS NOT ({_sql_breed('NULL')}) BEGIN\n"
+            + "\n".join(cls._adoption_breed_moves("OLD.id", "OLD.breed", "NULL")) + "\nEND"
+        )
+        return triggers
+
+    # ------------------------------------------------------------------
+    # Rebuild
+    # ------------------------------------------------------------------
+
+    def rebuild(self) -> int:
+        """Recompute both rollup tables from the raw rows and (re)install the triggers.
+
+        Runs in one transaction, so readers see either the old or the new rollup.
+
+        Returns:
+            Number of daily_stats rows written
+        """
+        conn = self.db._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                (f"{_TRIGGER_PREFIX}%",)
+            ).fetchall():
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            for trigger in self._trigger_sql():
+                conn.execute(trigger)
+
+            conn.execute("DELETE FROM daily_stats")
+            conn.execute("DELETE FROM daily_breed_stats")
+
+            for metric, (table, date_expr, condition) in DAILY_METRICS.items():
+                day = _sql_day(date_expr.format(r="r"))
+                conn.execute(
+                    f"INSERT INTO daily_stats (day, {metric}) "
+                    f"SELECT {day} AS d, COUNT(*) FROM {table} r "
+                    f"WHERE {day} IS NOT NULL AND ({condition.format(r='r')}) GROUP BY d "
+                    f"ON CONFLICT(day) DO UPDATE SET {metric} = excluded.{metric}"
+                )
+
+            for kind, (table, date_expr, condition, breed_expr) in BREED_METRICS.items():
+                breed = _sql_breed(breed_expr.format(r="r"))
+                for day in ("''", _sql_day(date_expr.format(r="r"))):
+                    conn.execute(
+                        f"INSERT INTO daily_breed_stats (kind, day, breed, count) "
+                        f"SELECT '{kind}', {day} AS d, {breed} AS b, COUNT(*) FROM {table} r "
+                        f"WHERE {day} IS NOT NULL AND ({condition.format(r='r')}) GROUP BY d, b"
+                    )
+
+            conn.commit()
+            row = conn.execute("SELECT COUNT(*) FROM daily_stats").fetchone()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        print(f"[INFO] Daily stats: rebuilt {row[0]} day(s)")
+        return row[0]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_days(self, start_date: str, end_date: str) -> Dict[str, Dict[str, int]]:
+        """Get the rollup rows of an inclusive date range.
+
+        Args:
+            start_date: First day, 'YYYY-MM-DD'
+            end_date: Last day, 'YYYY-MM-DD'
+
+        Returns:
+            Dictionary of day -> metric counts (days without activity are omitted)
+        """
+        rows = self.db.fetch_all(
+            "SELECT * FROM daily_stats WHERE day BETWEEN ? AND ? ORDER BY day",
+            (start_date, end_date)
+        )
+        return {row.pop("day"): row for row in rows}
+
+    def get_totals(self, start_date: str, end_date: str) -> Dict[str, int]:
+        """Sum every metric over an inclusive date range.
+
+        Args:
+            start_date: First day, 'YYYY-MM-DD'
+            end_date: Last day, 'YYYY-MM-DD'
+
+        Returns:
+            Dictionary of metric -> total (0 when there is no activity)
+        """
+        sums = ", ".join(f"COALESCE(SUM({m}), 0) AS {m}" for m in DAILY_METRICS)
+        row = self.db.fetch_one(
+            f"SELECT {sums} FROM daily_stats WHERE day BETWEEN ? AND ?",
+            (start_date, end_date)
+        )
+        return row or {m: 0 for m in DAILY_METRICS}
+
+    def get_top_breeds(self, kind: str, limit: int = 3) -> List[Tuple[str, int]]:
+        """Get the all-time most frequent breeds of a breed trend kind.
+
+        Args:
+            kind: "adoption" or "rescue"
+            limit: Maximum number of breeds
+
+        Returns:
+            List of (breed, count) tuples sorted by count descending
+        """
+        rows = self.db.fetch_all(
+            "SELECT breed, count FROM daily_breed_stats WHERE kind = ? AND day = '' AND count > 0 "
+            "ORDER BY count DESC, breed LIMIT ?",
+            (kind, limit)
+        )
+        return [(row["breed"], row["count"]) for row in rows]
+
+    def get_series(
+        self,
+        metrics: List[str],
+        start_date: str,
+        end_date: str,
+        granularity: str = "day"
+    ) -> Dict[str, Dict[str, int]]:
+        """Sum metrics per day, week, month or year over an inclusive date range.
+
+        Args:
+            metrics: daily_stats metric columns
+            start_date: First day, 'YYYY-MM-DD'
+            end_date: Last day, 'YYYY-MM-DD'
+            granularity: "day", "week", "month" or "year"
+
+        Returns:
+            Dictionary of bucket start day -> metric totals (empty buckets are omitted)
+
+        Raises:
+            ValueError: For an unknown metric or granularity
+        """
+        unknown = [m for m in metrics if m not in DAILY_METRICS]
+        if unknown:
+            raise ValueError(f"Unknown metric: {unknown[0]}")
+        sums = ", ".join(f"SUM({m}) AS {m}" for m in metrics)
+        rows = self.db.fetch_all(
+            f"SELECT {_sql_bucket('day', granularity)} AS bucket, {sums} FROM daily_stats "
+            f"WHERE day BETWEEN ? AND ? GROUP BY bucket",
+            (start_date, end_date)
+        )
+        return {row.pop("bucket"): row for row in rows}
+
+    def get_breed_series(
+        self,
+        kind: str,
+        breeds: List[str],
+        start_date: str,
+        end_date: str,
+        granularity: str = "day"
+    ) -> Dict[Tuple[str, str], int]:
+        """Get per-bucket counts of some breeds over an inclusive date range.
+
+        Args:
+            kind: "adoption" or "rescue"
+            breeds: Normalized breed names
+            start_date: First day, 'YYYY-MM-DD'
+            end_date: Last day, 'YYYY-MM-DD'
+            granularity: "day", "week", "month" or "year"
+
+        Returns:
+            Dictionary of (breed, bucket start day) -> count
+        """
+        if not breeds:
+            return {}
+        placeholders = ", ".join("?" for _ in breeds)
+        rows = self.db.fetch_all(
+            f"SELECT breed, {_sql_bucket('day', granularity)} AS bucket, SUM(count) AS count "
+            f"FROM daily_breed_stats "
+            f"WHERE kind = ? AND day BETWEEN ? AND ? AND breed IN ({placeholders}) "
+            f"GROUP BY breed, bucket",
+            (kind, start_date, end_date, *breeds)
+        )
+        return {(row["breed"], row["bucket"]): row["count"] for row in rows}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the daily_stats rollup from the raw tables")
+    parser.add_argument("--db", default=app_config.DB_PATH, help="Path to the database file")
+    args = parser.parse_args(argv)
+
+    service = DailyStatsService(args.db, ensure_tables=False)
+    service._ensure_tables()
+    service.rebuild()
+    return 0
+
+
+__all__ = ["DailyStatsService", "DAILY_METRICS", "BREED_METRICS", "GRANULARITIES", "bucket_start", "bucket_starts"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
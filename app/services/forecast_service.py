@@ -0,0 +1,224 @@
+"""Capacity forecast: when will the shelter run out of space?
+
+The daily intake and adoption series come from the ``daily_stats`` rollup
+and the current population from ``status_counters``, so the only work is
+array arithmetic over at most a few years of days:
+
+* a classical multiplicative decomposition gives a day-of-week factor per
+  series (ratio of each day to its centered 7-day moving average, averaged
+  per weekday);
+* the deseasonalized series is reduced to an exponentially weighted daily
+  rate, so recent weeks count most;
+* the next N weeks are projected as rate x weekday factor, and the
+  population as today's count plus the cumulative net intake.
+
+NumPy is optional; without it ``get_capacity_forecast`` returns None.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from storage.database import Database
+from storage.cache import get_query_cache, QueryCache
+from .daily_stats_service import DailyStatsService
+from .status_counter_service import StatusCounterService
+import app_config
+from app_config import AnimalStatus
+
+# Days of history the rates and weekday factors are estimated from
+HISTORY_DAYS = 3 * 365
+
+_SERIES = ("intakes", "adoptions")
+
+
+@dataclass
+class CapacityForecast:
+    """Projected intake, adoptions and population for the coming weeks."""
+    computed_on: date
+    capacity: int
+    current_population: int
+    # Exponentially weighted rates, per week
+    intake_per_week: float
+    adoptions_per_week: float
+    # One entry per projected week (seven-day periods starting today)
+    week_starts: List[date] = field(default_factory=list)
+    intake: List[float] = field(default_factory=list)
+    adoptions: List[float] = field(default_factory=list)
+    # Population at the end of each week
+    population: List[float] = field(default_factory=list)
+    # First day the population reaches capacity, None if not within the horizon
+    full_on: Optional[date] = None
+    # Series name -> seven multiplicative factors, Monday first
+    weekday_factors: Dict[str, List[float]] = field(default_factory=dict)
+
+
+def _weekday_factors(series: Any, weekdays: Any) -> Any:
+    """Day-of-week factors (rows x 7, mean 1) from ratios to a centered 7-day average."""
+    rows, days = series.shape
+    factors = np.ones((rows, 7))
+    if days < 7:
+        return factors
+    totals = np.cumsum(np.pad(series, ((0, 0), (1, 0))), axis=1)
+    trend = (totals[:, 7:] - totals[:, :-7]) / 7.0  # centered on days 3 .. days-4
+    centered = series[:, 3:days - 3]
+    centered_weekdays = weekdays[3:days - 3]
+    for row in range(rows):
+        known = trend[row] > 0
+        ratios = centered[row, known] / trend[row, known]
+        sums = np.bincount(centered_weekdays[known], weights=ratios, minlength=7)
+        counts = np.bincount(centered_weekdays[known], minlength=7)
+        if counts.all():
+            factors[row] = sums / counts
+            mean = factors[row].mean()
+            factors[row] = factors[row] / mean if mean > 0 else 1.0
+    return factors
+
+
+def _ewm_rates(series: Any, halflife_days: float) -> Any:
+    """Exponentially weighted mean of each row, the last day weighing most."""
+    days = series.shape[1]
+    weights = 0.5 ** (np.arange(days - 1, -1, -1) / halflife_days)
+    return series @ weights / weights.sum()
+
+
+def project(
+    history: Any,
+    first_day: date,
+    current_population: int,
+    capacity: int,
+    weeks: int,
+    halflife_days: float
+) -> Tuple[Any, Any, Any, Optional[int]]:
+    """Project daily intake, adoptions and population after the history ends.
+
+    Args:
+        history: Array of shape (2, days): daily intakes and adoptions
+        first_day: Day of history[:, 0]
+        current_population: Animals in the shelter at the end of the history
+        capacity: Animals the shelter can house
+        weeks: Number of weeks to project
+        halflife_days: Half-life of the rate weights
+
+    Returns:
+        Tuple of (factors (2 x 7), daily rates (2,), projected days (2 x 7*weeks),
+        index of the first projected day at capacity or None)
+    """
+    days = history.shape[1]
+    weekdays = (np.arange(days) + first_day.weekday()) % 7
+    factors = _weekday_factors(history, weekdays)
+    deseasonalized = np.divide(history, factors[:, weekdays], out=history.copy(), where=factors[:, weekdays] > 0)
+    rates = _ewm_rates(deseasonalized, halflife_days) if days else np.zeros(len(history))
+
+    future_weekdays = (np.arange(days, days + 7 * weeks) + first_day.weekday()) % 7
+    projected = rates[:, None] * factors[:, future_weekdays]
+    population = current_population + np.cumsum(projected[0] - projected[1])
+    full = np.flatnonzero(population >= capacity)
+    return factors, rates, projected, int(full[0]) if len(full) else None
+
+
+class ForecastService:
+    """Capacity forecast from the daily rollup and the status counters."""
+
+    def __init__(self, db: Optional[Database | str] = None) -> None:
+        """Initialize the service.
+
+        Args:
+            db: Database instance or path to sqlite file
+        """
+        if isinstance(db, Database):
+            self.db = db
+        else:
+            self.db = Database(db if isinstance(db, str) else app_config.DB_PATH)
+
+        self.daily_stats = DailyStatsService(self.db)
+        self.status_counters = StatusCounterService(self.db)
+        self._cache: QueryCache = get_query_cache()
+
+    def get_current_population(self) -> int:
+        """Animals currently in the shelter (not removed and not adopted)."""
+        counts = self.status_counters.get_counts("animals")["animals"]
+        return sum(counts.values()) - counts.get(AnimalStatus.ADOPTED, 0)
+
+    def get_capacity_forecast(
+        self,
+        weeks: Optional[int] = None,
+        capacity: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> Optional[CapacityForecast]:
+        """Get the capacity forecast, computed at most once per day.
+
+        Args:
+            weeks: Weeks to project (default app_config.FORECAST_WEEKS)
+            capacity: Shelter capacity (default app_config.SHELTER_CAPACITY)
+            today: Day the forecast is made on (default: today, UTC)
+
+        Returns:
+            CapacityForecast, or None when NumPy is not installed
+
+        Raises:
+            ValueError: If weeks is not positive
+        """
+        if not NUMPY_AVAILABLE:
+            return None
+        weeks = app_config.FORECAST_WEEKS if weeks is None else weeks
+        capacity = app_config.SHELTER_CAPACITY if capacity is None else capacity
+        today = today or datetime.utcnow().date()
+        if weeks < 1:
+            raise ValueError("weeks must be at least 1")
+
+        return self._cache.get_or_fetch(
+            "capacity_forecast",
+            (self.db.db_path, today.isoformat(), weeks, capacity, app_config.FORECAST_HALFLIFE_DAYS),
+            lambda: self._compute(weeks, capacity, today),
+            ttl_seconds=24 * 60 * 60
+        )
+
+    def _compute(self, weeks: int, capacity: int, today: date) -> CapacityForecast:
+        """Build the forecast from complete days only (today is still filling up)."""
+        end = today - timedelta(days=1)
+        start = end - timedelta(days=HISTORY_DAYS - 1)
+        rows = self.daily_stats.get_series(list(_SERIES), start.isoformat(), end.isoformat())
+
+        history = np.zeros((len(_SERIES), HISTORY_DAYS))
+        if rows:
+            offsets = (np.array(list(rows), dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+            history[:, offsets] = np.array([[row[s] or 0 for row in rows.values()] for s in _SERIES])
+            # Leading days before the shelter had any activity would flatten the factors
+            first = int(offsets.min())
+            history = history[:, first:]
+            start += timedelta(days=first)
+        else:
+            history = history[:, :0]
+
+        population = self.get_current_population()
+        factors, rates, projected, full_index = project(
+            history, start, population, capacity, weeks, app_config.FORECAST_HALFLIFE_DAYS
+        )
+
+        weekly = projected.reshape(len(_SERIES), weeks, 7).sum(axis=2)
+        net = np.cumsum(projected[0] - projected[1])
+        return CapacityForecast(
+            computed_on=today,
+            capacity=capacity,
+            current_population=population,
+            intake_per_week=round(float(rates[0]) * 7, 2),
+            adoptions_per_week=round(float(rates[1]) * 7, 2),
+            week_starts=[today + timedelta(days=7 * w) for w in range(weeks)],
+            intake=[round(float(v), 2) for v in weekly[0]],
+            adoptions=[round(float(v), 2) for v in weekly[1]],
+            population=[round(population + float(v), 2) for v in net[6::7]],
+            full_on=today + timedelta(days=full_index) if full_index is not None else None,
+            weekday_factors={name: [round(float(f), 3) for f in factors[i]] for i, name in enumerate(_SERIES)},
+        )
+
+
+__all__ = ["ForecastService", "CapacityForecast", "NUMPY_AVAILABLE", "project"]
@@ -0,0 +1,332 @@
+"""Migration of legacy inline base64 photos into FileStore.
+
+Older rows may hold whole images as base64 text in their photo columns.
+Every ``SELECT *`` on those tables then drags megabytes of image data into
+Python. This service moves such blobs into FileStore in small batches and
+rewrites the column to the new filename. Progress is kept in the
+``maintenance_state`` table so an interrupted run resumes where it stopped.
+
+It also backfills ``animals.photo_placeholder`` (the tiny inline preview)
+for animals whose photo was saved before previews existed.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from storage.database import Database
+from storage.file_store import FileStoreError
+from services.photo_service import get_photo_service, PhotoServiceError, PIL_AVAILABLE
+import app_config
+
+
+_PLACEHOLDER_CURSOR_KEY = "photo_placeholder:animals"
+
+# (table, photo column, column used to name the extracted file)
+PHOTO_COLUMNS: Tuple[Tuple[str, str, str], ...] = (
+    ("animals", "photo", "name"),
+    ("rescue_missions", "animal_photo", "animal_name"),
+    ("users", "profile_picture", "name"),
+)
+
+
+class PhotoMigrationService:
+    """Moves inline base64 photos out of the database in resumable batches."""
+
+    def __init__(
+        self,
+        db: Optional[Database | str] = None,
+        *,
+        batch_size: int = 25,
+        ensure_tables: bool = True
+    ) -> None:
+        """Initialize the migration service.
+
+        Args:
+            db: Database instance or path to sqlite file
+            batch_size: Rows examined per batch (each batch is its own transaction)
+            ensure_tables: Whether to create the progress table
+        """
+        if isinstance(db, Database):
+            self.db = db
+        else:
+            self.db = Database(db if isinstance(db, str) else app_config.DB_PATH)
+
+        self.batch_size = max(1, batch_size)
+        self.photo_service = get_photo_service()
+
+        if ensure_tables:
+            self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        """Ensure the maintenance_state key/value table exists."""
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    @staticmethod
+    def _cursor_key(table: str, column: str) -> str:
+        return f"photo_migration:{table}.{column}"
+
+    def get_cursor(self, table: str, column: str) -> int:
+        """Get the last row id processed for a column (0 if not started)."""
+        row = self.db.fetch_one(
+            "SELECT value FROM maintenance_state WHERE key = ?",
+            (self._cursor_key(table, column),)
+        )
+        return int(row["value"]) if row and row.get("value") else 0
+
+    def _set_cursor(self, table: str, column: str, last_id: int) -> None:
+        self._set_state(self._cursor_key(table, column), str(last_id))
+
+    def _set_state(self, key: str, value: str) -> None:
+        self.db.execute(
+            """
+            INSERT INTO maintenance_state (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            """,
+            (key, value)
+        )
+
+    def reset(self) -> None:
+        """Forget saved progress so the next run rescans every row."""
+        self.db.execute(
+            "DELETE FROM maintenance_state WHERE key LIKE 'photo_migration:%' OR key = ?",
+            (_PLACEHOLDER_CURSOR_KEY,)
+        )
+
+    def count_pending(self) -> Dict[str, Dict[str, int]]:
+        """Count rows that still hold inline photo data.
+
+        Returns:
+            Dict keyed by 'table.column' with 'rows' and 'bytes'
+        """
+        pending = {}
+        for table, column, _ in PHOTO_COLUMNS:
+            row = self.db.fetch_one(
+                f"SELECT COUNT(*) AS rows, COALESCE(SUM(length({column})), 0) AS bytes "
+                f"FROM {table} WHERE length({column}) > ?",
+                (app_config.MAX_PHOTO_REFERENCE_LENGTH,)
+            )
+            pending[f"{table}.{column}"] = {"rows": row["rows"], "bytes": row["bytes"]}
+        return pending
+
+    def migrate_batch(self, table: str, column: str, name_column: str) -> Dict[str, Any]:
+        """Extract one batch of inline photos for a column.
+
+        Args:
+            table: Table name
+            column: Photo column name
+            name_column: Column used to name the extracted file
+
+        Returns:
+            Dict with processed, migrated, failed, bytes_reclaimed and done
+        """
+        cursor = self.get_cursor(table, column)
+        rows = self.db.fetch_all(
+            f"SELECT id, {name_column} AS label, {column} AS photo FROM {table} "
+            f"WHERE id > ? AND length({column}) > ? ORDER BY id LIMIT ?",
+            (cursor, app_config.MAX_PHOTO_REFERENCE_LENGTH, self.batch_size)
+        )
+
+        result = {"processed": 0, "migrated": 0, "failed": 0, "bytes_reclaimed": 0, "done": False}
+        if not rows:
+            result["done"] = True
+            return result
+
+        for row in rows:
+            result["processed"] += 1
+            inline = row["photo"]
+            try:
+                filename = self.photo_service.ensure_file_reference(inline, row.get("label") or table)
+            except (PhotoServiceError, FileStoreError) as e:
+                print(f"[WARN] Photo migration: {table}#{row['id']} left as-is: {e}")
+                result["failed"] += 1
+                continue
+
+            if filename == inline:
+                # Long but not base64 (e.g. a URL); nothing to extract
+                continue
+
+            # Compare-and-set so a concurrent edit of the row is never overwritten
+            conn = self.db._get_connection()
+            try:
+                updated = conn.execute(
+                    f"UPDATE {table} SET {column} = ? WHERE id = ? AND {column} = ?",
+                    (filename, row["id"], inline)
+                ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+            if not updated:
+                # The row changed meanwhile; release the copy nothing references
+                self.photo_service.file_store.delete_file(filename)
+                continue
+            result["migrated"] += 1
+            result["bytes_reclaimed"] += len(inline) - len(filename)
+
+        self._set_cursor(table, column, rows[-1]["id"])
+        result["done"] = len(rows) < self.batch_size
+        return result
+
+    def run(
+        self,
+        max_batches: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+        vacuum: bool = False
+    ) -> Dict[str, Any]:
+        """Migrate inline photos across all photo columns.
+
+        Args:
+            max_batches: Optional cap on batches for this call (resume later)
+            stop_event: Optional event that stops the run between batches
+            vacuum: Run VACUUM afterwards so reclaimed space is returned to disk
+
+        Returns:
+            Report with per-column and total counts plus bytes_reclaimed and complete
+        """
+        report: Dict[str, Any] = {
+            "columns": {},
+            "migrated": 0,
+            "failed": 0,
+            "bytes_reclaimed": 0,
+            "complete": True,
+        }
+        batches = 0
+
+        for table, column, name_column in PHOTO_COLUMNS:
+            stats = {"migrated": 0, "failed": 0, "bytes_reclaimed": 0}
+            report["columns"][f"{table}.{column}"] = stats
+
+            while True:
+                if (max_batches is not None and batches >= max_batches) or (
+                    stop_event is not None and stop_event.is_set()
+                ):
+                    report["complete"] = False
+                    break
+
+                batch = self.migrate_batch(table, column, name_column)
+                batches += 1
+                for key in ("migrated", "failed", "bytes_reclaimed"):
+                    stats[key] += batch[key]
+                if batch["done"]:
+                    break
+
+            for key in ("migrated", "failed", "bytes_reclaimed"):
+                report[key] += stats[key]
+            if not report["complete"]:
+                break
+
+        if report["migrated"]:
+            print(
+                f"[INFO] Photo migration: moved {report['migrated']} inline photo(s) to FileStore, "
+                f"reclaimed {report['bytes_reclaimed'] / (1024 * 1024):.2f} MB"
+            )
+
+        if vacuum and report["complete"] and report["bytes_reclaimed"]:
+            self.db.execute("VACUUM")
+
+        return report
+
+    def backfill_placeholders(
+        self,
+        max_batches: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """Generate missing inline previews for animals that have a photo.
+
+        Rows whose preview cannot be made (missing file, undecodable data)
+        are passed over so the cursor still advances.
+
+        Args:
+            max_batches: Optional cap on batches for this call (resume later)
+            stop_event: Optional event that stops the run between batches
+
+        Returns:
+            Report with generated, failed and complete
+        """
+        report = {"generated": 0, "failed": 0, "complete": True}
+        if not PIL_AVAILABLE:
+            report["complete"] = False
+            return report
+
+        row = self.db.fetch_one("SELECT value FROM maintenance_state WHERE key = ?", (_PLACEHOLDER_CURSOR_KEY,))
+        cursor = int(row["value"]) if row and row.get("value") else 0
+        batches = 0
+
+        while True:
+            if (max_batches is not None and batches >= max_batches) or (
+                stop_event is not None and stop_event.is_set()
+            ):
+                report["complete"] = False
+                break
+
+            rows = self.db.fetch_all(
+                "SELECT id, photo FROM animals WHERE id > ? AND photo IS NOT NULL AND photo != '' "
+                "AND photo_placeholder IS NULL ORDER BY id LIMIT ?",
+                (cursor, self.batch_size)
+            )
+            batches += 1
+            for row in rows:
+                placeholder = self.photo_service.create_placeholder(row["photo"])
+                if not placeholder:
+                    report["failed"] += 1
+                    continue
+                # Only fill in if the photo was not replaced meanwhile
+                self.db.execute(
+                    "UPDATE animals SET photo_placeholder = ? WHERE id = ? AND photo = ?",
+                    (placeholder, row["id"], row["photo"])
+                )
+                report["generated"] += 1
+
+            if rows:
+                cursor = rows[-1]["id"]
+                self._set_state(_PLACEHOLDER_CURSOR_KEY, str(cursor))
+            if len(rows) < self.batch_size:
+                break
+
+        if report["generated"]:
+            print(f"[INFO] Photo migration: generated {report['generated']} photo preview(s)")
+        return report
+
+
+_migration_thread: Optional[threading.Thread] = None
+_migration_lock = threading.Lock()
+
+
+def start_background_migration(db_path: Optional[str] = None) -> Optional[threading.Thread]:
+    """Run the photo migration and preview backfill in a daemon thread, once per process.
+
+    Later calls are no-ops, so this is safe to call from every session start.
+
+    Args:
+        db_path: Path to database file. Defaults to app_config.DB_PATH
+
+    Returns:
+        The started thread, or None if the migration was already started
+    """
+    global _migration_thread
+
+    with _migration_lock:
+        if _migration_thread is not None:
+            return None
+
+        def _run() -> None:
+            try:
+                service = PhotoMigrationService(db_path)
+                service.run()
+                service.backfill_placeholders()
+            except Exception as e:
+                print(f"[WARN] Photo migration failed: {e}")
+
+        _migration_thread = threading.Thread(target=_run, name="photo-migration", daemon=True)
+        _migration_thread.start()
+        return _migration_thread
+
+
+__all__ = ["PhotoMigrationService", "PHOTO_COLUMNS", "start_background_migration"]
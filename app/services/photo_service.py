@@ -2,12 +2,24 @@
 from __future__ import annotations
 
 import base64
-from typing import Optional, Tuple
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from enum import Enum
 
-from storage.file_store import get_file_store, FileStoreError
+from storage.cache import LRUCache
+from storage.file_store import get_file_store, FileStoreError, MIME_SNIFF_BYTES, sniff_mime_type
+from storage.image_normalizer import make_placeholder
 import app_config
 
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    PIL_AVAILABLE = False
+
 
 class PhotoValidationResult(Enum):
     """Result of photo validation."""
@@ -31,6 +43,7 @@ class PhotoService:
     - MIME type validation for security
     - Size validation
     - Base64 detection and handling
+    - Byte-bounded LRU cache of encoded photos
     """
     
     def __init__(self):
@@ -39,6 +52,12 @@ class PhotoService:
         self._allowed_mime_types = app_config.ALLOWED_MIME_TYPES
         self._max_size_mb = app_config.MAX_PHOTO_SIZE_MB
         self._allowed_extensions = app_config.ALLOWED_PHOTO_EXTENSIONS
+        # (filename, version, file size, requested max dimension) -> base64 payload
+        self._cache: LRUCache[str] = LRUCache(
+            max_size=app_config.PHOTO_CACHE_MAX_ENTRIES,
+            max_bytes=app_config.PHOTO_CACHE_MAX_MB * 1024 * 1024,
+            size_fn=len,
+        )
     
     def is_base64(self, data: str) -> bool:
         """Check if a string is base64 data (not a filename).
@@ -66,7 +85,9 @@ class PhotoService:
     def validate_base64_image(self, base64_data: str) -> Tuple[PhotoValidationResult, str]:
         """Validate base64 encoded image data.
         
-        Performs MIME type and size validation for security.
+        Performs MIME type and size validation for security. Only the leading
+        characters are decoded: the size is computed from the text length and
+        the type is sniffed from the header bytes.
         
         Args:
             base64_data: Base64 encoded image data
@@ -77,17 +98,18 @@ class PhotoService:
         if not base64_data:
             return PhotoValidationResult.INVALID_FORMAT, "No image data provided"
         
-        # Try to decode to check size
+        # Decode just enough whole base64 quanta to cover the magic bytes
+        header_chars = -(-MIME_SNIFF_BYTES // 3) * 4
         try:
-            decoded = base64.b64decode(base64_data)
+            header = base64.b64decode(base64_data[:header_chars])
         except Exception as e:
             return PhotoValidationResult.DECODE_ERROR, f"Invalid base64 data: {e}"
         
-        size_mb = len(decoded) / (1024 * 1024)
+        size_mb = (len(base64_data.rstrip("=")) * 3 // 4) / (1024 * 1024)
         if size_mb > self._max_size_mb:
             return PhotoValidationResult.INVALID_SIZE, f"Image too large ({size_mb:.2f}MB). Max: {self._max_size_mb}MB"
         
-        mime_type = self._detect_mime_type(decoded)
+        mime_type = self._detect_mime_type(header)
         if mime_type not in self._allowed_mime_types:
             return PhotoValidationResult.INVALID_TYPE, f"Invalid image type. Allowed: {', '.join(self._allowed_mime_types)}"
         
@@ -102,25 +124,21 @@ class PhotoService:
         Returns:
             Detected MIME type or None
         """
-        if len(data) < 4:
-            return None
-        
-        if data[:3] == b'\xff\xd8\xff':
-            return "image/jpeg"
-        elif data[:8] == b'\x89PNG\r\n\x1a\n':
-            return "image/png"
-        elif data[:6] in (b'GIF87a', b'GIF89a'):
-            return "image/gif"
-        elif data[:4] == b'RIFF' and data[8:12] == b'WEBP':
-            return "image/webp"
-        
-        return None
+        return sniff_mime_type(data[:MIME_SNIFF_BYTES])
     
-    def load_photo_as_base64(self, photo_data: Optional[str]) -> Optional[str]:
+    def load_photo_as_base64(
+        self,
+        photo_data: Optional[str],
+        max_size: Optional[int] = None
+    ) -> Optional[str]:
         """Load a photo as base64 for display, handling both formats.
         
+        Encoded files are cached by filename, modification time, file size
+        and requested size, so repeat renders skip the disk read and encode.
+        
         Args:
             photo_data: Either a filename (from FileStore) or base64 data (legacy)
+            max_size: Optional longest-side pixel limit; downscales when Pillow is available
             
         Returns:
             Base64 encoded image data for display, or None if not found
@@ -133,14 +151,218 @@ class PhotoService:
             return photo_data
         
         # It's a filename - load from FileStore
+        signature = self.file_store.get_signature(photo_data)
+        if signature is None:
+            # File not found
+            return None
+        
+        key = (photo_data, *signature, max_size)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            return self.file_store.read_file_as_base64(photo_data)
+            if max_size and PIL_AVAILABLE:
+                encoded = base64.b64encode(
+                    self._resize(self.file_store.read_file_as_bytes(photo_data), max_size)
+                ).decode()
+            else:
+                encoded = self.file_store.read_file_as_base64(photo_data)
         except FileStoreError:
             # File not found
             return None
         except Exception as e:
             print(f"[ERROR] PhotoService: Failed to load photo: {e}")
             return None
+        
+        self._cache.set(key, encoded)
+        return encoded
+    
+    def _resize(self, data: bytes, max_size: int) -> bytes:
+        """Downscale image bytes so the longest side is at most max_size.
+        
+        Args:
+            data: Raw image bytes
+            max_size: Longest-side pixel limit
+            
+        Returns:
+            Resized image bytes in the original format, or the input if already small enough
+        """
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= max_size:
+                return data
+            image_format = img.format or "PNG"
+            img.thumbnail((max_size, max_size))
+            buffer = io.BytesIO()
+            img.save(buffer, format=image_format)
+            return buffer.getvalue()
+    
+    def invalidate(self, photo_data: Optional[str]) -> int:
+        """Drop every cached encoding of a photo.
+        
+        Args:
+            photo_data: Filename whose cached payloads should be dropped
+            
+        Returns:
+            Number of cache entries removed
+        """
+        if not photo_data or self.is_base64(photo_data):
+            return 0
+        return self._cache.delete_where(lambda key: key[0] == photo_data)
+    
+    def load_many(
+        self,
+        filenames: Iterable[Optional[str]],
+        size: Optional[int] = None,
+        on_loaded: Optional[Callable[[str, Optional[str]], None]] = None
+    ) -> Dict[str, Optional[str]]:
+        """Load several photos as base64 concurrently.
+        
+        Reads run on a shared, bounded thread pool, so a grid of N photos
+        costs roughly N / PHOTO_PREFETCH_WORKERS disk reads of latency
+        instead of N.
+        
+        Args:
+            filenames: Filenames or legacy base64 values; empty and duplicate values are skipped
+            size: Optional longest-side pixel limit (as in load_photo_as_base64)
+            on_loaded: Optional callback ``(photo, base64)`` run as each photo finishes
+            
+        Returns:
+            Dict mapping each photo value to its base64 data (None if not found)
+        """
+        return _run_concurrently(lambda photo: self.load_photo_as_base64(photo, size), filenames, on_loaded)
+    
+    def resolve_many(
+        self,
+        photos: Iterable[Optional[str]],
+        on_resolved: Optional[Callable[[str, Tuple[Optional[str], Optional[str]]], None]] = None
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Resolve several photos to (url, base64) pairs concurrently.
+        
+        Args:
+            photos: Filenames or legacy base64 values; empty and duplicate values are skipped
+            on_resolved: Optional callback ``(photo, (url, base64))`` run as each photo finishes
+            
+        Returns:
+            Dict mapping each photo value to the pair from get_photo_source
+        """
+        return _run_concurrently(self.get_photo_source, photos, on_resolved, default=(None, None))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get photo cache statistics (entries, bytes, hit rate, evictions)."""
+        return self._cache.stats()
+    
+    def get_photo_url(self, photo_data: Optional[str]) -> Optional[str]:
+        """Get a cacheable URL for a stored photo.
+        
+        Args:
+            photo_data: Either a filename (from FileStore) or base64 data (legacy)
+            
+        Returns:
+            Content-hashed media URL, or None for legacy base64 data or missing files
+        """
+        if not photo_data or self.is_base64(photo_data):
+            return None
+        
+        try:
+            return self.file_store.get_public_url(photo_data)
+        except FileStoreError:
+            return None
+        except Exception as e:
+            print(f"[ERROR] PhotoService: Failed to publish photo: {e}")
+            return None
+    
+    def get_photo_source(self, photo_data: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Resolve how a photo should be referenced by an image control.
+        
+        Stored files are referenced by URL so the browser can cache them;
+        only legacy inline base64 data is passed through as base64.
+        
+        Args:
+            photo_data: Either a filename (from FileStore) or base64 data (legacy)
+            
+        Returns:
+            Tuple of (url, base64) where at most one is set
+        """
+        if not photo_data:
+            return None, None
+        
+        if self.is_base64(photo_data):
+            return None, photo_data
+        
+        return self.get_photo_url(photo_data), None
+    
+    def create_placeholder(self, photo_data: Optional[str]) -> Optional[str]:
+        """Build the tiny inline preview stored next to a photo.
+        
+        Args:
+            photo_data: Either a filename (from FileStore) or base64 data (legacy)
+            
+        Returns:
+            Base64 preview image, or None if it cannot be made (no photo,
+            missing file, undecodable data or Pillow unavailable)
+        """
+        if not photo_data or not PIL_AVAILABLE:
+            return None
+        
+        try:
+            if self.is_base64(photo_data):
+                data, _ = self.decode_inline_photo(photo_data)
+            else:
+                data = self.file_store.read_file_as_bytes(photo_data)
+        except (FileStoreError, PhotoServiceError):
+            return None
+        
+        return make_placeholder(data)
+    
+    def decode_inline_photo(self, photo_data: str) -> Tuple[bytes, str]:
+        """Decode legacy inline photo data (raw base64 or a data: URI).
+        
+        Args:
+            photo_data: Inline base64 image data
+            
+        Returns:
+            Tuple of (raw bytes, file extension such as '.jpg')
+            
+        Raises:
+            PhotoServiceError: If the data cannot be decoded as a supported image
+        """
+        payload = photo_data.split(",", 1)[1] if photo_data.startswith("data:") else photo_data
+        try:
+            data = base64.b64decode(payload)
+        except Exception as e:
+            raise PhotoServiceError(f"Invalid base64 data: {e}")
+        
+        mime_type = self._detect_mime_type(data)
+        if mime_type not in self._allowed_mime_types:
+            raise PhotoServiceError("Inline photo is not a supported image type")
+        
+        ext = ".jpg" if mime_type == "image/jpeg" else "." + mime_type.split("/", 1)[1]
+        return data, ext
+    
+    def ensure_file_reference(self, photo_data: Optional[str], name: str = "photo") -> Optional[str]:
+        """Make sure a photo value is a FileStore filename before it is written.
+        
+        Inline base64 data is extracted into the FileStore and replaced by
+        the new filename; filenames and empty values pass through unchanged.
+        Services call this on every photo write so new inline blobs never
+        reach the database.
+        
+        Args:
+            photo_data: Filename, inline base64 data, or None
+            name: Name prefix for the extracted file
+            
+        Returns:
+            Filename to store in the database, or the original empty value
+            
+        Raises:
+            PhotoServiceError: If inline data is not a valid image
+        """
+        if not photo_data or not self.is_base64(photo_data):
+            return photo_data
+        
+        data, ext = self.decode_inline_photo(photo_data)
+        return self.file_store.save_bytes(data, f"{name}{ext}", validate=False, custom_name=name)
     
     def save_photo_from_base64(
         self, 
@@ -180,6 +402,7 @@ class PhotoService:
         if not photo_data or self.is_base64(photo_data):
             return False
         
+        self.invalidate(photo_data)
         try:
             return self.file_store.delete_file(photo_data)
         except FileStoreError as e:
@@ -216,6 +439,58 @@ class PhotoService:
             return None
 
 
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_lock = threading.Lock()
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """Get the process-wide photo loading pool (bounded by PHOTO_PREFETCH_WORKERS)."""
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(
+                max_workers=app_config.PHOTO_PREFETCH_WORKERS,
+                thread_name_prefix="photo-prefetch",
+            )
+        return _prefetch_executor
+
+
+def _run_concurrently(
+    fn: Callable[[str], Any],
+    photos: Iterable[Optional[str]],
+    on_result: Optional[Callable[[str, Any], None]] = None,
+    default: Any = None
+) -> Dict[str, Any]:
+    """Apply fn to each distinct photo on the prefetch pool.
+    
+    Args:
+        fn: Loader called with one photo value
+        photos: Photo values; empty and duplicate values are skipped
+        on_result: Optional callback ``(photo, result)`` run in the calling thread as results arrive
+        default: Result recorded when fn raises
+        
+    Returns:
+        Dict mapping each photo value to its result
+    """
+    unique = list(dict.fromkeys(photo for photo in photos if photo))
+    if not unique:
+        return {}
+    
+    executor = _get_prefetch_executor()
+    futures = {executor.submit(fn, photo): photo for photo in unique}
+    results: Dict[str, Any] = {}
+    for future in as_completed(futures):
+        photo = futures[future]
+        try:
+            results[photo] = future.result()
+        except Exception as e:
+            print(f"[ERROR] PhotoService: Failed to load photo: {e}")
+            results[photo] = default
+        if on_result is not None:
+            on_result(photo, results[photo])
+    return results
+
+
 # Singleton instance
 _photo_service: Optional[PhotoService] = None
 
@@ -228,16 +503,42 @@ def get_photo_service() -> PhotoService:
     return _photo_service
 
 
-def load_photo(photo_data: Optional[str]) -> Optional[str]:
+def load_photo(photo_data: Optional[str], max_size: Optional[int] = None) -> Optional[str]:
     """Convenience function to load a photo as base64.
     
     Args:
         photo_data: Either a filename or base64 data from database
+        max_size: Optional longest-side pixel limit
         
     Returns:
         Base64 data for display, or None
     """
-    return get_photo_service().load_photo_as_base64(photo_data)
+    return get_photo_service().load_photo_as_base64(photo_data, max_size)
+
+
+def load_many(filenames: Iterable[Optional[str]], size: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """Convenience function to load several photos as base64 concurrently.
+    
+    Args:
+        filenames: Filenames or base64 data from database
+        size: Optional longest-side pixel limit
+        
+    Returns:
+        Dict mapping each photo value to base64 data (None if not found)
+    """
+    return get_photo_service().load_many(filenames, size)
+
+
+def load_photo_source(photo_data: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Convenience function to resolve a photo to a (url, base64) pair.
+    
+    Args:
+        photo_data: Either a filename or base64 data from database
+        
+    Returns:
+        Tuple of (url, base64) for display where at most one is set
+    """
+    return get_photo_service().get_photo_source(photo_data)
 
 
 __all__ = [
@@ -246,4 +547,6 @@ __all__ = [
     "PhotoValidationResult",
     "get_photo_service", 
     "load_photo",
+    "load_many",
+    "load_photo_source",
 ]
@@ -5,8 +5,9 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from storage.database import Database
+from services.photo_service import get_photo_service
 import app_config
-from app_config import RescueStatus, Urgency
+from app_config import RescueStatus, Urgency, normalize_breed, normalize_species
 
 
 class RescueService:
@@ -45,16 +46,17 @@ class RescueService:
         The `animal_photo` parameter stores the photo filename (if uploaded).
         """
         urgency_level = Urgency.from_label(urgency)
+        animal_photo = get_photo_service().ensure_file_reference(animal_photo, name or "rescue")
         
         sql = """
             INSERT INTO rescue_missions 
             (user_id, animal_id, location, latitude, longitude, notes, status, 
-             animal_type, animal_name, breed, reporter_name, reporter_phone, urgency, animal_photo, is_closed)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+             animal_type, animal_name, breed, breed_key, reporter_name, reporter_phone, urgency, animal_photo, is_closed)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
         """
         mid = self.db.execute(sql, (
             user_id, animal_id, location, latitude, longitude, details, status,
-            animal_type, name, breed, reporter_name, reporter_phone, urgency_level, animal_photo
+            animal_type, name, breed, normalize_breed(breed), reporter_name, reporter_phone, urgency_level, animal_photo
         ))
         return mid
 
@@ -155,6 +157,12 @@ class RescueService:
         animal_name = mission.get('animal_name') or f"Rescued {animal_type}"
         breed = mission.get('breed')  # Get breed from mission if available
         animal_photo = mission.get('animal_photo')  # Get photo from mission if available
+        try:
+            animal_photo = get_photo_service().ensure_file_reference(animal_photo, animal_name)
+        except Exception as e:
+            print(f"[WARN] Could not extract inline mission photo: {e}")
+            animal_photo = None
+        photo_placeholder = get_photo_service().create_placeholder(animal_photo)
         
         # Map common animal types to species (capitalized for consistency)
         species = animal_type.lower()
@@ -169,8 +177,9 @@ class RescueService:
         
         from app_config import AnimalStatus
         sql = """
-            INSERT INTO animals (name, species, breed, status, photo, rescue_mission_id)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO animals (name, species, breed, status, photo, photo_placeholder, rescue_mission_id,
+                                 breed_key, species_key)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         try:
             animal_id = self.db.execute(sql, (
@@ -179,7 +188,10 @@ class RescueService:
                 breed,
                 AnimalStatus.PROCESSING,
                 animal_photo,
-                mission.get('id')
+                photo_placeholder,
+                mission.get('id'),
+                normalize_breed(breed),
+                normalize_species(species),
             ))
             return animal_id
         except Exception as e:
@@ -206,6 +218,19 @@ class RescueService:
         )
         return rows
 
+    def get_map_missions(self) -> List[Dict[str, Any]]:
+        """Return missions that can be placed on the rescue map, newest first.
+        
+        Only rows with coordinates are loaded; the map itself still hides
+        removed and cancelled missions.
+        """
+        rows = self.db.fetch_all(
+            "SELECT * FROM rescue_missions "
+            "WHERE latitude IS NOT NULL AND longitude IS NOT NULL "
+            "ORDER BY mission_date DESC"
+        )
+        return rows
+
     def get_user_missions(self, user_id: int) -> List[Dict[str, Any]]:
         """Return missions submitted by a specific user, newest first."""
         rows = self.db.fetch_all(
@@ -0,0 +1,248 @@
+"""Running per-status row counts for dashboards, badges and stats.
+
+``status_counters`` holds one row per (scope, status) with the number of
+rows currently in that state: animals, rescue missions and adoption
+requests by base status (only rows analytics counts, i.e. not removed or
+cancelled) and users by role and disabled flag. Reading a count is a
+primary-key lookup instead of a COUNT over the whole table.
+
+Like the daily rollup, the counters are maintained by SQLite triggers
+generated from the definitions below, inside the transaction that changes
+the row. ``check`` compares them with a fresh count; the command below
+reports any drift and rebuilds them:
+
+    python -m services.status_counter_service [--db PATH]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from storage.database import Database
+from .daily_stats_service import _sql_base_status
+import app_config
+
+
+# Scope -> (table, status expression, condition). "{r}" is the row alias.
+# A NULL status never satisfies the conditions, like the *_for_analytics queries.
+COUNTERS: Dict[str, Tuple[str, str, str]] = {
+    "animals": ("animals", _sql_base_status("{r}.status"), "{r}.status != 'removed'"),
+    "rescue_missions": (
+        "rescue_missions",
+        _sql_base_status("{r}.status"),
+        "{r}.status NOT IN ('removed', 'cancelled')",
+    ),
+    "adoption_requests": (
+        "adoption_requests",
+        _sql_base_status("{r}.status"),
+        "{r}.status NOT IN ('removed', 'cancelled')",
+    ),
+    "user_roles": ("users", "COALESCE({r}.role, '')", "1"),
+    "disabled_users": ("users", "'disabled'", "{r}.is_disabled = 1"),
+}
+
+# Columns whose updates can move a row between counters
+_WATCHED_COLUMNS = {
+    "animals": ["status"],
+    "rescue_missions": ["status"],
+    "adoption_requests": ["status"],
+    "users": ["role", "is_disabled"],
+}
+
+# Bump when the trigger bodies change; stale triggers are replaced by a rebuild
+_TRIGGER_VERSION = 1
+_TRIGGER_PREFIX = "status_counters_"
+
+
+class StatusCounterService:
+    """Reads, checks and rebuilds the status_counters table."""
+
+    def __init__(self, db: Optional[Database | str] = None, *, ensure_tables: bool = True) -> None:
+        """Initialize the service.
+
+        Args:
+            db: Database instance or path to sqlite file
+            ensure_tables: Whether to create the counter table and triggers
+                (backfilling them the first time)
+        """
+        if isinstance(db, Database):
+            self.db = db
+        else:
+            self.db = Database(db if isinstance(db, str) else app_config.DB_PATH)
+
+        if ensure_tables:
+            self._ensure_tables()
+
+    def _ensure_tables(self) -> None:
+        """Create the counter table, and rebuild it if the triggers are missing or stale."""
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS status_counters (
+                scope TEXT NOT NULL,
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (scope, status)
+            )
+        """)
+
+        if not self.db.fetch_one(
+            "SELECT 1 AS found FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+            (f"{_TRIGGER_PREFIX}animals_insert_v{_TRIGGER_VERSION}",)
+        ):
+            self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Trigger generation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _contribution_sql(table: str, row: str, sign: int) -> List[str]:
+        """Statements adding (sign=1) or removing (sign=-1) one row's counts."""
+        statements = []
+        for scope, (counter_table, status_expr, condition) in COUNTERS.items():
+            if counter_table != table:
+                continue
+            statements.append(
+                f"INSERT INTO status_counters (scope, status, count) "
+                f"SELECT '{scope}', {status_expr.format(r=row)}, {sign} WHERE {condition.format(r=row)} "
+                f"ON CONFLICT(scope, status) DO UPDATE SET count = count + excluded.count;"
+            )
+        return statements
+
+    @classmethod
+    def _trigger_sql(cls) -> List[str]:
+        """CREATE TRIGGER statements for every watched table."""
+        version = f"_v{_TRIGGER_VERSION}"
+        triggers = []
+        for table, columns in _WATCHED_COLUMNS.items():
+            name = f"{_TRIGGER_PREFIX}{table}"
+            changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columns)
+            triggers.append(
+                f"CREATE TRIGGER {name}_insert{version} AFTER INSERT ON {table} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "NEW", 1)) + "\nEND"
+            )
+            triggers.append(
+                f"CREATE TRIGGER {name}_delete{version} AFTER DELETE ON {table} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "OLD", -1)) + "\nEND"
+            )
+            triggers.append(
+                f"CREATE TRIGGER {name}_update{version} AFTER UPDATE OF {', '.join(columns)} ON {table} "
+                f"WHEN {changed} BEGIN\n"
+                + "\n".join(cls._contribution_sql(table, "OLD", -1) + cls._contribution_sql(table, "NEW", 1))
+                + "\nEND"
+            )
+        return triggers
+
+    # ------------------------------------------------------------------
+    # Rebuild and consistency check
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _count_sql() -> str:
+        """SELECT of the true (scope, status, count) rows from the raw tables."""
+        return " UNION ALL ".join(
+            f"SELECT '{scope}' AS scope, {status_expr.format(r='r')} AS status, COUNT(*) AS count "
+            f"FROM {table} r WHERE {condition.format(r='r')} GROUP BY 2"
+            for scope, (table, status_expr, condition) in COUNTERS.items()
+        )
+
+    def rebuild(self) -> int:
+        """Recompute the counters from the raw rows and (re)install the triggers.
+
+        Runs in one transaction, so readers see either the old or the new counts.
+
+        Returns:
+            Number of status_counters rows written
+        """
+        conn = self.db._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                (f"{_TRIGGER_PREFIX}%",)
+            ).fetchall():
+                conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            for trigger in self._trigger_sql():
+                conn.execute(trigger)
+
+            conn.execute("DELETE FROM status_counters")
+            conn.execute(f"INSERT INTO status_counters (scope, status, count) {self._count_sql()}")
+
+            conn.commit()
+            row = conn.execute("SELECT COUNT(*) FROM status_counters").fetchone()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        print(f"[INFO] Status counters: rebuilt {row[0]} counter(s)")
+        return row[0]
+
+    def check(self) -> List[Tuple[str, str, int, int]]:
+        """Compare the stored counters with a fresh count of the raw tables.
+
+        Returns:
+            List of (scope, status, stored, actual) for every counter that is off
+        """
+        stored = {
+            (row["scope"], row["status"]): row["count"]
+            for row in self.db.fetch_all("SELECT scope, status, count FROM status_counters")
+        }
+        actual = {
+            (row["scope"], row["status"]): row["count"]
+            for row in self.db.fetch_all(self._count_sql())
+        }
+        return [
+            (scope, status, stored.get((scope, status), 0), actual.get((scope, status), 0))
+            for scope, status in sorted(set(stored) | set(actual))
+            if stored.get((scope, status), 0) != actual.get((scope, status), 0)
+        ]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_counts(self, *scopes: str) -> Dict[str, Dict[str, int]]:
+        """Get the current counts of one or more scopes in a single lookup.
+
+        Args:
+            scopes: Names from COUNTERS
+
+        Returns:
+            Dictionary of scope -> {status: count}; statuses with no rows are omitted
+
+        Raises:
+            ValueError: For an unknown scope
+        """
+        unknown = [s for s in scopes if s not in COUNTERS]
+        if unknown:
+            raise ValueError(f"Unknown counter scope: {unknown[0]}")
+        placeholders = ", ".join("?" for _ in scopes)
+        counts: Dict[str, Dict[str, int]] = {scope: {} for scope in scopes}
+        for row in self.db.fetch_all(
+            f"SELECT scope, status, count FROM status_counters WHERE scope IN ({placeholders}) AND count != 0",
+            scopes
+        ):
+            counts[row["scope"]][row["status"]] = row["count"]
+        return counts
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the status_counters table and rebuild it")
+    parser.add_argument("--db", default=app_config.DB_PATH, help="Path to the database file")
+    args = parser.parse_args(argv)
+
+    service = StatusCounterService(args.db)
+    drift = service.check()
+    for scope, status, stored, actual in drift:
+        print(f"[WARN] Status counters: {scope}/{status or '(none)'} was {stored}, actual {actual}")
+    service.rebuild()
+    return 1 if drift else 0
+
+
+__all__ = ["StatusCounterService", "COUNTERS"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
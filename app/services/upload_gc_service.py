@@ -0,0 +1,273 @@
+"""Mark-and-sweep garbage collection of orphaned uploads.
+
+Files are left behind in FileStore when animals or missions are deleted,
+photos are replaced or imports fail. This service marks every filename
+still referenced from a photo column and sweeps the store index for files
+that are not referenced. Orphans are first quarantined, so they can still
+be restored, and are only purged once they have stayed unreferenced for
+the grace period. Files younger than the grace period are never touched,
+because the row that will reference them may not be saved yet.
+
+The sweep walks the index in filename order and keeps its position in the
+``maintenance_state`` table, so it runs in small batches and resumes after
+an interruption.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Set
+
+from storage.database import Database
+from storage.file_store import FileStore, FileStoreError, get_file_store
+from services.photo_migration_service import PHOTO_COLUMNS
+import app_config
+
+
+_CURSOR_KEY = "upload_gc:cursor"
+_LAST_COMPLETE_KEY = "upload_gc:last_complete"
+
+
+class UploadGCService:
+    """Quarantines and purges uploads that no database row references."""
+
+    def __init__(
+        self,
+        db: Optional[Database | str] = None,
+        *,
+        file_store: Optional[FileStore] = None,
+        grace_hours: Optional[float] = None,
+        batch_size: int = 200,
+        ensure_tables: bool = True
+    ) -> None:
+        """Initialize the garbage collector.
+
+        Args:
+            db: Database instance or path to sqlite file
+            file_store: Store to collect. Defaults to the shared FileStore
+            grace_hours: Minimum file age, and minimum time in quarantine before
+                purging. Defaults to app_config.UPLOAD_GC_GRACE_HOURS
+            batch_size: Index rows examined per sweep batch
+            ensure_tables: Whether to create the progress table
+        """
+        if isinstance(db, Database):
+            self.db = db
+        else:
+            self.db = Database(db if isinstance(db, str) else app_config.DB_PATH)
+
+        self.file_store = file_store or get_file_store()
+        self.grace_hours = grace_hours if grace_hours is not None else app_config.UPLOAD_GC_GRACE_HOURS
+        self.batch_size = max(1, batch_size)
+
+        if ensure_tables:
+            self._ensure_table()
+
+    def _ensure_table(self) -> None:
+        """Ensure the maintenance_state key/value table exists."""
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS maintenance_state (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self.db.fetch_one("SELECT value FROM maintenance_state WHERE key = ?", (key,))
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str) -> None:
+        self.db.execute(
+            """
+            INSERT INTO maintenance_state (key, value, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            """,
+            (key, value)
+        )
+
+    def get_cursor(self) -> str:
+        """Get the last filename swept in the current pass ('' at the start of a pass)."""
+        return self._get_state(_CURSOR_KEY) or ""
+
+    def reset(self) -> None:
+        """Forget sweep progress so the next run starts a fresh pass."""
+        self.db.execute("DELETE FROM maintenance_state WHERE key LIKE 'upload_gc:%'")
+
+    def mark(self) -> Set[str]:
+        """Collect every filename referenced by a photo column.
+
+        Returns:
+            Set of referenced filenames
+        """
+        referenced: Set[str] = set()
+        for table, column, _ in PHOTO_COLUMNS:
+            rows = self.db.fetch_all(
+                f"SELECT DISTINCT {column} AS ref FROM {table} "
+                f"WHERE {column} IS NOT NULL AND {column} != '' AND length({column}) <= ?",
+                (app_config.MAX_PHOTO_REFERENCE_LENGTH,)
+            )
+            referenced.update(row["ref"] for row in rows)
+        return referenced
+
+    def _is_referenced(self, filename: str) -> bool:
+        """Re-check a single filename right before acting on it.
+
+        Catches rows saved after ``mark`` ran (e.g. a new upload that
+        deduplicated to an old file).
+        """
+        for table, column, _ in PHOTO_COLUMNS:
+            if self.db.fetch_one(f"SELECT 1 AS found FROM {table} WHERE {column} = ? LIMIT 1", (filename,)):
+                return True
+        return False
+
+    def _cutoff(self) -> str:
+        return (datetime.now() - timedelta(hours=self.grace_hours)).strftime("%Y-%m-%d %H:%M:%S")
+
+    def sweep_batch(self, referenced: Set[str]) -> Dict[str, Any]:
+        """Quarantine unreferenced files in the next batch of the index.
+
+        Args:
+            referenced: Filenames from ``mark``
+
+        Returns:
+            Dict with examined, quarantined, skipped_recent, bytes_quarantined and done
+        """
+        cursor = self.get_cursor()
+        records = self.file_store.list_file_records(after=cursor, limit=self.batch_size)
+        cutoff = self._cutoff()
+
+        result = {"examined": 0, "quarantined": 0, "skipped_recent": 0, "bytes_quarantined": 0, "done": False}
+
+        for record in records:
+            result["examined"] += 1
+            filename = record["filename"]
+            if filename in referenced:
+                continue
+            if record.get("created_at") and record["created_at"] > cutoff:
+                result["skipped_recent"] += 1
+                continue
+            if self._is_referenced(filename):
+                continue
+
+            try:
+                size = self.file_store.quarantine_file(filename)
+            except FileStoreError as e:
+                print(f"[WARN] Upload GC: could not quarantine {filename}: {e}")
+                continue
+            result["quarantined"] += 1
+            result["bytes_quarantined"] += size
+
+        result["done"] = len(records) < self.batch_size
+        if result["done"]:
+            # Pass complete; the next sweep starts from the beginning again
+            self._set_state(_CURSOR_KEY, "")
+            self._set_state(_LAST_COMPLETE_KEY, datetime.now().isoformat(timespec="seconds"))
+        else:
+            self._set_state(_CURSOR_KEY, records[-1]["filename"])
+        return result
+
+    def purge(self, referenced: Set[str]) -> Dict[str, Any]:
+        """Delete files that have sat in quarantine past the grace period.
+
+        Quarantined files that became referenced again are restored instead.
+
+        Args:
+            referenced: Filenames from ``mark``
+
+        Returns:
+            Dict with purged, restored and bytes_reclaimed
+        """
+        result = {"purged": 0, "restored": 0, "bytes_reclaimed": 0}
+        for row in self.file_store.list_quarantined(older_than_hours=self.grace_hours):
+            filename = row["filename"]
+            try:
+                if filename in referenced or self._is_referenced(filename):
+                    if self.file_store.restore_file(filename):
+                        result["restored"] += 1
+                    continue
+                result["bytes_reclaimed"] += self.file_store.purge_quarantined(filename)
+                result["purged"] += 1
+            except FileStoreError as e:
+                print(f"[WARN] Upload GC: could not purge {filename}: {e}")
+        return result
+
+    def run(
+        self,
+        max_batches: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> Dict[str, Any]:
+        """Mark references, purge expired quarantine, then sweep for new orphans.
+
+        Args:
+            max_batches: Optional cap on sweep batches for this call (resume later)
+            stop_event: Optional event that stops the sweep between batches
+
+        Returns:
+            Report with quarantined, purged, restored, skipped_recent,
+            bytes_quarantined, bytes_reclaimed and complete
+        """
+        referenced = self.mark()
+        report: Dict[str, Any] = {
+            "referenced": len(referenced),
+            "quarantined": 0,
+            "skipped_recent": 0,
+            "bytes_quarantined": 0,
+            "complete": True,
+        }
+        report.update(self.purge(referenced))
+
+        batches = 0
+        while True:
+            if (max_batches is not None and batches >= max_batches) or (
+                stop_event is not None and stop_event.is_set()
+            ):
+                report["complete"] = False
+                break
+
+            batch = self.sweep_batch(referenced)
+            batches += 1
+            for key in ("quarantined", "skipped_recent", "bytes_quarantined"):
+                report[key] += batch[key]
+            if batch["done"]:
+                break
+
+        if report["quarantined"] or report["purged"]:
+            print(
+                f"[INFO] Upload GC: quarantined {report['quarantined']} orphaned file(s), "
+                f"purged {report['purged']}, reclaimed {report['bytes_reclaimed'] / (1024 * 1024):.2f} MB"
+            )
+        return report
+
+
+_gc_thread: Optional[threading.Thread] = None
+_gc_lock = threading.Lock()
+
+
+def start_background_gc(db_path: Optional[str] = None) -> Optional[threading.Thread]:
+    """Run the upload garbage collector in a daemon thread, once per process.
+
+    Args:
+        db_path: Path to database file. Defaults to app_config.DB_PATH
+
+    Returns:
+        The started thread, or None if the collector was already started
+    """
+    global _gc_thread
+
+    with _gc_lock:
+        if _gc_thread is not None:
+            return None
+
+        def _run() -> None:
+            try:
+                UploadGCService(db_path).run()
+            except Exception as e:
+                print(f"[WARN] Upload GC failed: {e}")
+
+        _gc_thread = threading.Thread(target=_run, name="upload-gc", daemon=True)
+        _gc_thread.start()
+        return _gc_thread
+
+
+__all__ = ["UploadGCService", "start_background_gc"]
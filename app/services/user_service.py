@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional
 
 from storage.database import Database
 from services.logging_service import get_admin_logger, get_auth_logger
+from services.status_counter_service import StatusCounterService
 from services.password_policy import (
     get_password_policy,
     PasswordHistoryManager
@@ -50,6 +51,7 @@ class UserService:
         self.password_policy = get_password_policy()
         self.password_history = PasswordHistoryManager(db_path or app_config.DB_PATH)
         self._ensure_columns()
+        self.status_counters = StatusCounterService(self.db)
     
     def _ensure_columns(self) -> None:
         """Ensure required columns exist in users table."""
@@ -483,13 +485,9 @@ class UserService:
         Returns:
             Dictionary with user stats
         """
-        total = self.db.fetch_one("SELECT COUNT(*) as count FROM users")
-        admins = self.db.fetch_one(
-            "SELECT COUNT(*) as count FROM users WHERE role = 'admin'"
-        )
-        disabled = self.db.fetch_one(
-            "SELECT COUNT(*) as count FROM users WHERE is_disabled = 1"
-        )
+        counts = self.status_counters.get_counts("user_roles", "disabled_users")
+        total = sum(counts["user_roles"].values())
+        admins = counts["user_roles"].get("admin", 0)
         recent = self.db.fetch_one(
             """
             SELECT COUNT(*) as count FROM users 
@@ -498,10 +496,10 @@ class UserService:
         )
         
         return {
-            "total": total["count"] if total else 0,
-            "admins": admins["count"] if admins else 0,
-            "users": (total["count"] if total else 0) - (admins["count"] if admins else 0),
-            "disabled": disabled["count"] if disabled else 0,
+            "total": total,
+            "admins": admins,
+            "users": total - admins,
+            "disabled": counts["disabled_users"].get("disabled", 0),
             "recent_signups": recent["count"] if recent else 0,
         }
     
@@ -584,6 +582,13 @@ class UserService:
                 params.append(None)
         
         if profile_picture is not None:
+            from services.photo_service import get_photo_service, PhotoServiceError
+            try:
+                profile_picture = get_photo_service().ensure_file_reference(
+                    profile_picture, f"profile_{user_id}"
+                )
+            except PhotoServiceError as e:
+                raise UserServiceError(str(e))
             updates.append("profile_picture = ?")
             params.append(profile_picture)
         
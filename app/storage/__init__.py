@@ -11,7 +11,10 @@ from .file_store import (
     save_photo,
     read_photo,
     delete_photo,
+    get_photo_url,
 )
+from .blob_store import BlobFileStore
+from .media import MediaCacheMiddleware
 from .cache import (
     Cache,
     CacheEntry,
@@ -35,6 +38,9 @@ __all__ = [
     "save_photo",
     "read_photo",
     "delete_photo",
+    "get_photo_url",
+    "BlobFileStore",
+    "MediaCacheMiddleware",
     "Cache",
     "CacheEntry",
     "LRUCache",
@@ -0,0 +1,664 @@
+"""SQLite BLOB backend for FileStore.
+
+Stores uploaded files as BLOBs in a dedicated SQLite database instead of
+loose files, so the database files are the only thing to back up or
+replicate. Content is written and read through ``Connection.blobopen``
+(incremental blob I/O) in fixed-size chunks, so streams and copies never
+need a second full-size buffer.
+
+The metadata index (``file_index``) and quarantine table have the same
+schema as the filesystem backend, plus a ``blob_id`` pointing into
+``file_blobs``. Blob and index row are written in one transaction, so a
+reader can never see an index row without its content.
+"""
+from __future__ import annotations
+
+import base64
+import io
+import os
+import sqlite3
+import tempfile
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+
+import app_config
+from .database import Database
+from .file_store import FileNotFoundError, FileStore, FileStoreError, _parse_timestamp
+from .image_normalizer import read_dimensions
+
+
+class BlobFileStore(FileStore):
+    """FileStore that keeps file content in SQLite BLOBs.
+
+    Offers the same interface as FileStore (save_bytes, save_stream,
+    read_file_as_bytes, delete_file, get_public_url, quarantine...), with
+    the same deduplication, normalization and reference counting. Files
+    have no on-disk path, so ``get_file_path`` raises; use
+    ``read_file_as_bytes`` or ``open_blob`` instead.
+
+    Attributes:
+        db_path: Path to the SQLite database holding the files
+        max_size_mb: Maximum allowed file size in megabytes
+        allowed_extensions: Tuple of allowed file extensions
+        media_dir: Public directory that published (content-hashed) copies are served from
+        content_addressed: Whether identical content is deduplicated via the hash index
+        normalize_images: Whether images are normalized before they are stored
+    """
+
+    # Spooled uploads stay in memory up to this size before spilling to a temp file
+    SPOOL_MAX_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_size_mb: float = None,
+        allowed_extensions: Tuple[str, ...] = None,
+        media_dir: Optional[Path] = None,
+        content_addressed: Optional[bool] = None,
+        normalize_images: Optional[bool] = None
+    ) -> None:
+        """Initialize the blob store.
+
+        Args:
+            db_path: SQLite file holding the blobs. Defaults to app_config.BLOB_STORE_PATH
+            max_size_mb: Maximum file size in MB. Defaults to app_config.MAX_PHOTO_SIZE_MB
+            allowed_extensions: Allowed file extensions. Defaults to app_config.ALLOWED_PHOTO_EXTENSIONS
+            media_dir: Public media directory. Defaults to app_config.MEDIA_DIR
+            content_addressed: Deduplicate by SHA-256. Defaults to app_config.CONTENT_ADDRESSED_UPLOADS
+            normalize_images: Normalize photos on ingest. Defaults to app_config.PHOTO_NORMALIZE_ON_UPLOAD
+        """
+        self.db_path = str(db_path or app_config.BLOB_STORE_PATH)
+        # The blob database's directory stands in for the uploads directory
+        super().__init__(
+            uploads_dir=Path(self.db_path).parent,
+            max_size_mb=max_size_mb,
+            allowed_extensions=allowed_extensions,
+            media_dir=media_dir,
+            content_addressed=content_addressed,
+            normalize_images=normalize_images,
+            sharded=False
+        )
+
+    def _open_index(self) -> Database:
+        """Blobs and their index live in the same database."""
+        return Database(self.db_path)
+
+    def _ensure_index(self) -> None:
+        """Create the blob table next to the usual index and quarantine tables."""
+        super()._ensure_index()
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS file_blobs (
+                id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL
+            )
+        """)
+        self._index.ensure_column_exists("file_index", "blob_id", "INTEGER")
+        self._index.ensure_column_exists("file_quarantine", "blob_id", "INTEGER")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection whose statements commit together or not at all."""
+        conn = self._index._get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except FileStoreError:
+            conn.rollback()
+            raise
+        except Exception as e:
+            conn.rollback()
+            raise FileStoreError(f"Blob store operation failed: {e}")
+        finally:
+            conn.close()
+
+    def _insert_blob(self, conn: sqlite3.Connection, source: BinaryIO, size_bytes: int) -> int:
+        """Stream content into a new blob row in chunks.
+
+        Args:
+            conn: Open connection (inside a transaction)
+            source: Readable positioned at the start of the content
+            size_bytes: Exact content length
+
+        Returns:
+            Row id of the new blob
+        """
+        blob_id = conn.execute(
+            "INSERT INTO file_blobs (data) VALUES (zeroblob(?))", (size_bytes,)
+        ).lastrowid
+        if size_bytes:
+            with conn.blobopen("file_blobs", "data", blob_id) as blob:
+                for chunk in iter(lambda: source.read(self.HASH_CHUNK_SIZE), b""):
+                    blob.write(chunk)
+        return blob_id
+
+    def _store(
+        self,
+        source: BinaryIO,
+        filename: str,
+        digest: str,
+        size_bytes: int,
+        created_at: Optional[str] = None
+    ) -> str:
+        """Store content and its index row, reusing identical stored content.
+
+        Args:
+            source: Seekable readable holding the complete content
+            filename: Filename for new content
+            digest: SHA-256 hex digest of the content
+            size_bytes: Content length
+            created_at: Creation time to record. Defaults to now
+
+        Returns:
+            The filename the content is stored under
+        """
+        with self._index_lock:
+            if self.content_addressed:
+                existing = self._acquire_existing(digest)
+                if existing:
+                    return existing
+
+            source.seek(0)
+            width, height = read_dimensions(source)
+            source.seek(0)
+            with self._transaction() as conn:
+                blob_id = self._insert_blob(conn, source, size_bytes)
+                conn.execute(
+                    "INSERT INTO file_index "
+                    "(filename, sha256, size_bytes, refcount, width, height, created_at, blob_id) "
+                    "VALUES (?, ?, ?, 1, ?, ?, ?, ?)",
+                    (filename, digest, size_bytes, width, height,
+                     created_at or self._timestamp(), blob_id)
+                )
+        return filename
+
+    def _write_file(self, data: bytes, filename: str, normalize: bool = True) -> str:
+        """Write content to a new blob, reusing an identical stored file if present."""
+        if normalize:
+            data, filename = self._normalize(data, filename)
+        return self._store(io.BytesIO(data), filename, self._compute_hash(data), len(data))
+
+    def save_stream(
+        self,
+        readable: BinaryIO,
+        original_name: str = "file.jpg",
+        validate: bool = True,
+        custom_name: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> str:
+        """Save a file-like object without holding large uploads in memory.
+
+        Content is validated and hashed while it is spooled (in memory up to
+        SPOOL_MAX_BYTES, then to a temp file), and is then streamed into
+        its blob.
+
+        Args:
+            readable: Binary file-like object with a ``read(n)`` method
+            original_name: Original filename (for extension)
+            validate: Whether to validate type and size
+            custom_name: Optional custom name to use in filename (e.g., animal name)
+            chunk_size: Bytes per read. Defaults to HASH_CHUNK_SIZE
+
+        Returns:
+            The saved filename
+
+        Raises:
+            FileTypeError: If file type not allowed
+            FileSizeError: If file too large
+            FileStoreError: If the write fails
+        """
+        if validate:
+            self._validate_extension(original_name)
+
+        if custom_name:
+            filename = self._generate_named_filename(custom_name, original_name)
+        else:
+            filename = self._generate_unique_filename(original_name)
+
+        with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_BYTES) as spool:
+            try:
+                digest, size = self._copy_validated(readable, spool, validate, chunk_size)
+            except FileStoreError:
+                raise
+            except Exception as e:
+                raise FileStoreError(f"Failed to save file: {e}")
+
+            if self.normalize_images:
+                # Decoded from the spool; only the downsized output is in memory
+                spool.seek(0)
+                data, normalized_name = self._normalize(spool, filename)
+                if data is not spool:
+                    return self._write_file(data, normalized_name, normalize=False)
+
+            return self._store(spool, filename, digest, size)
+
+    def find_by_hash(self, sha256: str) -> Optional[str]:
+        """Look up a stored file by its content hash.
+
+        Args:
+            sha256: SHA-256 hex digest of the content
+
+        Returns:
+            Filename holding that content, or None
+        """
+        if not self.content_addressed:
+            return None
+        row = self._index.fetch_one(
+            "SELECT filename FROM file_index WHERE sha256 = ? ORDER BY created_at LIMIT 1",
+            (sha256,)
+        )
+        return row["filename"] if row else None
+
+    @contextmanager
+    def open_blob(self, filename: str) -> Iterator[sqlite3.Blob]:
+        """Open a stored file's content for chunked, read-only access.
+
+        The yielded ``sqlite3.Blob`` supports ``read(n)``, ``seek`` and
+        ``tell`` and is only valid inside the ``with`` block.
+
+        Args:
+            filename: Filename to open
+
+        Raises:
+            FileNotFoundError: If the file is not stored
+        """
+        conn = self._index._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT blob_id FROM file_index WHERE filename = ?", (filename,)
+            ).fetchone()
+            if row is None or row["blob_id"] is None:
+                raise FileNotFoundError(f"File not found: {filename}")
+            with conn.blobopen("file_blobs", "data", row["blob_id"], readonly=True) as blob:
+                yield blob
+        except sqlite3.Error as e:
+            raise FileStoreError(f"Failed to read file: {e}")
+        finally:
+            conn.close()
+
+    def _copy_to(self, filename: str, out: BinaryIO) -> int:
+        """Stream a stored file into a writable in chunks.
+
+        Returns:
+            Bytes copied
+        """
+        copied = 0
+        with self.open_blob(filename) as blob:
+            for chunk in iter(lambda: blob.read(self.HASH_CHUNK_SIZE), b""):
+                out.write(chunk)
+                copied += len(chunk)
+        return copied
+
+    def read_file_as_bytes(self, filename: str) -> bytes:
+        """Read a stored file and return its raw bytes.
+
+        Args:
+            filename: Filename to read
+
+        Returns:
+            File content as bytes
+
+        Raises:
+            FileNotFoundError: If the file is not stored
+        """
+        with self.open_blob(filename) as blob:
+            data = blob.read()
+        self._touch(filename)
+        return data
+
+    def read_file_as_base64(self, filename: str) -> str:
+        """Read a stored file and return its content as base64."""
+        return base64.b64encode(self.read_file_as_bytes(filename)).decode()
+
+    def delete_file(self, filename: str) -> bool:
+        """Release one reference to a file, deleting its blob with the last one.
+
+        Args:
+            filename: Filename to delete
+
+        Returns:
+            True if the reference was released, False if the file didn't exist
+        """
+        with self._index_lock:
+            row = self._index.fetch_one(
+                "SELECT refcount, blob_id, sha256 FROM file_index WHERE filename = ?", (filename,)
+            )
+            if not row:
+                return False
+
+            if row["refcount"] > 1:
+                self._index.execute(
+                    "UPDATE file_index SET refcount = refcount - 1 WHERE filename = ?",
+                    (filename,)
+                )
+                return True
+
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM file_blobs WHERE id = ?", (row["blob_id"],))
+                conn.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+            self._touched.pop(filename, None)
+            self._unpublish(filename, row["sha256"])
+            return True
+
+    def rename_file(self, old_filename: str, new_name: str) -> str:
+        """Rename a file with a new custom name while preserving extension.
+
+        Only the index row changes; the blob is not copied. Shared files
+        keep their current name.
+
+        Args:
+            old_filename: Current filename in storage
+            new_name: New name to use (e.g., animal name like 'ashley')
+
+        Returns:
+            The new filename after renaming
+
+        Raises:
+            FileNotFoundError: If the old file doesn't exist
+        """
+        with self._index_lock:
+            if not self.file_exists(old_filename):
+                raise FileNotFoundError(f"File not found: {old_filename}")
+            if self.get_refcount(old_filename) > 1:
+                return old_filename
+
+            new_filename = self._generate_named_filename(new_name, old_filename)
+            self._index.execute(
+                "UPDATE file_index SET filename = ? WHERE filename = ?",
+                (new_filename, old_filename)
+            )
+            self._public_names.pop(old_filename, None)
+
+        print(f"[INFO] Renamed photo: {old_filename} -> {new_filename}")
+        return new_filename
+
+    def quarantine_file(self, filename: str) -> int:
+        """Take a file out of service without deleting its blob.
+
+        Args:
+            filename: Filename to quarantine
+
+        Returns:
+            Size in bytes of the quarantined file, or 0 if it did not exist
+        """
+        with self._index_lock:
+            row = self._index.fetch_one(
+                "SELECT sha256, size_bytes, created_at, blob_id FROM file_index WHERE filename = ?",
+                (filename,)
+            )
+            if not row:
+                return 0
+
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO file_quarantine "
+                    "(filename, sha256, size_bytes, created_at, quarantined_at, blob_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (filename, row["sha256"], row["size_bytes"], row["created_at"],
+                     self._timestamp(), row["blob_id"])
+                )
+                conn.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+            self._touched.pop(filename, None)
+            # A restored file is published again on its next render
+            self._unpublish(filename, row["sha256"])
+
+        return row["size_bytes"]
+
+    def restore_file(self, filename: str) -> bool:
+        """Put a quarantined file back into service.
+
+        Args:
+            filename: Filename to restore
+
+        Returns:
+            True if restored, False if it was not quarantined
+        """
+        with self._index_lock:
+            row = self._index.fetch_one("SELECT * FROM file_quarantine WHERE filename = ?", (filename,))
+            if not row:
+                return False
+
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO file_index "
+                    "(filename, sha256, size_bytes, refcount, created_at, blob_id) "
+                    "VALUES (?, ?, ?, 1, ?, ?)",
+                    (filename, row["sha256"], row["size_bytes"],
+                     row["created_at"] or self._timestamp(), row["blob_id"])
+                )
+                conn.execute("DELETE FROM file_quarantine WHERE filename = ?", (filename,))
+
+        with self.open_blob(filename) as blob:
+            width, height = read_dimensions(blob)
+        if width:
+            self._index.execute(
+                "UPDATE file_index SET width = ?, height = ? WHERE filename = ?",
+                (width, height, filename)
+            )
+
+        print(f"[INFO] FileStore: Restored {filename} from quarantine")
+        return True
+
+    def purge_quarantined(self, filename: str) -> int:
+        """Permanently delete a quarantined file and its blob.
+
+        Args:
+            filename: Filename to purge
+
+        Returns:
+            Bytes freed (0 if the file was not quarantined)
+        """
+        with self._index_lock:
+            row = self._index.fetch_one(
+                "SELECT size_bytes, blob_id, sha256 FROM file_quarantine WHERE filename = ?", (filename,)
+            )
+            if not row:
+                return 0
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM file_blobs WHERE id = ?", (row["blob_id"],))
+                conn.execute("DELETE FROM file_quarantine WHERE filename = ?", (filename,))
+            # Copies published before the file was quarantined
+            self._unpublish(filename, row["sha256"])
+        return row["size_bytes"]
+
+    def index_existing_files(self) -> int:
+        """Nothing to index: every blob is written together with its index row."""
+        return 0
+
+    def migrate_to_sharded(self) -> int:
+        """Nothing to move: blobs have no directory layout."""
+        return 0
+
+    def import_files(self, source: FileStore, batch_size: int = 100) -> int:
+        """Copy every file of a filesystem store into this one.
+
+        Filenames and creation times are kept, so database references stay
+        valid after switching FILE_STORE_BACKEND. Files already present are
+        skipped, so an interrupted import can simply be run again.
+
+        Args:
+            source: Filesystem store to copy from
+            batch_size: Index rows read per page
+
+        Returns:
+            Number of files imported
+        """
+        imported = 0
+        after = ""
+        while True:
+            records = source.list_file_records(after=after, limit=batch_size)
+            for record in records:
+                filename = record["filename"]
+                if self.file_exists(filename):
+                    continue
+                try:
+                    path = source.get_file_path(filename)
+                    with open(path, "rb") as f:
+                        digest = source.get_file_hash(filename) or source._hash_file(path)
+                        self._store(f, filename, digest, path.stat().st_size, record.get("created_at"))
+                except (OSError, FileStoreError) as e:
+                    print(f"[WARN] BlobFileStore: Could not import {filename}: {e}")
+                    continue
+                imported += 1
+            if len(records) < batch_size:
+                break
+            after = records[-1]["filename"]
+
+        if imported:
+            print(f"[INFO] BlobFileStore: Imported {imported} file(s) from {source.uploads_dir}")
+        return imported
+
+    def get_file_path(self, filename: str) -> Path:
+        """Blobs have no filesystem path.
+
+        Raises:
+            FileStoreError: Always; use read_file_as_bytes or open_blob
+        """
+        raise FileStoreError(
+            f"{filename} is stored in {self.db_path}; use read_file_as_bytes() or open_blob()"
+        )
+
+    def get_signature(self, filename: str) -> Optional[Tuple[int, int]]:
+        """Get (blob_id, size) for a stored file; a new blob id means new content."""
+        row = self._index.fetch_one(
+            "SELECT blob_id, size_bytes FROM file_index WHERE filename = ?", (filename,)
+        )
+        return (row["blob_id"], row["size_bytes"]) if row else None
+
+    def file_exists(self, filename: str) -> bool:
+        """Check if a file is stored."""
+        return self._index.fetch_one(
+            "SELECT 1 AS found FROM file_index WHERE filename = ?", (filename,)
+        ) is not None
+
+    def get_file_info(self, filename: str) -> Dict[str, Any]:
+        """Get metadata about a stored file.
+
+        Args:
+            filename: Filename to describe
+
+        Returns:
+            Dictionary with the same keys as FileStore.get_file_info;
+            ``full_path`` names the database and file
+
+        Raises:
+            FileNotFoundError: If the file is not stored
+        """
+        row = self._index.fetch_one("SELECT * FROM file_index WHERE filename = ?", (filename,))
+        if not row:
+            raise FileNotFoundError(f"File not found: {filename}")
+
+        created_at = _parse_timestamp(row["created_at"])
+        return {
+            "filename": filename,
+            "size_bytes": row["size_bytes"],
+            "size_mb": row["size_bytes"] / (1024 * 1024),
+            "extension": Path(filename).suffix.lower(),
+            "sha256": row["sha256"],
+            "width": row.get("width"),
+            "height": row.get("height"),
+            "refcount": row["refcount"],
+            "created_at": created_at,
+            "modified_at": created_at,
+            "last_accessed_at": _parse_timestamp(row.get("last_accessed_at")),
+            "full_path": f"{self.db_path}#{filename}",
+        }
+
+    def cleanup_old_files(self, days: int = 30) -> int:
+        """Delete files older than specified days, regardless of references.
+
+        Args:
+            days: Delete files older than this many days
+
+        Returns:
+            Number of files deleted
+        """
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
+        with self._index_lock, self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT filename, blob_id, sha256 FROM file_index WHERE created_at < ?", (cutoff,)
+            ).fetchall()
+            for row in rows:
+                conn.execute("DELETE FROM file_blobs WHERE id = ?", (row["blob_id"],))
+                conn.execute("DELETE FROM file_index WHERE filename = ?", (row["filename"],))
+        for row in rows:
+            self._touched.pop(row["filename"], None)
+            self._unpublish(row["filename"], row["sha256"])
+        return len(rows)
+
+    def get_public_url(self, filename: str) -> str:
+        """Publish a stored file under a content-hashed name and return its URL.
+
+        The public name comes from the indexed SHA-256, so publishing only
+        streams the blob out once and never re-hashes it.
+
+        Args:
+            filename: Filename to publish
+
+        Returns:
+            URL path such as '/media/3f2a...c9.jpg'
+
+        Raises:
+            FileNotFoundError: If the file is not stored
+            FileStoreError: If the file could not be published
+        """
+        row = self._index.fetch_one(
+            "SELECT sha256, blob_id, size_bytes FROM file_index WHERE filename = ?", (filename,)
+        )
+        if not row:
+            raise FileNotFoundError(f"File not found: {filename}")
+
+        signature = (row["blob_id"], row["size_bytes"])
+
+        with self._publish_lock:
+            cached = self._public_names.get(filename)
+            if cached and cached[0] == signature and (self.media_dir / cached[1]).exists():
+                return app_config.MEDIA_URL_PREFIX + cached[1]
+
+            public_name = self._public_name(row["sha256"], filename)
+            public_path = self.media_dir / public_name
+
+            if not public_path.exists():
+                self.media_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.media_dir / f".{public_name}.{uuid.uuid4().hex[:8]}.tmp"
+                try:
+                    with open(tmp_path, "wb") as out:
+                        self._copy_to(filename, out)
+                    os.replace(tmp_path, public_path)
+                except FileStoreError:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
+                except Exception as e:
+                    tmp_path.unlink(missing_ok=True)
+                    raise FileStoreError(f"Failed to publish file: {e}")
+
+            self._public_names[filename] = (signature, public_name)
+
+        self._touch(filename)
+        return app_config.MEDIA_URL_PREFIX + public_name
+
+    def copy_file(self, filename: str, destination: Path) -> str:
+        """Write a stored file out to a directory.
+
+        Args:
+            filename: Filename to copy
+            destination: Destination directory
+
+        Returns:
+            Full path to the copied file
+        """
+        if not self.file_exists(filename):
+            raise FileNotFoundError(f"File not found: {filename}")
+
+        destination = Path(destination)
+        destination.mkdir(parents=True, exist_ok=True)
+
+        dest_path = destination / filename
+        with open(dest_path, "wb") as out:
+            self._copy_to(filename, out)
+        return str(dest_path)
+
+
+__all__ = ["BlobFileStore"]
@@ -7,7 +7,7 @@ import threading
 import time
 from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -282,44 +282,80 @@ class LRUCache(Generic[T]):
     """Least Recently Used (LRU) cache with fixed size.
     
     When the cache is full, the least recently accessed item is evicted.
+    Optionally also bounded by total bytes, measured with ``size_fn``.
     Thread-safe implementation using OrderedDict.
     
     Example:
         cache = LRUCache[dict](max_size=100)
         cache.set("user:1", {"name": "Alice"})
         user = cache.get("user:1")
+        
+        photos = LRUCache[str](max_size=500, max_bytes=64 * 1024 * 1024, size_fn=len)
     """
     
-    def __init__(self, max_size: int = 100) -> None:
+    def __init__(
+        self,
+        max_size: int = 100,
+        max_bytes: Optional[int] = None,
+        size_fn: Optional[Callable[[T], int]] = None
+    ) -> None:
         """Initialize the LRU cache.
         
         Args:
             max_size: Maximum number of entries
+            max_bytes: Optional maximum total size of cached values
+            size_fn: Function returning a value's size in bytes (required with max_bytes)
         """
-        self._data: OrderedDict[str, T] = OrderedDict()
+        if max_bytes is not None and size_fn is None:
+            raise ValueError("size_fn is required when max_bytes is set")
+        
+        self._data: OrderedDict[Hashable, T] = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
         self._lock = threading.RLock()
         self.max_size = max(1, max_size)
+        self.max_bytes = max_bytes
+        self._size_fn = size_fn
+        self._bytes = 0
         
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
     
-    def set(self, key: str, value: T) -> None:
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and its size accounting (caller holds the lock)."""
+        del self._data[key]
+        self._bytes -= self._sizes.pop(key, 0)
+    
+    def set(self, key: Hashable, value: T) -> None:
         """Store a value in the cache.
         
+        Values larger than ``max_bytes`` on their own are not cached.
+        
         Args:
             key: Cache key
             value: Value to cache
         """
+        size = self._size_fn(value) if self._size_fn else 0
+        
         with self._lock:
             if key in self._data:
-                del self._data[key]
+                self._remove(key)
+            
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
             
             self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
             
-            while len(self._data) > self.max_size:
-                self._data.popitem(last=False)
+            while len(self._data) > self.max_size or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._data))
+                self._remove(oldest_key)
+                self._evictions += 1
     
-    def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
+    def get(self, key: Hashable, default: Optional[T] = None) -> Optional[T]:
         """Retrieve a value from the cache.
         
         Accessing a key moves it to the end (most recently used).
@@ -340,33 +376,58 @@ class LRUCache(Generic[T]):
             self._hits += 1
             return self._data[key]
     
-    def delete(self, key: str) -> bool:
+    def delete(self, key: Hashable) -> bool:
         """Remove a key from the cache."""
         with self._lock:
             if key in self._data:
-                del self._data[key]
+                self._remove(key)
                 return True
             return False
     
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches a predicate.
+        
+        Args:
+            predicate: Function called with each key
+            
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+    
     def clear(self) -> None:
         """Remove all entries from the cache."""
         with self._lock:
             self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
     
     def size(self) -> int:
         """Get the number of entries in the cache."""
         return len(self._data)
     
+    def size_bytes(self) -> int:
+        """Get the total size of cached values as measured by size_fn."""
+        return self._bytes
+    
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        total = self._hits + self._misses
-        return {
-            "size": len(self._data),
-            "max_size": self.max_size,
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_rate_percent": round(self._hits / total * 100, 2) if total > 0 else 0,
-        }
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "size_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_percent": round(self._hits / total * 100, 2) if total > 0 else 0,
+                "evictions": self._evictions,
+            }
 
 
 def _make_cache_key(*args, **kwargs) -> str:
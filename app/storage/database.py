@@ -2,10 +2,37 @@
 from __future__ import annotations
 
 import sqlite3
+import time
 from typing import Any, Dict, List, Optional, Sequence
 import app_config
 
 
+# Integer epoch-second shadows of text timestamp columns:
+# (table, source, shadow, source is local time). Triggers keep them in step on
+# every write, so range filters compare integers. Columns defaulting to
+# CURRENT_TIMESTAMP are UTC; those written with datetime.now() are local time
+# and are converted, so every shadow counts UTC seconds.
+EPOCH_COLUMNS = (
+	("animals", "intake_date", "intake_ts", False),
+	("rescue_missions", "mission_date", "mission_ts", False),
+	("rescue_missions", "rescued_at", "rescued_ts", True),
+	("adoption_requests", "request_date", "request_ts", False),
+	("adoption_requests", "approved_at", "approved_ts", True),
+	("adoption_requests", "decided_at", "decided_ts", True),
+)
+
+
+def sql_epoch(column: str, local: bool = False) -> str:
+	"""SQL expression for the epoch seconds of a stored timestamp.
+
+	Reads the first 19 characters ('YYYY-MM-DD HH:MM:SS' or ISO with a 'T'),
+	ignoring fractions and UTC offsets; NULL or unparseable values give NULL.
+	With `local`, the value is read as local time of the host's zone.
+	"""
+	modifier = ", 'utc'" if local else ""
+	return f"CAST(strftime('%s', substr({column}, 1, 19){modifier}) AS INTEGER)"
+
+
 class Database:
 	"""Lightweight sqlite3 wrapper. Thread-safe: opens a fresh connection per operation."""
 
@@ -149,6 +176,7 @@ class Database:
 			intake_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 			updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 			photo TEXT,
+			photo_placeholder TEXT,
 			rescue_mission_id INTEGER,
 			FOREIGN KEY(rescue_mission_id) REFERENCES rescue_missions(id) ON DELETE SET NULL
 		);
@@ -246,6 +274,15 @@ class Database:
 			if 'breed' not in columns:
 				cur.execute("ALTER TABLE animals ADD COLUMN breed TEXT")
 				conn.commit()
+			if 'photo_placeholder' not in columns:
+				cur.execute("ALTER TABLE animals ADD COLUMN photo_placeholder TEXT")
+				conn.commit()
+			if 'breed_key' not in columns:
+				cur.execute("ALTER TABLE animals ADD COLUMN breed_key TEXT")
+				conn.commit()
+			if 'species_key' not in columns:
+				cur.execute("ALTER TABLE animals ADD COLUMN species_key TEXT")
+				conn.commit()
 			
 			# Check if admin_message column exists in rescue_missions table
 			cur.execute("PRAGMA table_info(rescue_missions)")
@@ -282,6 +319,9 @@ class Database:
 			if 'animal_photo' not in rescue_columns:
 				cur.execute("ALTER TABLE rescue_missions ADD COLUMN animal_photo TEXT")
 				conn.commit()
+			if 'breed_key' not in rescue_columns:
+				cur.execute("ALTER TABLE rescue_missions ADD COLUMN breed_key TEXT")
+				conn.commit()
 			
 			# Check if adoption_requests needs migration (animal_id should allow NULL)
 			cur.execute("PRAGMA table_info(adoption_requests)")
@@ -450,6 +490,15 @@ class Database:
 			if 'approved_at' not in adopt_cols_final:
 				cur.execute("ALTER TABLE adoption_requests ADD COLUMN approved_at TIMESTAMP")
 				conn.commit()
+			if 'decided_at' not in adopt_cols_final:
+				cur.execute("ALTER TABLE adoption_requests ADD COLUMN decided_at TIMESTAMP")
+				# Backfill: best known decision time of already approved/denied requests
+				# (all three columns hold local time)
+				cur.execute("""
+					UPDATE adoption_requests SET decided_at = COALESCE(approved_at, updated_at)
+					WHERE REPLACE(LOWER(status), '|archived', '') IN ('approved', 'adopted', 'completed', 'denied')
+				""")
+				conn.commit()
 			
 			# Add archive/remove columns to animals
 			cur.execute("PRAGMA table_info(animals)")
@@ -552,9 +601,225 @@ class Database:
 				cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_phone_unique ON users(phone) WHERE phone IS NOT NULL")
 				conn.commit()
 				print("[INFO] Created unique index on users.phone column")
-				
+			
+			# =========================================================================
+			# Guard photo columns against new inline base64 writes
+			# =========================================================================
+			# Photos belong in FileStore; these columns only hold short filenames.
+			# Existing legacy rows are left alone (UPDATE triggers only fire when the
+			# value changes) and are moved out by PhotoMigrationService.
+			max_len = app_config.MAX_PHOTO_REFERENCE_LENGTH
+			for table, column in (
+				("animals", "photo"),
+				("rescue_missions", "animal_photo"),
+				("users", "profile_picture"),
+			):
+				message = f"inline photo data not allowed in {table}.{column}; save it to FileStore"
+				cur.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS trg_{table}_{column}_no_inline_insert
+					BEFORE INSERT ON {table}
+					WHEN length(NEW.{column}) > {max_len}
+					BEGIN
+						SELECT RAISE(ABORT, '{message}');
+					END
+				""")
+				cur.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS trg_{table}_{column}_no_inline_update
+					BEFORE UPDATE OF {column} ON {table}
+					WHEN NEW.{column} IS NOT OLD.{column} AND length(NEW.{column}) > {max_len}
+					BEGIN
+						SELECT RAISE(ABORT, '{message}');
+					END
+				""")
+			conn.commit()
+
+			# =========================================================================
+			# Per-user lookups (user dashboard and analytics)
+			# =========================================================================
+			cur.execute("CREATE INDEX IF NOT EXISTS idx_rescue_missions_user ON rescue_missions(user_id)")
+			cur.execute("CREATE INDEX IF NOT EXISTS idx_adoption_requests_user ON adoption_requests(user_id)")
+			conn.commit()
+
+			# =========================================================================
+			# Normalized breed/species keys (breed rankings group by these)
+			# =========================================================================
+			# Services store the keys on every write; rows without one (older
+			# databases, direct SQL writes) are filled in here.
+			cur.execute("CREATE INDEX IF NOT EXISTS idx_animals_breed_key ON animals(breed_key, species_key)")
+			cur.execute("CREATE INDEX IF NOT EXISTS idx_rescue_missions_breed_key ON rescue_missions(breed_key, status)")
+			for table, column, key, normalize in (
+				("animals", "breed", "breed_key", app_config.normalize_breed),
+				("animals", "species", "species_key", app_config.normalize_species),
+				("rescue_missions", "breed", "breed_key", app_config.normalize_breed),
+			):
+				rows = cur.execute(f"SELECT id, {column} FROM {table} WHERE {key} IS NULL").fetchall()
+				if rows:
+					cur.executemany(
+						f"UPDATE {table} SET {key} = ? WHERE id = ?",
+						[(normalize(value), row_id) for row_id, value in rows]
+					)
+			conn.commit()
+
+			# =========================================================================
+			# Epoch shadow columns of timestamps (see EPOCH_COLUMNS)
+			# =========================================================================
+			for table, source, shadow, local in EPOCH_COLUMNS:
+				cur.execute(f"PRAGMA table_info({table})")
+				if shadow not in [row[1] for row in cur.fetchall()]:
+					cur.execute(f"ALTER TABLE {table} ADD COLUMN {shadow} INTEGER")
+					cur.execute(f"UPDATE {table} SET {shadow} = {sql_epoch(source, local)} WHERE {source} IS NOT NULL")
+				cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{shadow} ON {table}({shadow})")
+				self._create_epoch_triggers(cur, table, source, shadow, local)
+			conn.commit()
+
+			# =========================================================================
+			# Per-user data versions (user insight cache keys)
+			# =========================================================================
+			# Bumped in the writing transaction whenever one of a user's missions or
+			# requests changes, or an animal they requested changes breed/species.
+			cur.execute("""
+				CREATE TABLE IF NOT EXISTS user_data_versions (
+					user_id INTEGER PRIMARY KEY,
+					version INTEGER NOT NULL DEFAULT 0
+				)
+			""")
+
+			def bump(user_sql: str, where: str = "") -> str:
+				return (
+					f"INSERT INTO user_data_versions (user_id, version) {user_sql} "
+					f"{where} ON CONFLICT(user_id) DO UPDATE SET version = version + 1;"
+				)
+
+			# Columns the per-user insights read; updates of anything else (e.g. the
+			# *_ts shadows written by other triggers) leave the version alone
+			user_columns = {
+				"rescue_missions": "user_id, status, mission_date",
+				"adoption_requests": "user_id, status, request_date, animal_id, animal_species",
+			}
+			for table, columns in user_columns.items():
+				cur.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS trg_{table}_user_version_insert
+					AFTER INSERT ON {table}
+					WHEN NEW.user_id IS NOT NULL
+					BEGIN
+						{bump("SELECT NEW.user_id, 1", "WHERE 1")}
+					END
+				""")
+				cur.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS trg_{table}_user_version_delete
+					AFTER DELETE ON {table}
+					WHEN OLD.user_id IS NOT NULL
+					BEGIN
+						{bump("SELECT OLD.user_id, 1", "WHERE 1")}
+					END
+				""")
+				# Replaces the first version, which fired on updates of any column
+				cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_user_version_update")
+				cur.execute(f"""
+					CREATE TRIGGER IF NOT EXISTS trg_{table}_user_version_change
+					AFTER UPDATE OF {columns} ON {table}
+					BEGIN
+						{bump("SELECT NEW.user_id, 1", "WHERE NEW.user_id IS NOT NULL")}
+						{bump("SELECT OLD.user_id, 1", "WHERE OLD.user_id IS NOT NULL AND OLD.user_id IS NOT NEW.user_id")}
+					END
+				""")
+			cur.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS trg_animals_user_version_update
+				AFTER UPDATE OF breed, breed_key, species, species_key ON animals
+				BEGIN
+					{bump("SELECT DISTINCT user_id, 1 FROM adoption_requests", "WHERE animal_id = NEW.id AND user_id IS NOT NULL")}
+				END
+			""")
+			conn.commit()
+
+			# =========================================================================
+			# Analytics table versions (analytics cache keys)
+			# =========================================================================
+			# Bumped in the writing transaction on every insert, update or delete of
+			# a table, so caches are keyed by a primary-key lookup instead of a scan.
+			cur.execute("""
+				CREATE TABLE IF NOT EXISTS table_versions (
+					table_name TEXT PRIMARY KEY,
+					version INTEGER NOT NULL DEFAULT 0
+				)
+			""")
+			for table in ("animals", "rescue_missions", "adoption_requests"):
+				for event in ("INSERT", "UPDATE", "DELETE"):
+					cur.execute(f"""
+						CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+						AFTER {event} ON {table}
+						BEGIN
+							INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)
+							ON CONFLICT(table_name) DO UPDATE SET version = version + 1;
+						END
+					""")
+			conn.commit()
+
 		except Exception as e:
 			# Log but don't fail - column might already be in the CREATE TABLE statement
 			print(f"[INFO] Schema migration note: {e}")
 		finally:
 			conn.close()
+
+		# Data migrations must not be swallowed by the block above: a failure stops startup
+		self._run_data_migrations()
+
+	@staticmethod
+	def _create_epoch_triggers(cur: sqlite3.Cursor, table: str, source: str, shadow: str, local: bool) -> None:
+		"""Create the triggers keeping `shadow` equal to the epoch of `source`."""
+		cur.execute(f"""
+			CREATE TRIGGER IF NOT EXISTS trg_{table}_{shadow}_insert
+			AFTER INSERT ON {table}
+			WHEN NEW.{source} IS NOT NULL
+			BEGIN
+				UPDATE {table} SET {shadow} = {sql_epoch(f"NEW.{source}", local)} WHERE id = NEW.id;
+			END
+		""")
+		cur.execute(f"""
+			CREATE TRIGGER IF NOT EXISTS trg_{table}_{shadow}_update
+			AFTER UPDATE OF {source} ON {table}
+			BEGIN
+				UPDATE {table} SET {shadow} = {sql_epoch(f"NEW.{source}", local)} WHERE id = NEW.id;
+			END
+		""")
+
+	def _run_data_migrations(self) -> None:
+		"""Apply one-time data migrations, each in one transaction, recording what was applied.
+
+		Raises:
+			sqlite3.Error: If a migration fails (it is rolled back and retried next start)
+		"""
+		conn = self._get_connection()
+		try:
+			cur = conn.cursor()
+			cur.execute("""
+				CREATE TABLE IF NOT EXISTS schema_migrations (
+					name TEXT PRIMARY KEY,
+					applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+					detail TEXT
+				)
+			""")
+			applied = {row[0] for row in cur.execute("SELECT name FROM schema_migrations").fetchall()}
+
+			if "local_epoch_shadows" not in applied:
+				# Shadows of local-time columns were first computed as if the text
+				# were UTC. Only the derived shadows are recomputed (with the host's
+				# zone, which wrote the text); the stored timestamps are untouched.
+				cur.execute("BEGIN")
+				for table, source, shadow, local in EPOCH_COLUMNS:
+					if not local:
+						continue
+					cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{shadow}_insert")
+					cur.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{shadow}_update")
+					self._create_epoch_triggers(cur, table, source, shadow, local)
+					cur.execute(f"UPDATE {table} SET {shadow} = {sql_epoch(source, local)} WHERE {source} IS NOT NULL")
+				cur.execute(
+					"INSERT INTO schema_migrations (name, detail) VALUES ('local_epoch_shadows', ?)",
+					(f"zone {time.strftime('%Z')}, UTC offset {time.strftime('%z')}",)
+				)
+				conn.commit()
+		except Exception:
+			conn.rollback()
+			raise
+		finally:
+			conn.close()
@@ -3,13 +3,18 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import os
 import shutil
+import threading
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, BinaryIO, Union
 
 import app_config
+from .database import Database
+from .image_normalizer import normalize_image, read_dimensions
 
 
 class FileStoreError(Exception):
@@ -32,23 +37,91 @@ class FileNotFoundError(FileStoreError):
     pass
 
 
+# Bytes needed to recognise every supported image signature
+MIME_SNIFF_BYTES = 12
+
+
+def sniff_mime_type(header: bytes) -> Optional[str]:
+    """Detect an image MIME type from the first bytes of a file.
+    
+    Only the leading ``MIME_SNIFF_BYTES`` are inspected, so callers never
+    need the whole file in memory to check its type.
+    
+    Args:
+        header: Leading bytes of the file
+        
+    Returns:
+        Detected MIME type or None
+    """
+    if len(header) < 4:
+        return None
+    
+    if header[:3] == b'\xff\xd8\xff':
+        return "image/jpeg"
+    elif header[:8] == b'\x89PNG\r\n\x1a\n':
+        return "image/png"
+    elif header[:6] in (b'GIF87a', b'GIF89a'):
+        return "image/gif"
+    elif header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return "image/webp"
+    
+    return None
+
+
 class FileStore:
     """File storage manager for handling uploads and downloads.
     
     Thread-safe file storage utility that manages files in a dedicated
     uploads directory within the storage folder.
     
+    Files are addressed by bare filename. In sharded mode each file lives
+    two hashed subdirectories deep (``uploads/ab/cd/<filename>``) so no
+    directory grows unbounded; files left in the flat layout are still
+    found and are moved into their shard when the store is created.
+    
+    Every stored file has a row in a small SQLite metadata index kept next
+    to the files (name, size, SHA-256, dimensions, created and last access
+    times), so listing, sizing and file info never walk the directory.
+    
+    In content-addressed mode the index is also used for deduplication.
+    Saving content that is already stored returns the existing filename and
+    bumps its reference count instead of writing a new copy; deleting only
+    removes the file from disk once the last reference is gone.
+    
+    With image normalization on, photos are resized, oriented, stripped of
+    metadata and re-encoded before they are stored (see image_normalizer).
+    
     Attributes:
         uploads_dir: Path to the uploads directory
         max_size_mb: Maximum allowed file size in megabytes
         allowed_extensions: Tuple of allowed file extensions
+        media_dir: Public directory that published (content-hashed) copies are served from
+        content_addressed: Whether identical content is deduplicated via the hash index
+        normalize_images: Whether images are normalized before they are stored
+        sharded: Whether files are stored in hashed subdirectories
     """
     
+    # Read size used when hashing, publishing and streaming files
+    HASH_CHUNK_SIZE = 64 * 1024
+    
+    # Metadata index database, kept inside uploads_dir (dotfiles are never listed)
+    INDEX_FILENAME = ".file_index.db"
+    
+    # Minimum seconds between last-access writes for the same file
+    ACCESS_TOUCH_SECONDS = 3600
+    
+    # Hidden directory holding files set aside by the garbage collector
+    QUARANTINE_DIRNAME = ".quarantine"
+    
     def __init__(
         self,
         uploads_dir: Optional[Path] = None,
         max_size_mb: float = None,
-        allowed_extensions: Tuple[str, ...] = None
+        allowed_extensions: Tuple[str, ...] = None,
+        media_dir: Optional[Path] = None,
+        content_addressed: Optional[bool] = None,
+        normalize_images: Optional[bool] = None,
+        sharded: Optional[bool] = None
     ) -> None:
         """Initialize the file store.
         
@@ -56,13 +129,112 @@ class FileStore:
             uploads_dir: Custom uploads directory path. Defaults to storage/uploads
             max_size_mb: Maximum file size in MB. Defaults to app_config.MAX_PHOTO_SIZE_MB
             allowed_extensions: Allowed file extensions. Defaults to app_config.ALLOWED_PHOTO_EXTENSIONS
+            media_dir: Public media directory. Defaults to app_config.MEDIA_DIR
+            content_addressed: Deduplicate by SHA-256. Defaults to app_config.CONTENT_ADDRESSED_UPLOADS
+            normalize_images: Normalize photos on ingest. Defaults to app_config.PHOTO_NORMALIZE_ON_UPLOAD
+            sharded: Use the hashed two-level layout. Defaults to app_config.SHARDED_UPLOADS
         """
         self.uploads_dir = uploads_dir or (app_config.STORAGE_DIR / "uploads")
         self.max_size_mb = max_size_mb if max_size_mb is not None else app_config.MAX_PHOTO_SIZE_MB
         self.allowed_extensions = allowed_extensions or app_config.ALLOWED_PHOTO_EXTENSIONS
+        self.media_dir = Path(media_dir) if media_dir else app_config.MEDIA_DIR
+        self.content_addressed = (
+            content_addressed if content_addressed is not None
+            else app_config.CONTENT_ADDRESSED_UPLOADS
+        )
+        self.normalize_images = (
+            normalize_images if normalize_images is not None
+            else app_config.PHOTO_NORMALIZE_ON_UPLOAD
+        )
+        self.sharded = sharded if sharded is not None else app_config.SHARDED_UPLOADS
+        
+        # filename -> ((mtime_ns, size), public name); avoids re-hashing unchanged files
+        self._public_names: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._publish_lock = threading.Lock()
+        
+        # Serializes hash lookups with the writes/refcount changes that follow them
+        self._index_lock = threading.RLock()
+        
+        # filename -> monotonic time of the last last_accessed_at write
+        self._touched: Dict[str, float] = {}
         
         # Ensure uploads directory exists
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._index = self._open_index()
+        self._ensure_index()
+        
+        if self.sharded:
+            self.migrate_to_sharded()
+        
+        # Listings, sizes and dedup read only the index, so files stored before
+        # it existed are indexed once per store, in whichever layout they are
+        if not self._index.fetch_one("SELECT 1 FROM schema_migrations WHERE name = 'index_existing_files'"):
+            self.index_existing_files()
+            self._index.execute("INSERT OR IGNORE INTO schema_migrations (name) VALUES ('index_existing_files')")
+    
+    def _open_index(self) -> Database:
+        """Open the database holding the metadata index."""
+        return Database(str(self.uploads_dir / self.INDEX_FILENAME))
+    
+    def _ensure_index(self) -> None:
+        """Create the metadata index table if it doesn't exist."""
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS file_index (
+                filename TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                refcount INTEGER NOT NULL DEFAULT 1,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # Columns added with the sharded layout
+        self._index.ensure_columns_exist("file_index", {
+            "width": "INTEGER",
+            "height": "INTEGER",
+            "last_accessed_at": "TEXT",
+        })
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_index_sha256 ON file_index(sha256)"
+        )
+        self._index.execute(
+            "CREATE INDEX IF NOT EXISTS idx_file_index_created_at ON file_index(created_at)"
+        )
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS file_quarantine (
+                filename TEXT PRIMARY KEY,
+                sha256 TEXT,
+                size_bytes INTEGER NOT NULL,
+                created_at TEXT,
+                quarantined_at TEXT NOT NULL
+            )
+        """)
+        # One-time maintenance passes that have completed
+        self._index.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                name TEXT PRIMARY KEY,
+                applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+    
+    @staticmethod
+    def _is_internal(path: Path) -> bool:
+        """Check whether a path is store bookkeeping (index db, temp files)."""
+        return path.name.startswith(".")
+    
+    @staticmethod
+    def _timestamp() -> str:
+        """Current local time in the format stored in the index."""
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    
+    def _shard_path(self, filename: str) -> Path:
+        """Get the sharded location of a file (``uploads/ab/cd/<filename>``)."""
+        digest = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+        return self.uploads_dir / digest[:2] / digest[2:4] / filename
+    
+    def _target_path(self, filename: str) -> Path:
+        """Get the path a new file should be written to in the current layout."""
+        return self._shard_path(filename) if self.sharded else self.uploads_dir / filename
     
     def _generate_unique_filename(self, original_name: str) -> str:
         """Generate a unique filename preserving the original extension.
@@ -130,7 +302,21 @@ class FileStore:
         Raises:
             FileSizeError: If file exceeds size limit
         """
-        size_mb = len(data) / (1024 * 1024)
+        return self._validate_byte_count(len(data))
+    
+    def _validate_byte_count(self, size_bytes: int) -> bool:
+        """Check a byte count against the size limit without needing the data.
+        
+        Args:
+            size_bytes: Size of the file in bytes
+            
+        Returns:
+            True if size is within limits
+            
+        Raises:
+            FileSizeError: If file exceeds size limit
+        """
+        size_mb = size_bytes / (1024 * 1024)
         if size_mb > self.max_size_mb:
             raise FileSizeError(
                 f"File size ({size_mb:.2f} MB) exceeds limit ({self.max_size_mb} MB)"
@@ -138,15 +324,447 @@ class FileStore:
         return True
     
     def _compute_hash(self, data: bytes) -> str:
-        """Compute MD5 hash of file content for integrity checking.
+        """Compute the SHA-256 digest used to address file content.
+        
+        Args:
+            data: File content as bytes
+            
+        Returns:
+            SHA-256 hex digest
+        """
+        return hashlib.sha256(data).hexdigest()
+    
+    def _write_file(self, data: bytes, filename: str, normalize: bool = True) -> str:
+        """Write content to storage, reusing an identical stored file if present.
         
         Args:
             data: File content as bytes
+            filename: Filename to use when the content is new
+            normalize: Whether to run the image normalization stage first
+            
+        Returns:
+            The filename the content is stored under
+            
+        Raises:
+            FileStoreError: If the write fails
+        """
+        if normalize:
+            data, filename = self._normalize(data, filename)
+        
+        digest = self._compute_hash(data)
+        if self.content_addressed:
+            with self._index_lock:
+                existing = self._acquire_existing(digest)
+                if existing:
+                    return existing
+        
+        tmp_path = self._new_temp_path()
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise FileStoreError(f"Failed to save file: {e}")
+        
+        return self._commit_temp(tmp_path, filename, digest, len(data))
+    
+    def _normalize(self, data: Union[bytes, Path, BinaryIO], filename: str) -> Tuple[Any, str]:
+        """Run the ingest normalization stage if enabled.
+        
+        Args:
+            data: Original file content, or a path or binary file holding it
+                  (decoded from the file, never read into memory whole)
+            filename: Intended filename
+            
+        Returns:
+            Tuple of (content to store, filename with matching extension);
+            ``data`` itself is returned when the image is not re-encoded
+        """
+        if not self.normalize_images:
+            return data, filename
+        
+        result = normalize_image(data)
+        if not result.changed:
+            return data, filename
+        return result.data, f"{Path(filename).stem}{result.extension}"
+    
+    def _new_temp_path(self) -> Path:
+        """Get a fresh temp path inside uploads_dir (hidden from listings)."""
+        return self.uploads_dir / f".upload_{uuid.uuid4().hex}.tmp"
+    
+    def _acquire_existing(self, digest: str) -> Optional[str]:
+        """Add a reference to stored content with this digest, if any.
+        
+        Caller must hold ``_index_lock``.
+        
+        Args:
+            digest: SHA-256 hex digest
+            
+        Returns:
+            Existing filename (now with one more reference), or None
+        """
+        existing = self.find_by_hash(digest)
+        if existing:
+            self._index.execute(
+                "UPDATE file_index SET refcount = refcount + 1 WHERE filename = ?",
+                (existing,)
+            )
+        return existing
+    
+    def _commit_temp(self, tmp_path: Path, filename: str, digest: str, size_bytes: int) -> str:
+        """Atomically move a fully written temp file into place and index it.
+        
+        In content-addressed mode, content that was stored concurrently
+        while the temp file was being written is reused instead.
+        
+        Args:
+            tmp_path: Completed temp file
+            filename: Final filename for new content
+            digest: SHA-256 hex digest of the content
+            size_bytes: File size in bytes
+            
+        Returns:
+            The filename the content is stored under
+            
+        Raises:
+            FileStoreError: If the rename fails
+        """
+        with self._index_lock:
+            if self.content_addressed:
+                existing = self._acquire_existing(digest)
+                if existing:
+                    tmp_path.unlink(missing_ok=True)
+                    return existing
+            
+            target = self._target_path(filename)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp_path, target)
+            except Exception as e:
+                tmp_path.unlink(missing_ok=True)
+                raise FileStoreError(f"Failed to save file: {e}")
+            
+            self._index_row(filename, target, digest, size_bytes)
+        
+        return filename
+    
+    def _index_row(self, filename: str, path: Path, digest: str, size_bytes: int) -> None:
+        """Insert or replace the metadata row of a stored file (one reference)."""
+        width, height = read_dimensions(path)
+        self._index.execute(
+            "INSERT OR REPLACE INTO file_index "
+            "(filename, sha256, size_bytes, refcount, width, height, created_at) "
+            "VALUES (?, ?, ?, 1, ?, ?, ?)",
+            (filename, digest, size_bytes, width, height, self._timestamp())
+        )
+    
+    def _touch(self, filename: str) -> None:
+        """Record a read of a file, writing at most once per ACCESS_TOUCH_SECONDS."""
+        now = time.monotonic()
+        last = self._touched.get(filename)
+        if last is not None and now - last < self.ACCESS_TOUCH_SECONDS:
+            return
+        self._touched[filename] = now
+        self._index.execute(
+            "UPDATE file_index SET last_accessed_at = ? WHERE filename = ?",
+            (self._timestamp(), filename)
+        )
+    
+    def save_stream(
+        self,
+        readable: BinaryIO,
+        original_name: str = "file.jpg",
+        validate: bool = True,
+        custom_name: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> str:
+        """Save a file-like object to disk without holding it in memory.
+        
+        Content is copied in chunks to a temp file while being hashed. With
+        validation on, the image type is checked from the first bytes and the
+        copy aborts as soon as the size limit is passed. The temp file is
+        renamed into place only once complete, so readers never see a
+        partial file. Normalization decodes the temp file directly; only its
+        downsized output is held in memory.
+        
+        Args:
+            readable: Binary file-like object with a ``read(n)`` method
+            original_name: Original filename (for extension)
+            validate: Whether to validate type and size
+            custom_name: Optional custom name to use in filename (e.g., animal name)
+            chunk_size: Bytes per read. Defaults to HASH_CHUNK_SIZE
+            
+        Returns:
+            The saved filename (not full path). In content-addressed mode this
+            is the existing filename when identical content is already stored.
+            
+        Raises:
+            FileTypeError: If file type not allowed
+            FileSizeError: If file too large
+            FileStoreError: If the write fails
+        """
+        if validate:
+            self._validate_extension(original_name)
+        
+        tmp_path = self._new_temp_path()
+        try:
+            with open(tmp_path, "wb") as out:
+                digest, size = self._copy_validated(readable, out, validate, chunk_size)
+        except FileStoreError:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise FileStoreError(f"Failed to save file: {e}")
+        
+        if custom_name:
+            filename = self._generate_named_filename(custom_name, original_name)
+        else:
+            filename = self._generate_unique_filename(original_name)
+        
+        if self.normalize_images:
+            # Decoded from the temp file; only the downsized output is in memory
+            data, normalized_name = self._normalize(tmp_path, filename)
+            if data is not tmp_path:
+                tmp_path.unlink(missing_ok=True)
+                return self._write_file(data, normalized_name, normalize=False)
+        
+        return self._commit_temp(tmp_path, filename, digest, size)
+    
+    def _copy_validated(
+        self,
+        readable: BinaryIO,
+        out: BinaryIO,
+        validate: bool,
+        chunk_size: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """Copy a stream in chunks while hashing and, optionally, validating it.
+        
+        The image type is checked from the first bytes and the copy aborts as
+        soon as the size limit is passed.
+        
+        Args:
+            readable: Source with a ``read(n)`` method
+            out: Destination with a ``write`` method
+            validate: Whether to check type and size
+            chunk_size: Bytes per read. Defaults to HASH_CHUNK_SIZE
+            
+        Returns:
+            Tuple of (SHA-256 hex digest, bytes copied)
+            
+        Raises:
+            FileTypeError: If the content is not an allowed image type
+            FileSizeError: If the content is too large
+        """
+        chunk_size = chunk_size or self.HASH_CHUNK_SIZE
+        max_bytes = self.max_size_mb * 1024 * 1024
+        digest = hashlib.sha256()
+        size = 0
+        header = b""
+        
+        while True:
+            chunk = readable.read(chunk_size)
+            if not chunk:
+                break
+            
+            if validate and len(header) < MIME_SNIFF_BYTES:
+                header += chunk[:MIME_SNIFF_BYTES - len(header)]
+                if len(header) >= MIME_SNIFF_BYTES:
+                    self._validate_mime(header)
+            
+            size += len(chunk)
+            if validate and size > max_bytes:
+                self._validate_byte_count(size)
+            
+            digest.update(chunk)
+            out.write(chunk)
+        
+        if validate and len(header) < MIME_SNIFF_BYTES:
+            self._validate_mime(header)
+        return digest.hexdigest(), size
+    
+    def _validate_mime(self, header: bytes) -> bool:
+        """Check the sniffed image type of a file header.
+        
+        Args:
+            header: Leading bytes of the file
+            
+        Returns:
+            True if the type is allowed
+            
+        Raises:
+            FileTypeError: If the content is not an allowed image type
+        """
+        if sniff_mime_type(header) not in app_config.ALLOWED_MIME_TYPES:
+            raise FileTypeError(
+                f"File content is not an allowed image type. "
+                f"Allowed types: {', '.join(app_config.ALLOWED_MIME_TYPES)}"
+            )
+        return True
+    
+    def validate_upload(self, path: Path | str, original_name: Optional[str] = None) -> str:
+        """Check an uploaded file's extension, size and type without reading it all.
+        
+        Args:
+            path: Path to the uploaded file
+            original_name: Name used for the extension check. Defaults to the path name
+            
+        Returns:
+            The sniffed MIME type
+            
+        Raises:
+            FileTypeError: If file type not allowed
+            FileSizeError: If file too large
+            FileNotFoundError: If the file does not exist
+        """
+        path = Path(path)
+        self._validate_extension(original_name or path.name)
+        
+        try:
+            self._validate_byte_count(path.stat().st_size)
+            with open(path, "rb") as f:
+                header = f.read(MIME_SNIFF_BYTES)
+        except OSError:
+            raise FileNotFoundError(f"File not found: {path.name}")
+        
+        self._validate_mime(header)
+        return sniff_mime_type(header)
+    
+    def find_by_hash(self, sha256: str) -> Optional[str]:
+        """Look up a stored file by its content hash.
+        
+        Index rows whose file has disappeared from disk are dropped.
+        
+        Args:
+            sha256: SHA-256 hex digest of the content
+            
+        Returns:
+            Filename holding that content, or None
+        """
+        if not self.content_addressed:
+            return None
+        
+        with self._index_lock:
+            rows = self._index.fetch_all(
+                "SELECT filename FROM file_index WHERE sha256 = ? ORDER BY created_at",
+                (sha256,)
+            )
+            for row in rows:
+                if self.get_file_path(row["filename"]).exists():
+                    return row["filename"]
+                self._index.execute("DELETE FROM file_index WHERE filename = ?", (row["filename"],))
+        return None
+    
+    def get_file_hash(self, filename: str) -> Optional[str]:
+        """Get the indexed SHA-256 digest of a stored file.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            SHA-256 hex digest, or None if the file is not indexed
+        """
+        row = self._index.fetch_one("SELECT sha256 FROM file_index WHERE filename = ?", (filename,))
+        return row["sha256"] if row else None
+    
+    def get_refcount(self, filename: str) -> int:
+        """Get the number of references held on a stored file.
+        
+        Args:
+            filename: Filename (not full path)
             
         Returns:
-            MD5 hex digest
+            Reference count; 1 for unindexed files that exist, 0 if missing
+        """
+        row = self._index.fetch_one("SELECT refcount FROM file_index WHERE filename = ?", (filename,))
+        if row:
+            return row["refcount"]
+        return 1 if self.file_exists(filename) else 0
+    
+    def _iter_stored_files(self):
+        """Yield every stored file on disk, in both the flat and sharded layouts.
+        
+        This walks the whole tree; it is only used for migrations.
+        """
+        for item in self.uploads_dir.iterdir():
+            if self._is_internal(item):
+                continue
+            if item.is_file():
+                yield item
+            elif item.is_dir() and len(item.name) == 2:
+                for sub in item.iterdir():
+                    if not sub.is_dir():
+                        continue
+                    for path in sub.iterdir():
+                        if path.is_file() and not self._is_internal(path):
+                            yield path
+    
+    def index_existing_files(self) -> int:
+        """Add files stored without an index row (e.g. before indexing existed).
+        
+        Each file gets a single reference. Later uploads of the same content
+        then resolve to it instead of being written again.
+        
+        Returns:
+            Number of files newly indexed
+        """
+        indexed = {row["filename"] for row in self._index.fetch_all("SELECT filename FROM file_index")}
+        added = 0
+        for item in self._iter_stored_files():
+            if item.name in indexed:
+                continue
+            try:
+                digest = self._hash_file(item)
+                stat = item.stat()
+            except OSError as e:
+                print(f"[WARN] FileStore: Could not index {item.name}: {e}")
+                continue
+            width, height = read_dimensions(item)
+            self._index.execute(
+                "INSERT OR IGNORE INTO file_index "
+                "(filename, sha256, size_bytes, refcount, width, height, created_at) "
+                "VALUES (?, ?, ?, 1, ?, ?, ?)",
+                (item.name, digest, stat.st_size, width, height,
+                 datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            indexed.add(item.name)
+            added += 1
+        
+        if added:
+            print(f"[INFO] FileStore: Indexed {added} existing file(s)")
+        return added
+    
+    def migrate_to_sharded(self) -> int:
+        """Move files left in the flat layout into their shard directories.
+        
+        Filenames are unchanged, so database references stay valid. Moved
+        files that have no index row yet are indexed (files that were never
+        moved are indexed once when the store opens). Runs in place and is
+        safe to repeat; with nothing to move it only lists the top directory.
+        
+        Returns:
+            Number of files moved
         """
-        return hashlib.md5(data).hexdigest()
+        moved = 0
+        with self._index_lock:
+            for item in list(self.uploads_dir.iterdir()):
+                if not item.is_file() or self._is_internal(item):
+                    continue
+                target = self._shard_path(item.name)
+                if target.exists():
+                    continue
+                try:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(item, target)
+                except OSError as e:
+                    print(f"[WARN] FileStore: Could not move {item.name} into its shard: {e}")
+                    continue
+                moved += 1
+            
+            if moved:
+                print(f"[INFO] FileStore: Moved {moved} file(s) into the sharded layout")
+                self.index_existing_files()
+        return moved
     
     def save_base64_file(
         self,
@@ -162,35 +780,30 @@ class FileStore:
             validate: Whether to validate type and size
             
         Returns:
-            The saved filename (not full path)
+            The saved filename (not full path). In content-addressed mode this
+            is the existing filename when identical content is already stored.
             
         Raises:
             FileTypeError: If file type not allowed
             FileSizeError: If file too large
         """
+        # Reject oversized payloads from their length before decoding anything
+        if validate:
+            self._validate_extension(original_name)
+            self._validate_byte_count(_decoded_length(base64_data))
+        
         # Decode base64
         try:
             file_bytes = base64.b64decode(base64_data)
         except Exception as e:
             raise FileStoreError(f"Invalid base64 data: {e}")
         
-        # Validate if requested
         if validate:
-            self._validate_extension(original_name)
             self._validate_size(file_bytes)
         
-        # Generate unique filename
+        # Generate unique filename and write (or reuse identical content)
         filename = self._generate_unique_filename(original_name)
-        file_path = self.uploads_dir / filename
-        
-        # Write to disk
-        try:
-            with open(file_path, "wb") as f:
-                f.write(file_bytes)
-        except Exception as e:
-            raise FileStoreError(f"Failed to save file: {e}")
-        
-        return filename
+        return self._write_file(file_bytes, filename)
     
     def save_bytes(
         self,
@@ -219,15 +832,8 @@ class FileStore:
             filename = self._generate_named_filename(custom_name, original_name)
         else:
             filename = self._generate_unique_filename(original_name)
-        file_path = self.uploads_dir / filename
         
-        try:
-            with open(file_path, "wb") as f:
-                f.write(data)
-        except Exception as e:
-            raise FileStoreError(f"Failed to save file: {e}")
-        
-        return filename
+        return self._write_file(data, filename)
     
     def save_base64_with_name(
         self,
@@ -247,25 +853,20 @@ class FileStore:
         Returns:
             The saved filename (not full path)
         """
+        if validate:
+            self._validate_extension(original_name)
+            self._validate_byte_count(_decoded_length(base64_data))
+        
         try:
             file_bytes = base64.b64decode(base64_data)
         except Exception as e:
             raise FileStoreError(f"Invalid base64 data: {e}")
         
         if validate:
-            self._validate_extension(original_name)
             self._validate_size(file_bytes)
         
         filename = self._generate_named_filename(name, original_name)
-        file_path = self.uploads_dir / filename
-        
-        try:
-            with open(file_path, "wb") as f:
-                f.write(file_bytes)
-        except Exception as e:
-            raise FileStoreError(f"Failed to save file: {e}")
-        
-        return filename
+        return self._write_file(file_bytes, filename)
     
     def read_file_as_base64(self, filename: str) -> str:
         """Read a file and return its content as base64.
@@ -279,16 +880,19 @@ class FileStore:
         Raises:
             FileNotFoundError: If file does not exist
         """
-        file_path = self.uploads_dir / filename
+        file_path = self.get_file_path(filename)
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {filename}")
         
         try:
             with open(file_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
+                data = f.read()
         except Exception as e:
             raise FileStoreError(f"Failed to read file: {e}")
+        
+        self._touch(filename)
+        return base64.b64encode(data).decode()
     
     def read_file_as_bytes(self, filename: str) -> bytes:
         """Read a file and return its raw bytes.
@@ -299,40 +903,66 @@ class FileStore:
         Returns:
             File content as bytes
         """
-        file_path = self.uploads_dir / filename
+        file_path = self.get_file_path(filename)
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {filename}")
         
         try:
             with open(file_path, "rb") as f:
-                return f.read()
+                data = f.read()
         except Exception as e:
             raise FileStoreError(f"Failed to read file: {e}")
+        
+        self._touch(filename)
+        return data
     
     def delete_file(self, filename: str) -> bool:
         """Delete a file from storage.
         
+        In content-addressed mode this releases one reference; the file is
+        only removed from disk when no references remain.
+        
         Args:
             filename: Filename (not full path) to delete
             
         Returns:
-            True if file was deleted, False if it didn't exist
+            True if the reference was released, False if the file didn't exist
         """
-        file_path = self.uploads_dir / filename
-        
-        if not file_path.exists():
-            return False
+        file_path = self.get_file_path(filename)
         
-        try:
-            file_path.unlink()
+        with self._index_lock:
+            row = self._index.fetch_one(
+                "SELECT refcount, sha256 FROM file_index WHERE filename = ?", (filename,)
+            )
+            if not file_path.exists():
+                self._index.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+                self._unpublish(filename, row and row["sha256"])
+                return False
+            
+            if row and row["refcount"] > 1:
+                self._index.execute(
+                    "UPDATE file_index SET refcount = refcount - 1 WHERE filename = ?",
+                    (filename,)
+                )
+                return True
+            
+            try:
+                file_path.unlink()
+            except Exception as e:
+                raise FileStoreError(f"Failed to delete file: {e}")
+            
+            self._index.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+            self._touched.pop(filename, None)
+            self._unpublish(filename, row and row["sha256"])
             return True
-        except Exception as e:
-            raise FileStoreError(f"Failed to delete file: {e}")
     
     def rename_file(self, old_filename: str, new_name: str) -> str:
         """Rename a file with a new custom name while preserving extension.
         
+        A content-addressed file that is shared by several references keeps
+        its current name, since renaming it would break the other references.
+        
         Args:
             old_filename: Current filename in storage
             new_name: New name to use (e.g., animal name like 'ashley')
@@ -344,22 +974,217 @@ class FileStore:
             FileNotFoundError: If the old file doesn't exist
             FileStoreError: If rename operation fails
         """
-        old_path = self.uploads_dir / old_filename
+        old_path = self.get_file_path(old_filename)
         
         if not old_path.exists():
             raise FileNotFoundError(f"File not found: {old_filename}")
         
-        # Generate new filename with the new name
-        new_filename = self._generate_named_filename(new_name, old_filename)
-        new_path = self.uploads_dir / new_filename
+        with self._index_lock:
+            if self.get_refcount(old_filename) > 1:
+                return old_filename
+            
+            # Generate new filename with the new name
+            new_filename = self._generate_named_filename(new_name, old_filename)
+            new_path = self._target_path(new_filename)
+            
+            try:
+                new_path.parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(str(old_path), str(new_path))
+            except Exception as e:
+                raise FileStoreError(f"Failed to rename file: {e}")
+            
+            self._index.execute(
+                "UPDATE file_index SET filename = ? WHERE filename = ?",
+                (new_filename, old_filename)
+            )
+        
+        print(f"[INFO] Renamed photo: {old_filename} -> {new_filename}")
+        return new_filename
+    
+    def list_file_records(self, after: str = "", limit: int = 100) -> List[Dict[str, Any]]:
+        """Page through the index in filename order.
         
+        Args:
+            after: Return only filenames sorting after this one (a resume cursor)
+            limit: Maximum rows to return
+            
+        Returns:
+            List of dicts with filename, size_bytes and created_at
+        """
+        return self._index.fetch_all(
+            "SELECT filename, size_bytes, created_at FROM file_index "
+            "WHERE filename > ? ORDER BY filename LIMIT ?",
+            (after, limit)
+        )
+    
+    def _quarantine_path(self, filename: str) -> Path:
+        return self.uploads_dir / self.QUARANTINE_DIRNAME / filename
+    
+    def quarantine_file(self, filename: str) -> int:
+        """Move a stored file out of service without deleting it.
+        
+        The file is moved to a hidden quarantine directory and its index
+        row is set aside, so it no longer resolves, lists or deduplicates.
+        ``restore_file`` undoes this; ``purge_quarantined`` deletes it.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            Size in bytes of the quarantined file, or 0 if it did not exist
+            
+        Raises:
+            FileStoreError: If the move fails
+        """
+        with self._index_lock:
+            file_path = self.get_file_path(filename)
+            if not file_path.exists():
+                self._index.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+                return 0
+            
+            row = self._index.fetch_one(
+                "SELECT sha256, size_bytes, created_at FROM file_index WHERE filename = ?", (filename,)
+            ) or {}
+            size_bytes = row.get("size_bytes") or file_path.stat().st_size
+            
+            target = self._quarantine_path(filename)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(file_path, target)
+            except OSError as e:
+                raise FileStoreError(f"Failed to quarantine file: {e}")
+            
+            self._index.execute(
+                "INSERT OR REPLACE INTO file_quarantine "
+                "(filename, sha256, size_bytes, created_at, quarantined_at) VALUES (?, ?, ?, ?, ?)",
+                (filename, row.get("sha256"), size_bytes, row.get("created_at"), self._timestamp())
+            )
+            self._index.execute("DELETE FROM file_index WHERE filename = ?", (filename,))
+            self._touched.pop(filename, None)
+            # A restored file is published again on its next render
+            self._unpublish(filename, row.get("sha256"))
+        
+        return size_bytes
+    
+    def restore_file(self, filename: str) -> bool:
+        """Put a quarantined file back into service.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            True if restored, False if it was not quarantined
+        """
+        with self._index_lock:
+            source = self._quarantine_path(filename)
+            row = self._index.fetch_one("SELECT * FROM file_quarantine WHERE filename = ?", (filename,))
+            if not row or not source.exists():
+                self._index.execute("DELETE FROM file_quarantine WHERE filename = ?", (filename,))
+                return False
+            
+            target = self._target_path(filename)
+            try:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(source, target)
+            except OSError as e:
+                raise FileStoreError(f"Failed to restore file: {e}")
+            
+            self._index.execute(
+                "INSERT OR REPLACE INTO file_index "
+                "(filename, sha256, size_bytes, refcount, width, height, created_at) "
+                "VALUES (?, ?, ?, 1, ?, ?, ?)",
+                (filename, row["sha256"] or self._hash_file(target), row["size_bytes"],
+                 *read_dimensions(target), row["created_at"] or self._timestamp())
+            )
+            self._index.execute("DELETE FROM file_quarantine WHERE filename = ?", (filename,))
+        
+        print(f"[INFO] FileStore: Restored {filename} from quarantine")
+        return True
+    
+    def list_quarantined(self, older_than_hours: Optional[float] = None) -> List[Dict[str, Any]]:
+        """List quarantined files.
+        
+        Args:
+            older_than_hours: Only files quarantined at least this long ago
+            
+        Returns:
+            List of dicts with filename, size_bytes and quarantined_at
+        """
+        if older_than_hours is None:
+            return self._index.fetch_all(
+                "SELECT filename, size_bytes, quarantined_at FROM file_quarantine ORDER BY filename"
+            )
+        cutoff = (datetime.now() - timedelta(hours=older_than_hours)).strftime("%Y-%m-%d %H:%M:%S")
+        return self._index.fetch_all(
+            "SELECT filename, size_bytes, quarantined_at FROM file_quarantine "
+            "WHERE quarantined_at <= ? ORDER BY filename",
+            (cutoff,)
+        )
+    
+    def purge_quarantined(self, filename: str) -> int:
+        """Permanently delete a quarantined file.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            Bytes freed (0 if the file was not quarantined)
+        """
+        with self._index_lock:
+            row = self._index.fetch_one(
+                "SELECT size_bytes, sha256 FROM file_quarantine WHERE filename = ?", (filename,)
+            )
+            if not row:
+                return 0
+            try:
+                self._quarantine_path(filename).unlink(missing_ok=True)
+            except OSError as e:
+                raise FileStoreError(f"Failed to delete file: {e}")
+            self._index.execute("DELETE FROM file_quarantine WHERE filename = ?", (filename,))
+            # Copies published before the file was quarantined
+            self._unpublish(filename, row["sha256"])
+        return row["size_bytes"]
+    
+    def _hash_file(self, path: Path) -> str:
+        """Compute the SHA-256 digest of a file in chunks."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def get_file_path(self, filename: str) -> Path:
+        """Get the on-disk path of a stored file.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            Path inside the uploads directory. Files still in the other layout
+            (flat vs. sharded) are found too; for missing files this is where
+            a new file of that name would be written.
+        """
+        primary = self._target_path(filename)
+        if primary.exists():
+            return primary
+        
+        alternate = self.uploads_dir / filename if self.sharded else self._shard_path(filename)
+        return alternate if alternate.exists() else primary
+    
+    def get_signature(self, filename: str) -> Optional[Tuple[int, int]]:
+        """Get a cheap (version, size) pair that changes whenever a file's content does.
+        
+        Args:
+            filename: Filename (not full path)
+            
+        Returns:
+            Tuple of (mtime_ns, size in bytes), or None if the file does not exist
+        """
         try:
-            import shutil
-            shutil.move(str(old_path), str(new_path))
-            print(f"[INFO] Renamed photo: {old_filename} -> {new_filename}")
-            return new_filename
-        except Exception as e:
-            raise FileStoreError(f"Failed to rename file: {e}")
+            stat = self.get_file_path(filename).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
     
     def file_exists(self, filename: str) -> bool:
         """Check if a file exists in storage.
@@ -370,10 +1195,13 @@ class FileStore:
         Returns:
             True if file exists
         """
-        return (self.uploads_dir / filename).exists()
+        return self.get_file_path(filename).exists()
     
     def get_file_info(self, filename: str) -> Dict[str, Any]:
-        """Get metadata about a stored file.
+        """Get metadata about a stored file from the index.
+        
+        Files without an index row (e.g. copied in by hand) fall back to
+        ``stat`` and carry no hash or dimensions.
         
         Args:
             filename: Filename (not full path)
@@ -381,7 +1209,26 @@ class FileStore:
         Returns:
             Dictionary with file metadata
         """
-        file_path = self.uploads_dir / filename
+        file_path = self.get_file_path(filename)
+        row = self._index.fetch_one("SELECT * FROM file_index WHERE filename = ?", (filename,))
+        
+        if row:
+            created_at = _parse_timestamp(row["created_at"])
+            return {
+                "filename": filename,
+                "size_bytes": row["size_bytes"],
+                "size_mb": row["size_bytes"] / (1024 * 1024),
+                "extension": file_path.suffix.lower(),
+                "sha256": row["sha256"],
+                "width": row.get("width"),
+                "height": row.get("height"),
+                "refcount": row["refcount"],
+                "created_at": created_at,
+                # Stored files are written once, so they are never modified after creation
+                "modified_at": created_at,
+                "last_accessed_at": _parse_timestamp(row.get("last_accessed_at")),
+                "full_path": str(file_path),
+            }
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {filename}")
@@ -393,13 +1240,18 @@ class FileStore:
             "size_bytes": stat.st_size,
             "size_mb": stat.st_size / (1024 * 1024),
             "extension": file_path.suffix.lower(),
+            "sha256": None,
+            "width": None,
+            "height": None,
+            "refcount": 1,
             "created_at": datetime.fromtimestamp(stat.st_ctime),
             "modified_at": datetime.fromtimestamp(stat.st_mtime),
+            "last_accessed_at": None,
             "full_path": str(file_path),
         }
     
     def list_files(self, extension: Optional[str] = None) -> List[str]:
-        """List all files in the uploads directory.
+        """List all stored files from the index.
         
         Args:
             extension: Optional filter by extension (e.g., '.jpg')
@@ -407,12 +1259,14 @@ class FileStore:
         Returns:
             List of filenames
         """
-        files = []
-        for item in self.uploads_dir.iterdir():
-            if item.is_file():
-                if extension is None or item.suffix.lower() == extension.lower():
-                    files.append(item.name)
-        return sorted(files)
+        if extension is None:
+            rows = self._index.fetch_all("SELECT filename FROM file_index ORDER BY filename")
+        else:
+            rows = self._index.fetch_all(
+                "SELECT filename FROM file_index WHERE lower(filename) LIKE ? ORDER BY filename",
+                (f"%{extension.lower()}",)
+            )
+        return [row["filename"] for row in rows]
     
     def get_total_size_mb(self) -> float:
         """Get total size of all stored files in MB.
@@ -420,38 +1274,121 @@ class FileStore:
         Returns:
             Total size in megabytes
         """
-        total_bytes = sum(
-            f.stat().st_size 
-            for f in self.uploads_dir.iterdir() 
-            if f.is_file()
-        )
-        return total_bytes / (1024 * 1024)
+        row = self._index.fetch_one("SELECT COALESCE(SUM(size_bytes), 0) AS total FROM file_index")
+        return row["total"] / (1024 * 1024)
     
     def cleanup_old_files(self, days: int = 30) -> int:
         """Delete files older than specified days.
         
+        This goes by age alone and will delete files that are still
+        referenced; use UploadGCService to remove only unreferenced files.
+        
         Args:
             days: Delete files older than this many days
             
         Returns:
             Number of files deleted
         """
-        from datetime import timedelta
-        
-        cutoff = datetime.now() - timedelta(days=days)
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
         deleted = 0
         
-        for item in self.uploads_dir.iterdir():
-            if item.is_file():
-                if datetime.fromtimestamp(item.stat().st_mtime) < cutoff:
-                    try:
-                        item.unlink()
-                        deleted += 1
-                    except Exception:
-                        pass  # Skip files that can't be deleted
+        rows = self._index.fetch_all(
+            "SELECT filename, sha256 FROM file_index WHERE created_at < ?", (cutoff,)
+        )
+        with self._index_lock:
+            for row in rows:
+                try:
+                    self.get_file_path(row["filename"]).unlink(missing_ok=True)
+                except Exception:
+                    continue  # Skip files that can't be deleted
+                self._index.execute("DELETE FROM file_index WHERE filename = ?", (row["filename"],))
+                self._unpublish(row["filename"], row["sha256"])
+                deleted += 1
         
         return deleted
     
+    @staticmethod
+    def _public_name(sha256: str, filename: str) -> str:
+        """Name of a file's published copy: a SHA-256 prefix plus its extension."""
+        return f"{sha256[:32]}{Path(filename).suffix.lower()}"
+    
+    def _unpublish(self, filename: str, sha256: Optional[str]) -> None:
+        """Delete the published copy of a file whose index row is gone.
+        
+        The copy is kept while another indexed file with the same content and
+        extension is still published under the same name.
+        """
+        self._public_names.pop(filename, None)
+        if not sha256:
+            return
+        public_name = self._public_name(sha256, filename)
+        with self._publish_lock:
+            for row in self._index.fetch_all("SELECT filename FROM file_index WHERE sha256 = ?", (sha256,)):
+                if self._public_name(sha256, row["filename"]) == public_name:
+                    return
+            try:
+                (self.media_dir / public_name).unlink(missing_ok=True)
+            except OSError as e:
+                print(f"[WARN] FileStore: Could not remove published copy {public_name}: {e}")
+    
+    def get_public_url(self, filename: str) -> str:
+        """Publish a stored file under a content-hashed name and return its URL.
+        
+        The file is hard-linked once into the public media directory as
+        ``<sha256 prefix><ext>`` (copied when the two directories are on
+        different filesystems), so its URL only changes when its content
+        does. Browsers can therefore cache it indefinitely and repeat renders
+        reference the photo by URL instead of re-sending its bytes. The link
+        is removed again with the last file it serves.
+        
+        Args:
+            filename: Filename (not full path) in uploads
+            
+        Returns:
+            URL path such as '/media/3f2a...c9.jpg'
+            
+        Raises:
+            FileNotFoundError: If file does not exist
+            FileStoreError: If the file could not be published
+        """
+        file_path = self.get_file_path(filename)
+        
+        try:
+            stat = file_path.stat()
+        except OSError:
+            raise FileNotFoundError(f"File not found: {filename}")
+        
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._publish_lock:
+            cached = self._public_names.get(filename)
+            if cached and cached[0] == signature and (self.media_dir / cached[1]).exists():
+                return app_config.MEDIA_URL_PREFIX + cached[1]
+            
+            try:
+                public_name = self._public_name(self._hash_file(file_path), filename)
+                public_path = self.media_dir / public_name
+                
+                if not public_path.exists():
+                    self.media_dir.mkdir(parents=True, exist_ok=True)
+                    # Stage under a temp name first so a half-written file is never served
+                    tmp_path = self.media_dir / f".{public_name}.{uuid.uuid4().hex[:8]}.tmp"
+                    try:
+                        # Stored files are only ever replaced, never rewritten in
+                        # place, so a hard link shares the bytes safely
+                        os.link(file_path, tmp_path)
+                    except OSError:
+                        # Different filesystem, or links unsupported
+                        shutil.copyfile(file_path, tmp_path)
+                    os.replace(tmp_path, public_path)
+            except Exception as e:
+                raise FileStoreError(f"Failed to publish file: {e}")
+            
+            self._public_names[filename] = (signature, public_name)
+        
+        self._touch(filename)
+        return app_config.MEDIA_URL_PREFIX + public_name
+    
     def copy_file(self, filename: str, destination: Path) -> str:
         """Copy a file to another location.
         
@@ -462,7 +1399,7 @@ class FileStore:
         Returns:
             Full path to copied file
         """
-        source = self.uploads_dir / filename
+        source = self.get_file_path(filename)
         
         if not source.exists():
             raise FileNotFoundError(f"File not found: {filename}")
@@ -476,6 +1413,29 @@ class FileStore:
         return str(dest_path)
 
 
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an index timestamp ('YYYY-MM-DD HH:MM:SS'), or None."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _decoded_length(base64_data: str) -> int:
+    """Compute the decoded size of base64 text from its length alone.
+    
+    Args:
+        base64_data: Base64 encoded content
+        
+    Returns:
+        Number of bytes the data decodes to (exact for unwrapped base64)
+    """
+    stripped = base64_data.rstrip("=")
+    return len(stripped) * 3 // 4
+
+
 # Create a default instance for convenience
 _default_store: Optional[FileStore] = None
 
@@ -484,11 +1444,15 @@ def get_file_store() -> FileStore:
     """Get the default FileStore instance.
     
     Returns:
-        Singleton FileStore instance
+        Singleton FileStore (a BlobFileStore when FILE_STORE_BACKEND is 'sqlite')
     """
     global _default_store
     if _default_store is None:
-        _default_store = FileStore()
+        if app_config.FILE_STORE_BACKEND == "sqlite":
+            from .blob_store import BlobFileStore
+            _default_store = BlobFileStore()
+        else:
+            _default_store = FileStore()
     return _default_store
 
 
@@ -530,14 +1494,29 @@ def delete_photo(filename: str) -> bool:
     return get_file_store().delete_file(filename)
 
 
+def get_photo_url(filename: str) -> str:
+    """Get the public content-hashed URL of a photo using the default store.
+    
+    Args:
+        filename: Photo filename
+        
+    Returns:
+        URL path of the published photo
+    """
+    return get_file_store().get_public_url(filename)
+
+
 __all__ = [
     "FileStore",
     "FileStoreError",
     "FileSizeError",
     "FileTypeError",
     "FileNotFoundError",
+    "MIME_SNIFF_BYTES",
+    "sniff_mime_type",
     "get_file_store",
     "save_photo",
     "read_photo",
     "delete_photo",
+    "get_photo_url",
 ]
@@ -0,0 +1,205 @@
+"""Ingest-time image normalization for uploaded photos.
+
+Phone photos are often several megabytes at 4000px or more, carry EXIF
+metadata (including GPS position) and rely on an EXIF orientation flag. Every
+later consumer (display, thumbnails, AI classification) pays to decode them.
+``normalize_image`` downsizes an image once at upload time, applies its
+orientation, drops metadata and re-encodes it as WebP or JPEG.
+
+Pillow is optional: without it images are stored unchanged.
+"""
+from __future__ import annotations
+
+import base64
+import io
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Tuple, Union
+
+import app_config
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    ImageOps = None
+    PIL_AVAILABLE = False
+
+
+# Output format name -> (Pillow format, file extension)
+OUTPUT_FORMATS = {
+    "webp": ("WEBP", ".webp"),
+    "jpeg": ("JPEG", ".jpg"),
+}
+
+# Formats that are re-encoded; GIFs are left alone so animations survive
+NORMALIZABLE_FORMATS = ("JPEG", "PNG", "WEBP", "MPO")
+
+
+@dataclass
+class NormalizedImage:
+    """Result of normalizing an image.
+
+    Attributes:
+        data: Encoded image bytes (the input itself when unchanged)
+        extension: File extension matching ``data`` (e.g. '.webp'), or None if unchanged
+        width: Pixel width, if known
+        height: Pixel height, if known
+        changed: Whether the image was re-encoded
+    """
+    data: bytes
+    extension: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    changed: bool = False
+
+
+def normalize_image(
+    data: Union[bytes, str, os.PathLike, BinaryIO],
+    max_dimension: Optional[int] = None,
+    quality: Optional[int] = None,
+    output_format: Optional[str] = None
+) -> NormalizedImage:
+    """Resize, orient, strip metadata from and re-encode an image.
+
+    A path or binary file is decoded from the file itself, so the encoded
+    original is never held in memory; only the (downsized) output is.
+
+    Args:
+        data: Original image bytes, or a path or binary file holding them
+        max_dimension: Longest-side limit in pixels. Defaults to app_config.PHOTO_MAX_DIMENSION
+        quality: Encoder quality 1-100. Defaults to app_config.PHOTO_QUALITY
+        output_format: 'webp' or 'jpeg'. Defaults to app_config.PHOTO_OUTPUT_FORMAT
+
+    Returns:
+        NormalizedImage; ``changed`` is False when Pillow is unavailable, the
+        data is not a normalizable image, or decoding fails
+    """
+    if not PIL_AVAILABLE:
+        return NormalizedImage(data)
+
+    max_dimension = max_dimension or app_config.PHOTO_MAX_DIMENSION
+    quality = quality or app_config.PHOTO_QUALITY
+    pil_format, extension = OUTPUT_FORMATS.get(
+        (output_format or app_config.PHOTO_OUTPUT_FORMAT).lower(), OUTPUT_FORMATS["webp"]
+    )
+
+    try:
+        source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        with Image.open(source) as img:
+            if img.format not in NORMALIZABLE_FORMATS:
+                return NormalizedImage(data, width=img.width, height=img.height)
+
+            # Applies the EXIF orientation to the pixels and drops the flag
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            if pil_format == "JPEG" or not has_alpha:
+                if has_alpha:
+                    background = Image.new("RGB", img.size, (255, 255, 255))
+                    background.paste(img.convert("RGBA"), mask=img.convert("RGBA").split()[-1])
+                    img = background
+                elif img.mode != "RGB":
+                    img = img.convert("RGB")
+            elif img.mode != "RGBA":
+                img = img.convert("RGBA")
+
+            # No exif/icc arguments are passed, so metadata is not carried over
+            buffer = io.BytesIO()
+            save_kwargs = {"quality": quality}
+            if pil_format == "JPEG":
+                save_kwargs.update(optimize=True, progressive=True)
+            else:
+                save_kwargs["method"] = 4
+            img.save(buffer, format=pil_format, **save_kwargs)
+
+            return NormalizedImage(
+                buffer.getvalue(),
+                extension=extension,
+                width=img.width,
+                height=img.height,
+                changed=True,
+            )
+    except Exception as e:
+        print(f"[WARN] Image normalization skipped: {e}")
+        return NormalizedImage(data)
+
+
+def make_placeholder(data: bytes, size: Optional[int] = None) -> Optional[str]:
+    """Encode a tiny preview of an image for instant display.
+
+    The preview keeps the aspect ratio and fits in ``size`` x ``size``
+    pixels. Scaled up by the UI it reads as a blurred version of the photo
+    while the real image loads.
+
+    Args:
+        data: Image bytes
+        size: Longest side in pixels. Defaults to app_config.PHOTO_PLACEHOLDER_SIZE
+
+    Returns:
+        Base64 WebP (JPEG if WebP is unavailable) of a few hundred bytes,
+        or None if Pillow is unavailable or the data cannot be decoded
+    """
+    if not PIL_AVAILABLE:
+        return None
+
+    size = size or app_config.PHOTO_PLACEHOLDER_SIZE
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((size, size), Image.BILINEAR)
+            img = img.convert("RGB")
+            buffer = io.BytesIO()
+            try:
+                img.save(buffer, format="WEBP", quality=40)
+            except (KeyError, OSError):
+                buffer = io.BytesIO()
+                img.save(buffer, format="JPEG", quality=40)
+            return base64.b64encode(buffer.getvalue()).decode()
+    except Exception:
+        return None
+
+
+def preview_base64(path: Union[str, os.PathLike], max_dimension: Optional[int] = None) -> str:
+    """Base64 of an image file as it will be stored, for on-screen preview.
+
+    The image is normalized from the file, so a large original is never read
+    into memory whole. Without Pillow, or for images that are not re-encoded
+    (e.g. GIFs), the file's own bytes are returned; validate the upload first
+    so its size limit bounds that read.
+
+    Args:
+        path: Path to the image file
+        max_dimension: Longest-side limit in pixels. Defaults to app_config.PHOTO_MAX_DIMENSION
+
+    Returns:
+        Base64 encoded image
+    """
+    result = normalize_image(path, max_dimension=max_dimension)
+    if result.changed:
+        return base64.b64encode(result.data).decode()
+    with open(path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode()
+
+
+def read_dimensions(path) -> Tuple[Optional[int], Optional[int]]:
+    """Read an image's pixel size from its header without decoding it.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        Tuple of (width, height), or (None, None) if unknown
+    """
+    if not PIL_AVAILABLE:
+        return None, None
+    try:
+        with Image.open(path) as img:
+            return img.width, img.height
+    except Exception:
+        return None, None
+
+
+__all__ = ["NormalizedImage", "normalize_image", "make_placeholder", "preview_base64", "read_dimensions", "PIL_AVAILABLE", "OUTPUT_FORMATS"]
@@ -0,0 +1,67 @@
+"""HTTP caching for published media files.
+
+Uploaded photos are published by ``FileStore.get_public_url`` under
+content-hashed names in ``assets/media``, which Flet serves as static files.
+Because a name never changes its content, responses under the media prefix
+can safely be cached by browsers for as long as they like.
+"""
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import app_config
+
+
+ASGIApp = Callable[..., Awaitable[None]]
+
+
+class MediaCacheMiddleware:
+    """ASGI middleware that adds long-lived cache headers to media responses.
+
+    Only successful responses for paths under ``app_config.MEDIA_URL_PREFIX``
+    are touched; everything else (including the Flet websocket) passes
+    through unchanged.
+
+    Attributes:
+        app: The wrapped ASGI application
+        prefix: URL prefix that identifies media requests
+        max_age: Cache lifetime in seconds
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: Optional[str] = None,
+        max_age: Optional[int] = None
+    ) -> None:
+        """Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            prefix: Media URL prefix. Defaults to app_config.MEDIA_URL_PREFIX
+            max_age: Cache lifetime in seconds. Defaults to app_config.MEDIA_CACHE_MAX_AGE
+        """
+        self.app = app
+        self.prefix = prefix or app_config.MEDIA_URL_PREFIX
+        self.max_age = max_age if max_age is not None else app_config.MEDIA_CACHE_MAX_AGE
+        self._cache_control = f"public, max-age={self.max_age}, immutable".encode()
+
+    async def __call__(self, scope: Dict[str, Any], receive: ASGIApp, send: ASGIApp) -> None:
+        if scope.get("type") != "http" or not scope.get("path", "").startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cache_headers(message: Dict[str, Any]) -> None:
+            if message.get("type") == "http.response.start" and message.get("status") == 200:
+                headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in (b"cache-control", b"expires", b"pragma")
+                ]
+                headers.append((b"cache-control", self._cache_control))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_headers)
+
+
+__all__ = ["MediaCacheMiddleware"]
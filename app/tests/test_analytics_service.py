@@ -1,8 +1,12 @@
 """Extended tests for AnalyticsService - comprehensive coverage."""
+import calendar
+import time
+
 import pytest
 from datetime import datetime, timedelta
 
 from services.analytics_service import AnalyticsService
+from storage.database import Database, sql_epoch
 
 
 class TestGetChartData:
@@ -108,6 +112,14 @@ class TestGetDashboardStats:
         stats = analytics_service.get_dashboard_stats()
         
         assert stats["pending_applications"] >= 1
+    
+    def test_dashboard_stats_reflect_writes_immediately(self, analytics_service, animal_service):
+        """Test a write shows up in the next read without clearing any cache."""
+        before = analytics_service.get_dashboard_stats()["total_animals"]
+        
+        animal_service.add_animal(name="Rex", type="dog", health_status="healthy")
+        
+        assert analytics_service.get_dashboard_stats()["total_animals"] == before + 1
 
 
 class TestCaching:
@@ -291,3 +303,469 @@ class TestAnalyticsEdgeCases:
         assert len(rescued_counts) == 30
         assert all(isinstance(count, int) for count in rescued_counts)
         assert all(count >= 0 for count in rescued_counts)
+
+
+def _python_daily_trend(service, days):
+    """Reference implementation: the per-row Python loop the SQL trend replaced."""
+    from components.utils import parse_datetime
+    import app_config
+    from app_config import RescueStatus, AdoptionStatus
+
+    now = datetime.utcnow()
+    day_dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days - 1, -1, -1)]
+    rescued = [0] * days
+    adopted = [0] * days
+
+    for ms in service.rescue_service.get_all_missions_for_analytics():
+        if RescueStatus.get_base_status((ms.get("status") or "").lower()) != RescueStatus.RESCUED:
+            continue
+        d = parse_datetime(ms.get("rescued_at") or ms.get("mission_date"))
+        if d is not None and d.strftime("%Y-%m-%d") in day_dates:
+            rescued[day_dates.index(d.strftime("%Y-%m-%d"))] += 1
+
+    for req in service.adoption_service.get_all_requests_for_analytics():
+        if AdoptionStatus.get_base_status((req.get("status") or "").lower()) not in app_config.APPROVED_ADOPTION_STATUSES:
+            continue
+        d = parse_datetime(req.get("approved_at") or req.get("request_date"))
+        if d is not None and d.strftime("%Y-%m-%d") in day_dates:
+            adopted[day_dates.index(d.strftime("%Y-%m-%d"))] += 1
+
+    return rescued, adopted
+
+
+class TestTrendQueryEquivalence:
+    """Test the SQL trend aggregation matches the per-row Python path."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_random_data_matches_python_path(self, analytics_service, sample_user, seed):
+        """Test randomized statuses and mixed timestamp formats bucket identically."""
+        import random
+        rng = random.Random(seed)
+        now = datetime.utcnow()
+
+        def random_timestamp():
+            dt = now - timedelta(days=rng.uniform(-2, 40))
+            return rng.choice([
+                dt,
+                dt.strftime("%Y-%m-%d %H:%M:%S"),
+                dt.isoformat(),
+                dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                dt.strftime("%Y-%m-%d"),
+                None,
+                "",
+                "not a date",
+            ])
+
+        statuses = ["rescued", "rescued|archived", "Rescued", "completed", "pending",
+                    "on-going", "failed", "removed", "cancelled", None]
+        for _ in range(300):
+            analytics_service.db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, mission_date, rescued_at) "
+                "VALUES (?, 'X', ?, ?, ?)",
+                (sample_user["id"], rng.choice(statuses), random_timestamp(), random_timestamp())
+            )
+
+        request_statuses = ["approved", "approved|archived", "Adopted", "completed", "pending",
+                            "denied", "removed", "cancelled", None]
+        for _ in range(300):
+            analytics_service.db.execute(
+                "INSERT INTO adoption_requests (user_id, status, request_date, approved_at) VALUES (?, ?, ?, ?)",
+                (sample_user["id"], rng.choice(request_statuses), random_timestamp(), random_timestamp())
+            )
+
+        for days, method in ((30, lambda: analytics_service.get_chart_data()[0]),
+                             (14, analytics_service.get_chart_data_14_days)):
+            _, rescued, adopted = method()
+            expected_rescued, expected_adopted = _python_daily_trend(analytics_service, days)
+            assert rescued == expected_rescued
+            assert adopted == expected_adopted
+            assert sum(rescued) > 0 and sum(adopted) > 0
+
+
+class TestAnalyticsSnapshot:
+    """Test the single-pass snapshot used by the admin dashboard and charts page."""
+
+    @pytest.fixture
+    def seeded(self, analytics_service, animal_service, rescue_service, sample_user, sample_adoption_request):
+        """A few animals and missions in mixed states."""
+        from app_config import RescueStatus
+        animal_service.add_animal(name="Tom", type="cat", breed="Siamese", age=2, health_status="injured")
+        animal_service.add_animal(name="Rex", type="dog", breed="unknown", age=5, health_status="recovering")
+        for breed, status in (("Beagle", RescueStatus.RESCUED), ("Beagle", None), ("Pug", RescueStatus.FAILED)):
+            mission_id = rescue_service.submit_rescue_request(
+                user_id=sample_user["id"], animal_type="dog", breed=breed, name="X", location="Here",
+                latitude=13.5, longitude=123.3
+            )
+            if status:
+                rescue_service.update_rescue_status(mission_id, status)
+        analytics_service._cache.clear()
+
+    def test_snapshot_matches_individual_methods(self, analytics_service, seeded):
+        """Test every snapshot field equals the per-method result."""
+        snapshot = analytics_service.get_snapshot()
+
+        trend, type_dist, status_counts = analytics_service.get_chart_data()
+        assert snapshot.trend_30_days == trend
+        assert snapshot.trend_14_days == analytics_service.get_chart_data_14_days()
+        assert snapshot.type_distribution == type_dist
+        assert snapshot.health_status_counts == status_counts
+        assert snapshot.dashboard_stats == analytics_service.get_dashboard_stats()
+        assert snapshot.monthly_changes == analytics_service.get_monthly_changes()
+        assert snapshot.rescue_status_distribution == analytics_service.get_rescue_status_distribution()
+        assert snapshot.adoption_status_distribution == analytics_service.get_adoption_status_distribution()
+        assert snapshot.urgency_distribution == analytics_service.get_urgency_distribution()
+        assert snapshot.pending_rescue_missions == analytics_service.get_pending_rescue_missions()
+        assert snapshot.species_adoption_ranking == analytics_service.get_species_adoption_ranking(limit=5)
+        assert snapshot.breed_distribution == analytics_service.get_breed_distribution()
+        assert snapshot.breed_trends["rescue"] == analytics_service.get_breed_trends(mode="rescue")
+        assert snapshot.breed_trends["adoption"] == analytics_service.get_breed_trends(mode="adoption")
+        assert snapshot.chart_insights == analytics_service.get_chart_insights()
+        assert snapshot.request_status_counts == {"pending": 1}
+        assert len(snapshot.missions) == 3
+
+    @pytest.mark.parametrize("engine, expected", [
+        ("python", ["get_all_animals", "get_all_missions", "get_all_requests"]),
+        ("numpy", ["get_map_missions"]),
+    ])
+    def test_snapshot_reads_each_table_once(self, temp_db_path, seeded, monkeypatch, engine, expected):
+        """Test building the snapshot issues one full read per table, and only map rows with NumPy."""
+        if engine == "numpy":
+            pytest.importorskip("numpy")
+        analytics_service = AnalyticsService(temp_db_path, engine=engine)
+        calls = []
+        for service, name in (
+            (analytics_service.animal_service, "get_all_animals"),
+            (analytics_service.animal_service, "get_all_animals_for_analytics"),
+            (analytics_service.animal_service, "get_adoptable_animals"),
+            (analytics_service.rescue_service, "get_all_missions"),
+            (analytics_service.rescue_service, "get_all_missions_for_analytics"),
+            (analytics_service.rescue_service, "get_map_missions"),
+            (analytics_service.adoption_service, "get_all_requests"),
+            (analytics_service.adoption_service, "get_all_requests_for_analytics"),
+        ):
+            original = getattr(service, name)
+            monkeypatch.setattr(service, name, lambda original=original, name=name: calls.append(name) or original())
+
+        analytics_service.get_snapshot()
+
+        assert sorted(calls) == expected
+
+    def test_snapshot_cached_until_data_changes(self, analytics_service, rescue_service, sample_user, seeded):
+        """Test repeat calls reuse the snapshot and writes produce a fresh one."""
+        first = analytics_service.get_snapshot()
+        assert analytics_service.get_snapshot() is first
+
+        rescue_service.submit_rescue_request(
+            user_id=sample_user["id"], animal_type="cat", breed="Persian", name="Y", location="There",
+            latitude=14.0, longitude=121.0
+        )
+        second = analytics_service.get_snapshot()
+
+        assert second is not first
+        assert len(second.missions) == len(first.missions) + 1
+
+    def test_snapshot_sees_edits_without_updated_at(self, analytics_service, animal_service, seeded):
+        """Test an edit that leaves updated_at alone still invalidates the snapshot."""
+        first = analytics_service.get_snapshot()
+        tom = next(a for a in animal_service.get_all_animals() if a["name"] == "Tom")
+
+        assert animal_service.update_animal(tom["id"], health_status="healthy")
+
+        second = analytics_service.get_snapshot()
+        assert second is not first
+        assert second.health_status_counts["healthy"] == first.health_status_counts["healthy"] + 1
+
+    def test_signature_connections_are_closed(self, analytics_service):
+        """Test the per-thread signature connection closes with its thread or on close()."""
+        import gc
+        import sqlite3
+        import threading
+
+        connections = []
+
+        def read_signature():
+            analytics_service._data_signature()
+            connections.append(analytics_service._scan.signature.conn)
+
+        thread = threading.Thread(target=read_signature)
+        thread.start()
+        thread.join()
+        gc.collect()
+        read_signature()
+        analytics_service.close()
+
+        for conn in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+        assert analytics_service._data_signature()[0] == analytics_service.db.db_path
+
+
+class TestUserInsightBundle:
+    """Test per-user aggregates come from user-scoped queries."""
+
+    @pytest.fixture
+    def seeded_users(self, analytics_service, auth_service, animal_service):
+        """Two users with random missions and requests."""
+        import random
+        rng = random.Random(7)
+        user_ids = [
+            auth_service.register_user(f"User {i}", f"user{i}@example.com", "Password123!")
+            for i in range(2)
+        ]
+        animal_ids = [
+            animal_service.add_animal(name=f"A{i}", type=rng.choice(["dog", "cat"]),
+                                      breed=rng.choice(["Beagle", "beagle", "unknown", None]),
+                                      age=1, health_status="healthy")
+            for i in range(6)
+        ]
+        now = datetime.utcnow()
+        for _ in range(40):
+            analytics_service.db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, mission_date) VALUES (?, 'X', ?, ?)",
+                (rng.choice(user_ids), rng.choice(["pending", "on-going", "rescued", "rescued|archived",
+                                                   "failed", "removed", "cancelled"]),
+                 (now - timedelta(days=rng.uniform(0, 40))).isoformat())
+            )
+            analytics_service.db.execute(
+                "INSERT INTO adoption_requests (user_id, animal_id, status, request_date) VALUES (?, ?, ?, ?)",
+                (rng.choice(user_ids), rng.choice(animal_ids),
+                 rng.choice(["pending", "approved", "approved|archived", "denied", "removed", "cancelled"]),
+                 (now - timedelta(days=rng.uniform(0, 40))).isoformat())
+            )
+        return user_ids
+
+    def test_bundle_matches_global_scan(self, analytics_service, seeded_users):
+        """Test the scoped queries agree with filtering every row in Python."""
+        from app_config import RescueStatus, AdoptionStatus
+        missions = analytics_service.rescue_service.get_all_missions_for_analytics()
+        requests = analytics_service.adoption_service.get_all_requests_for_analytics()
+
+        for user_id in seeded_users:
+            bundle = analytics_service.get_user_insight_bundle(user_id)
+            user_missions = [m for m in missions if m["user_id"] == user_id]
+            user_requests = [r for r in requests if r["user_id"] == user_id]
+            mission_statuses = [RescueStatus.get_base_status(m["status"].lower()) for m in user_missions]
+            request_statuses = [AdoptionStatus.get_base_status(r["status"].lower()) for r in user_requests]
+
+            assert bundle.activity_stats == {
+                "total_adoptions": request_statuses.count("approved"),
+                "rescue_reports_filed": len(user_missions),
+                "pending_adoption_requests": request_statuses.count("pending"),
+                "ongoing_rescue_missions": mission_statuses.count("on-going"),
+            }
+            assert bundle.rescue_status_distribution == {
+                s: mission_statuses.count(s) for s in ("pending", "on-going", "rescued", "failed")
+            }
+            assert bundle.adoption_status_distribution == {
+                s: request_statuses.count(s) for s in ("pending", "approved", "denied")
+            }
+            expected_breeds = {}
+            for r in user_requests:
+                key = f"{analytics_service._normalize_breed(r['animal_breed'])} ({r['animal_species'].capitalize()})"
+                expected_breeds[key] = expected_breeds.get(key, 0) + 1
+            assert dict(bundle.breed_preferences) == expected_breeds
+            assert sum(bundle.chart_data[1]) == len([
+                m for m in user_missions
+                if m["mission_date"][:10] >= (datetime.utcnow() - timedelta(days=29)).strftime("%Y-%m-%d")
+            ])
+            assert bundle.insights == analytics_service.get_user_insights(user_id)
+            assert bundle.impact_insights == analytics_service.get_user_impact_insights(user_id)
+
+    def test_bundle_does_not_scan_all_rows(self, analytics_service, seeded_users, monkeypatch):
+        """Test no shelter-wide mission or request read happens for a user."""
+        for service, name in (
+            (analytics_service.rescue_service, "get_all_missions"),
+            (analytics_service.rescue_service, "get_all_missions_for_analytics"),
+            (analytics_service.rescue_service, "get_map_missions"),
+            (analytics_service.adoption_service, "get_all_requests"),
+            (analytics_service.adoption_service, "get_all_requests_for_analytics"),
+        ):
+            monkeypatch.setattr(service, name, lambda name=name: pytest.fail(f"{name} called"))
+
+        bundle = analytics_service.get_user_insight_bundle(seeded_users[0])
+
+        assert bundle.rescue_reports > 0
+        assert bundle.adoption_requests > 0
+
+    def test_bundle_cached_until_user_data_changes(self, analytics_service, seeded_users, monkeypatch):
+        """Test repeat visits reuse the bundle and only the user's own writes rebuild it."""
+        user_id, other_id = seeded_users
+        first = analytics_service.get_user_insight_bundle(user_id)
+        assert analytics_service.get_user_insight_bundle(user_id) is first
+
+        db = analytics_service.db
+        db.execute("INSERT INTO rescue_missions (user_id, location, status) VALUES (?, 'X', 'pending')", (other_id,))
+        monkeypatch.setattr(analytics_service, "_build_user_insight_bundle",
+                            lambda user_id: pytest.fail("bundle rebuilt"))
+        assert analytics_service.get_user_insight_bundle(user_id) is first
+        monkeypatch.undo()
+
+        version = analytics_service.get_user_data_version(user_id)
+        db.execute("INSERT INTO rescue_missions (user_id, location, status) VALUES (?, 'X', 'pending')", (user_id,))
+        assert analytics_service.get_user_data_version(user_id) > version
+
+        second = analytics_service.get_user_insight_bundle(user_id)
+        assert second is not first
+        assert second.rescue_reports == first.rescue_reports + 1
+
+    def test_version_follows_requested_animals(self, analytics_service, seeded_users):
+        """Test updates, deletes and breed changes of requested animals bump the version."""
+        user_id = seeded_users[0]
+        db = analytics_service.db
+        request = db.fetch_one("SELECT id, animal_id FROM adoption_requests WHERE user_id = ? LIMIT 1", (user_id,))
+
+        versions = [analytics_service.get_user_data_version(user_id)]
+        db.execute("UPDATE animals SET breed = 'Pug', breed_key = 'Pug' WHERE id = ?", (request["animal_id"],))
+        versions.append(analytics_service.get_user_data_version(user_id))
+        db.execute("UPDATE adoption_requests SET status = 'denied' WHERE id = ?", (request["id"],))
+        versions.append(analytics_service.get_user_data_version(user_id))
+        db.execute("DELETE FROM adoption_requests WHERE id = ?", (request["id"],))
+        versions.append(analytics_service.get_user_data_version(user_id))
+
+        assert versions == sorted(set(versions))
+
+    def test_version_ignores_unread_columns(self, analytics_service, seeded_users):
+        """Test one edit bumps the version once and maintenance writes not at all."""
+        user_id = seeded_users[0]
+        db = analytics_service.db
+        mission = db.fetch_one("SELECT id FROM rescue_missions WHERE user_id = ? LIMIT 1", (user_id,))
+
+        version = analytics_service.get_user_data_version(user_id)
+        db.execute("UPDATE rescue_missions SET mission_date = '2024-01-01 00:00:00' WHERE id = ?", (mission["id"],))
+        assert analytics_service.get_user_data_version(user_id) == version + 1
+
+        db.execute("UPDATE rescue_missions SET notes = 'checked', mission_ts = mission_ts WHERE id = ?", (mission["id"],))
+        assert analytics_service.get_user_data_version(user_id) == version + 1
+
+        db.execute("INSERT INTO rescue_missions (user_id, location, status, mission_date) "
+                   "VALUES (?, 'X', 'pending', '2024-01-02')", (user_id,))
+        assert analytics_service.get_user_data_version(user_id) == version + 2
+
+
+class TestEpochColumns:
+    """Test the integer epoch shadows of timestamp columns."""
+
+    def test_shadows_follow_every_format(self, analytics_service, sample_user):
+        """Test inserts and updates fill *_ts for space, 'T' and date-only timestamps."""
+        db = analytics_service.db
+        values = ["2024-03-05 10:20:30.123456", "2024-03-05T10:20:30+08:00", "2024-03-05", "not a date"]
+        ids = [
+            db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, mission_date) VALUES (?, 'X', 'pending', ?)",
+                (sample_user["id"], value)
+            )
+            for value in values
+        ]
+        db.execute("UPDATE rescue_missions SET rescued_at = ? WHERE id = ?", ("2024-03-06 00:00:00", ids[0]))
+
+        rows = {r["id"]: r for r in db.fetch_all("SELECT id, mission_ts, rescued_ts FROM rescue_missions")}
+        base = calendar.timegm((2024, 3, 5, 0, 0, 0))
+        assert [rows[i]["mission_ts"] for i in ids] == [base + 37230, base + 37230, base, None]
+        assert rows[ids[0]]["rescued_ts"] == base + 86400
+        assert rows[ids[1]]["rescued_ts"] is None
+
+
+@pytest.fixture
+def local_zone(monkeypatch):
+    """Run with a local time zone 5:30 ahead of UTC."""
+    monkeypatch.setenv("TZ", "XST-5:30")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestLatencyMetrics:
+    """Test the SQL percentile latency metrics."""
+
+    def test_rescue_response_percentiles(self, analytics_service, sample_user):
+        """Test nearest-rank p50/p90/p99 per urgency and overall."""
+        db = analytics_service.db
+        reported = datetime(2024, 1, 1)
+        for hours in range(1, 11):
+            db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, urgency, mission_date, rescued_at) "
+                "VALUES (?, 'X', 'rescued', 'high', ?, ?)",
+                (sample_user["id"], reported.isoformat(), (reported + timedelta(hours=hours)).isoformat())
+            )
+        # Not rescued and undated durations are ignored, negative ones counted as errors
+        db.execute(
+            "INSERT INTO rescue_missions (user_id, location, status, urgency, mission_date, rescued_at) "
+            "VALUES (?, 'X', 'failed', 'low', ?, ?)",
+            (sample_user["id"], reported.isoformat(), (reported + timedelta(days=9)).isoformat())
+        )
+        db.execute(
+            "INSERT INTO rescue_missions (user_id, location, status, urgency, mission_date, rescued_at) "
+            "VALUES (?, 'X', 'rescued', 'low', ?, ?)",
+            (sample_user["id"], reported.isoformat(), (reported - timedelta(hours=1)).isoformat())
+        )
+
+        result = analytics_service.get_rescue_response_times()
+
+        assert result["high"] == {"count": 10, "errors": 0, "p50": 5 * 3600, "p90": 9 * 3600, "p99": 10 * 3600}
+        assert result["all"] == {**result["high"], "errors": 1}
+        assert result["low"] == {"count": 0, "errors": 1, "p50": None, "p90": None, "p99": None}
+        assert analytics_service.get_rescue_response_times(since=datetime(2030, 1, 1).date())["all"]["count"] == 0
+
+    def test_decision_times_use_decided_at(self, analytics_service, adoption_service, sample_adoption_request):
+        """Test update_status records decisions and both outcomes are measured."""
+        adoption_service.update_status(sample_adoption_request["id"], "denied")
+
+        row = analytics_service.db.fetch_one(
+            "SELECT decided_at, decided_ts, request_ts FROM adoption_requests WHERE id = ?",
+            (sample_adoption_request["id"],)
+        )
+        assert row["decided_at"] is not None
+        assert row["decided_ts"] >= row["request_ts"]
+
+        result = analytics_service.get_adoption_decision_times()
+        assert result["denied"]["count"] == 1
+        assert result["approved"]["count"] == 0
+        assert result["all"]["p50"] == result["denied"]["p50"] >= 0
+
+    def test_response_time_uses_one_clock(self, local_zone, rescue_service, analytics_service,
+                                          sample_rescue_mission):
+        """Test a rescue right after its report takes seconds, not the UTC offset."""
+        rescue_service.update_rescue_status(sample_rescue_mission["id"], "rescued")
+
+        result = analytics_service.get_rescue_response_times()
+
+        assert result["all"]["count"] == 1
+        assert 0 <= result["all"]["p50"] < 60
+
+    def test_local_event_shadows_recomputed_once(self, local_zone, analytics_service, sample_user):
+        """Test shadows of local-time columns are made UTC without touching the stored text."""
+        db = analytics_service.db
+        local = "2024-01-01 12:00:00"
+        mission_id = db.execute(
+            "INSERT INTO rescue_missions (user_id, location, status, mission_date, rescued_at) "
+            "VALUES (?, 'X', 'rescued', '2024-01-01 06:00:00', ?)",
+            (sample_user["id"], local)
+        )
+        request_id = db.execute(
+            "INSERT INTO adoption_requests (user_id, status, request_date, approved_at, decided_at) "
+            "VALUES (?, 'approved', '2024-01-01 06:00:00', ?, ?)",
+            (sample_user["id"], local, local)
+        )
+        # Shadows as computed before local columns were converted
+        db.execute(f"UPDATE rescue_missions SET rescued_ts = {sql_epoch('rescued_at')}")
+        db.execute(f"UPDATE adoption_requests SET decided_ts = {sql_epoch('decided_at')}")
+        db.execute("DELETE FROM schema_migrations WHERE name = 'local_epoch_shadows'")
+
+        Database(db.db_path).create_tables()
+
+        mission = db.fetch_one("SELECT rescued_at, rescued_ts, mission_ts FROM rescue_missions WHERE id = ?", (mission_id,))
+        request = db.fetch_one("SELECT decided_at, decided_ts, request_ts FROM adoption_requests WHERE id = ?", (request_id,))
+        assert mission["rescued_at"] == local
+        assert mission["rescued_ts"] - mission["mission_ts"] == 30 * 60
+        assert request["decided_ts"] - request["request_ts"] == 30 * 60
+        migration = db.fetch_one("SELECT detail FROM schema_migrations WHERE name = 'local_epoch_shadows'")
+        assert "+0530" in migration["detail"]
+
+    def test_snapshot_includes_latency(self, analytics_service):
+        """Test the cached snapshot carries every latency group."""
+        latency = analytics_service.get_snapshot().latency_metrics
+
+        assert latency["length_of_stay"]["count"] == 0
+        assert set(latency["rescue_response"]) == {"low", "medium", "high", "all"}
+        assert set(latency["adoption_decision"]) == {"approved", "denied", "all"}
@@ -0,0 +1,119 @@
+"""Tests for AnalyticsWarmer - background recompute of analytics aggregates."""
+import time
+
+import pytest
+
+from services.analytics_service import AnalyticsService
+from services.analytics_warmer import AnalyticsWarmer
+
+
+def _wait_for(predicate, timeout=10.0):
+    """Poll `predicate` until it is true or `timeout` seconds pass."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture
+def warmer(temp_db_path):
+    """Warmer with short debounce; stopped after the test."""
+    warmer = AnalyticsWarmer(temp_db_path, debounce_seconds=0.1, max_delay_seconds=1.0, poll_interval=0.02)
+    yield warmer
+    warmer.stop()
+
+
+class TestAnalyticsWarmer:
+    """Test warming, staleness reporting and serving published snapshots."""
+
+    def test_published_snapshot_served_until_rewarmed(self, warmer, temp_db_path, animal_service):
+        """Test page reads use the published snapshot instead of aggregating after a write."""
+        warmer.warm_now()
+        published = AnalyticsService(temp_db_path).get_snapshot()
+
+        animal_service.add_animal(name="Rex", type="dog", health_status="healthy")
+        warmer.notify()
+
+        assert AnalyticsService(temp_db_path).get_snapshot() is published
+        status = warmer.status()["snapshot"]
+        assert status["pending"] is True
+        assert status["stale_seconds"] >= 0
+        assert status["last_error"] is None
+
+        warmer.warm_now()
+
+        snapshot = AnalyticsService(temp_db_path).get_snapshot()
+        assert snapshot.dashboard_stats["total_animals"] == published.dashboard_stats["total_animals"] + 1
+        assert warmer.status()["snapshot"]["pending"] is False
+
+    def test_background_thread_picks_up_writes(self, warmer, temp_db_path, animal_service):
+        """Test a committed write is noticed, debounced and recomputed off the caller's thread."""
+        warmer.start()
+        assert _wait_for(lambda: warmer.status()["snapshot"]["computed_at"] is not None)
+        first = warmer.status()["snapshot"]["computed_at"]
+
+        for i in range(3):
+            animal_service.add_animal(name=f"Pet {i}", type="cat", health_status="healthy")
+
+        assert _wait_for(lambda: warmer.status()["snapshot"]["computed_at"] != first
+                         and not warmer.status()["snapshot"]["pending"])
+        assert AnalyticsService(temp_db_path).get_snapshot().dashboard_stats["total_animals"] == 3
+
+    def test_stop_unpublishes(self, warmer, temp_db_path, animal_service):
+        """Test a stopped warmer's snapshot is no longer served."""
+        warmer.warm_now()
+        animal_service.add_animal(name="Rex", type="dog", health_status="healthy")
+
+        warmer.stop()
+
+        assert AnalyticsService(temp_db_path).get_snapshot().dashboard_stats["total_animals"] == 1
+
+    def test_failed_checks_are_retried(self, temp_db_path, animal_service, monkeypatch):
+        """Test an error in the loop is retried instead of ending the thread."""
+        warmer = AnalyticsWarmer(temp_db_path, debounce_seconds=0.1, poll_interval=0.02, retry_seconds=0.05)
+        original = warmer.service._data_signature
+        failures = []
+
+        def flaky_signature():
+            if len(failures) < 2:
+                failures.append(1)
+                raise RuntimeError("database is locked")
+            return original()
+
+        monkeypatch.setattr(warmer.service, "_data_signature", flaky_signature)
+        warmer.start()
+        try:
+            assert _wait_for(lambda: warmer.status()["snapshot"]["computed_at"] is not None)
+            assert len(failures) == 2
+            assert warmer._thread.is_alive()
+        finally:
+            warmer.stop()
+
+    @pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+    def test_thread_exit_unpublishes(self, warmer, temp_db_path, animal_service, monkeypatch):
+        """Test the published snapshot is dropped when the thread dies, even without stop()."""
+        warmer.start()
+        assert _wait_for(lambda: warmer.status()["snapshot"]["computed_at"] is not None)
+
+        def die(conn, version):
+            raise SystemExit
+
+        monkeypatch.setattr(warmer, "_check_for_changes", die)
+        warmer._thread.join(5)
+        assert not warmer._thread.is_alive()
+        animal_service.add_animal(name="Rex", type="dog", health_status="healthy")
+
+        assert AnalyticsService(temp_db_path).get_snapshot().dashboard_stats["total_animals"] == 1
+
+    def test_published_snapshot_expires(self, warmer, temp_db_path, animal_service, monkeypatch):
+        """Test a published snapshot past the staleness bound is no longer served."""
+        monkeypatch.setattr("app_config.ANALYTICS_WARMER_MAX_STALE_SECONDS", 0.2)
+        warmer.warm_now()
+        animal_service.add_animal(name="Rex", type="dog", health_status="healthy")
+        assert AnalyticsService(temp_db_path).get_snapshot().dashboard_stats["total_animals"] == 0
+
+        time.sleep(0.3)
+
+        assert AnalyticsService(temp_db_path).get_snapshot().dashboard_stats["total_animals"] == 1
@@ -147,6 +147,37 @@ class TestUpdateAnimal:
         
         # Service returns True even if no rows were affected
         assert success is True
+    
+    def test_update_breed_refreshes_keys(self, animal_service, sample_animal):
+        """Test breed and type changes rewrite the normalized analytics keys."""
+        animal_service.update_animal(sample_animal["id"], breed="  unknown ", type=" cat")
+        
+        animal = animal_service.get_animal_by_id(sample_animal["id"])
+        assert animal["breed_key"] == "Not Specified"
+        assert animal["species_key"] == "Cat"
+
+
+class TestNormalizedKeys:
+    """Test breed/species keys stored for analytics."""
+    
+    def test_add_animal_stores_keys(self, animal_service):
+        """Test keys are normalized at insert time."""
+        animal_id = animal_service.add_animal(name="Rex", type="dog ", breed="golden RETRIEVER")
+        
+        animal = animal_service.get_animal_by_id(animal_id)
+        assert animal["breed_key"] == "Golden retriever"
+        assert animal["species_key"] == "Dog"
+    
+    def test_create_tables_backfills_missing_keys(self, temp_db_path):
+        """Test rows written without keys are filled in by create_tables."""
+        db = Database(temp_db_path)
+        db.create_tables()
+        animal_id = db.execute("INSERT INTO animals (name, species, breed) VALUES ('A', NULL, 'mixed breed')")
+        
+        db.create_tables()
+        
+        row = db.fetch_one("SELECT breed_key, species_key FROM animals WHERE id = ?", (animal_id,))
+        assert row == {"breed_key": "Mixed Breed", "species_key": "Unknown"}
 
 
 class TestArchiveAnimal:
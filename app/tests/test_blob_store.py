@@ -0,0 +1,149 @@
+"""Tests for BlobFileStore - the SQLite BLOB backend of FileStore."""
+import base64
+import io
+
+import pytest
+
+from storage.blob_store import BlobFileStore
+from storage.file_store import FileStore, FileStoreError, FileNotFoundError as StoreFileNotFoundError
+
+
+@pytest.fixture
+def blob_store(temp_photo_dir):
+    """Create a BlobFileStore backed by a temporary database."""
+    return BlobFileStore(
+        db_path=str(temp_photo_dir / "photos.db"),
+        media_dir=temp_photo_dir / "media",
+        normalize_images=False,
+    )
+
+
+class TestBlobFileStore:
+    """Test the FileStore interface on top of SQLite BLOBs."""
+
+    def test_save_and_read_roundtrip(self, blob_store):
+        """Test bytes written in several chunks read back unchanged."""
+        data = bytes(range(256)) * 1000
+        filename = blob_store.save_bytes(data, "photo.jpg", validate=False)
+
+        assert blob_store.read_file_as_bytes(filename) == data
+        assert blob_store.file_exists(filename)
+        assert blob_store.get_file_info(filename)["size_bytes"] == len(data)
+
+    def test_open_blob_reads_in_chunks(self, blob_store):
+        """Test open_blob gives incremental access to the content."""
+        filename = blob_store.save_bytes(b"abcdefghij", "photo.jpg", validate=False)
+
+        with blob_store.open_blob(filename) as blob:
+            assert blob.read(4) == b"abcd"
+            blob.seek(8)
+            assert blob.read() == b"ij"
+
+    def test_save_stream(self, blob_store, sample_photo_base64):
+        """Test streamed uploads are validated and stored."""
+        data = base64.b64decode(sample_photo_base64)
+
+        filename = blob_store.save_stream(io.BytesIO(data), "photo.png", chunk_size=16)
+
+        assert blob_store.read_file_as_bytes(filename) == data
+        with pytest.raises(FileStoreError):
+            blob_store.save_stream(io.BytesIO(b"not an image at all"), "photo.png")
+
+    def test_dedup_and_delete(self, blob_store):
+        """Test identical content shares one blob until the last reference goes."""
+        first = blob_store.save_bytes(b"shared", "a.jpg", validate=False)
+        second = blob_store.save_bytes(b"shared", "b.jpg", validate=False)
+        assert first == second
+
+        assert blob_store.delete_file(first) is True
+        assert blob_store.file_exists(first)
+        assert blob_store.delete_file(first) is True
+        assert not blob_store.file_exists(first)
+        assert blob_store.delete_file(first) is False
+        assert blob_store._index.fetch_one("SELECT COUNT(*) AS n FROM file_blobs")["n"] == 0
+
+        with pytest.raises(StoreFileNotFoundError):
+            blob_store.read_file_as_bytes(first)
+
+    def test_rename_and_signature(self, blob_store):
+        """Test renames keep content and signatures track the blob."""
+        filename = blob_store.save_bytes(b"content", "photo.jpg", validate=False)
+        signature = blob_store.get_signature(filename)
+
+        renamed = blob_store.rename_file(filename, "Buddy")
+
+        assert renamed.startswith("buddy_")
+        assert blob_store.read_file_as_bytes(renamed) == b"content"
+        assert blob_store.get_signature(renamed) == signature
+        assert blob_store.get_signature(filename) is None
+
+    def test_quarantine_restore_and_purge(self, blob_store):
+        """Test the garbage collector hooks work without touching the filesystem."""
+        keep = blob_store.save_bytes(b"keep me", "a.jpg", validate=False)
+        drop = blob_store.save_bytes(b"drop me", "b.jpg", validate=False)
+
+        assert blob_store.quarantine_file(keep) == 7
+        assert blob_store.quarantine_file(drop) == 7
+        assert blob_store.list_files() == []
+
+        assert blob_store.restore_file(keep) is True
+        assert blob_store.read_file_as_bytes(keep) == b"keep me"
+        assert blob_store.purge_quarantined(drop) == 7
+        assert blob_store.list_quarantined() == []
+
+    def test_public_url_streams_blob(self, blob_store, temp_photo_dir):
+        """Test publishing writes the blob out under its content hash."""
+        filename = blob_store.save_bytes(b"published", "photo.jpg", validate=False)
+        digest = blob_store.get_file_hash(filename)
+
+        url = blob_store.get_public_url(filename)
+
+        assert url == f"/media/{digest[:32]}.jpg"
+        assert (temp_photo_dir / "media" / f"{digest[:32]}.jpg").read_bytes() == b"published"
+
+    def test_deleted_blob_is_unpublished(self, blob_store, temp_photo_dir):
+        """Test the published copy goes with the last reference to its blob."""
+        kept = blob_store.save_bytes(b"published", "a.jpg", validate=False)
+        dropped = blob_store.save_bytes(b"quarantined", "b.jpg", validate=False)
+        blob_store.get_public_url(kept)
+        blob_store.get_public_url(dropped)
+
+        blob_store.quarantine_file(dropped)
+        assert len(list((temp_photo_dir / "media").iterdir())) == 1
+
+        blob_store.delete_file(kept)
+        assert list((temp_photo_dir / "media").iterdir()) == []
+
+    def test_stream_normalized_from_spool(self, temp_photo_dir):
+        """Test a streamed image is normalized and stored, small images pass through."""
+        Image = pytest.importorskip("PIL.Image")
+        store = BlobFileStore(db_path=str(temp_photo_dir / "normalized.db"), normalize_images=True)
+        big = io.BytesIO()
+        Image.new("RGB", (3200, 800), (200, 120, 40)).save(big, format="PNG")
+
+        filename = store.save_stream(io.BytesIO(big.getvalue()), "scan.png")
+
+        assert filename.endswith(".webp")
+        with Image.open(io.BytesIO(store.read_file_as_bytes(filename))) as img:
+            assert img.size == (1600, 400)
+        gif = io.BytesIO()
+        Image.new("P", (8, 8)).save(gif, format="GIF")
+        kept = store.save_stream(io.BytesIO(gif.getvalue()), "anim.gif")
+        assert store.read_file_as_bytes(kept) == gif.getvalue()
+
+    def test_get_file_path_raises(self, blob_store):
+        """Test callers needing a real path get a clear error."""
+        with pytest.raises(FileStoreError):
+            blob_store.get_file_path("photo.jpg")
+
+    def test_import_from_filesystem_store(self, blob_store, temp_photo_dir):
+        """Test files move over with their names, hashes and creation times."""
+        source = FileStore(uploads_dir=temp_photo_dir / "uploads", normalize_images=False)
+        names = [source.save_bytes(f"photo {i}".encode(), "p.jpg", validate=False) for i in range(3)]
+
+        assert blob_store.import_files(source, batch_size=2) == 3
+        assert blob_store.import_files(source) == 0
+
+        for name in names:
+            assert blob_store.read_file_as_bytes(name) == source.read_file_as_bytes(name)
+            assert blob_store.get_file_hash(name) == source.get_file_hash(name)
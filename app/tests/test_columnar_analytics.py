@@ -0,0 +1,102 @@
+"""Tests for ColumnarAnalytics - the NumPy analytics engine."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.analytics_service import AnalyticsService
+from services.columnar_analytics import ColumnarAnalytics, NUMPY_AVAILABLE
+
+pytestmark = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy is not installed")
+
+
+@pytest.fixture
+def seeded_db(temp_db_path, sample_user):
+    """Random animals, missions and requests with messy statuses, breeds and dates."""
+    service = AnalyticsService(temp_db_path, engine="python")
+    db = service.db
+    rng = random.Random(11)
+    now = datetime.utcnow()
+
+    def timestamp():
+        dt = now - timedelta(days=rng.uniform(-2, 70))
+        return rng.choice([dt.isoformat(), dt.strftime("%Y-%m-%d %H:%M:%S"), dt.strftime("%Y-%m-%d"), None, ""])
+
+    breeds = ["Beagle", "beagle ", "Pug", "unknown", "Mixed Breed", "", None]
+    species = ["dog", "Dog", "cat", " Cat", None]
+    animal_ids = [
+        db.execute(
+            "INSERT INTO animals (name, species, breed, status, intake_date) VALUES ('A', ?, ?, ?, ?)",
+            (rng.choice(species), rng.choice(breeds),
+             rng.choice(["healthy", "Recovering", "injured", "adopted", "processing", "sick",
+                         "removed", "healthy|archived", None]),
+             timestamp())
+        )
+        for _ in range(60)
+    ]
+    for _ in range(300):
+        db.execute(
+            "INSERT INTO rescue_missions (user_id, location, status, breed, urgency, mission_date, rescued_at) "
+            "VALUES (?, 'X', ?, ?, ?, ?, ?)",
+            (sample_user["id"],
+             rng.choice(["pending", "on-going", "rescued", "Rescued|archived", "failed", "cancelled", "removed"]),
+             rng.choice(breeds), rng.choice(["low", "Medium", "high", "urgent", None]), timestamp(), timestamp())
+        )
+        db.execute(
+            "INSERT INTO adoption_requests (user_id, animal_id, animal_species, status, request_date) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (sample_user["id"], rng.choice(animal_ids + [None]), rng.choice(species),
+             rng.choice(["pending", "approved", "Approved|archived", "adopted", "denied", "cancelled", "removed"]),
+             timestamp())
+        )
+    return temp_db_path
+
+
+def _same_ranking(actual, expected):
+    """Equal counts per label and the same descending count sequence (ties may reorder)."""
+    assert dict(actual) == dict(expected)
+    assert [c for _, c in actual] == [c for _, c in expected]
+
+
+class TestColumnarAnalytics:
+    """Test the vectorized results equal the row-by-row Python ones."""
+
+    def test_distributions_match_python_engine(self, seeded_db):
+        """Test every delegated aggregate agrees with the Python engine."""
+        python = AnalyticsService(seeded_db, engine="python")
+        columnar = AnalyticsService(seeded_db, engine="numpy")
+        assert columnar._columnar() is not None
+
+        assert columnar.get_animal_statistics() == python.get_animal_statistics()
+        assert columnar.get_urgency_distribution() == python.get_urgency_distribution()
+        assert columnar.get_chart_insights() == python.get_chart_insights()
+        _same_ranking(columnar.get_species_adoption_ranking(limit=50), python.get_species_adoption_ranking(limit=50))
+        _same_ranking(columnar.get_breed_distribution(), python.get_breed_distribution())
+        _same_ranking(columnar.get_top_breeds_for_adoption(limit=50), python.get_top_breeds_for_adoption(limit=50))
+        _same_ranking(columnar.get_top_breeds_for_rescue(limit=50), python.get_top_breeds_for_rescue(limit=50))
+        _same_ranking(
+            columnar.get_adoptable_breed_distribution(limit=50), python.get_adoptable_breed_distribution(limit=50)
+        )
+
+    def test_trend_and_periods_match_rollup(self, seeded_db):
+        """Test daily trends and period totals agree with the daily_stats rollup."""
+        service = AnalyticsService(seeded_db, engine="python")
+        engine = ColumnarAnalytics.load(service.db)
+        today = datetime.utcnow().date()
+
+        labels, rescued, adopted = service.get_chart_data_14_days()
+        assert engine.daily_trend(today - timedelta(days=13), today) == (rescued, adopted)
+
+        for start, end in ((today - timedelta(days=30), today), (today.replace(day=1), today)):
+            assert engine.period_totals(start, end) == service.daily_stats.get_totals(
+                start.isoformat(), end.isoformat()
+            )
+
+    def test_empty_database(self, temp_db_path):
+        """Test an empty history loads and yields zero counts."""
+        engine = ColumnarAnalytics.load(AnalyticsService(temp_db_path, engine="python").db)
+        today = datetime.utcnow().date()
+
+        assert engine.urgency_distribution() == {"low": 0, "medium": 0, "high": 0}
+        assert engine.breed_distribution() == []
+        assert engine.daily_trend(today - timedelta(days=2), today) == ([0, 0, 0], [0, 0, 0])
@@ -0,0 +1,199 @@
+"""Tests for DailyStatsService - the trigger-maintained daily rollup."""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.daily_stats_service import DailyStatsService, DAILY_METRICS
+from storage.database import Database
+
+
+@pytest.fixture
+def stats_db(temp_db_path):
+    """Database shared with the service fixtures."""
+    return Database(temp_db_path)
+
+
+@pytest.fixture
+def daily_stats(stats_db):
+    """DailyStatsService with its triggers installed on the temporary database."""
+    return DailyStatsService(stats_db)
+
+
+def _rollup(db):
+    """Non-zero contents of both rollup tables."""
+    days = {}
+    for row in db.fetch_all("SELECT * FROM daily_stats ORDER BY day"):
+        day = row.pop("day")
+        counts = {k: v for k, v in row.items() if v}
+        if counts:
+            days[day] = counts
+    breeds = {
+        (row["kind"], row["day"], row["breed"]): row["count"]
+        for row in db.fetch_all("SELECT * FROM daily_breed_stats WHERE count != 0")
+    }
+    return days, breeds
+
+
+class TestDailyStats:
+    """Test incremental maintenance and reads."""
+
+    def test_status_transition_moves_counts(self, daily_stats, adoption_service, sample_adoption_request):
+        """Test approving a request moves it from pending to adoptions on its day."""
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        assert daily_stats.get_totals(today, today)["pending_requests"] == 1
+
+        adoption_service.update_status(sample_adoption_request["id"], "approved")
+
+        totals = daily_stats.get_totals(today, today)
+        assert totals["pending_requests"] == 0
+        assert totals["adoptions"] == 1
+
+    def test_ranges_and_breeds(self, daily_stats, stats_db, sample_user):
+        """Test day and total reads honour the inclusive range."""
+        for days_ago, breed in ((0, "beagle"), (1, "Beagle"), (40, "pug"), (None, "Pug")):
+            mission_date = (datetime.utcnow() - timedelta(days=days_ago)).isoformat() if days_ago is not None else None
+            stats_db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, breed, mission_date) "
+                "VALUES (?, 'X', 'rescued', ?, ?)",
+                (sample_user["id"], breed, mission_date)
+            )
+
+        start = (datetime.utcnow() - timedelta(days=29)).strftime("%Y-%m-%d")
+        end = datetime.utcnow().strftime("%Y-%m-%d")
+        assert len(daily_stats.get_days(start, end)) == 2
+        assert daily_stats.get_totals(start, end)["rescues"] == 2
+        assert daily_stats.get_totals("2000-01-01", "2000-01-31") == {m: 0 for m in DAILY_METRICS}
+        # Undated missions still count toward all-time breed totals
+        assert daily_stats.get_top_breeds("rescue") == [("Beagle", 2), ("Pug", 2)]
+        assert sum(daily_stats.get_breed_series("rescue", ["Beagle"], start, end).values()) == 2
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_incremental_matches_rebuild(self, daily_stats, stats_db, sample_user, seed):
+        """Test random inserts, transitions and deletes leave the same rollup as a rebuild."""
+        rng = random.Random(seed)
+        now = datetime.utcnow()
+
+        def timestamp():
+            dt = now - timedelta(days=rng.uniform(-2, 60))
+            return rng.choice([dt.isoformat(), dt.strftime("%Y-%m-%d %H:%M:%S"), dt.strftime("%Y-%m-%d"), None])
+
+        breeds = ["Beagle", "beagle ", "Pug", "unknown", None]
+        statuses = ["pending", "rescued", "Rescued|archived", "failed", "cancelled", "removed"]
+        request_statuses = ["pending", "approved", "adopted|archived", "denied", "cancelled", "removed"]
+
+        animal_ids = []
+        for _ in range(20):
+            animal_ids.append(stats_db.execute(
+                "INSERT INTO animals (name, species, breed, status, intake_date) VALUES ('A', 'dog', ?, ?, ?)",
+                (rng.choice(breeds), rng.choice(["healthy", "removed"]), timestamp())
+            ))
+        mission_ids = [
+            stats_db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, breed, mission_date, rescued_at) "
+                "VALUES (?, 'X', ?, ?, ?, ?)",
+                (sample_user["id"], rng.choice(statuses), rng.choice(breeds), timestamp(), timestamp())
+            )
+            for _ in range(60)
+        ]
+        request_ids = [
+            stats_db.execute(
+                "INSERT INTO adoption_requests (user_id, animal_id, status, request_date) VALUES (?, ?, ?, ?)",
+                (sample_user["id"], rng.choice(animal_ids), rng.choice(request_statuses), timestamp())
+            )
+            for _ in range(60)
+        ]
+
+        for _ in range(80):
+            action = rng.randrange(6)
+            if action == 0:
+                stats_db.execute("UPDATE rescue_missions SET status = ?, rescued_at = ? WHERE id = ?",
+                                 (rng.choice(statuses), timestamp(), rng.choice(mission_ids)))
+            elif action == 1:
+                stats_db.execute("UPDATE adoption_requests SET status = ? WHERE id = ?",
+                                 (rng.choice(request_statuses), rng.choice(request_ids)))
+            elif action == 2:
+                stats_db.execute("UPDATE animals SET breed = ? WHERE id = ?",
+                                 (rng.choice(breeds), rng.choice(animal_ids)))
+            elif action == 3:
+                stats_db.execute("UPDATE animals SET status = ?, intake_date = ? WHERE id = ?",
+                                 (rng.choice(["healthy", "removed"]), timestamp(), rng.choice(animal_ids)))
+            elif action == 4:
+                stats_db.execute("DELETE FROM adoption_requests WHERE id = ?", (rng.choice(request_ids),))
+            else:
+                stats_db.execute("DELETE FROM animals WHERE id = ?", (rng.choice(animal_ids),))
+
+        incremental = _rollup(stats_db)
+        daily_stats.rebuild()
+
+        assert incremental == _rollup(stats_db)
+        assert incremental[0]
+
+    def test_deleted_animal_moves_adoption_breed(self, daily_stats, stats_db, animal_service, sample_user):
+        """Test requests of a permanently deleted animal count as Not Specified."""
+        animal_id = stats_db.execute(
+            "INSERT INTO animals (name, species, breed, status) VALUES ('A', 'dog', 'Poodle', 'removed')"
+        )
+        stats_db.execute(
+            "INSERT INTO adoption_requests (user_id, animal_id, status, request_date) VALUES (?, ?, 'pending', ?)",
+            (sample_user["id"], animal_id, datetime.utcnow().isoformat())
+        )
+        assert daily_stats.get_top_breeds("adoption") == [("Poodle", 1)]
+
+        assert animal_service.permanently_delete_animal(animal_id)["success"]
+
+        assert daily_stats.get_top_breeds("adoption") == [("Not Specified", 1)]
+        incremental = _rollup(stats_db)
+        daily_stats.rebuild()
+        assert incremental == _rollup(stats_db)
+
+    def test_missing_triggers_trigger_rebuild(self, stats_db, sample_user):
+        """Test rows written before the service existed are backfilled."""
+        stats_db.execute(
+            "INSERT INTO rescue_missions (user_id, location, status, mission_date) VALUES (?, 'X', 'failed', ?)",
+            (sample_user["id"], datetime.utcnow().isoformat())
+        )
+
+        service = DailyStatsService(stats_db)
+
+        today = datetime.utcnow().strftime("%Y-%m-%d")
+        assert service.get_totals(today, today)["failed_rescues"] == 1
+
+
+class TestTrendWindows:
+    """Test bucketed trend reads over configurable windows."""
+
+    def test_weeks_and_months_sum_days(self, analytics_service, stats_db, sample_user):
+        """Test coarser buckets hold exactly the sum of their days."""
+        rng = random.Random(5)
+        now = datetime.utcnow()
+        for _ in range(80):
+            stats_db.execute(
+                "INSERT INTO rescue_missions (user_id, location, status, mission_date) VALUES (?, 'X', 'rescued', ?)",
+                (sample_user["id"], (now - timedelta(days=rng.uniform(0, 400))).isoformat())
+            )
+
+        end = now.date()
+        start = end - timedelta(days=364)
+        _, days = analytics_service.get_trend("rescues", start, end, "day")
+        week_labels, weeks = analytics_service.get_trend("rescues", start, end, "week")
+        month_labels, months = analytics_service.get_trend("rescues", start, end, "month")
+
+        assert len(days) == 365
+        assert len(week_labels) in (53, 54)
+        assert len(month_labels) in (12, 13)
+        # Widened starts only add earlier days, never drop any in range
+        assert sum(weeks) >= sum(days) and sum(months) >= sum(days)
+        month_start = start.replace(day=1)
+        _, exact = analytics_service.get_trend("rescues", month_start, end, "day")
+        assert sum(exact) == sum(months)
+
+    def test_invalid_arguments(self, analytics_service):
+        """Test unknown metrics, granularities and reversed ranges are rejected."""
+        today = datetime.utcnow().date()
+        with pytest.raises(ValueError):
+            analytics_service.get_trend("visits")
+        with pytest.raises(ValueError):
+            analytics_service.get_trend("rescues", granularity="fortnight")
+        with pytest.raises(ValueError):
+            analytics_service.get_trend("rescues", today, today - timedelta(days=1))
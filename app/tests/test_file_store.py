@@ -0,0 +1,500 @@
+"""Tests for FileStore - saving, publishing and serving uploaded files."""
+import asyncio
+import base64
+import hashlib
+import io
+
+import pytest
+
+from storage.file_store import (
+    FileStore,
+    FileSizeError,
+    FileTypeError,
+    FileNotFoundError as StoreFileNotFoundError,
+    sniff_mime_type,
+)
+from storage.media import MediaCacheMiddleware
+from services.photo_service import PhotoService
+
+
+@pytest.fixture
+def file_store(temp_photo_dir):
+    """Create a FileStore isolated in a temporary directory."""
+    return FileStore(
+        uploads_dir=temp_photo_dir / "uploads",
+        media_dir=temp_photo_dir / "media",
+        normalize_images=False,
+    )
+
+
+class TestContentAddressing:
+    """Test SHA-256 deduplication and reference counting."""
+
+    def test_duplicate_save_reuses_file(self, file_store, sample_photo_base64):
+        """Test saving identical content twice writes one file."""
+        first = file_store.save_base64_file(sample_photo_base64, "a.png")
+        second = file_store.save_bytes(base64.b64decode(sample_photo_base64), "b.png")
+
+        assert first == second
+        assert file_store.list_files() == [first]
+        assert file_store.get_refcount(first) == 2
+
+    def test_hash_index_lookup(self, file_store):
+        """Test the hash index maps content digests to filenames."""
+        data = b"indexed content"
+        filename = file_store.save_bytes(data, "photo.jpg", validate=False)
+        digest = hashlib.sha256(data).hexdigest()
+
+        assert file_store.get_file_hash(filename) == digest
+        assert file_store.find_by_hash(digest) == filename
+        assert file_store.find_by_hash("0" * 64) is None
+
+    def test_delete_keeps_file_until_last_reference(self, file_store):
+        """Test a shared file survives until every reference is released."""
+        data = b"shared content"
+        filename = file_store.save_bytes(data, "photo.jpg", validate=False)
+        file_store.save_bytes(data, "photo.jpg", validate=False)
+
+        assert file_store.delete_file(filename) is True
+        assert file_store.file_exists(filename)
+
+        assert file_store.delete_file(filename) is True
+        assert not file_store.file_exists(filename)
+        assert file_store.find_by_hash(hashlib.sha256(data).hexdigest()) is None
+
+    def test_rename_shared_file_keeps_name(self, file_store):
+        """Test renaming a shared file leaves it in place."""
+        filename = file_store.save_bytes(b"shared", "photo.jpg", validate=False)
+        file_store.save_bytes(b"shared", "photo.jpg", validate=False)
+
+        assert file_store.rename_file(filename, "ashley") == filename
+
+    def test_rename_updates_index(self, file_store):
+        """Test renaming a single-reference file keeps it indexed."""
+        filename = file_store.save_bytes(b"solo", "photo.jpg", validate=False)
+
+        renamed = file_store.rename_file(filename, "ashley")
+
+        assert renamed.startswith("ashley_")
+        assert file_store.find_by_hash(hashlib.sha256(b"solo").hexdigest()) == renamed
+
+    def test_index_existing_files(self, file_store):
+        """Test files written outside the index are picked up for dedup."""
+        (file_store.uploads_dir / "legacy.jpg").write_bytes(b"legacy content")
+
+        assert file_store.index_existing_files() == 1
+        assert file_store.save_bytes(b"legacy content", "new.jpg", validate=False) == "legacy.jpg"
+
+    def test_index_not_listed(self, file_store):
+        """Test the index database is hidden from listings."""
+        file_store.save_bytes(b"content", "photo.jpg", validate=False)
+
+        assert all(not name.startswith(".") for name in file_store.list_files())
+
+    def test_plain_mode_writes_every_save(self, temp_photo_dir):
+        """Test disabling content addressing keeps one file per save."""
+        store = FileStore(uploads_dir=temp_photo_dir / "plain", content_addressed=False)
+
+        first = store.save_bytes(b"same", "photo.jpg", validate=False)
+        second = store.save_bytes(b"same", "photo.jpg", validate=False)
+
+        assert first != second
+        assert store.delete_file(first) is True
+        assert not store.file_exists(first)
+
+
+class TestShardedLayout:
+    """Test the hashed directory layout and the metadata index."""
+
+    def test_files_stored_in_two_level_shards(self, file_store):
+        """Test new files land in uploads/ab/cd/ and the root stays small."""
+        filename = file_store.save_bytes(b"sharded", "photo.jpg", validate=False)
+
+        path = file_store.get_file_path(filename)
+        relative = path.relative_to(file_store.uploads_dir)
+        assert len(relative.parts) == 3
+        assert all(len(part) == 2 for part in relative.parts[:2])
+        assert path.read_bytes() == b"sharded"
+        assert all(item.is_dir() or item.name.startswith(".") for item in file_store.uploads_dir.iterdir())
+
+    def test_flat_files_migrate_in_place(self, temp_photo_dir):
+        """Test files from the flat layout move into shards under the same name."""
+        uploads = temp_photo_dir / "legacy"
+        uploads.mkdir()
+        (uploads / "old_photo.jpg").write_bytes(b"old photo")
+
+        store = FileStore(uploads_dir=uploads, normalize_images=False)
+
+        assert not (uploads / "old_photo.jpg").exists()
+        assert store.read_file_as_bytes("old_photo.jpg") == b"old photo"
+        assert store.list_files() == ["old_photo.jpg"]
+        assert store.get_file_hash("old_photo.jpg") == hashlib.sha256(b"old photo").hexdigest()
+
+    def test_listing_and_size_come_from_index(self, file_store):
+        """Test listing, filtering and total size are answered by the index."""
+        file_store.save_bytes(b"a" * 1024, "one.jpg", validate=False)
+        file_store.save_bytes(b"b" * 2048, "two.png", validate=False)
+
+        assert len(file_store.list_files()) == 2
+        assert len(file_store.list_files(".PNG")) == 1
+        assert file_store.get_total_size_mb() == pytest.approx(3072 / (1024 * 1024))
+
+    def test_file_info_tracks_access(self, file_store):
+        """Test file info includes hash and records the last read."""
+        filename = file_store.save_bytes(b"info", "photo.jpg", validate=False)
+
+        info = file_store.get_file_info(filename)
+        assert info["size_bytes"] == 4
+        assert info["sha256"] == hashlib.sha256(b"info").hexdigest()
+        assert info["last_accessed_at"] is None
+
+        file_store.read_file_as_bytes(filename)
+        assert file_store.get_file_info(filename)["last_accessed_at"] is not None
+
+    def test_cleanup_uses_indexed_creation_time(self, file_store):
+        """Test old files are found through the index and removed."""
+        old = file_store.save_bytes(b"old", "old.jpg", validate=False)
+        new = file_store.save_bytes(b"new", "new.jpg", validate=False)
+        file_store._index.execute(
+            "UPDATE file_index SET created_at = '2000-01-01 00:00:00' WHERE filename = ?", (old,)
+        )
+
+        assert file_store.cleanup_old_files(days=30) == 1
+        assert not file_store.file_exists(old)
+        assert file_store.list_files() == [new]
+
+    @pytest.mark.parametrize("sharded", [True, False])
+    def test_unindexed_files_indexed_on_open(self, temp_photo_dir, sharded):
+        """Test files without index rows are listed even when nothing has to move."""
+        store = FileStore(uploads_dir=temp_photo_dir / "legacy", sharded=sharded, normalize_images=False)
+        path = store._shard_path("old.jpg") if sharded else store.uploads_dir / "old.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"old photo")
+        store._index.execute("DELETE FROM schema_migrations")
+
+        reopened = FileStore(uploads_dir=store.uploads_dir, sharded=sharded, normalize_images=False)
+
+        assert reopened.list_files() == ["old.jpg"]
+        assert reopened.get_total_size_mb() > 0
+
+    def test_flat_mode_still_supported(self, temp_photo_dir):
+        """Test disabling sharding keeps files at the top level."""
+        store = FileStore(uploads_dir=temp_photo_dir / "flat", sharded=False, normalize_images=False)
+
+        filename = store.save_bytes(b"flat", "photo.jpg", validate=False)
+
+        assert store.get_file_path(filename) == temp_photo_dir / "flat" / filename
+
+
+class _CountingReader(io.BytesIO):
+    """BytesIO that records how many bytes were read."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+
+class TestSaveStream:
+    """Test chunked streaming saves."""
+
+    def test_stream_saves_content(self, file_store):
+        """Test streamed content lands on disk and is indexed by hash."""
+        data = PNG_HEADER + b"\x01" * 200_000
+
+        filename = file_store.save_stream(io.BytesIO(data), "photo.png", chunk_size=4096)
+
+        assert file_store.read_file_as_bytes(filename) == data
+        assert file_store.get_file_hash(filename) == hashlib.sha256(data).hexdigest()
+
+    def test_stream_dedups_existing_content(self, file_store):
+        """Test streaming content already stored reuses the file."""
+        data = PNG_HEADER + b"\x02" * 1000
+        first = file_store.save_bytes(data, "photo.png")
+
+        second = file_store.save_stream(io.BytesIO(data), "other.png")
+
+        assert first == second
+        assert file_store.list_files() == [first]
+
+    def test_oversized_stream_aborts_early(self, temp_photo_dir):
+        """Test the copy stops once the size limit is passed."""
+        store = FileStore(uploads_dir=temp_photo_dir / "small", max_size_mb=0.01)
+        reader = _CountingReader(PNG_HEADER + b"\x00" * 1_000_000)
+
+        with pytest.raises(FileSizeError):
+            store.save_stream(reader, "photo.png", chunk_size=1024)
+
+        assert reader.bytes_read < 20_000
+        assert list((temp_photo_dir / "small").glob(".upload_*")) == []
+
+    def test_non_image_rejected_from_header(self, file_store):
+        """Test content with a non-image signature is refused."""
+        reader = _CountingReader(b"MZ" + b"\x00" * 500_000)
+
+        with pytest.raises(FileTypeError):
+            file_store.save_stream(reader, "photo.png", chunk_size=1024)
+
+        assert reader.bytes_read == 1024
+        assert file_store.list_files() == []
+
+    def test_validate_upload_reads_header_only(self, file_store, temp_photo_dir):
+        """Test uploads are checked from stat and header bytes."""
+        path = temp_photo_dir / "upload.png"
+        path.write_bytes(PNG_HEADER + b"\x00" * 100)
+
+        assert file_store.validate_upload(path) == "image/png"
+
+        path.write_bytes(b"<html>" + b"\x00" * 100)
+        with pytest.raises(FileTypeError):
+            file_store.validate_upload(path)
+
+    def test_sniff_mime_type(self):
+        """Test header sniffing recognises each supported signature."""
+        assert sniff_mime_type(b"\xff\xd8\xff\xe0") == "image/jpeg"
+        assert sniff_mime_type(PNG_HEADER) == "image/png"
+        assert sniff_mime_type(b"GIF89a\x00\x00") == "image/gif"
+        assert sniff_mime_type(b"RIFF\x00\x00\x00\x00WEBP") == "image/webp"
+        assert sniff_mime_type(b"abc") is None
+
+
+def _make_image(size, fmt="JPEG", exif=None):
+    """Encode a solid-colour test image with Pillow."""
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    kwargs = {"exif": exif} if exif is not None else {}
+    Image.new("RGB", size, (200, 120, 40)).save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+class TestImageNormalization:
+    """Test ingest-time resizing, orientation and re-encoding."""
+
+    @pytest.fixture
+    def store(self, temp_photo_dir):
+        return FileStore(uploads_dir=temp_photo_dir / "normalized", normalize_images=True)
+
+    def test_large_image_is_downsized(self, store):
+        """Test images are capped at the configured longest side."""
+        Image = pytest.importorskip("PIL.Image")
+        filename = store.save_bytes(_make_image((4000, 3000)), "photo.jpg")
+
+        assert filename.endswith(".webp")
+        with Image.open(store.get_file_path(filename)) as img:
+            assert max(img.size) == 1600
+            assert img.format == "WEBP"
+
+    def test_orientation_applied_and_metadata_dropped(self, store):
+        """Test EXIF orientation is baked into pixels and EXIF is stripped."""
+        Image = pytest.importorskip("PIL.Image")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees clockwise
+        exif[0x010F] = "TestCam"
+        filename = store.save_bytes(_make_image((400, 200), exif=exif), "photo.jpg")
+
+        with Image.open(store.get_file_path(filename)) as img:
+            assert img.size == (200, 400)
+            assert len(img.getexif()) == 0
+
+    def test_stream_is_normalized(self, store):
+        """Test streamed uploads go through the same normalization."""
+        Image = pytest.importorskip("PIL.Image")
+        filename = store.save_stream(io.BytesIO(_make_image((3200, 800), fmt="PNG")), "scan.png")
+
+        with Image.open(store.get_file_path(filename)) as img:
+            assert img.size == (1600, 400)
+        assert store.list_files() == [filename]
+
+    def test_stream_is_decoded_from_temp_file(self, store, monkeypatch):
+        """Test the streamed upload is not read back into memory to normalize it."""
+        pytest.importorskip("PIL.Image")
+        monkeypatch.setattr("pathlib.Path.read_bytes", lambda self: pytest.fail("upload read back whole"))
+
+        filename = store.save_stream(io.BytesIO(_make_image((2000, 1000))), "photo.jpg")
+
+        assert filename.endswith(".webp")
+
+    def test_preview_is_downsized_from_file(self, temp_photo_dir):
+        """Test the upload preview is the image as it will be stored."""
+        Image = pytest.importorskip("PIL.Image")
+        from storage.image_normalizer import preview_base64
+        path = temp_photo_dir / "big.jpg"
+        path.write_bytes(_make_image((4000, 3000)))
+
+        with Image.open(io.BytesIO(base64.b64decode(preview_base64(path)))) as img:
+            assert max(img.size) == 1600
+
+    def test_undecodable_image_stored_unchanged(self, store):
+        """Test data Pillow cannot decode is kept byte for byte."""
+        data = PNG_HEADER + b"\x00" * 100
+
+        filename = store.save_bytes(data, "photo.png")
+
+        assert filename.endswith(".png")
+        assert store.read_file_as_bytes(filename) == data
+
+
+class TestPublicUrl:
+    """Test content-hashed URL publishing."""
+
+    def test_public_url_is_content_hashed(self, file_store, sample_photo_base64):
+        """Test the URL is derived from content and the copy is published."""
+        filename = file_store.save_base64_file(sample_photo_base64, "photo.png")
+
+        url = file_store.get_public_url(filename)
+
+        assert url.startswith("/media/")
+        assert url.endswith(".png")
+        published = file_store.media_dir / url.rsplit("/", 1)[-1]
+        assert published.read_bytes() == base64.b64decode(sample_photo_base64)
+
+    def test_public_file_is_hard_linked(self, file_store, sample_photo_base64):
+        """Test publishing links the stored file instead of duplicating its bytes."""
+        filename = file_store.save_base64_file(sample_photo_base64, "photo.png")
+
+        published = file_store.media_dir / file_store.get_public_url(filename).rsplit("/", 1)[-1]
+
+        assert published.stat().st_ino == file_store.get_file_path(filename).stat().st_ino
+
+    def test_public_file_copied_when_link_fails(self, file_store, sample_photo_base64, monkeypatch):
+        """Test publishing falls back to a copy across filesystems."""
+        filename = file_store.save_base64_file(sample_photo_base64, "photo.png")
+
+        def cross_device(src, dst):
+            raise OSError(18, "Invalid cross-device link")
+
+        monkeypatch.setattr("storage.file_store.os.link", cross_device)
+        published = file_store.media_dir / file_store.get_public_url(filename).rsplit("/", 1)[-1]
+
+        assert published.read_bytes() == base64.b64decode(sample_photo_base64)
+        assert published.stat().st_ino != file_store.get_file_path(filename).stat().st_ino
+
+    def test_public_url_is_stable_across_calls(self, file_store, sample_photo_base64):
+        """Test repeat lookups return the same URL."""
+        filename = file_store.save_base64_file(sample_photo_base64, "photo.png")
+
+        assert file_store.get_public_url(filename) == file_store.get_public_url(filename)
+
+    def test_identical_content_shares_url(self, file_store, sample_photo_base64):
+        """Test two uploads of the same image map to one public file."""
+        first = file_store.save_base64_file(sample_photo_base64, "a.png")
+        second = file_store.save_base64_file(sample_photo_base64, "b.png")
+
+        assert file_store.get_public_url(first) == file_store.get_public_url(second)
+        assert len(list(file_store.media_dir.iterdir())) == 1
+
+    def test_url_changes_when_content_changes(self, file_store):
+        """Test rewriting a file produces a new URL."""
+        filename = file_store.save_bytes(b"first version", "photo.jpg", validate=False)
+        first_url = file_store.get_public_url(filename)
+
+        file_store.get_file_path(filename).write_bytes(b"second version, longer")
+
+        assert file_store.get_public_url(filename) != first_url
+
+    def test_copy_removed_with_last_reference(self, file_store, sample_photo_base64):
+        """Test the published copy outlives one of two files sharing it, but not both."""
+        first = file_store.save_base64_file(sample_photo_base64, "a.png")
+        second = file_store.save_base64_file(sample_photo_base64, "b.png")
+        published = file_store.media_dir / file_store.get_public_url(first).rsplit("/", 1)[-1]
+        file_store.get_public_url(second)
+
+        file_store.delete_file(first)
+        assert published.exists()
+
+        file_store.delete_file(second)
+        assert not published.exists()
+
+    def test_quarantine_and_cleanup_remove_copy(self, file_store, sample_photo_base64):
+        """Test quarantined and expired files stop being served."""
+        quarantined = file_store.save_base64_file(sample_photo_base64, "a.png")
+        expired = file_store.save_bytes(b"old photo", "b.jpg", validate=False)
+        urls = [file_store.get_public_url(name) for name in (quarantined, expired)]
+
+        file_store.quarantine_file(quarantined)
+        file_store.cleanup_old_files(days=-1)
+
+        assert list(file_store.media_dir.iterdir()) == []
+        file_store.restore_file(quarantined)
+        assert file_store.get_public_url(quarantined) == urls[0]
+
+    def test_missing_file_raises(self, file_store):
+        """Test publishing a missing file raises FileNotFoundError."""
+        with pytest.raises(StoreFileNotFoundError):
+            file_store.get_public_url("missing.jpg")
+
+
+class TestPhotoServiceSource:
+    """Test PhotoService URL resolution."""
+
+    def test_filename_resolves_to_url(self, file_store, sample_photo_base64):
+        """Test stored files are referenced by URL, not base64."""
+        service = PhotoService()
+        service.file_store = file_store
+        filename = file_store.save_base64_file(sample_photo_base64, "photo.png")
+
+        url, b64 = service.get_photo_source(filename)
+
+        assert url == file_store.get_public_url(filename)
+        assert b64 is None
+
+    def test_legacy_base64_passes_through(self):
+        """Test inline base64 data is returned as base64."""
+        service = PhotoService()
+        legacy = "a" * 300
+
+        assert service.get_photo_source(legacy) == (None, legacy)
+        assert service.get_photo_url(legacy) is None
+
+    def test_missing_photo_has_no_source(self, file_store):
+        """Test missing files and empty values resolve to nothing."""
+        service = PhotoService()
+        service.file_store = file_store
+
+        assert service.get_photo_source(None) == (None, None)
+        assert service.get_photo_source("missing.jpg") == (None, None)
+
+
+class TestMediaCacheMiddleware:
+    """Test cache headers on media responses."""
+
+    @staticmethod
+    def _run(path, status=200):
+        async def app(scope, receive, send):
+            await send({
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"cache-control", b"no-cache")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        middleware = MediaCacheMiddleware(app, max_age=3600)
+        asyncio.run(middleware({"type": "http", "path": path}, None, send))
+        return dict(sent[0]["headers"])
+
+    def test_media_response_is_cached(self):
+        """Test media responses get immutable long-lived caching."""
+        headers = self._run("/media/abc.jpg")
+        assert headers[b"cache-control"] == b"public, max-age=3600, immutable"
+
+    def test_other_paths_untouched(self):
+        """Test non-media responses keep their original headers."""
+        headers = self._run("/index.html")
+        assert headers[b"cache-control"] == b"no-cache"
+
+    def test_error_responses_untouched(self):
+        """Test missing media is not cached."""
+        headers = self._run("/media/missing.jpg", status=404)
+        assert headers[b"cache-control"] == b"no-cache"
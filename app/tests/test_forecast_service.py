@@ -0,0 +1,93 @@
+"""Tests for ForecastService - capacity forecast over the daily rollup."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from services.forecast_service import ForecastService, NUMPY_AVAILABLE, project
+
+pytestmark = pytest.mark.skipif(not NUMPY_AVAILABLE, reason="NumPy is not installed")
+
+
+@pytest.fixture
+def forecast_service(temp_db_path):
+    """ForecastService on the temporary database."""
+    return ForecastService(temp_db_path)
+
+
+class TestProject:
+    """Test the vectorized projection on synthetic series."""
+
+    def test_recovers_weekday_pattern_and_rates(self):
+        """Test a weekly pattern is found and steady rates project linearly."""
+        import numpy as np
+        # 2024-01-01 is a Monday; intakes double on Saturdays, adoptions are flat
+        pattern = np.array([1, 1, 1, 1, 1, 2, 1], dtype=float)
+        intakes = np.tile(pattern, 52)
+        history = np.vstack([intakes, np.full(len(intakes), 0.5)])
+
+        factors, rates, projected, full_index = project(history, date(2024, 1, 1), 10, 1000, 4, 28.0)
+
+        assert factors[0] == pytest.approx(pattern / pattern.mean(), rel=1e-6)
+        assert factors[1] == pytest.approx(np.ones(7))
+        assert rates[1] == pytest.approx(0.5)
+        # The projection continues on a Monday and keeps the weekly totals
+        assert projected[0, :7].sum() == pytest.approx(pattern.sum(), rel=0.02)
+        assert projected[0, 5] == pytest.approx(2 * projected[0, 0])
+        assert full_index is None
+
+    def test_full_index(self):
+        """Test the first day at capacity is reported."""
+        import numpy as np
+        history = np.vstack([np.full(70, 3.0), np.full(70, 1.0)])
+
+        _, _, _, full_index = project(history, date(2024, 1, 1), 90, 100, 2, 28.0)
+
+        # Net +2 per day from 90: reaches 100 on the fifth projected day
+        assert full_index == 4
+
+    def test_empty_history(self):
+        """Test no history projects no change."""
+        import numpy as np
+        _, rates, projected, full_index = project(np.zeros((2, 0)), date(2024, 1, 1), 5, 10, 1, 28.0)
+
+        assert list(rates) == [0, 0]
+        assert projected.sum() == 0
+        assert full_index is None
+
+
+class TestForecastService:
+    """Test the forecast read from the rollup and counters."""
+
+    def test_forecast_from_intakes(self, forecast_service):
+        """Test intakes raise the projected population from the current count."""
+        db = forecast_service.db
+        now = datetime.utcnow()
+        for days_ago in range(1, 57):
+            db.execute(
+                "INSERT INTO animals (name, species, status, intake_date) VALUES ('A', 'dog', 'healthy', ?)",
+                ((now - timedelta(days=days_ago)).isoformat(),)
+            )
+        db.execute("INSERT INTO animals (name, species, status) VALUES ('B', 'cat', 'adopted')")
+
+        forecast = forecast_service.get_capacity_forecast(weeks=4, capacity=70)
+
+        assert forecast.current_population == 56
+        assert forecast.intake_per_week == pytest.approx(7, rel=0.05)
+        assert forecast.adoptions_per_week == 0
+        assert len(forecast.week_starts) == len(forecast.population) == 4
+        assert forecast.population[0] == pytest.approx(63, rel=0.05)
+        assert forecast.full_on == forecast.computed_on + timedelta(days=13)
+
+    def test_cached_per_day(self, forecast_service):
+        """Test the same day reuses the forecast and another day recomputes it."""
+        first = forecast_service.get_capacity_forecast(weeks=2, capacity=10)
+        forecast_service.db.execute("INSERT INTO animals (name, species, status) VALUES ('A', 'dog', 'healthy')")
+
+        assert forecast_service.get_capacity_forecast(weeks=2, capacity=10) is first
+        tomorrow = first.computed_on + timedelta(days=1)
+        assert forecast_service.get_capacity_forecast(weeks=2, capacity=10, today=tomorrow).current_population == 1
+
+    def test_invalid_weeks(self, forecast_service):
+        """Test a non-positive horizon is rejected."""
+        with pytest.raises(ValueError):
+            forecast_service.get_capacity_forecast(weeks=0)
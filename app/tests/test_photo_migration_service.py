@@ -0,0 +1,176 @@
+"""Tests for PhotoMigrationService - moving inline base64 photos to FileStore."""
+import base64
+import sqlite3
+
+import pytest
+
+from services.photo_migration_service import PhotoMigrationService
+from services.photo_service import PhotoService
+from storage.file_store import FileStore
+
+
+# A PNG header padded well past MAX_PHOTO_REFERENCE_LENGTH once encoded
+INLINE_PNG = base64.b64encode(b"\x89PNG\r\n\x1a\n" + b"\x00" * 600).decode()
+
+
+@pytest.fixture
+def photo_service(temp_photo_dir):
+    """PhotoService writing to an isolated FileStore."""
+    service = PhotoService()
+    service.file_store = FileStore(uploads_dir=temp_photo_dir / "uploads")
+    return service
+
+
+@pytest.fixture
+def legacy_db(temp_db):
+    """Database with the inline-photo guard removed so legacy rows can be seeded."""
+    temp_db.execute("DROP TRIGGER IF EXISTS trg_animals_photo_no_inline_insert")
+    temp_db.execute("DROP TRIGGER IF EXISTS trg_animals_photo_no_inline_update")
+    for i in range(5):
+        temp_db.execute(
+            "INSERT INTO animals (name, species, status, photo) VALUES (?, 'Dog', 'healthy', ?)",
+            (f"Legacy {i}", INLINE_PNG)
+        )
+    temp_db.execute(
+        "INSERT INTO animals (name, species, status, photo) VALUES ('Modern', 'Cat', 'healthy', 'modern.jpg')"
+    )
+    return temp_db
+
+
+def _make_service(db, photo_service, batch_size=2):
+    service = PhotoMigrationService(db, batch_size=batch_size)
+    service.photo_service = photo_service
+    return service
+
+
+class TestPhotoMigration:
+    """Test batch extraction of inline photos."""
+
+    def test_run_extracts_inline_photos(self, legacy_db, photo_service):
+        """Test every inline photo becomes a stored file and bytes are reported."""
+        service = _make_service(legacy_db, photo_service)
+
+        report = service.run()
+
+        assert report["complete"] is True
+        assert report["migrated"] == 5
+        assert report["bytes_reclaimed"] > 5 * 700
+        rows = legacy_db.fetch_all("SELECT photo FROM animals ORDER BY id")
+        for row in rows[:5]:
+            assert photo_service.file_store.file_exists(row["photo"])
+            assert row["photo"].endswith(".png")
+        assert rows[5]["photo"] == "modern.jpg"
+        assert service.count_pending()["animals.photo"]["rows"] == 0
+
+    def test_run_resumes_from_cursor(self, legacy_db, photo_service):
+        """Test a capped run stops early and a later run finishes the rest."""
+        service = _make_service(legacy_db, photo_service)
+
+        first = service.run(max_batches=1)
+        assert first["complete"] is False
+        assert first["migrated"] == 2
+        assert service.get_cursor("animals", "photo") > 0
+
+        second = _make_service(legacy_db, photo_service).run()
+        assert second["complete"] is True
+        assert second["migrated"] == 3
+
+    def test_undecodable_rows_are_skipped(self, legacy_db, photo_service):
+        """Test invalid inline data is counted as failed and left unchanged."""
+        junk = "z" * 400
+        legacy_db.execute("UPDATE animals SET photo = ? WHERE name = 'Legacy 0'", (junk,))
+
+        report = _make_service(legacy_db, photo_service).run()
+
+        assert report["failed"] == 1
+        assert legacy_db.fetch_one("SELECT photo FROM animals WHERE name = 'Legacy 0'")["photo"] == junk
+
+    def test_lost_compare_and_set_releases_file(self, legacy_db, photo_service, monkeypatch):
+        """Test a row edited during extraction is not counted and its copy is released."""
+        extracted = []
+        original = photo_service.ensure_file_reference
+
+        def edit_during_extraction(photo, name):
+            extracted.append(original(photo, name))
+            legacy_db.execute("UPDATE animals SET photo = 'edited.jpg' WHERE name = 'Legacy 0'")
+            return extracted[-1]
+
+        monkeypatch.setattr(photo_service, "ensure_file_reference", edit_during_extraction)
+        service = _make_service(legacy_db, photo_service, batch_size=1)
+
+        result = service.migrate_batch("animals", "photo", "name")
+
+        assert result["processed"] == 1
+        assert result["migrated"] == 0
+        assert legacy_db.fetch_one("SELECT photo FROM animals WHERE name = 'Legacy 0'")["photo"] == "edited.jpg"
+        assert not photo_service.file_store.file_exists(extracted[0])
+
+
+class TestInlinePhotoGuard:
+    """Test new inline writes are prevented."""
+
+    def test_trigger_rejects_inline_insert(self, temp_db):
+        """Test the database refuses inline photo data."""
+        with pytest.raises(sqlite3.IntegrityError):
+            temp_db.execute(
+                "INSERT INTO animals (name, species, photo) VALUES ('Raw', 'Dog', ?)",
+                (INLINE_PNG,)
+            )
+
+    def test_trigger_rejects_inline_update(self, temp_db):
+        """Test switching a filename to inline data is refused."""
+        rescue_id = temp_db.execute(
+            "INSERT INTO rescue_missions (location, status, animal_photo) VALUES ('X', 'pending', 'a.jpg')"
+        )
+        with pytest.raises(sqlite3.IntegrityError):
+            temp_db.execute(
+                "UPDATE rescue_missions SET animal_photo = ? WHERE id = ?", (INLINE_PNG, rescue_id)
+            )
+
+    def test_service_extracts_inline_data(self, photo_service):
+        """Test ensure_file_reference turns inline data into a filename."""
+        filename = photo_service.ensure_file_reference(INLINE_PNG, "buddy")
+
+        assert filename.startswith("buddy_") and filename.endswith(".png")
+        assert photo_service.ensure_file_reference(filename) == filename
+        assert photo_service.ensure_file_reference(None) is None
+
+
+class TestPlaceholderBackfill:
+    """Test backfilling inline previews for existing photos."""
+
+    def test_backfill_generates_previews(self, temp_db, photo_service):
+        """Test animals with a photo but no preview get a tiny one."""
+        Image = pytest.importorskip("PIL.Image")
+        import io
+
+        buffer = io.BytesIO()
+        Image.new("RGB", (640, 480), (30, 90, 160)).save(buffer, format="PNG")
+        filename = photo_service.file_store.save_bytes(buffer.getvalue(), "photo.png")
+        temp_db.execute(
+            "INSERT INTO animals (name, species, status, photo) VALUES ('Sky', 'Cat', 'healthy', ?)",
+            (filename,)
+        )
+
+        report = _make_service(temp_db, photo_service).backfill_placeholders()
+
+        assert report == {"generated": 1, "failed": 0, "complete": True}
+        placeholder = temp_db.fetch_one("SELECT photo_placeholder FROM animals WHERE name = 'Sky'")["photo_placeholder"]
+        with Image.open(io.BytesIO(base64.b64decode(placeholder))) as preview:
+            assert preview.size == (16, 12)
+
+    def test_missing_files_are_passed_over(self, temp_db, photo_service, monkeypatch):
+        """Test rows whose preview cannot be made do not stall the backfill."""
+        import services.photo_migration_service as migration
+
+        monkeypatch.setattr(migration, "PIL_AVAILABLE", True)
+        temp_db.execute(
+            "INSERT INTO animals (name, species, status, photo) VALUES ('Gone', 'Dog', 'healthy', 'gone.jpg')"
+        )
+        service = _make_service(temp_db, photo_service)
+
+        report = service.backfill_placeholders()
+
+        assert report["failed"] == 1
+        assert report["complete"] is True
+        assert service.backfill_placeholders()["failed"] == 0
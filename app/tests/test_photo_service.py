@@ -70,6 +70,26 @@ class TestPhotoValidation:
         assert result == PhotoValidationResult.VALID
 
 
+class TestHeaderOnlyValidation:
+    """Test validation that avoids decoding whole payloads."""
+    
+    def test_validate_large_payload_rejected_by_length(self):
+        """Test oversize data is rejected from its length."""
+        service = PhotoService()
+        too_big = base64.b64encode(b'\x89PNG\r\n\x1a\n').decode() + "A" * (8 * 1024 * 1024)
+        
+        result, _ = service.validate_base64_image(too_big)
+        assert result == PhotoValidationResult.INVALID_SIZE
+    
+    def test_validate_checks_header_type(self):
+        """Test the type check uses the decoded header."""
+        service = PhotoService()
+        not_image = base64.b64encode(b"plain text, not an image at all").decode()
+        
+        result, _ = service.validate_base64_image(not_image)
+        assert result == PhotoValidationResult.INVALID_TYPE
+
+
 class TestPhotoLoading:
     """Test photo loading operations."""
     
@@ -228,3 +248,126 @@ class TestPhotoInfo:
         
         info = service.get_photo_info("")
         assert info is None
+
+
+class TestPhotoCache:
+    """Test the encoded photo LRU cache."""
+    
+    @pytest.fixture
+    def service(self, temp_photo_dir):
+        """PhotoService backed by an isolated FileStore."""
+        from storage.file_store import FileStore
+        
+        service = PhotoService()
+        service.file_store = FileStore(uploads_dir=temp_photo_dir / "uploads", normalize_images=False)
+        return service
+    
+    def test_repeat_load_hits_cache(self, service, sample_photo_base64):
+        """Test the second load of a photo is served from the cache."""
+        filename = service.file_store.save_base64_file(sample_photo_base64, "photo.png")
+        
+        first = service.load_photo_as_base64(filename)
+        second = service.load_photo_as_base64(filename)
+        
+        assert first == second == sample_photo_base64
+        stats = service.cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_modified_file_is_reloaded(self, service):
+        """Test a rewritten file is not served stale."""
+        filename = service.file_store.save_bytes(b"old bytes", "photo.jpg", validate=False)
+        service.load_photo_as_base64(filename)
+        
+        service.file_store.get_file_path(filename).write_bytes(b"new, longer bytes")
+        
+        assert service.load_photo_as_base64(filename) == base64.b64encode(b"new, longer bytes").decode()
+    
+    def test_delete_photo_invalidates(self, service):
+        """Test deleting a photo drops its cached payload."""
+        filename = service.file_store.save_bytes(b"cached bytes", "photo.jpg", validate=False)
+        service.load_photo_as_base64(filename)
+        
+        assert service.delete_photo(filename) is True
+        assert service.cache_stats()["size"] == 0
+        assert service.load_photo_as_base64(filename) is None
+    
+    def test_cache_is_byte_bounded(self):
+        """Test entries are evicted once the byte budget is exceeded."""
+        from storage.cache import LRUCache
+        
+        cache = LRUCache(max_size=100, max_bytes=10, size_fn=len)
+        cache.set("a", "12345")
+        cache.set("b", "12345")
+        cache.set("c", "12345")
+        
+        assert cache.get("a") is None
+        assert cache.get("c") == "12345"
+        assert cache.size_bytes() == 10
+        assert cache.stats()["evictions"] == 1
+    
+    def test_oversized_value_not_cached(self):
+        """Test a value larger than the whole budget is skipped."""
+        from storage.cache import LRUCache
+        
+        cache = LRUCache(max_size=100, max_bytes=4, size_fn=len)
+        cache.set("big", "12345")
+        
+        assert cache.size() == 0
+
+
+class TestLoadMany:
+    """Test concurrent multi-photo loading."""
+    
+    @pytest.fixture
+    def service(self, temp_photo_dir):
+        """PhotoService backed by an isolated FileStore."""
+        from storage.file_store import FileStore
+        
+        service = PhotoService()
+        service.file_store = FileStore(
+            uploads_dir=temp_photo_dir / "uploads",
+            media_dir=temp_photo_dir / "media",
+            normalize_images=False,
+        )
+        return service
+    
+    def test_returns_map_of_photos(self, service):
+        """Test each distinct photo is loaded once and missing files map to None."""
+        first = service.file_store.save_bytes(b"first", "a.jpg", validate=False)
+        second = service.file_store.save_bytes(b"second", "b.jpg", validate=False)
+        
+        result = service.load_many([first, second, first, None, "", "missing.jpg"])
+        
+        assert result == {
+            first: base64.b64encode(b"first").decode(),
+            second: base64.b64encode(b"second").decode(),
+            "missing.jpg": None,
+        }
+    
+    def test_loads_run_concurrently(self, service):
+        """Test photos are loaded in parallel rather than one after another."""
+        import threading
+        
+        barrier = threading.Barrier(4, timeout=5)
+        
+        def slow_load(photo, max_size=None):
+            barrier.wait()  # Only passes if four loads are in flight at once
+            return photo.upper()
+        
+        service.load_photo_as_base64 = slow_load
+        
+        result = service.load_many(["a.jpg", "b.jpg", "c.jpg", "d.jpg"])
+        
+        assert result["d.jpg"] == "D.JPG"
+        assert None not in result.values()
+    
+    def test_callback_reports_each_photo(self, service):
+        """Test the callback fires with each resolved (url, base64) pair."""
+        filename = service.file_store.save_bytes(b"photo", "a.jpg", validate=False)
+        seen = []
+        
+        service.resolve_many([filename, "missing.jpg"], on_resolved=lambda p, src: seen.append((p, src)))
+        
+        assert dict(seen)["missing.jpg"] == (None, None)
+        assert dict(seen)[filename][0].startswith("/media/")
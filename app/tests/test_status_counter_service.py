@@ -0,0 +1,109 @@
+"""Tests for StatusCounterService - the trigger-maintained status counters."""
+import random
+
+import pytest
+
+from services.status_counter_service import StatusCounterService, main
+from storage.database import Database
+
+
+@pytest.fixture
+def counters_db(temp_db_path):
+    """Database shared with the service fixtures."""
+    return Database(temp_db_path)
+
+
+@pytest.fixture
+def counters(counters_db):
+    """StatusCounterService with its triggers installed on the temporary database."""
+    return StatusCounterService(counters_db)
+
+
+class TestStatusCounters:
+    """Test incremental maintenance, reads and the consistency check."""
+
+    def test_status_transition_moves_counts(self, counters, adoption_service, sample_adoption_request):
+        """Test approving a request moves it from pending to approved."""
+        assert counters.get_counts("adoption_requests")["adoption_requests"] == {"pending": 1}
+
+        adoption_service.update_status(sample_adoption_request["id"], "approved")
+
+        assert counters.get_counts("adoption_requests")["adoption_requests"] == {"approved": 1}
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_incremental_matches_rebuild(self, counters, counters_db, sample_user, seed):
+        """Test random inserts, transitions and deletes leave no drift."""
+        rng = random.Random(seed)
+        statuses = ["pending", "rescued", "Rescued|archived", "on-going", "cancelled", "removed", None]
+        request_statuses = ["pending", "approved", "approved|archived", "denied", "cancelled", "removed", None]
+        animal_statuses = ["healthy", "Injured", "adopted|archived", "removed", None]
+
+        animal_ids = [
+            counters_db.execute("INSERT INTO animals (name, species, status) VALUES ('A', 'dog', ?)",
+                                (rng.choice(animal_statuses),))
+            for _ in range(20)
+        ]
+        mission_ids = [
+            counters_db.execute("INSERT INTO rescue_missions (user_id, location, status) VALUES (?, 'X', ?)",
+                                (sample_user["id"], rng.choice(statuses)))
+            for _ in range(40)
+        ]
+        request_ids = [
+            counters_db.execute("INSERT INTO adoption_requests (user_id, animal_id, status) VALUES (?, ?, ?)",
+                                (sample_user["id"], rng.choice(animal_ids), rng.choice(request_statuses)))
+            for _ in range(40)
+        ]
+        user_ids = [
+            counters_db.execute("INSERT INTO users (name, email, role) VALUES ('U', ?, ?)",
+                                (f"u{i}@example.com", rng.choice(["user", "admin", None])))
+            for i in range(10)
+        ]
+
+        for _ in range(80):
+            action = rng.randrange(5)
+            if action == 0:
+                counters_db.execute("UPDATE rescue_missions SET status = ? WHERE id = ?",
+                                    (rng.choice(statuses), rng.choice(mission_ids)))
+            elif action == 1:
+                counters_db.execute("UPDATE adoption_requests SET status = ? WHERE id = ?",
+                                    (rng.choice(request_statuses), rng.choice(request_ids)))
+            elif action == 2:
+                counters_db.execute("UPDATE animals SET status = ? WHERE id = ?",
+                                    (rng.choice(animal_statuses), rng.choice(animal_ids)))
+            elif action == 3:
+                counters_db.execute("UPDATE users SET role = ?, is_disabled = ? WHERE id = ?",
+                                    (rng.choice(["user", "admin"]), rng.randint(0, 1), rng.choice(user_ids)))
+            else:
+                counters_db.execute("DELETE FROM adoption_requests WHERE id = ?", (rng.choice(request_ids),))
+
+        assert counters.check() == []
+        counts = counters.get_counts("rescue_missions", "user_roles")
+        assert sum(counts["rescue_missions"].values()) > 0
+        total_users = counters_db.fetch_one("SELECT COUNT(*) AS n FROM users")["n"]
+        assert sum(counts["user_roles"].values()) == total_users
+
+    def test_drift_is_reported_and_rebuilt(self, counters, counters_db, temp_db_path, sample_animal):
+        """Test the command reports tampered counters and repairs them."""
+        counters_db.execute("UPDATE status_counters SET count = 7 WHERE scope = 'animals'")
+        assert counters.check() == [("animals", "healthy", 7, 1)]
+
+        assert main(["--db", temp_db_path]) == 1
+        assert counters.check() == []
+        assert main(["--db", temp_db_path]) == 0
+
+    def test_unknown_scope(self, counters):
+        """Test unknown scopes are rejected."""
+        with pytest.raises(ValueError):
+            counters.get_counts("visits")
+
+    def test_user_stats_from_counters(self, user_service, sample_user, sample_admin, counters_db):
+        """Test UserService.get_user_stats follows role and disabled changes."""
+        counters_db.execute("UPDATE users SET is_disabled = 1 WHERE id = ?", (sample_user["id"],))
+
+        stats = user_service.get_user_stats()
+
+        rows = counters_db.fetch_all("SELECT role, is_disabled FROM users")
+        assert stats["total"] == len(rows)
+        assert stats["admins"] == sum(1 for r in rows if r["role"] == "admin") >= 1
+        assert stats["users"] == stats["total"] - stats["admins"]
+        assert stats["disabled"] == 1
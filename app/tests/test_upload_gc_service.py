@@ -0,0 +1,94 @@
+"""Tests for UploadGCService - quarantining and purging orphaned uploads."""
+import pytest
+
+from services.upload_gc_service import UploadGCService
+from storage.file_store import FileStore
+
+
+@pytest.fixture
+def gc_store(temp_photo_dir):
+    """FileStore isolated in a temporary directory."""
+    return FileStore(uploads_dir=temp_photo_dir / "uploads", normalize_images=False)
+
+
+@pytest.fixture
+def stored(temp_db, gc_store):
+    """One referenced and two orphaned files."""
+    live = gc_store.save_bytes(b"live photo", "live.jpg", validate=False)
+    orphan_a = gc_store.save_bytes(b"orphan a" * 100, "a.jpg", validate=False)
+    orphan_b = gc_store.save_bytes(b"orphan b" * 100, "b.jpg", validate=False)
+    temp_db.execute(
+        "INSERT INTO animals (name, species, status, photo) VALUES ('Buddy', 'Dog', 'healthy', ?)",
+        (live,)
+    )
+    return {"live": live, "orphans": [orphan_a, orphan_b]}
+
+
+def _make_service(db, store, **kwargs):
+    kwargs.setdefault("grace_hours", 0)
+    return UploadGCService(db, file_store=store, **kwargs)
+
+
+class TestUploadGC:
+    """Test mark, quarantine and purge."""
+
+    def test_mark_collects_references(self, temp_db, gc_store, stored):
+        """Test referenced filenames come from every photo column."""
+        temp_db.execute(
+            "INSERT INTO rescue_missions (location, status, animal_photo) VALUES ('X', 'pending', 'r.jpg')"
+        )
+
+        referenced = _make_service(temp_db, gc_store).mark()
+
+        assert stored["live"] in referenced
+        assert "r.jpg" in referenced
+
+    def test_orphans_quarantined_then_purged(self, temp_db, gc_store, stored):
+        """Test orphans are set aside first and deleted on a later run."""
+        service = _make_service(temp_db, gc_store)
+
+        first = service.run()
+        assert first["complete"] is True
+        assert first["quarantined"] == 2
+        assert first["bytes_quarantined"] == 1600
+        assert gc_store.list_files() == [stored["live"]]
+        assert len(gc_store.list_quarantined()) == 2
+
+        second = service.run()
+        assert second["purged"] == 2
+        assert second["bytes_reclaimed"] == 1600
+        assert gc_store.list_quarantined() == []
+        assert gc_store.file_exists(stored["live"])
+
+    def test_recent_files_are_skipped(self, temp_db, gc_store, stored):
+        """Test files younger than the grace period are left alone."""
+        report = _make_service(temp_db, gc_store, grace_hours=24).run()
+
+        assert report["quarantined"] == 0
+        assert report["skipped_recent"] == 2
+        assert len(gc_store.list_files()) == 3
+
+    def test_rereferenced_file_is_restored(self, temp_db, gc_store, stored):
+        """Test a quarantined file that gains a reference comes back."""
+        service = _make_service(temp_db, gc_store)
+        service.run()
+        orphan = stored["orphans"][0]
+        temp_db.execute("UPDATE animals SET photo = ? WHERE name = 'Buddy'", (orphan,))
+
+        report = service.run()
+
+        assert report["restored"] == 1
+        assert gc_store.read_file_as_bytes(orphan) == b"orphan a" * 100
+
+    def test_sweep_resumes_from_cursor(self, temp_db, gc_store, stored):
+        """Test a capped run stops early and a later run finishes the pass."""
+        service = _make_service(temp_db, gc_store, batch_size=1)
+
+        first = service.run(max_batches=1)
+        assert first["complete"] is False
+        assert service.get_cursor() != ""
+
+        second = _make_service(temp_db, gc_store, batch_size=1).run()
+        assert second["complete"] is True
+        assert first["quarantined"] + second["quarantined"] == 2
+        assert service.get_cursor() == ""
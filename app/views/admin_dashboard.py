@@ -49,28 +49,28 @@ class AdminDashboard:
         drawer = create_admin_drawer(page, current_route=page.route) if _mobile else None
         _gradient_ref = show_page_loading(page, None if _mobile else sidebar, "Loading dashboard...")
 
-        stats = self.analytics_service.get_dashboard_stats()
+        snapshot = self.analytics_service.get_snapshot()
+        stats = snapshot.dashboard_stats
         total_animals = stats["total_animals"]
         total_adoptions = stats["total_adoptions"]  # Actual approved count
         pending_applications = stats["pending_applications"]
         
-        all_requests = self.adoption_service.get_all_requests() or []
-        total_requests = len([r for r in all_requests if (r.get("status") or "").lower() in ["pending", "approved", "denied"]])
+        total_requests = sum(snapshot.request_status_counts.get(s, 0) for s in ("pending", "approved", "denied"))
         
-        pending_rescues = self.analytics_service.get_pending_rescue_missions()
+        pending_rescues = snapshot.pending_rescue_missions
         
-        changes = self.analytics_service.get_monthly_changes()
+        changes = snapshot.monthly_changes
         animals_change = changes["animals_change"]
         adoptions_change = changes["adoptions_change"]
         pending_change = changes["pending_change"]
         rescues_change = changes["rescues_change"]
 
-        (month_labels, rescued_counts, adopted_counts) = self.analytics_service.get_chart_data_14_days()
-        _, type_dist, status_counts = self.analytics_service.get_chart_data()
+        (month_labels, rescued_counts, adopted_counts) = snapshot.trend_14_days
+        status_counts = snapshot.health_status_counts
         
-        breed_distribution = self.analytics_service.get_breed_distribution()
+        breed_distribution = snapshot.breed_distribution
 
-        missions = self.rescue_service.get_all_missions() or []
+        missions = snapshot.missions
 
         sidebar = create_admin_sidebar(page, current_route=page.route)
 
@@ -11,11 +11,10 @@ from typing import Callable, Optional
 
 import app_config
 from state import get_app_state
-from services.photo_service import load_photo
 from services.rescue_service import RescueService
 from components import (
     create_admin_sidebar, create_user_sidebar, create_gradient_background,
-    create_page_title, create_animal_card, create_empty_state, show_snackbar,
+    create_page_title, create_animal_card, load_card_photos, create_empty_state, show_snackbar,
     create_archive_dialog, create_remove_dialog, create_action_button,
     show_page_loading, finish_page_loading,
     is_mobile, create_responsive_layout, responsive_padding,
@@ -180,10 +179,14 @@ class AnimalsListPage:
             on_click=lambda e: self._export_csv(animals),
         ) if is_admin else None
 
+        # Cards start with a placeholder; photos are filled in once the page is shown
+        photo_slots = []
+
         def create_card_for_animal(animal):
             aid = animal.get("id")
             aname = animal.get("name", "Unknown")
-            photo_base64 = load_photo(animal.get("photo"))
+            photo_ref = ft.Ref[ft.Container]()
+            photo_slots.append((animal.get("photo"), photo_ref))
             rescue_mission_id = animal.get("rescue_mission_id")
             rescue_info = None
             if rescue_mission_id:
@@ -251,7 +254,6 @@ class AnimalsListPage:
                 species=animal.get("species", "Unknown"),
                 age=animal.get("age", 0),
                 status=animal.get("status", "unknown"),
-                photo_base64=photo_base64,
                 on_adopt=lambda e, id=aid: page.go(f"/adoption_form?animal_id={id}"),
                 on_edit=lambda e, id=aid: self._on_edit(page, id) if is_admin else None,
                 on_archive=handle_archive if is_admin else None,
@@ -261,6 +263,8 @@ class AnimalsListPage:
                 is_rescued=is_rescued,
                 rescue_info=rescue_info,
                 breed=animal.get("breed"),
+                photo_ref=photo_ref,
+                photo_placeholder=animal.get("photo_placeholder"),
             )
 
         animal_cards = []
@@ -341,6 +345,7 @@ class AnimalsListPage:
             layout = main_content
 
         finish_page_loading(page, _gradient_ref, layout)
+        load_card_photos(page, photo_slots)
 
     # ---- actions ----
     def _on_edit(self, page, animal_id: int) -> None:
@@ -400,11 +405,13 @@ class AnimalsListPage:
         
         # Rebuild animal cards
         animal_cards = []
+        photo_slots = []
         if animals:
             for animal in animals:
                 aid = animal.get("id")
                 aname = animal.get("name", "Unknown")
-                photo_base64 = load_photo(animal.get("photo"))
+                photo_ref = ft.Ref[ft.Container]()
+                photo_slots.append((animal.get("photo"), photo_ref))
                 rescue_mission_id = animal.get("rescue_mission_id")
                 rescue_info = None
                 if rescue_mission_id:
@@ -471,7 +478,6 @@ class AnimalsListPage:
                     species=animal.get("species", "Unknown"),
                     age=animal.get("age", 0),
                     status=animal.get("status", "unknown"),
-                    photo_base64=photo_base64,
                     on_adopt=lambda e, id=aid: page.go(f"/adoption_form?animal_id={id}"),
                     on_edit=lambda e, id=aid: self._on_edit(page, id) if is_admin else None,
                     on_archive=handle_archive if is_admin else None,
@@ -481,6 +487,8 @@ class AnimalsListPage:
                     is_rescued=is_rescued,
                     rescue_info=rescue_info,
                     breed=animal.get("breed"),
+                    photo_ref=photo_ref,
+                    photo_placeholder=animal.get("photo_placeholder"),
                 ))
             animal_card_controls = [
                 ft.Container(card, col={"xs": 6, "sm": 6, "md": 4, "lg": 3})
@@ -502,6 +510,7 @@ class AnimalsListPage:
         if self._animal_cards_container:
             self._animal_cards_container.controls = animal_card_controls
             self._animal_cards_container.update()
+            load_card_photos(page, photo_slots)
         
         if self._count_text:
             self._count_text.value = f"Showing {len(animals)} animal(s)"
@@ -8,10 +8,9 @@ from typing import Optional
 
 import app_config
 from state import get_app_state
-from services.photo_service import load_photo
 from components import (
     create_user_sidebar, create_gradient_background,
-    create_page_title, create_animal_card, create_empty_state,
+    create_page_title, create_animal_card, load_card_photos, create_empty_state,
     show_page_loading, finish_page_loading,
     is_mobile, create_responsive_layout, responsive_padding,
     create_user_drawer, create_page_control_bar,
@@ -60,20 +59,25 @@ class AvailableAdoptionPage:
                       if search_query in (a.get("name", "Unknown").lower() or "")
                       or search_query in (a.get("breed", "") or "").lower()]
 
+        # Cards start with a placeholder; photos are filled in once the page is shown
+        photo_slots = []
+
         def create_card_for_animal(animal):
             aid = animal.get("id")
-            photo_base64 = load_photo(animal.get("photo"))
+            photo_ref = ft.Ref[ft.Container]()
+            photo_slots.append((animal.get("photo"), photo_ref))
             return create_animal_card(
                 animal_id=aid,
                 name=animal.get("name", "Unknown"),
                 species=animal.get("species", "Unknown"),
                 age=animal.get("age", 0),
                 status=animal.get("status", "unknown"),
-                photo_base64=photo_base64,
                 on_adopt=lambda e, id=aid: self._on_apply(page, id),
                 is_admin=False,
                 show_adopt_button=True,
                 breed=animal.get("breed"),
+                photo_ref=photo_ref,
+                photo_placeholder=animal.get("photo_placeholder"),
             )
 
         animal_cards = []
@@ -153,6 +157,7 @@ class AvailableAdoptionPage:
         layout = create_responsive_layout(page, sidebar, main_content, drawer, title="Available Adoption")
 
         finish_page_loading(page, _gradient_ref, layout)
+        load_card_photos(page, photo_slots)
 
     def _on_apply(self, page, animal_id: int) -> None:
         # navigate to adoption form with query param
@@ -183,21 +188,24 @@ class AvailableAdoptionPage:
         
         # Rebuild animal cards
         animal_cards = []
+        photo_slots = []
         if animals:
             for animal in animals:
                 aid = animal.get("id")
-                photo_base64 = load_photo(animal.get("photo"))
+                photo_ref = ft.Ref[ft.Container]()
+                photo_slots.append((animal.get("photo"), photo_ref))
                 animal_cards.append(create_animal_card(
                     animal_id=aid,
                     name=animal.get("name", "Unknown"),
                     species=animal.get("species", "Unknown"),
                     age=animal.get("age", 0),
                     status=animal.get("status", "unknown"),
-                    photo_base64=photo_base64,
                     on_adopt=lambda e, id=aid: self._on_apply(page, id),
                     is_admin=False,
                     show_adopt_button=True,
                     breed=animal.get("breed"),
+                    photo_ref=photo_ref,
+                    photo_placeholder=animal.get("photo_placeholder"),
                 ))
             animal_card_controls = [
                 ft.Container(card, col={"xs": 6, "sm": 6, "md": 4, "lg": 3})
@@ -219,6 +227,7 @@ class AvailableAdoptionPage:
         if self._animal_cards_container:
             self._animal_cards_container.controls = animal_card_controls
             self._animal_cards_container.update()
+            load_card_photos(page, photo_slots)
 
 
 __all__ = ["AvailableAdoptionPage"]
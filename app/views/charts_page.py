@@ -1,13 +1,15 @@
 """Analytics charts page with rescue and adoption statistics."""
 from __future__ import annotations
 
-from typing import Optional, Any, List
+from datetime import datetime, timedelta
+from typing import Optional, Any, Callable, Dict, List
 
 import app_config
 from services.animal_service import AnimalService
 from services.rescue_service import RescueService
 from services.adoption_service import AdoptionService
 from services.analytics_service import AnalyticsService
+from services.forecast_service import ForecastService
 from components import (
     create_admin_sidebar, create_gradient_background,
     create_line_chart, create_bar_chart, create_pie_chart,
@@ -17,9 +19,19 @@ from components import (
     create_interactive_map,
     show_page_loading, finish_page_loading,
     is_mobile, create_responsive_layout, responsive_padding,
-    create_admin_drawer,
+    create_admin_drawer, format_duration,
 )
 
+# Rescued vs adopted windows: key -> (title, days before today, bucket granularity).
+# The default window comes from the snapshot; wider ones are read bucketed from
+# the daily rollup on demand
+TREND_WINDOWS = {
+    "30d": ("Last 30 Days", 29, "day"),
+    "12w": ("Last 12 Weeks", 7 * 12 - 1, "week"),
+    "52w": ("Last Year, Weekly", 364, "week"),
+    "12m": ("Last Year, Monthly", 364, "month"),
+}
+
 
 class ChartsPage:
     def __init__(self, db_path: Optional[str] = None) -> None:
@@ -27,6 +39,7 @@ class ChartsPage:
         self.rescue_service = RescueService(db_path or app_config.DB_PATH)
         self.adoption_service = AdoptionService(db_path or app_config.DB_PATH)
         self.analytics_service = AnalyticsService(db_path or app_config.DB_PATH)
+        self.forecast_service = ForecastService(db_path or app_config.DB_PATH)
 
     def build(self, page) -> None:
         try:
@@ -56,51 +69,32 @@ class ChartsPage:
                 legend_height=220 if _mobile else 240,
             )
 
-        (months, rescued_counts, adopted_counts), type_dist, status_counts = self.analytics_service.get_chart_data()
+        # One cached pass over the tables feeds every chart and stat on this page
+        snapshot = self.analytics_service.get_snapshot()
+        months, rescued_counts, adopted_counts = snapshot.trend_30_days
+        type_dist, status_counts = snapshot.type_distribution, snapshot.health_status_counts
 
         total_rescued = sum(rescued_counts)
         total_adopted = sum(adopted_counts)
-        pending_requests = self.adoption_service.get_all_requests() or []
-        total_pending = len([r for r in pending_requests if (r.get("status") or "").lower() == "pending"])
-        total_requests = len([r for r in pending_requests if (r.get("status") or "").lower() in ["pending", "approved", "denied"]])
+        request_status_counts = snapshot.request_status_counts
+        total_pending = request_status_counts.get("pending", 0)
+        total_requests = sum(request_status_counts.get(s, 0) for s in ("pending", "approved", "denied"))
         
-        pending_rescues = self.analytics_service.get_pending_rescue_missions()
+        pending_rescues = snapshot.pending_rescue_missions
         
-        changes = self.analytics_service.get_monthly_changes()
+        changes = snapshot.monthly_changes
         rescues_change = changes["rescues_change"]
         adoptions_change = changes["adoptions_change"]
         pending_change = changes["pending_change"]
         pending_rescues_change = changes["rescues_change"]  # Use rescues change for pending rescues
 
-        rescue_status_dist = self.analytics_service.get_rescue_status_distribution()
-        adoption_status_dist = self.analytics_service.get_adoption_status_distribution()
-        urgency_dist = self.analytics_service.get_urgency_distribution()
-        species_ranking = self.analytics_service.get_species_adoption_ranking(limit=5)
-        insights = self.analytics_service.get_chart_insights()
-        
-        breed_distribution = self.analytics_service.get_breed_distribution()  # All animals, no limit
-
-        # Line chart: rescued vs adopted trend (last 1 month / 30 days)
-        has_line_data = any(c > 0 for c in rescued_counts) or any(c > 0 for c in adopted_counts)
+        rescue_status_dist = snapshot.rescue_status_distribution
+        adoption_status_dist = snapshot.adoption_status_distribution
+        urgency_dist = snapshot.urgency_distribution
+        species_ranking = snapshot.species_adoption_ranking
+        insights = snapshot.chart_insights
         
-        line_refs = {}  # For legend-line sync
-        if has_line_data:
-            line_data = [
-                {"label": "Rescued", "color": CHART_COLORS["primary"], "values": list(zip(range(len(months)), rescued_counts))},
-                {"label": "Adopted", "color": CHART_COLORS["secondary"], "values": list(zip(range(len(months)), adopted_counts))},
-            ]
-            line_chart = create_line_chart(line_data, width=line_chart_width, height=line_chart_height, x_labels=months, legend_refs=line_refs)
-            line_legend = create_chart_legend([
-                {"label": "Rescued", "color": CHART_COLORS["primary"], "value": sum(rescued_counts)},
-                {"label": "Adopted", "color": CHART_COLORS["secondary"], "value": sum(adopted_counts)},
-            ], horizontal=False, line_refs=line_refs)
-        else:
-            line_chart = create_empty_chart_message("No rescue/adoption data available yet", width=line_chart_width, height=line_chart_height,
-                button_text="View Manage Records", button_icon=ft.Icons.FOLDER_OPEN,
-                on_click=lambda e: page.go("/manage_records"))
-            line_legend = ft.Container()
-
-        chart1_body = _build_horizontal_panel(line_chart, line_legend)
+        breed_distribution = snapshot.breed_distribution  # All animals, no limit
 
         # Pie chart: type distribution
         type_pie_refs = {}  # For legend-pie sync
@@ -242,7 +236,7 @@ class ChartsPage:
 
         from services.map_service import MapService
         map_service = MapService()
-        missions = self.rescue_service.get_all_missions() or []
+        missions = snapshot.missions
         
         is_online = map_service.check_map_tiles_available()
 
@@ -294,21 +288,9 @@ class ChartsPage:
         ], spacing=15, run_spacing=15)
 
         # Chart containers with Flet native charts
-        chart1_container = ft.Container(
-            ft.Column([
-                ft.Row([
-                    ft.Icon(ft.Icons.SHOW_CHART, size=20, color=ft.Colors.TEAL_600),
-                    ft.Text("Rescued vs. Adopted (Last 30 Days)", size=16, weight="w600", color=ft.Colors.BLACK87, expand=True, max_lines=2),
-                ], spacing=10),
-                ft.Divider(height=12, color=ft.Colors.GREY_200),
-                chart1_body,
-            ], spacing=8, horizontal_alignment="center"),
-            padding=ft.padding.only(top=20 if _mobile else 25, bottom=20 if _mobile else 50, left=16 if _mobile else 25, right=16 if _mobile else 25),
-            bgcolor=ft.Colors.WHITE,
-            border_radius=12,
-            border=ft.border.all(1, ft.Colors.GREY_200),
-            shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
-            expand=True,
+        chart1_container = self._build_trend_card(
+            page, months, rescued_counts, adopted_counts, _build_horizontal_panel,
+            line_chart_width, line_chart_height, _mobile,
         )
         
         # Breed trend chart with toggle (adoption vs rescue)
@@ -317,7 +299,7 @@ class ChartsPage:
         
         def build_breed_trend_chart(mode: str) -> tuple:
             """Build breed trend chart for given mode (adoption or rescue)."""
-            day_labels, breed_series = self.analytics_service.get_breed_trends(mode=mode)
+            day_labels, breed_series = snapshot.breed_trends[mode]
             
             if mode == "adoption":
                 breed_colors = ["#9C27B0", "#E91E63", "#26C6DA"]  # Purple, Pink, Cyan
@@ -548,6 +530,12 @@ class ChartsPage:
             ft.Container(create_chart_card_container("Breed Distribution", breed_pie_chart, breed_legend, ft.Icons.PETS, breed_data), col={"xs": 12, "md": 6, "lg": 4}),
         ], spacing=15, run_spacing=15)
 
+        # Latency percentiles (cached with the snapshot)
+        latency_row = self._build_latency_row(snapshot.latency_metrics, _mobile)
+
+        # Capacity forecast (computed once per day)
+        forecast_row = self._build_forecast_card(_build_horizontal_panel, line_chart_width, line_chart_height, _mobile)
+
         rescue_insight_data = insights.get("rescue_insight", {"headline": "No data", "detail": "", "action": ""})
         adoption_insight_data = insights.get("adoption_insight", {"headline": "No data", "detail": "", "action": ""})
         health_insight_data = insights.get("health_insight", {"headline": "No data", "detail": "", "action": ""})
@@ -708,6 +696,10 @@ class ChartsPage:
                         ft.Container(height=20),
                         bar_charts_row,
                         ft.Container(height=20),
+                        latency_row,
+                        ft.Container(height=20),
+                        forecast_row,
+                        ft.Container(height=20),
                         insights_row,
                         ft.Container(height=20),
                         map_container,
@@ -726,6 +718,194 @@ class ChartsPage:
         finish_page_loading(page, _gradient_ref, main_layout)
 
 
+    def _build_trend_card(
+        self,
+        page,
+        months: List[str],
+        rescued_counts: List[int],
+        adopted_counts: List[int],
+        panel: Callable[..., Any],
+        chart_width: Optional[int],
+        chart_height: int,
+        mobile: bool,
+    ) -> Any:
+        """Rescued vs adopted card, with a window picker that reloads the chart."""
+        import flet as ft
+
+        trend_title = ft.Ref[ft.Text]()
+        trend_chart_content = ft.Ref[ft.Container]()
+
+        def build_trend_chart(labels: List[str], rescued: List[int], adopted: List[int]) -> tuple:
+            """Build the rescued vs adopted line chart and legend for one window."""
+            has_line_data = any(c > 0 for c in rescued) or any(c > 0 for c in adopted)
+            line_refs = {}  # For legend-line sync
+            if not has_line_data:
+                return create_empty_chart_message("No rescue/adoption data available yet", width=chart_width, height=chart_height,
+                    button_text="View Manage Records", button_icon=ft.Icons.FOLDER_OPEN,
+                    on_click=lambda e: page.go("/manage_records")), ft.Container()
+            line_data = [
+                {"label": "Rescued", "color": CHART_COLORS["primary"], "values": list(zip(range(len(labels)), rescued))},
+                {"label": "Adopted", "color": CHART_COLORS["secondary"], "values": list(zip(range(len(labels)), adopted))},
+            ]
+            chart = create_line_chart(line_data, width=chart_width, height=chart_height, x_labels=labels, legend_refs=line_refs)
+            legend = create_chart_legend([
+                {"label": "Rescued", "color": CHART_COLORS["primary"], "value": sum(rescued)},
+                {"label": "Adopted", "color": CHART_COLORS["secondary"], "value": sum(adopted)},
+            ], horizontal=False, line_refs=line_refs)
+            return chart, legend
+
+        def on_trend_window_change(e):
+            """Reload the rescued vs adopted chart for the selected window."""
+            title, days, granularity = TREND_WINDOWS[e.control.value]
+            if e.control.value == "30d":
+                labels, rescued, adopted = months, rescued_counts, adopted_counts
+            else:
+                end = datetime.utcnow().date()
+                labels, series = self.analytics_service.get_trends(
+                    ["rescues", "adoptions"], end - timedelta(days=days), end, granularity
+                )
+                rescued, adopted = series["rescues"], series["adoptions"]
+            chart, legend = build_trend_chart(labels, rescued, adopted)
+            trend_title.current.value = f"Rescued vs. Adopted ({title})"
+            trend_chart_content.current.content = panel(chart, legend)
+            page.update()
+
+        line_chart, line_legend = build_trend_chart(months, rescued_counts, adopted_counts)
+        chart1_body = ft.Container(ref=trend_chart_content, content=panel(line_chart, line_legend))
+
+        return ft.Container(
+            ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.SHOW_CHART, size=20, color=ft.Colors.TEAL_600),
+                    ft.Text("Rescued vs. Adopted (Last 30 Days)", ref=trend_title, size=16, weight="w600", color=ft.Colors.BLACK87, expand=True, max_lines=2),
+                    ft.Dropdown(
+                        value="30d",
+                        width=170,
+                        dense=True,
+                        border_radius=8,
+                        options=[ft.dropdown.Option(key, text=label) for key, (label, _, _) in TREND_WINDOWS.items()],
+                        on_change=on_trend_window_change,
+                    ),
+                ], spacing=10),
+                ft.Divider(height=12, color=ft.Colors.GREY_200),
+                chart1_body,
+            ], spacing=8, horizontal_alignment="center"),
+            padding=ft.padding.only(top=20 if mobile else 25, bottom=20 if mobile else 50, left=16 if mobile else 25, right=16 if mobile else 25),
+            bgcolor=ft.Colors.WHITE,
+            border_radius=12,
+            border=ft.border.all(1, ft.Colors.GREY_200),
+            shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
+            expand=True,
+        )
+
+    def _build_latency_row(self, latency: Dict[str, Any], mobile: bool) -> Any:
+        """Row of p50/p90/p99 cards for stay length, rescue response and adoption decisions."""
+        import flet as ft
+
+        def _build_latency_card(title: str, icon: Any, rows: List[tuple]) -> Any:
+            """Card with one p50/p90/p99 line per (label, stats) row."""
+            def cell(value: str, weight: str = "normal", color: Any = ft.Colors.BLACK87) -> Any:
+                return ft.Container(ft.Text(value, size=13, weight=weight, color=color), expand=1)
+
+            lines = [ft.Row([
+                cell("", "w600"),
+                *(cell(name, "w600", ft.Colors.BLACK54) for name in ("p50", "p90", "p99", "n")),
+            ])]
+            for label, stats in rows:
+                lines.append(ft.Row([
+                    cell(label, "w500"),
+                    *(cell(format_duration(stats.get(name))) for name in ("p50", "p90", "p99")),
+                    cell(str(stats.get("count", 0)), color=ft.Colors.BLACK54),
+                ]))
+            return ft.Container(
+                ft.Column([
+                    ft.Row([
+                        ft.Icon(icon, size=20, color=ft.Colors.TEAL_600),
+                        ft.Text(title, size=16, weight="w600", color=ft.Colors.BLACK87, expand=True, max_lines=2),
+                    ], spacing=10),
+                    ft.Divider(height=12, color=ft.Colors.GREY_200),
+                    *lines,
+                ], spacing=8),
+                padding=16 if mobile else 25,
+                bgcolor=ft.Colors.WHITE,
+                border_radius=12,
+                border=ft.border.all(1, ft.Colors.GREY_200),
+                shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
+                expand=True,
+            )
+
+        empty_latency = {"count": 0}
+        rescue_response = latency.get("rescue_response", {})
+        adoption_decision = latency.get("adoption_decision", {})
+        return ft.ResponsiveRow([
+            ft.Container(_build_latency_card("Length of Stay (Intake to Adoption)", ft.Icons.HOME, [
+                ("All animals", latency.get("length_of_stay", empty_latency)),
+            ]), col={"xs": 12, "md": 6, "lg": 4}),
+            ft.Container(_build_latency_card("Rescue Response Time", ft.Icons.TIMER, [
+                (label, rescue_response.get(key, empty_latency))
+                for key, label in (("high", "High"), ("medium", "Medium"), ("low", "Low"), ("all", "All"))
+            ]), col={"xs": 12, "md": 6, "lg": 4}),
+            ft.Container(_build_latency_card("Adoption Decision Time", ft.Icons.GAVEL, [
+                (label, adoption_decision.get(key, empty_latency))
+                for key, label in (("approved", "Approved"), ("denied", "Denied"), ("all", "All"))
+            ]), col={"xs": 12, "md": 12, "lg": 4}),
+        ], spacing=15, run_spacing=15)
+
+    def _build_forecast_card(
+        self,
+        panel: Callable[..., Any],
+        chart_width: Optional[int],
+        chart_height: int,
+        mobile: bool,
+    ) -> Any:
+        """Projected population against capacity, or an empty container without enough history."""
+        import flet as ft
+
+        forecast = self.forecast_service.get_capacity_forecast()
+        if forecast is None:
+            return ft.Container()
+        forecast_labels = [d.strftime("%m-%d") for d in forecast.week_starts]
+        forecast_refs = {}
+        forecast_chart = create_line_chart([
+            {"label": "Projected Population", "color": CHART_COLORS["info"],
+             "values": list(enumerate(forecast.population))},
+            {"label": "Capacity", "color": CHART_COLORS["danger"],
+             "values": [(i, forecast.capacity) for i in range(len(forecast.population))]},
+        ], width=chart_width, height=chart_height, x_labels=forecast_labels, legend_refs=forecast_refs)
+        forecast_legend = create_chart_legend([
+            {"label": "Projected Population", "color": CHART_COLORS["info"], "value": round(forecast.population[-1])},
+            {"label": "Capacity", "color": CHART_COLORS["danger"], "value": forecast.capacity},
+        ], horizontal=False, line_refs=forecast_refs)
+        if forecast.full_on is not None:
+            outlook = f"At capacity around {forecast.full_on.strftime('%b %d, %Y')}"
+            outlook_color = ft.Colors.RED_700
+        else:
+            outlook = f"No shortage projected in the next {len(forecast.week_starts)} weeks"
+            outlook_color = ft.Colors.GREEN_700
+        return ft.Container(
+            ft.Column([
+                ft.Row([
+                    ft.Icon(ft.Icons.WAREHOUSE, size=20, color=ft.Colors.TEAL_600),
+                    ft.Text(f"Capacity Forecast (Next {len(forecast.week_starts)} Weeks)", size=16, weight="w600",
+                            color=ft.Colors.BLACK87, expand=True, max_lines=2),
+                ], spacing=10),
+                ft.Divider(height=12, color=ft.Colors.GREY_200),
+                ft.Text(outlook, size=14, weight="w600", color=outlook_color),
+                ft.Text(
+                    f"{forecast.current_population} of {forecast.capacity} spaces in use · "
+                    f"~{forecast.intake_per_week:.1f} intakes and ~{forecast.adoptions_per_week:.1f} adoptions per week",
+                    size=13, color=ft.Colors.BLACK54,
+                ),
+                panel(forecast_chart, forecast_legend),
+            ], spacing=8),
+            padding=16 if mobile else 25,
+            bgcolor=ft.Colors.WHITE,
+            border_radius=12,
+            border=ft.border.all(1, ft.Colors.GREY_200),
+            shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
+        )
+
+
 __all__ = ["ChartsPage"]
 
 
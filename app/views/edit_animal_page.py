@@ -10,7 +10,7 @@ from urllib.parse import urlparse, parse_qs
 import app_config
 from services.animal_service import AnimalService
 from services.rescue_service import RescueService
-from storage.file_store import get_file_store
+from storage.file_store import FileStoreError, get_file_store
 from components import (
     create_page_header, create_gradient_background, create_animal_form, show_snackbar
 )
@@ -24,6 +24,20 @@ class EditAnimalPage:
         self._animal_id = None
         self._original_photo = None
 
+    def _rename_photo(self, new_name: str) -> None:
+        """Rename the animal's stored photo file after its name changed."""
+        existing_photo = self._original_photo
+        if not existing_photo or existing_photo.startswith('data:') or len(existing_photo) >= 200:
+            return
+        try:
+            renamed_filename = self.file_store.rename_file(existing_photo, new_name)
+        except (FileNotFoundError, FileStoreError) as e:
+            print(f"[WARN] Could not rename photo {existing_photo}: {e}")
+            return
+        # A shared file keeps its name; re-pointing would release its reference
+        if renamed_filename != existing_photo:
+            self.service.update_animal_photo(self._animal_id, renamed_filename)
+
     def build(self, page, animal_id: Optional[int] = None) -> None:
         """Build the edit animal form on the provided `flet.Page`."""
         try:
@@ -92,13 +106,14 @@ class EditAnimalPage:
             """Handle form submission."""
             try:
                 new_photo_filename = None
-                if form_data.get("pending_image_bytes"):
-                    new_photo_filename = self.file_store.save_bytes(
-                        form_data["pending_image_bytes"],
-                        original_name=form_data.get("pending_original_name") or "photo.jpg",
-                        validate=True,
-                        custom_name=form_data["name"]
-                    )
+                if form_data.get("pending_image_path"):
+                    with open(form_data["pending_image_path"], "rb") as image_file:
+                        new_photo_filename = self.file_store.save_stream(
+                            image_file,
+                            original_name=form_data.get("pending_original_name") or "photo.jpg",
+                            validate=True,
+                            custom_name=form_data["name"]
+                        )
                 
                 original_animal = self.service.get_animal_by_id(self._animal_id)
                 original_name = original_animal.get('name', '') if original_animal else ''
@@ -114,18 +129,9 @@ class EditAnimalPage:
                 
                 if new_photo_filename and success:
                     self.service.update_animal_photo(self._animal_id, new_photo_filename)
-                elif success and original_name != form_data["name"] and not form_data.get("pending_image_bytes"):
+                elif success and original_name != form_data["name"] and not form_data.get("pending_image_path"):
                     # Name changed but no new photo - rename existing photo file
-                    existing_photo = self._original_photo
-                    if existing_photo and not existing_photo.startswith('data:') and len(existing_photo) < 200:
-                        try:
-                            renamed_filename = self.file_store.rename_file(existing_photo, form_data["name"])
-                            self.service.db.execute(
-                                "UPDATE animals SET photo = ? WHERE id = ?",
-                                (renamed_filename, self._animal_id)
-                            )
-                        except Exception:
-                            pass
+                    self._rename_photo(form_data["name"])
                 
                 if success:
                     show_snackbar(page, "Animal updated successfully!")
@@ -58,12 +58,13 @@ class UserAnalyticsPage:
         _gradient_ref = show_page_loading(page, None if _mobile else sidebar, "Loading analytics...")
         sidebar = create_user_sidebar(page, user_name, current_route=page.route)
 
-        user_activity_stats = self.analytics_service.get_user_activity_stats(user_id)
-        user_rescue_status_dist = self.analytics_service.get_user_rescue_status_distribution(user_id)
-        user_adoption_status_dist = self.analytics_service.get_user_adoption_status_distribution(user_id)
-        user_insights = self.analytics_service.get_user_insights(user_id)
+        bundle = self.analytics_service.get_user_insight_bundle(user_id)
+        user_activity_stats = bundle.activity_stats
+        user_rescue_status_dist = bundle.rescue_status_distribution
+        user_adoption_status_dist = bundle.adoption_status_distribution
+        user_insights = bundle.insights
         
-        day_labels, rescues_reported, adoptions_approved = self.analytics_service.get_user_chart_data(user_id)
+        day_labels, rescues_reported, adoptions_approved = bundle.chart_data
         
         app_state.rescues.load_user_missions(user_id)
         user_missions = app_state.rescues.user_missions or []
@@ -324,7 +325,7 @@ class UserAnalyticsPage:
         ], spacing=15, expand=True)
 
         # Chart 4: Your Breed Preferences Bar Chart (Top 5)
-        user_breed_prefs = self.analytics_service.get_user_breed_preferences(user_id, limit=5)
+        user_breed_prefs = bundle.breed_preferences
         breed_bar_refs = {}
         
         if user_breed_prefs and sum(count for _, count in user_breed_prefs) > 0:
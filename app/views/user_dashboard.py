@@ -1,6 +1,6 @@
 """User dashboard with activity overview and featured animals."""
 from __future__ import annotations
-from typing import Optional
+from typing import Dict, List, Optional
 import threading
 import random
 
@@ -8,9 +8,9 @@ import app_config
 from services.animal_service import AnimalService
 from services.rescue_service import RescueService
 from services.adoption_service import AdoptionService
-from services.analytics_service import AnalyticsService
+from services.analytics_service import AnalyticsService, UserInsightBundle
 from services.map_service import MapService
-from services.photo_service import load_photo
+from services.photo_service import load_photo_source
 from state import get_app_state
 from components import (
     create_user_sidebar, create_gradient_background,
@@ -56,62 +56,19 @@ class UserDashboard:
         sync_thread = threading.Thread(target=sync_task, daemon=True)
         sync_thread.start()
 
-    def build(self, page) -> None:
-        """Build the user dashboard on the provided flet.Page instance."""
-        try:
-            import flet as ft
-        except Exception as exc:
-            raise RuntimeError("Flet must be installed to build the UI") from exc
-
-        page.title = "User Dashboard"
-
-        app_state = get_app_state(page)
-        user_name = app_state.auth.user_name or "User"
-        user_id = app_state.auth.user_id
-
-        _mobile = is_mobile(page)
-        sidebar = create_user_sidebar(page, user_name, current_route=page.route)
-        drawer = create_user_drawer(page, current_route=page.route) if _mobile else None
-        _gradient_ref = show_page_loading(page, None if _mobile else sidebar, "Loading dashboard...")
-
-        self._sync_pending_addresses_background()
-
-        all_adoptions = self.adoption_service.get_all_requests() or []
-        all_rescues = self.rescue_service.get_all_missions() or []
-        
-        if user_id:
-            user_rescues = self.rescue_service.get_user_missions(user_id)
-            user_rescues = [r for r in user_rescues if (r.get("status") or "").lower() != "cancelled"]
-        else:
-            user_rescues = []
-        
-        if user_id:
-            user_adoptions = [a for a in all_adoptions if a.get("user_id") == user_id]
-            user_adoptions = [a for a in user_adoptions if (a.get("status") or "").lower() != "cancelled"]
-        else:
-            user_adoptions = []
-        
-        total_adoptions = len(user_adoptions)
-        total_rescues = len(user_rescues)
-
-        user_rescue_status_dist = self.analytics_service.get_user_rescue_status_distribution(user_id) if user_id else {}
-        user_adoption_status_dist = self.analytics_service.get_user_adoption_status_distribution(user_id) if user_id else {}
-
-        adoptable_animals = self.animal_service.get_adoptable_animals() or []
-        if adoptable_animals:
-            random.shuffle(adoptable_animals)
+    def _build_impact_section(self, page, bundle: Optional[UserInsightBundle], mobile: bool) -> object:
+        """Build the "Your Impact" card from the user's insight bundle (empty without one)."""
+        import flet as ft
 
-        sidebar = create_user_sidebar(page, user_name, current_route=page.route)
-        if _mobile:
-            drawer = create_user_drawer(page, current_route=page.route)
-
-        user_activity_stats = self.analytics_service.get_user_activity_stats(user_id) if user_id else {}
-        rescued_successfully = user_rescue_status_dist.get("rescued", 0) if user_rescue_status_dist else 0
+        total_rescues = bundle.rescue_reports if bundle else 0
+        rescue_status_dist = bundle.rescue_status_distribution if bundle else {}
+        user_activity_stats = bundle.activity_stats if bundle else {}
+        rescued_successfully = rescue_status_dist.get("rescued", 0)
         
-        impact_insight_data = self.analytics_service.get_user_impact_insights(user_id) if user_id else []
+        impact_insight_data = bundle.impact_insights if bundle else []
         
         # Render insights using frontend component
-        insight_widgets = create_impact_insight_widgets(impact_insight_data, page=page, mobile=_mobile)
+        insight_widgets = create_impact_insight_widgets(impact_insight_data, page=page, mobile=mobile)
         
         def create_impact_stat(icon, value, label, color):
             return ft.Container(
@@ -132,7 +89,7 @@ class UserDashboard:
                 padding=ft.padding.symmetric(vertical=15),
             )
         
-        impact_section = ft.Container(
+        return ft.Container(
             ft.Column([
                 ft.Row([
                     ft.Icon(ft.Icons.AUTO_AWESOME, size=22, color=ft.Colors.AMBER_600),
@@ -155,6 +112,96 @@ class UserDashboard:
             shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
         )
 
+    def _build_status_pie(
+        self,
+        page,
+        status_dist: Dict[str, int],
+        status_order: List[str],
+        empty_message: str,
+        button_text: str,
+        button_icon: object,
+        route: str,
+    ) -> tuple:
+        """Build a status pie chart, its legend and the rows for its details dialog.
+        
+        Returns:
+            Tuple of (pie, legend, dialog rows); without data the pie is an empty
+            message linking to ``route`` and there are no dialog rows
+        """
+        import flet as ft
+
+        if not status_dist or sum(status_dist.values()) <= 0:
+            empty = create_empty_chart_message(
+                empty_message,
+                width=160,
+                height=150,
+                button_text=button_text,
+                button_icon=button_icon,
+                on_click=lambda e: page.go(route),
+            )
+            return empty, ft.Container(), []
+
+        pie_refs = {}  # For legend-pie sync
+        sections = []
+        total = sum(status_dist.values())
+        for status in status_order:
+            if status in status_dist:
+                value = status_dist[status]
+                pct = (value / total * 100) if total > 0 else 0
+                sections.append({
+                    "value": value,
+                    "title": f"{pct:.0f}%",
+                    "color": STATUS_COLORS.get(status, STATUS_COLORS["default"]),
+                })
+        pie = create_pie_chart(sections, width=140, height=140, section_radius=54, legend_refs=pie_refs)
+        
+        legend_items = [
+            {"label": status.capitalize(), "value": status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])}
+            for status in status_order
+        ]
+        legend = create_chart_legend(legend_items, horizontal=False, pie_refs=pie_refs)
+        data_for_dialog = [{"label": status.capitalize(), "value": status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])} for status in status_order if status in status_dist]
+        return pie, legend, data_for_dialog
+
+    def build(self, page) -> None:
+        """Build the user dashboard on the provided flet.Page instance."""
+        try:
+            import flet as ft
+        except Exception as exc:
+            raise RuntimeError("Flet must be installed to build the UI") from exc
+
+        page.title = "User Dashboard"
+
+        app_state = get_app_state(page)
+        user_name = app_state.auth.user_name or "User"
+        user_id = app_state.auth.user_id
+
+        _mobile = is_mobile(page)
+        sidebar = create_user_sidebar(page, user_name, current_route=page.route)
+        drawer = create_user_drawer(page, current_route=page.route) if _mobile else None
+        _gradient_ref = show_page_loading(page, None if _mobile else sidebar, "Loading dashboard...")
+
+        self._sync_pending_addresses_background()
+
+        bundle = self.analytics_service.get_user_insight_bundle(user_id) if user_id else None
+        map_missions = self.rescue_service.get_map_missions() or []
+        
+        total_adoptions = bundle.adoption_requests if bundle else 0
+        total_rescues = bundle.rescue_reports if bundle else 0
+
+        user_rescue_status_dist = bundle.rescue_status_distribution if bundle else {}
+        user_adoption_status_dist = bundle.adoption_status_distribution if bundle else {}
+
+        adoptable_animals = self.animal_service.get_adoptable_animals() or []
+        if adoptable_animals:
+            random.shuffle(adoptable_animals)
+
+        sidebar = create_user_sidebar(page, user_name, current_route=page.route)
+        if _mobile:
+            drawer = create_user_drawer(page, current_route=page.route)
+
+        impact_section = self._build_impact_section(page, bundle, _mobile)
+
         def create_quick_action_btn(icon, text, color, route):
             return ft.ElevatedButton(
                 content=ft.Row([
@@ -218,39 +265,10 @@ class UserDashboard:
                 shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
             )
 
-        adoption_pie_refs = {}  # For legend-pie sync
-        if user_adoption_status_dist and sum(user_adoption_status_dist.values()) > 0:
-            adoption_sections = []
-            total = sum(user_adoption_status_dist.values())
-            status_order = ["pending", "approved", "denied"]
-            for status in status_order:
-                if status in user_adoption_status_dist:
-                    value = user_adoption_status_dist[status]
-                    pct = (value / total * 100) if total > 0 else 0
-                    adoption_sections.append({
-                        "value": value,
-                        "title": f"{pct:.0f}%",
-                        "color": STATUS_COLORS.get(status, STATUS_COLORS["default"]),
-                    })
-            adoption_pie = create_pie_chart(adoption_sections, width=140, height=140, section_radius=54, legend_refs=adoption_pie_refs)
-            
-            adoption_legend_items = [
-                {"label": status.capitalize(), "value": user_adoption_status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])}
-                for status in status_order
-            ]
-            adoption_legend = create_chart_legend(adoption_legend_items, horizontal=False, pie_refs=adoption_pie_refs)
-            adoption_data_for_dialog = [{"label": status.capitalize(), "value": user_adoption_status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])} for status in status_order if status in user_adoption_status_dist]
-        else:
-            adoption_pie = create_empty_chart_message(
-                "No applications yet",
-                width=160,
-                height=150,
-                button_text="Apply to Adopt",
-                button_icon=ft.Icons.FAVORITE,
-                on_click=lambda e: page.go("/available_adoption"),
-            )
-            adoption_legend = ft.Container()
-            adoption_data_for_dialog = []
+        adoption_pie, adoption_legend, adoption_data_for_dialog = self._build_status_pie(
+            page, user_adoption_status_dist, ["pending", "approved", "denied"],
+            "No applications yet", "Apply to Adopt", ft.Icons.FAVORITE, "/available_adoption",
+        )
         
         def show_adoption_details(e):
             if adoption_data_for_dialog:
@@ -310,39 +328,10 @@ class UserDashboard:
             shadow=ft.BoxShadow(blur_radius=8, spread_radius=1, color=ft.Colors.BLACK12, offset=(0, 2)),
         )
 
-        rescue_pie_refs = {}  # For legend-pie sync
-        if user_rescue_status_dist and sum(user_rescue_status_dist.values()) > 0:
-            rescue_sections = []
-            total = sum(user_rescue_status_dist.values())
-            status_order = ["pending", "on-going", "rescued", "failed"]
-            for status in status_order:
-                if status in user_rescue_status_dist:
-                    value = user_rescue_status_dist[status]
-                    pct = (value / total * 100) if total > 0 else 0
-                    rescue_sections.append({
-                        "value": value,
-                        "title": f"{pct:.0f}%",
-                        "color": STATUS_COLORS.get(status, STATUS_COLORS["default"]),
-                    })
-            rescue_pie = create_pie_chart(rescue_sections, width=140, height=140, section_radius=54, legend_refs=rescue_pie_refs)
-            
-            rescue_legend_items = [
-                {"label": status.capitalize(), "value": user_rescue_status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])}
-                for status in status_order
-            ]
-            rescue_legend = create_chart_legend(rescue_legend_items, horizontal=False, pie_refs=rescue_pie_refs)
-            rescue_data_for_dialog = [{"label": status.capitalize(), "value": user_rescue_status_dist.get(status, 0), "color": STATUS_COLORS.get(status, STATUS_COLORS["default"])} for status in status_order if status in user_rescue_status_dist]
-        else:
-            rescue_pie = create_empty_chart_message(
-                "No reports yet",
-                width=160,
-                height=150,
-                button_text="Report Rescue",
-                button_icon=ft.Icons.PETS,
-                on_click=lambda e: page.go("/rescue_form"),
-            )
-            rescue_legend = ft.Container()
-            rescue_data_for_dialog = []
+        rescue_pie, rescue_legend, rescue_data_for_dialog = self._build_status_pie(
+            page, user_rescue_status_dist, ["pending", "on-going", "rescued", "failed"],
+            "No reports yet", "Report Rescue", ft.Icons.PETS, "/rescue_form",
+        )
         
         def show_rescue_details(e):
             if rescue_data_for_dialog:
@@ -601,7 +590,7 @@ class UserDashboard:
                 animal_species = animal.get("species", "Unknown")
                 animal_breed = animal.get("breed")
                 animal_health = animal.get("status", "Unknown")
-                animal_photo = load_photo(animal.get("photo"))
+                animal_photo_url, animal_photo = load_photo_source(animal.get("photo"))
                 
                 return create_animal_card(
                     animal_id=animal_id,
@@ -610,6 +599,7 @@ class UserDashboard:
                     age=animal_age if isinstance(animal_age, int) else 0,
                     status=animal_health,
                     photo_base64=animal_photo,
+                    photo_url=animal_photo_url,
                     on_adopt=lambda e, aid=animal_id: page.go(f"/adoption_form?animal_id={aid}"),
                     is_admin=False,
                     show_adopt_button=True,
@@ -778,7 +768,7 @@ class UserDashboard:
             map_card = ft.Container(
                 create_interactive_map(
                     map_service=self.map_service,
-                    missions=all_rescues,
+                    missions=map_missions,
                     page=page,
                     zoom=11,
                     is_admin=False,
@@ -789,7 +779,7 @@ class UserDashboard:
                 ),
             )
         else:
-            offline_widget = self.map_service.create_offline_map_fallback(all_rescues, is_admin=False)
+            offline_widget = self.map_service.create_offline_map_fallback(map_missions, is_admin=False)
             if offline_widget:
                 map_card = ft.Container(
                     ft.Column([
@@ -819,7 +809,7 @@ class UserDashboard:
                             ft.Text("Realtime Rescue Mission Map", size=16, weight="w600", color=ft.Colors.BLACK87),
                         ], spacing=8),
                         ft.Divider(height=15, color=ft.Colors.GREY_200),
-                        self.map_service.create_empty_map_placeholder(len(all_rescues)),
+                        self.map_service.create_empty_map_placeholder(len(map_missions)),
                     ], spacing=0),
                     padding=20,
                     bgcolor=ft.Colors.WHITE,